@@ -12,18 +12,23 @@ import os
 import json
 import uuid
 from datetime import datetime, timedelta
-from fastapi.responses import FileResponse
+from fastapi.responses import FileResponse, StreamingResponse
 from fastapi.background import BackgroundTasks
 import re
+import tempfile
 import traceback
 
 from ai_service.services import get_chart_service
-from ai_service.services.chart_service import create_chart_service
+from ai_service.services.chart_service import BATCH_VERIFICATION_MODES, create_chart_service
 from ai_service.api.services.openai import get_openai_service
 from ai_service.core.rectification.main import comprehensive_rectification
-from ai_service.utils.chart_visualizer import generate_comparison_chart, generate_chart_image
+from ai_service.core.render_cache import etag_matches, file_etag
+from ai_service.core.render_service import get_render_service
 from ai_service.database.repositories import ChartRepository
 from ai_service.core.config import settings
+from ai_service.utils.export_stream import (
+    choose_encoding, compress_chunks, encoded_etag, iter_file, iter_json, iter_text
+)
 
 # Set up logging
 logger = logging.getLogger(__name__)
@@ -31,6 +36,16 @@ logger = logging.getLogger(__name__)
 # Create router
 router = APIRouter()
 
+# Content types of chart exports by format
+EXPORT_CONTENT_TYPES = {
+    "pdf": "application/pdf",
+    "png": "image/png",
+    "jpeg": "image/jpeg",
+    "jpg": "image/jpeg",
+    "svg": "image/svg+xml",
+    "json": "application/json"
+}
+
 # Helper function to get chart repository
 async def get_chart_repository():
     """Get instance of chart repository for data storage"""
@@ -74,6 +89,13 @@ class RectificationRequest(BaseModel):
     include_details: bool = Field(False, description="Whether to include detailed rectification process")
 
 
+class RectificationJobRequest(BaseModel):
+    """Request to queue a birth time rectification."""
+    chart_id: str = Field(..., description="ID of the chart to rectify")
+    responses: List[Dict[str, Any]] = Field(..., description="List of questionnaire responses")
+    priority: int = Field(5, ge=0, le=9, description="Job priority from 0 (lowest) to 9 (highest)")
+
+
 class RectificationResponse(BaseModel):
     """Response for birth time rectification."""
     status: str
@@ -124,6 +146,95 @@ async def generate_chart(request: ChartGenerationRequest) -> Dict[str, Any]:
         raise HTTPException(status_code=500, detail=f"Error generating chart: {str(e)}")
 
 
+async def _read_ndjson(request: Request) -> List[Any]:
+    """
+    Parse an NDJSON request body line by line as it arrives.
+
+    The body is read before the response starts: a streaming response
+    listens on the same channel for the client disconnecting. Lines that
+    are not valid JSON are kept as strings and reported as invalid records.
+    """
+    records: List[Any] = []
+    pending = b""
+    async for chunk in request.stream():
+        pending += chunk
+        *lines, pending = pending.split(b"\n")
+        records.extend(_parse_ndjson_line(line) for line in lines if line.strip())
+    if pending.strip():
+        records.append(_parse_ndjson_line(pending))
+    return records
+
+
+def _parse_ndjson_line(line: bytes) -> Any:
+    try:
+        return json.loads(line)
+    except json.JSONDecodeError:
+        return line.decode("utf-8", errors="replace")
+
+
+async def _iterate(records: List[Any]):
+    for record in records:
+        yield record
+
+
+@router.post("/generate/batch", tags=["Chart"])
+async def generate_charts_batch(
+    request: Request,
+    verification: str = Query("skip", description="OpenAI verification: skip, inline or deferred"),
+    include_charts: bool = Query(False, description="Whether to include the chart data in each result"),
+    session_id: Optional[str] = Query(None, description="Session ID for tracking")
+):
+    """
+    Generate charts for many birth records in one request.
+
+    The body is NDJSON, one record per line (Content-Type
+    application/x-ndjson), or a JSON array of records. Each record holds
+    birth details as for /generate, either flat or under "birth_details".
+    Charts are calculated on the chart worker pool and stored in batches.
+
+    Results are streamed back as NDJSON, one line per record in the order
+    the charts finish, each with the record's index in the input.
+    """
+    if verification not in BATCH_VERIFICATION_MODES:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Unknown verification mode: {verification}. Use one of: {', '.join(BATCH_VERIFICATION_MODES)}"
+        )
+
+    content_type = request.headers.get("content-type", "")
+    if "ndjson" in content_type or "jsonlines" in content_type:
+        records = _iterate(await _read_ndjson(request))
+    else:
+        try:
+            body = await request.json()
+        except json.JSONDecodeError:
+            raise HTTPException(status_code=400, detail="Request body is not valid JSON")
+        if isinstance(body, dict) and isinstance(body.get("records"), list):
+            body = body["records"]
+        if not isinstance(body, list):
+            raise HTTPException(status_code=400, detail="Expected a JSON array of records or NDJSON")
+        records = _iterate(body)
+
+    if session_id:
+        chart_service = create_chart_service(session_id=session_id)
+    else:
+        chart_service = get_chart_service()
+
+    async def results():
+        succeeded = failed = 0
+        async for result in chart_service.generate_charts(records, verification=verification):
+            if result["status"] == "success":
+                succeeded += 1
+            else:
+                failed += 1
+            if not include_charts:
+                result.pop("chart", None)
+            yield json.dumps(result, default=str) + "\n"
+        logger.info(f"Batch chart generation finished: {succeeded} generated, {failed} failed")
+
+    return StreamingResponse(results(), media_type="application/x-ndjson")
+
+
 @router.get("/{chart_id}", response_model=ChartResponse, tags=["Chart"])
 async def get_chart(chart_id: str = Path(..., description="Chart ID")) -> Dict[str, Any]:
     """
@@ -229,10 +340,67 @@ async def rectify_chart(request: RectificationRequest) -> Dict[str, Any]:
         raise HTTPException(status_code=500, detail=f"Error rectifying birth time: {str(e)}")
 
 
+@router.post("/rectify/jobs", status_code=202, tags=["Chart"])
+async def enqueue_rectification_job(request: RectificationJobRequest) -> Dict[str, Any]:
+    """
+    Queue a birth time rectification and return its job ID immediately.
+
+    A rectification worker runs the job; poll GET /rectify/jobs/{job_id} for
+    progress, partial results and the final result. Submitting the same chart
+    and responses while a job for them is pending returns that job.
+
+    Args:
+        request: Rectification job request with chart ID, responses and priority
+
+    Returns:
+        Job ID and status
+    """
+    try:
+        chart_service = get_chart_service()
+        job = await chart_service.enqueue_rectification(
+            chart_id=request.chart_id,
+            answers=request.responses,
+            priority=request.priority
+        )
+
+        logger.info(f"Queued rectification job {job['job_id']} for chart {request.chart_id}")
+        return job
+
+    except ValueError as e:
+        logger.error(f"Validation error queuing rectification: {e}")
+        status_code = 404 if "not found" in str(e).lower() else 400
+        raise HTTPException(status_code=status_code, detail=str(e))
+    except Exception as e:
+        logger.error(f"Error queuing rectification: {e}")
+        raise HTTPException(status_code=503, detail=f"Rectification queue unavailable: {str(e)}")
+
+
+@router.get("/rectify/jobs/{job_id}", tags=["Chart"])
+async def get_rectification_job(job_id: str = Path(..., description="Rectification job ID")) -> Dict[str, Any]:
+    """
+    Get the status, progress and result of a queued rectification.
+
+    Args:
+        job_id: ID returned when the job was queued
+
+    Returns:
+        Job status with progress, latest partial result and, once completed,
+        the rectification result
+    """
+    chart_service = get_chart_service()
+    status = await chart_service.get_rectification_status(job_id)
+
+    if status.get("status") == "not_found":
+        raise HTTPException(status_code=404, detail=f"Rectification job {job_id} not found")
+    if status.get("status") == "error":
+        raise HTTPException(status_code=503, detail=status.get("error", "Rectification queue unavailable"))
+    return status
+
+
 @router.post("/export", response_model=Dict[str, Any])
 async def export_chart(
     chart_id: str = Body(..., description="Chart ID to export"),
-    format: str = Body("pdf", description="Export format: pdf, png, jpg"),
+    format: str = Body("pdf", description="Export format: pdf, png, jpg, svg, json"),
     include_interpretation: bool = Body(True, description="Include astrological interpretation in export"),
     paper_size: str = Body("letter", description="Paper size for PDF (letter, a4, legal)")
 ):
@@ -252,7 +420,7 @@ async def export_chart(
             raise HTTPException(status_code=404, detail=f"Chart {chart_id} not found")
 
         # Validate format
-        supported_formats = ["pdf", "png", "jpg", "jpeg"]
+        supported_formats = ["pdf", "png", "jpg", "jpeg", "svg", "json"]
         if format.lower() not in supported_formats:
             raise HTTPException(
                 status_code=400,
@@ -417,12 +585,17 @@ async def export_chart(
 async def download_chart_export(
     export_id: str,
     format: str,
+    request: Request,
     background_tasks: BackgroundTasks
 ):
     """
     Download a previously generated chart export.
 
     This endpoint returns the actual file for download after verifying its existence.
+    Files carry an ETag; a request whose If-None-Match matches it gets a 304
+    without the file. Exports evicted from the render cache are rendered again.
+    The file is sent in chunks, compressed with gzip or zstd when the client
+    accepts them.
     """
     chart_repository = await get_chart_repository()
 
@@ -446,28 +619,25 @@ async def download_chart_export(
             raise HTTPException(status_code=404, detail="Export file path not found")
 
         if not os.path.exists(file_path):
-            raise HTTPException(status_code=404, detail="Export file not found on server")
+            # Rendered exports may have been evicted from the render cache
+            chart = await get_chart_service().get_chart(export_details.get("chart_id", ""))
+            if not chart:
+                raise HTTPException(status_code=404, detail="Export file not found on server")
+            file_path = await get_chart_service().render_export_file(
+                chart, export_details.get("format", format), file_path
+            )
 
         if not os.path.isfile(file_path):
             raise HTTPException(status_code=404, detail="Export path exists but is not a file")
 
-        try:
-            # Check file is readable
-            with open(file_path, 'rb') as test_file:
-                test_file.read(1)
-        except Exception as file_error:
-            logger.error(f"File exists but cannot be read: {file_error}")
-            raise HTTPException(status_code=500, detail="Export file cannot be read")
-
-        # Determine content type
-        content_types = {
-            "pdf": "application/pdf",
-            "png": "image/png",
-            "jpeg": "image/jpeg",
-            "jpg": "image/jpeg"
-        }
+        # Determine content type and coding
+        content_type = EXPORT_CONTENT_TYPES.get(format.lower(), "application/octet-stream")
+        encoding = choose_encoding(request.headers.get("accept-encoding"), content_type)
 
-        content_type = content_types.get(format.lower(), "application/octet-stream")
+        # The client's copy is current; skip the file
+        etag = encoded_etag(file_etag(file_path), encoding)
+        if etag_matches(request.headers.get("if-none-match"), etag):
+            return Response(status_code=304, headers={"ETag": etag, "Vary": "Accept-Encoding"})
 
         # Log download
         logger.info(f"Export {export_id} downloading in {format} format")
@@ -483,11 +653,23 @@ async def download_chart_export(
         chart_id = export_details.get("chart_id", "chart")
         download_filename = f"astrological_chart_{chart_id}_{datetime.now().strftime('%Y%m%d')}.{format}"
 
+        headers = {"ETag": etag, "Vary": "Accept-Encoding"}
+        if encoding is not None:
+            headers["Content-Encoding"] = encoding
+            headers["Content-Disposition"] = f'attachment; filename="{download_filename}"'
+            return StreamingResponse(
+                compress_chunks(iter_file(file_path), encoding),
+                media_type=content_type,
+                headers=headers,
+                background=background_tasks
+            )
+
         # Return file
         return FileResponse(
             path=file_path,
             filename=download_filename,
             media_type=content_type,
+            headers=headers,
             background=background_tasks
         )
 
@@ -498,6 +680,71 @@ async def download_chart_export(
         logger.error(traceback.format_exc())
         raise HTTPException(status_code=500, detail=f"Chart download failed: {str(e)}")
 
+@router.get("/export/{chart_id}/stream")
+async def stream_chart_export(
+    request: Request,
+    background_tasks: BackgroundTasks,
+    chart_id: str = Path(..., description="Chart ID to export"),
+    format: str = Query("json", description="Export format: json, svg, pdf, png")
+):
+    """
+    Stream an export of a chart without storing it.
+
+    JSON and SVG are encoded while they are sent, so the first bytes go out
+    at once; PDFs and PNGs are rendered, or taken from the render cache, and
+    then sent in chunks. The response is compressed with gzip or zstd when
+    the client accepts them.
+    """
+    format = format.lower()
+    if format not in ("json", "svg", "pdf", "png"):
+        raise HTTPException(
+            status_code=400,
+            detail=f"Unsupported format: {format}. Supported formats: json, svg, pdf, png"
+        )
+
+    try:
+        chart_service = get_chart_service()
+        chart = await chart_service.get_chart(chart_id)
+        if not chart:
+            raise HTTPException(status_code=404, detail=f"Chart {chart_id} not found")
+
+        if format == "json":
+            chunks = iter_json(chart)
+        elif format == "svg":
+            from ai_service.utils.svg_chart import chart_wheel_svg
+            chunks = iter_text(chart_wheel_svg(chart))
+        else:
+            file_path = os.path.join(tempfile.gettempdir(), f"stream_{chart_id}_{uuid.uuid4().hex[:8]}.{format}")
+            rendered_path = await chart_service.render_export_file(chart, format, file_path)
+            if rendered_path == file_path:
+                # Not kept in the render cache; remove it once it is sent
+                background_tasks.add_task(os.remove, file_path)
+            chunks = iter_file(rendered_path)
+
+        content_type = EXPORT_CONTENT_TYPES[format]
+        encoding = choose_encoding(request.headers.get("accept-encoding"), content_type)
+        headers = {
+            "Content-Disposition": f'attachment; filename="astrological_chart_{chart_id}.{format}"',
+            "Vary": "Accept-Encoding"
+        }
+        if encoding is not None:
+            headers["Content-Encoding"] = encoding
+
+        logger.info(f"Streaming {format} export of chart {chart_id}")
+        return StreamingResponse(
+            compress_chunks(chunks, encoding),
+            media_type=content_type,
+            headers=headers,
+            background=background_tasks
+        )
+
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error streaming chart export: {e}")
+        logger.error(traceback.format_exc())
+        raise HTTPException(status_code=500, detail=f"Chart export failed: {str(e)}")
+
 async def _update_download_stats(chart_repository, export_id: str) -> None:
     """Update download statistics for an export."""
     try:
@@ -668,9 +915,6 @@ async def compare_charts(
 
         if include_visualization:
             try:
-                # Import chart visualization utilities
-                from ai_service.utils.chart_visualizer import generate_comparison_chart
-
                 # Create directory for visualizations
                 visualization_dir = os.path.join(settings.MEDIA_ROOT, "visualizations")
                 os.makedirs(visualization_dir, exist_ok=True)
@@ -680,13 +924,11 @@ async def compare_charts(
 
                 # Generate the comparison visualization
                 logger.info(f"Generating comparison visualization for {chart1_id} and {chart2_id}")
-                visualization_success = generate_comparison_chart(
-                    original_chart=chart1,
-                    rectified_chart=chart2,
-                    output_path=visualization_path
+                visualization_path = await get_render_service().render(
+                    "comparison", chart1, chart2, visualization_path
                 )
 
-                if visualization_success and os.path.exists(visualization_path):
+                if os.path.exists(visualization_path):
                     visualization_url = f"/api/chart/comparison/{comparison_id}/visualization"
 
                     # Get base64 encoding of the image for inline display
@@ -808,8 +1050,8 @@ async def download_comparison(
 
 @router.get("/comparison/{comparison_id}/visualization", response_class=FileResponse)
 async def get_comparison_visualization(
-    comparison_id: str = Path(..., description="Comparison ID"),
-    background_tasks: BackgroundTasks = Depends()
+    background_tasks: BackgroundTasks,
+    comparison_id: str = Path(..., description="Comparison ID")
 ):
     """
     Retrieve the visualization image for a chart comparison.
@@ -853,8 +1095,7 @@ async def get_comparison_visualization(
             os.makedirs(visualization_dir, exist_ok=True)
 
             # Generate the visualization
-            from ai_service.utils.chart_visualizer import generate_comparison_chart
-            file_path = generate_comparison_chart(chart1, chart2, file_path)
+            file_path = await get_render_service().render("comparison", chart1, chart2, file_path)
 
             if not os.path.exists(file_path):
                 raise HTTPException(status_code=500, detail="Failed to generate comparison visualization")
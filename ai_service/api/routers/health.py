@@ -27,6 +27,7 @@ class HealthResponse(BaseModel):
     version: str = "1.0.0"
     openai_status: str
     usage_stats: Dict[str, Any] = {}
+    chart_stats: Dict[str, Any] = {}
 
 
 @router.get("/", response_model=HealthResponse, tags=["Health"])
@@ -49,13 +50,22 @@ async def health_check() -> Dict[str, Any]:
         openai_status = "degraded"
         usage_stats = {}
 
+    # Chart cache and worker pool statistics
+    from ai_service.core.rectification.chart_cache import get_chart_cache
+    from ai_service.core.rectification.chart_workers import get_chart_worker_pool
+    chart_stats = {
+        "cache": get_chart_cache().get_stats(),
+        "workers": get_chart_worker_pool().get_metrics()
+    }
+
     return {
         "status": "healthy",
         "timestamp": datetime.now().isoformat(),
         "environment": "production",
         "version": "1.0.0",
         "openai_status": openai_status,
-        "usage_stats": usage_stats
+        "usage_stats": usage_stats,
+        "chart_stats": chart_stats
     }
 
 
@@ -33,7 +33,7 @@ async def initialize_session(request: Request, background_tasks: BackgroundTasks
         }
 
         # Save session data
-        save_session(session_id, session_data)
+        await save_session(session_id, session_data)
 
         # Store the new session ID in request state for middleware
         request.state.new_session_id = session_id
@@ -129,7 +129,7 @@ async def update_session_data(
             session_data[key] = value
 
     # Save updated session data
-    save_session(session_id, session_data)
+    await save_session(session_id, session_data)
 
     return {
         "status": "success",
@@ -0,0 +1,116 @@
+"""
+Async dispatcher for OpenAI API calls.
+
+Callers submit a request and await its future; one dispatcher task takes
+requests off an asyncio.Queue in arrival order, admits each through the
+rate limiter and starts it once a concurrency slot is free. Nothing polls:
+callers and the dispatcher sleep until there is work or a result.
+"""
+
+import asyncio
+import logging
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple
+
+from ai_service.api.services.openai.rate_limiter import TokenRateLimiter
+
+logger = logging.getLogger(__name__)
+
+Call = Callable[[], Awaitable[Any]]
+
+
+class RequestDispatcher:
+    """Queue of API calls run with bounded concurrency under a rate limiter."""
+
+    def __init__(self, max_concurrency: int = 8, rate_limiter: Optional[TokenRateLimiter] = None):
+        """
+        Args:
+            max_concurrency: Calls running at the same time
+            rate_limiter: Limiter every call is admitted through
+        """
+        self.max_concurrency = max(1, max_concurrency)
+        self.rate_limiter = rate_limiter
+        self.running = 0
+        self.completed = 0
+        self.failed = 0
+
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._queue: Optional["asyncio.Queue[Tuple[Call, int, asyncio.Future]]"] = None
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._worker: Optional[asyncio.Task] = None
+
+    def _ensure_started(self) -> None:
+        """Start the dispatcher task on the running loop, replacing one left on a previous loop."""
+        loop = asyncio.get_running_loop()
+        if self._loop is loop and self._worker is not None and not self._worker.done():
+            return
+        if self._loop is not loop:
+            self._queue = asyncio.Queue()
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+            self.running = 0
+        self._loop = loop
+        self._worker = loop.create_task(self._dispatch())
+
+    async def submit(self, call: Call, tokens: int = 0) -> Any:
+        """
+        Queue a call and wait for its result.
+
+        Args:
+            call: Coroutine function making the API call
+            tokens: Tokens the call is charged against the rate limiter
+
+        Returns:
+            The call's result; its exception is raised here
+        """
+        self._ensure_started()
+        future = self._loop.create_future()
+        self._queue.put_nowait((call, tokens, future))
+        return await future
+
+    async def _dispatch(self) -> None:
+        while True:
+            call, tokens, future = await self._queue.get()
+            if future.done():
+                # The caller gave up while the call was queued
+                continue
+
+            await self._semaphore.acquire()
+            try:
+                if self.rate_limiter is not None:
+                    await self.rate_limiter.acquire(tokens)
+            except BaseException:
+                self._semaphore.release()
+                raise
+            if future.done():
+                self._semaphore.release()
+                continue
+
+            self.running += 1
+            task = asyncio.ensure_future(self._execute(call, future))
+            # A caller that stops waiting cancels its call
+            future.add_done_callback(lambda done, task=task: task.cancel() if done.cancelled() else None)
+
+    async def _execute(self, call: Call, future: asyncio.Future) -> None:
+        try:
+            result = await call()
+        except asyncio.CancelledError:
+            future.cancel()
+        except BaseException as e:
+            self.failed += 1
+            if not future.done():
+                future.set_exception(e)
+        else:
+            self.completed += 1
+            if not future.done():
+                future.set_result(result)
+        finally:
+            self.running -= 1
+            self._semaphore.release()
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "max_concurrency": self.max_concurrency,
+            "queued": self._queue.qsize() if self._queue is not None else 0,
+            "running": self.running,
+            "completed": self.completed,
+            "failed": self.failed,
+        }
@@ -0,0 +1,153 @@
+"""
+Process-wide HTTP connection pool for OpenAI API calls.
+
+Every OpenAIService in a process sends its requests through one pooled
+httpx client, so TLS connections to the API are reused across requests and
+sessions, and multiplexed over HTTP/2 when the ``h2`` package is installed.
+The pool also keeps counters that show how close it runs to saturation.
+"""
+
+import asyncio
+import importlib.util
+import logging
+import os
+from typing import Any, Dict, Optional
+
+import httpx
+
+logger = logging.getLogger(__name__)
+
+# HTTP/2 needs the optional h2 package (httpx[http2])
+HTTP2_AVAILABLE = importlib.util.find_spec("h2") is not None
+
+
+class PoolMetrics:
+    """Counters for requests sent through the shared pool."""
+
+    def __init__(self, max_connections: int):
+        self.max_connections = max_connections
+        self.requests = 0
+        self.in_flight = 0
+        self.peak_in_flight = 0
+        # Requests that started while every connection was busy and so had
+        # to wait for one (or, over HTTP/2, share one)
+        self.saturated_requests = 0
+        self.pool_timeouts = 0
+
+    def started(self) -> None:
+        self.requests += 1
+        if self.in_flight >= self.max_connections:
+            self.saturated_requests += 1
+        self.in_flight += 1
+        self.peak_in_flight = max(self.peak_in_flight, self.in_flight)
+
+    def finished(self) -> None:
+        self.in_flight -= 1
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "max_connections": self.max_connections,
+            "requests": self.requests,
+            "in_flight": self.in_flight,
+            "peak_in_flight": self.peak_in_flight,
+            "utilization": self.in_flight / self.max_connections if self.max_connections else 0.0,
+            "saturated_requests": self.saturated_requests,
+            "pool_timeouts": self.pool_timeouts,
+            "http2": HTTP2_AVAILABLE and os.environ.get("OPENAI_HTTP2", "true").lower() == "true",
+        }
+
+
+MAX_CONNECTIONS = int(os.environ.get("OPENAI_MAX_CONNECTIONS", "100"))
+pool_metrics = PoolMetrics(MAX_CONNECTIONS)
+
+# Shared client and the event loop its connections belong to
+_client: Optional[httpx.AsyncClient] = None
+_client_loop: Optional[asyncio.AbstractEventLoop] = None
+
+
+def create_http_client() -> httpx.AsyncClient:
+    """
+    Create a pooled client for the OpenAI API.
+
+    OPENAI_MAX_CONNECTIONS, OPENAI_MAX_KEEPALIVE and OPENAI_KEEPALIVE_EXPIRY
+    size the pool; OPENAI_HTTP2=false turns HTTP/2 off.
+
+    Returns:
+        httpx.AsyncClient
+    """
+    http2 = HTTP2_AVAILABLE and os.environ.get("OPENAI_HTTP2", "true").lower() == "true"
+    limits = httpx.Limits(
+        max_connections=MAX_CONNECTIONS,
+        max_keepalive_connections=int(os.environ.get("OPENAI_MAX_KEEPALIVE", "20")),
+        keepalive_expiry=float(os.environ.get("OPENAI_KEEPALIVE_EXPIRY", "60"))
+    )
+    timeout = httpx.Timeout(
+        connect=10.0,  # Connection timeout
+        read=90.0,     # Read timeout
+        write=10.0,    # Write timeout
+        pool=10.0      # Wait for a free connection
+    )
+    logger.info(f"Creating shared OpenAI HTTP client (http2={http2}, max_connections={MAX_CONNECTIONS})")
+    return httpx.AsyncClient(
+        http2=http2,
+        limits=limits,
+        timeout=timeout,
+        verify=True,  # Verify SSL certificates
+        follow_redirects=True
+    )
+
+
+def get_shared_http_client() -> httpx.AsyncClient:
+    """
+    Return the process-wide client, creating it on first use.
+
+    Connections belong to the event loop that opened them, so a client used
+    under one loop is replaced when a different loop asks for it (a new
+    asyncio.run, or each test's loop).
+    """
+    global _client, _client_loop
+    try:
+        loop = asyncio.get_running_loop()
+    except RuntimeError:
+        loop = None
+
+    if _client is not None and not _client.is_closed:
+        if _client_loop is None or loop is None or _client_loop is loop:
+            _client_loop = _client_loop or loop
+            return _client
+
+    _client = create_http_client()
+    _client_loop = loop
+    return _client
+
+
+async def close_shared_http_client() -> None:
+    """Close the process-wide client and its connections."""
+    global _client, _client_loop
+    if _client is not None:
+        await _client.aclose()
+    _client = None
+    _client_loop = None
+
+
+async def pooled_post(client: Any, url: str, **kwargs: Any) -> Any:
+    """
+    POST through a client while recording pool metrics.
+
+    Args:
+        client: httpx.AsyncClient (or compatible test double)
+        url: Request URL
+        kwargs: Passed to client.post
+
+    Returns:
+        The response
+    """
+    pool_metrics.started()
+    try:
+        return await client.post(url, **kwargs)
+    except httpx.PoolTimeout:
+        pool_metrics.pool_timeouts += 1
+        logger.warning(f"Timed out waiting for an OpenAI connection ({pool_metrics.in_flight} requests in flight)")
+        raise
+    finally:
+        pool_metrics.finished()
@@ -0,0 +1,214 @@
+"""
+Token-aware rate limiting for OpenAI API calls.
+
+OpenAI limits both requests and tokens per minute, and counts a request's
+tokens as its prompt plus its max_tokens when it is admitted. The limiter
+keeps one bucket for each, charges requests with real prompt token
+estimates, and corrects itself from the ``x-ratelimit-*`` headers of every
+response, which reflect all traffic on the API key, not only this
+process's. A 429 pauses every queued request until the API's reset time
+instead of letting them all hit the limit again.
+"""
+
+import asyncio
+import functools
+import importlib.util
+import logging
+import re
+import time
+from typing import Any, Dict, List, Mapping, Optional, Union
+
+logger = logging.getLogger(__name__)
+
+# tiktoken gives exact counts when installed; otherwise about four
+# characters per token
+TIKTOKEN_AVAILABLE = importlib.util.find_spec("tiktoken") is not None
+
+# Tokens the chat format adds per message
+MESSAGE_OVERHEAD_TOKENS = 4
+
+_DURATION_PART = re.compile(r"(\d+(?:\.\d+)?)(ms|h|m|s)")
+_DURATION_SECONDS = {"ms": 0.001, "s": 1.0, "m": 60.0, "h": 3600.0}
+
+
+@functools.lru_cache(maxsize=16)
+def _encoding(model: str):
+    import tiktoken
+
+    try:
+        return tiktoken.encoding_for_model(model)
+    except KeyError:
+        return tiktoken.get_encoding("cl100k_base")
+
+
+def _count_text_tokens(text: str, model: str) -> int:
+    if TIKTOKEN_AVAILABLE:
+        try:
+            return len(_encoding(model).encode(text))
+        except Exception as e:
+            logger.debug(f"tiktoken could not count tokens for {model}: {e}")
+    return (len(text) + 3) // 4
+
+
+def estimate_tokens(prompt: Union[str, List[Dict[str, Any]]], model: str = "gpt-4") -> int:
+    """
+    Estimate the prompt tokens of a request.
+
+    Args:
+        prompt: Prompt text or chat messages
+        model: Model the request goes to
+
+    Returns:
+        Estimated prompt tokens
+    """
+    if isinstance(prompt, str):
+        return _count_text_tokens(prompt, model) + MESSAGE_OVERHEAD_TOKENS
+    return sum(
+        _count_text_tokens(str(message.get("content", "")), model) + MESSAGE_OVERHEAD_TOKENS
+        for message in prompt
+    )
+
+
+def parse_reset(value: Optional[str]) -> Optional[float]:
+    """
+    Parse an OpenAI reset duration ("1s", "6m0s", "20ms") or plain seconds.
+
+    Returns:
+        Seconds, or None if the value is missing or malformed
+    """
+    if not value:
+        return None
+    value = value.strip()
+    try:
+        return float(value)
+    except ValueError:
+        pass
+    parts = _DURATION_PART.findall(value)
+    if not parts:
+        return None
+    return sum(float(amount) * _DURATION_SECONDS[unit] for amount, unit in parts)
+
+
+class TokenRateLimiter:
+    """
+    Request and token buckets refilled continuously over a minute.
+
+    acquire() checks and debits both buckets under one lock, so concurrent
+    callers cannot overdraw them, and callers are admitted in arrival order.
+    """
+
+    def __init__(self, tokens_per_minute: int = 90000, requests_per_minute: int = 500):
+        """
+        Args:
+            tokens_per_minute: Token limit; replaced by x-ratelimit-limit-tokens
+            requests_per_minute: Request limit; replaced by x-ratelimit-limit-requests
+        """
+        self.token_limit = float(tokens_per_minute)
+        self.request_limit = float(requests_per_minute)
+        self.tokens = self.token_limit
+        self.requests = self.request_limit
+        self._updated = time.monotonic()
+        self._paused_until = 0.0
+        self._lock: Optional[asyncio.Lock] = None
+        self._lock_loop: Optional[asyncio.AbstractEventLoop] = None
+
+        self.waits = 0
+        self.wait_seconds = 0.0
+        self.throttled = 0
+
+    def _get_lock(self) -> asyncio.Lock:
+        # asyncio locks belong to one event loop
+        loop = asyncio.get_running_loop()
+        if self._lock is None or self._lock_loop is not loop:
+            self._lock = asyncio.Lock()
+            self._lock_loop = loop
+        return self._lock
+
+    def _refill(self, now: float) -> None:
+        elapsed = now - self._updated
+        self._updated = now
+        self.tokens = min(self.token_limit, self.tokens + elapsed * self.token_limit / 60.0)
+        self.requests = min(self.request_limit, self.requests + elapsed * self.request_limit / 60.0)
+
+    async def acquire(self, tokens: int) -> float:
+        """
+        Wait until a request of this many tokens fits, then debit it.
+
+        Args:
+            tokens: Prompt token estimate plus max_tokens
+
+        Returns:
+            Seconds spent waiting
+        """
+        # A request larger than the whole bucket would otherwise wait forever
+        tokens = min(float(tokens), self.token_limit)
+        waited = 0.0
+        async with self._get_lock():
+            while True:
+                now = time.monotonic()
+                self._refill(now)
+                wait = max(
+                    self._paused_until - now,
+                    (tokens - self.tokens) * 60.0 / self.token_limit,
+                    (1.0 - self.requests) * 60.0 / self.request_limit,
+                )
+                if wait <= 0:
+                    self.tokens -= tokens
+                    self.requests -= 1.0
+                    break
+                if waited == 0.0:
+                    self.waits += 1
+                    logger.info(f"Rate limiting: waiting {wait:.2f}s for {tokens:.0f} tokens")
+                waited += wait
+                await asyncio.sleep(wait)
+
+        self.wait_seconds += waited
+        return waited
+
+    def pause(self, seconds: float) -> None:
+        """Hold every request for the given time, e.g. after a 429."""
+        self._paused_until = max(self._paused_until, time.monotonic() + seconds)
+
+    def update_from_headers(self, headers: Mapping[str, str], status_code: int = 200) -> None:
+        """
+        Synchronize the buckets with a response's rate-limit headers.
+
+        Args:
+            headers: Response headers
+            status_code: Response status; 429 pauses until the limit resets
+        """
+        now = time.monotonic()
+        self._refill(now)
+
+        for kind in ("tokens", "requests"):
+            limit = headers.get(f"x-ratelimit-limit-{kind}")
+            remaining = headers.get(f"x-ratelimit-remaining-{kind}")
+            try:
+                if limit is not None and float(limit) > 0:
+                    setattr(self, f"{kind[:-1]}_limit", float(limit))
+                if remaining is not None:
+                    # Other processes share the key; never assume more than the API reports
+                    setattr(self, kind, min(getattr(self, kind), float(remaining)))
+            except (TypeError, ValueError):
+                logger.debug(f"Ignoring malformed x-ratelimit-*-{kind} headers")
+
+        if status_code == 429:
+            self.throttled += 1
+            delay = parse_reset(headers.get("retry-after"))
+            if delay is None:
+                resets = [parse_reset(headers.get(f"x-ratelimit-reset-{kind}")) for kind in ("tokens", "requests")]
+                delay = max([reset for reset in resets if reset is not None], default=1.0)
+            logger.warning(f"OpenAI rate limit hit; pausing requests for {delay:.2f}s")
+            self.pause(delay)
+
+    def get_stats(self) -> Dict[str, Any]:
+        self._refill(time.monotonic())
+        return {
+            "token_limit": self.token_limit,
+            "request_limit": self.request_limit,
+            "tokens_available": round(self.tokens),
+            "requests_available": round(self.requests, 1),
+            "waits": self.waits,
+            "wait_seconds": round(self.wait_seconds, 3),
+            "throttled": self.throttled,
+        }
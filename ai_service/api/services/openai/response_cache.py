@@ -0,0 +1,362 @@
+"""
+Bounded, optionally shared cache of LLM responses.
+
+Keys are SHA-256 digests of the normalized prompt, the model and every
+generation parameter, so they are stable across processes and replicas
+(Python's ``hash`` of a string is randomized per process). Responses are
+kept in an in-memory LRU tier bounded by entry count and total bytes, and
+optionally in a second tier shared by every worker: a SQLite file for the
+processes of one host, or Redis for a whole deployment. Hit rates are
+counted per task type.
+
+Configured from the environment:
+
+    ENABLE_CACHE            "false" disables caching
+    CACHE_TTL               seconds a response stays valid (default 3600)
+    LLM_CACHE_MAX_ENTRIES   memory tier entry limit (default 10000)
+    LLM_CACHE_MAX_BYTES     memory tier size limit (default 64 MiB)
+    LLM_CACHE_BACKEND       "memory" (default), "sqlite" or "redis"
+    LLM_CACHE_SQLITE_PATH   SQLite file for the sqlite backend
+    LLM_CACHE_REDIS_URL     Redis URL for the redis backend (default REDIS_URL)
+"""
+
+import asyncio
+import hashlib
+import json
+import logging
+import os
+import re
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+
+from ai_service.utils.json_encoder import DateTimeEncoder
+
+logger = logging.getLogger(__name__)
+
+_WHITESPACE = re.compile(r"\s+")
+
+
+def normalize_prompt(prompt: Any) -> str:
+    """
+    Normalize a prompt so formatting-only differences share a key.
+
+    Strings are stripped and runs of whitespace collapsed to one space;
+    message lists and other structures are serialized as sorted JSON with
+    their strings normalized the same way.
+    """
+    if isinstance(prompt, str):
+        return _WHITESPACE.sub(" ", prompt).strip()
+    if isinstance(prompt, dict):
+        return json.dumps({key: normalize_prompt(value) for key, value in prompt.items()}, sort_keys=True)
+    if isinstance(prompt, (list, tuple)):
+        return json.dumps([normalize_prompt(value) for value in prompt])
+    return json.dumps(prompt, cls=DateTimeEncoder, sort_keys=True)
+
+
+def make_cache_key(namespace: str, model: str, prompt: Any, **params: Any) -> str:
+    """
+    Build a stable cache key.
+
+    Args:
+        namespace: Caller namespace, so different callers never collide
+        model: Model identifier
+        prompt: Prompt text, message list or other JSON-serializable input
+        params: Generation parameters (max_tokens, temperature, task type...)
+
+    Returns:
+        Hex SHA-256 digest
+    """
+    material = json.dumps(
+        {"namespace": namespace, "model": model, "prompt": normalize_prompt(prompt), "params": params},
+        cls=DateTimeEncoder,
+        sort_keys=True
+    )
+    return hashlib.sha256(material.encode("utf-8")).hexdigest()
+
+
+class MemoryCacheTier:
+    """Thread-safe LRU of serialized responses bounded by entries and bytes."""
+
+    def __init__(self, max_entries: int = 10000, max_bytes: int = 64 * 1024 * 1024):
+        """
+        Args:
+            max_entries: Maximum number of responses kept
+            max_bytes: Maximum total size of the stored responses
+        """
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._entries: "OrderedDict[str, Tuple[float, bytes]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.bytes = 0
+        self.evictions = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: str) -> Optional[bytes]:
+        """Return the stored bytes, or None if missing or expired."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires_at, blob = entry
+            if expires_at <= time.time():
+                self._remove(key)
+                return None
+            self._entries.move_to_end(key)
+            return blob
+
+    def put(self, key: str, blob: bytes, expires_at: float) -> None:
+        """Store bytes, evicting the least recently used entries to stay within the limits."""
+        size = len(blob) + len(key)
+        if self.max_entries <= 0 or size > self.max_bytes:
+            return
+
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            self._entries[key] = (expires_at, blob)
+            self.bytes += size
+            while len(self._entries) > self.max_entries or self.bytes > self.max_bytes:
+                oldest = next(iter(self._entries))
+                self._remove(oldest)
+                self.evictions += 1
+
+    def _remove(self, key: str) -> None:
+        _, blob = self._entries.pop(key)
+        self.bytes -= len(blob) + len(key)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self.bytes = 0
+            self.evictions = 0
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "entries": len(self._entries),
+            "max_entries": self.max_entries,
+            "bytes": self.bytes,
+            "max_bytes": self.max_bytes,
+            "evictions": self.evictions,
+        }
+
+
+class SQLiteCacheTier:
+    """Shared tier in a SQLite file, for worker processes on one host."""
+
+    name = "sqlite"
+
+    # Expired rows are purged after this many writes
+    PURGE_INTERVAL = 1000
+
+    def __init__(self, path: str):
+        """
+        Args:
+            path: Database file; created with its directory if missing
+        """
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self.path = path
+        self._lock = threading.Lock()
+        self._writes = 0
+        self._connection = sqlite3.connect(path, check_same_thread=False, timeout=5.0)
+        with self._lock:
+            self._connection.execute("PRAGMA journal_mode=WAL")
+            self._connection.execute(
+                "CREATE TABLE IF NOT EXISTS llm_cache (key TEXT PRIMARY KEY, value BLOB NOT NULL, expires_at REAL NOT NULL)"
+            )
+            self._connection.commit()
+
+    def _get(self, key: str) -> Optional[bytes]:
+        with self._lock:
+            row = self._connection.execute(
+                "SELECT value FROM llm_cache WHERE key = ? AND expires_at > ?", (key, time.time())
+            ).fetchone()
+        return row[0] if row else None
+
+    def _put(self, key: str, blob: bytes, expires_at: float) -> None:
+        with self._lock:
+            self._connection.execute(
+                "INSERT OR REPLACE INTO llm_cache (key, value, expires_at) VALUES (?, ?, ?)", (key, blob, expires_at)
+            )
+            self._writes += 1
+            if self._writes % self.PURGE_INTERVAL == 0:
+                self._connection.execute("DELETE FROM llm_cache WHERE expires_at <= ?", (time.time(),))
+            self._connection.commit()
+
+    async def get(self, key: str) -> Optional[bytes]:
+        return await asyncio.to_thread(self._get, key)
+
+    async def put(self, key: str, blob: bytes, expires_at: float) -> None:
+        await asyncio.to_thread(self._put, key, blob, expires_at)
+
+
+class RedisCacheTier:
+    """Shared tier in Redis, for every replica of a deployment."""
+
+    name = "redis"
+
+    def __init__(self, redis_client: Any, prefix: str = "llm_cache:"):
+        """
+        Args:
+            redis_client: redis.asyncio client (bytes responses)
+            prefix: Key prefix
+        """
+        self.redis = redis_client
+        self.prefix = prefix
+
+    async def get(self, key: str) -> Optional[bytes]:
+        value = await self.redis.get(self.prefix + key)
+        return value.encode("utf-8") if isinstance(value, str) else value
+
+    async def put(self, key: str, blob: bytes, expires_at: float) -> None:
+        ttl = max(1, int(expires_at - time.time()))
+        await self.redis.set(self.prefix + key, blob, ex=ttl)
+
+
+class ResponseCache:
+    """
+    Two-tier response cache.
+
+    Lookups try the memory tier, then the shared tier (promoting hits into
+    memory). Shared-tier failures are logged and count as misses, so an
+    unavailable Redis or SQLite file never fails a request.
+    """
+
+    def __init__(self, memory: Optional[MemoryCacheTier] = None, shared: Any = None, ttl: float = 3600):
+        """
+        Args:
+            memory: In-process tier; defaults to a MemoryCacheTier
+            shared: Optional SQLiteCacheTier or RedisCacheTier
+            ttl: Seconds a stored response stays valid
+        """
+        self.memory = memory or MemoryCacheTier()
+        self.shared = shared
+        self.ttl = ttl
+        self.task_stats: Dict[str, Dict[str, int]] = {}
+
+    def _count(self, task_type: str, outcome: str) -> None:
+        stats = self.task_stats.setdefault(task_type, {"memory_hits": 0, "shared_hits": 0, "misses": 0})
+        stats[outcome] += 1
+
+    async def get(self, key: str, task_type: str = "general") -> Optional[Any]:
+        """
+        Look up a response.
+
+        Args:
+            key: Key from make_cache_key
+            task_type: Task label the lookup is counted under
+
+        Returns:
+            A private copy of the cached response, or None on a miss
+        """
+        blob = self.memory.get(key)
+        if blob is not None:
+            self._count(task_type, "memory_hits")
+            return json.loads(blob)
+
+        if self.shared is not None:
+            try:
+                blob = await self.shared.get(key)
+            except Exception as e:
+                logger.warning(f"LLM cache {self.shared.name} lookup failed: {e}")
+                blob = None
+            if blob is not None:
+                self.memory.put(key, blob, time.time() + self.ttl)
+                self._count(task_type, "shared_hits")
+                return json.loads(blob)
+
+        self._count(task_type, "misses")
+        return None
+
+    async def put(self, key: str, value: Any) -> None:
+        """
+        Store a JSON-serializable response in every tier.
+
+        Args:
+            key: Key from make_cache_key
+            value: Response to store
+        """
+        blob = json.dumps(value, cls=DateTimeEncoder).encode("utf-8")
+        expires_at = time.time() + self.ttl
+        self.memory.put(key, blob, expires_at)
+
+        if self.shared is not None:
+            try:
+                await self.shared.put(key, blob, expires_at)
+            except Exception as e:
+                logger.warning(f"LLM cache {self.shared.name} write failed: {e}")
+
+    def clear(self) -> None:
+        """Empty the memory tier and reset the counters; the shared tier is left alone."""
+        self.memory.clear()
+        self.task_stats.clear()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Return overall and per-task hit rates with the memory tier's size."""
+        by_task = {}
+        totals = {"memory_hits": 0, "shared_hits": 0, "misses": 0}
+        for task_type, stats in self.task_stats.items():
+            hits = stats["memory_hits"] + stats["shared_hits"]
+            lookups = hits + stats["misses"]
+            by_task[task_type] = dict(stats, hits=hits, hit_rate=hits / lookups if lookups else 0.0)
+            for outcome in totals:
+                totals[outcome] += stats[outcome]
+
+        hits = totals["memory_hits"] + totals["shared_hits"]
+        lookups = hits + totals["misses"]
+        return {
+            "hits": hits,
+            "misses": totals["misses"],
+            "memory_hits": totals["memory_hits"],
+            "shared_hits": totals["shared_hits"],
+            "cache_hit_ratio": hits / lookups if lookups else 0,
+            "by_task": by_task,
+            "memory": self.memory.get_stats(),
+            "shared_backend": self.shared.name if self.shared is not None else None,
+        }
+
+
+def create_response_cache() -> ResponseCache:
+    """Create a response cache configured from the environment."""
+    memory = MemoryCacheTier(
+        max_entries=int(os.environ.get("LLM_CACHE_MAX_ENTRIES", "10000")),
+        max_bytes=int(os.environ.get("LLM_CACHE_MAX_BYTES", str(64 * 1024 * 1024)))
+    )
+
+    backend = os.environ.get("LLM_CACHE_BACKEND", "memory").lower()
+    shared = None
+    try:
+        if backend == "sqlite":
+            shared = SQLiteCacheTier(os.environ.get("LLM_CACHE_SQLITE_PATH", os.path.join("cache", "llm_cache.sqlite3")))
+        elif backend == "redis":
+            import redis.asyncio as redis_asyncio
+            from ai_service.core.config import settings
+
+            shared = RedisCacheTier(redis_asyncio.Redis.from_url(
+                os.environ.get("LLM_CACHE_REDIS_URL", settings.REDIS_URL),
+                socket_timeout=1.0,
+                socket_connect_timeout=1.0
+            ))
+        elif backend != "memory":
+            logger.warning(f"Unknown LLM_CACHE_BACKEND '{backend}'; using the memory tier only")
+    except Exception as e:
+        logger.warning(f"Could not open the {backend} LLM cache tier: {e}; using the memory tier only")
+        shared = None
+
+    return ResponseCache(memory, shared, ttl=float(os.environ.get("CACHE_TTL", "3600")))
+
+
+# Shared cache instance
+_response_cache: Optional[ResponseCache] = None
+
+
+def get_response_cache() -> ResponseCache:
+    """Return the process-wide response cache."""
+    global _response_cache
+    if _response_cache is None:
+        _response_cache = create_response_cache()
+    return _response_cache
@@ -9,7 +9,7 @@ import time
 import uuid
 import asyncio
 import importlib.util
-from typing import Dict, Any, List, Optional, TypedDict, cast, Union, TYPE_CHECKING, Callable
+from typing import Dict, Any, List, Optional, cast, Union, TYPE_CHECKING, Callable
 import sys
 import random
 
@@ -23,28 +23,28 @@ from tenacity import retry, stop_after_attempt, wait_exponential, retry_if_excep
 
 from ai_service.api.services.openai.model_selection import select_model, get_task_category
 from ai_service.api.services.openai.cost_calculator import calculate_cost
+from ai_service.api.services.openai.dispatcher import RequestDispatcher
+from ai_service.api.services.openai.http_pool import get_shared_http_client, pool_metrics, pooled_post
+from ai_service.api.services.openai.rate_limiter import TokenRateLimiter, estimate_tokens
+from ai_service.api.services.openai.response_cache import ResponseCache, get_response_cache, make_cache_key
 from ai_service.utils.dependency_container import get_container
 
 # Set up logging
 logger = logging.getLogger(__name__)
 
-# Define typed dictionary for cache entries
-class CacheEntry(TypedDict):
-    """Type definition for cache entries."""
-    timestamp: float
-    response: Dict[str, Any]
-    response_json: Optional[Dict[str, Any]]
+OPENAI_CHAT_URL = "https://api.openai.com/v1/chat/completions"
 
 class OpenAIService:
     """Service for interacting with OpenAI API."""
 
-    def __init__(self, client=None, api_key=None):
+    def __init__(self, client=None, api_key=None, cache: Optional[ResponseCache] = None):
         """
         Initialize the OpenAI service with API key and model configuration.
 
         Args:
             client: Optional pre-configured OpenAI client for dependency injection
             api_key: Optional API key (defaults to environment variable)
+            cache: Optional response cache (defaults to the process-wide one)
         """
         # Clean up the API key - remove whitespace, newlines, and ensure it's properly formatted
         api_key_raw = api_key or os.environ.get("OPENAI_API_KEY", "")
@@ -60,69 +60,34 @@ class OpenAIService:
             logger.error("No OpenAI API key provided")
             raise ValueError("OpenAI API key not provided and OPENAI_API_KEY environment variable is not set")
 
-        # Use injected client or create a direct httpx client with no problematic params
+        # Use injected client or the process-wide pooled client, which keeps
+        # connections to the API alive across requests and sessions
+        self._injected_client = client
         if client:
-            self.client = client
             logger.info("Using provided client")
         else:
-            try:
-                logger.info("Initializing direct API client")
-                import httpx
-
-                # Get proxy settings from environment if available
-                http_proxy = os.environ.get("HTTP_PROXY", "")
-                https_proxy = os.environ.get("HTTPS_PROXY", "")
-
-                # Set up proxies if available in the environment
-                proxies = None
-                if http_proxy or https_proxy:
-                    proxies = {}
-                    if http_proxy:
-                        proxies["http://"] = http_proxy
-                    if https_proxy:
-                        proxies["https://"] = https_proxy
-                    logger.info(f"Using proxies: {proxies}")
-
-                # Configure httpx with appropriate timeouts and settings
-                timeout_settings = httpx.Timeout(
-                    connect=10.0,  # Connection timeout
-                    read=90.0,     # Read timeout
-                    write=10.0,    # Write timeout
-                    pool=10.0      # Pool timeout
-                )
-
-                # Create client with appropriate timeouts
-                # Note: the httpx version in the container doesn't support 'proxies' parameter
-                self.client = httpx.AsyncClient(
-                    timeout=timeout_settings,
-                    verify=True,  # Verify SSL certificates
-                    follow_redirects=True
-                )
-
-                # Track the client in test mode if the tracker exists
-                if 'tests.integration.test_sequence_flow_real' in sys.modules:
-                    # We're being called from the integration test - track the client
-                    if hasattr(sys.modules['tests.integration.test_sequence_flow_real'], 'active_http_clients'):
-                        sys.modules['tests.integration.test_sequence_flow_real'].active_http_clients.append(self.client)
-                        logger.info("Registered client with test tracker")
-
-                # Log connection settings
-                logger.info(f"Initialized direct API client for OpenAI with {timeout_settings}")
-            except Exception as e:
-                logger.error(f"Failed to initialize direct API client: {e}", exc_info=True)
-                raise ValueError(f"Failed to initialize direct API client: {e}")
+            # Track the client in test mode if the tracker exists
+            if 'tests.integration.test_sequence_flow_real' in sys.modules:
+                # We're being called from the integration test - track the client
+                if hasattr(sys.modules['tests.integration.test_sequence_flow_real'], 'active_http_clients'):
+                    sys.modules['tests.integration.test_sequence_flow_real'].active_http_clients.append(self.client)
+                    logger.info("Registered client with test tracker")
+            logger.info("Using shared pooled API client")
+
+        # Requests in flight by cache key; identical concurrent requests await
+        # the first one instead of calling the API again
+        self._in_flight: Dict[str, asyncio.Future] = {}
+        self.coalesced_calls = 0
 
         # Configuration
         self.default_model = os.environ.get("OPENAI_MODEL", "gpt-4-turbo-preview")
         self.model_name = self.default_model  # Add model_name attribute
         self.temperature = float(os.environ.get("OPENAI_TEMPERATURE", 0.7))
 
-        # Configure caching settings
+        # Configure caching settings; the bounded response cache is shared by
+        # every service in the process (see response_cache for its tiers)
         self.cache_enabled = os.environ.get("ENABLE_CACHE", "true").lower() == "true"
-        self.cache_ttl = int(os.environ.get("CACHE_TTL", "3600"))  # Default 1 hour
-        self.cache: Dict[str, CacheEntry] = {}
-        self.cache_hits = 0
-        self.cache_misses = 0
+        self.cache = cache or get_response_cache()
 
         # Usage statistics tracking
         self.usage_stats = {
@@ -142,11 +107,74 @@ class OpenAIService:
         # API call tracking
         self.api_calls = 0
         self.last_request_time = 0
-        self.tokens_this_minute = 0
-        self.rate_limit = 90000  # OpenAI rate limit (tokens per minute)
+
+        # Every API call is queued with the dispatcher, which caps concurrent
+        # calls and admits them through a token-aware rate limiter kept in
+        # step with the API's rate-limit headers
+        self.rate_limiter = TokenRateLimiter(
+            tokens_per_minute=int(os.environ.get("OPENAI_TOKENS_PER_MINUTE", "90000")),
+            requests_per_minute=int(os.environ.get("OPENAI_REQUESTS_PER_MINUTE", "500"))
+        )
+        self.dispatcher = RequestDispatcher(
+            max_concurrency=int(os.environ.get("OPENAI_MAX_CONCURRENCY", "8")),
+            rate_limiter=self.rate_limiter
+        )
+        self._batch_results: Dict[str, asyncio.Future] = {}
 
         logger.info(f"OpenAI service initialized with model: {self.default_model}")
 
+    @property
+    def client(self):
+        """HTTP client for API calls: the injected one, else the shared pool."""
+        return self._injected_client or get_shared_http_client()
+
+    @client.setter
+    def client(self, client):
+        self._injected_client = client
+
+    async def _single_flight(self, key: str, call: Callable[[], Any]) -> Any:
+        """
+        Run call() unless an identical request is already in flight.
+
+        Concurrent callers with the same key await the first caller's result
+        (or exception). If the first caller is cancelled, a waiting caller
+        makes the request itself.
+
+        Args:
+            key: Cache key identifying the request
+            call: Coroutine function making the request
+
+        Returns:
+            The request's result
+        """
+        while key in self._in_flight:
+            in_flight = self._in_flight[key]
+            self.coalesced_calls += 1
+            logger.debug("Coalescing identical in-flight OpenAI request")
+            try:
+                return await asyncio.shield(in_flight)
+            except asyncio.CancelledError:
+                if not in_flight.cancelled():
+                    raise
+
+        future = asyncio.get_running_loop().create_future()
+        self._in_flight[key] = future
+        try:
+            result = await call()
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except BaseException as e:
+            future.set_exception(e)
+            # Mark the exception retrieved; waiting callers still receive it
+            future.exception()
+            raise
+        else:
+            future.set_result(result)
+            return result
+        finally:
+            self._in_flight.pop(key, None)
+
     def _select_model(self, task_type: str) -> str:
         """
         Select the appropriate model based on task type.
@@ -205,8 +233,10 @@ class OpenAIService:
 
         while True:
             try:
-                # Apply rate limiting before making the call
-                await self._apply_rate_limiting()
+                # In integration tests, leave a short gap between requests
+                # to avoid overwhelming the API
+                if os.environ.get("TEST_MODE") == "true":
+                    await asyncio.sleep(0.5)
 
                 return await func(*args, **kwargs)
             except Exception as e:
@@ -289,18 +319,33 @@ class OpenAIService:
             logger.warning(f"Prompt is very long ({len(prompt)} chars). Truncating to reduce API timeouts.")
             prompt = prompt[:12000] + "\n...[truncated for performance]..."
 
-        # Create a unique key for this request for caching
-        cache_key = f"{model}:{task_type}:{hash(prompt)}:{max_tokens}:{temperature}"
+        # Create a stable key for this request for caching
+        cache_key = make_cache_key(
+            "completion", model, prompt, task_type=task_type, max_tokens=max_tokens, temperature=temperature
+        )
 
         # Check cache first if enabled
-        if self.cache_enabled and cache_key in self.cache:
-            cache_entry = self.cache[cache_key]
-            if time.time() - cache_entry["timestamp"] < self.cache_ttl:
-                self.cache_hits += 1
+        if self.cache_enabled:
+            cached = await self.cache.get(cache_key, task_type)
+            if cached is not None:
                 logger.debug(f"Cache hit for {task_type} task")
-                return cache_entry["response"]
+                return cached
+
+        return await self._single_flight(
+            cache_key,
+            lambda: self._request_completion(prompt, model, task_type, max_tokens, temperature, cache_key)
+        )
 
-        self.cache_misses += 1
+    async def _request_completion(
+        self,
+        prompt: str,
+        model: str,
+        task_type: str,
+        max_tokens: int,
+        temperature: float,
+        cache_key: str
+    ) -> Dict[str, Any]:
+        """Call the chat completions API and cache the successful response."""
         logger.info(f"Sending request to OpenAI API (model: {model}, task: {task_type})")
 
         # Track API call
@@ -348,14 +393,7 @@ class OpenAIService:
 
             # Execute the API call with a timeout
             try:
-                response = await asyncio.wait_for(
-                    self.client.post(
-                        "https://api.openai.com/v1/chat/completions",
-                        headers=headers,
-                        json=payload
-                    ),
-                    timeout=request_timeout
-                )
+                response = await self._dispatch_chat_request(payload, headers, timeout=request_timeout)
 
                 # Log the response status for debugging
                 logger.info(f"OpenAI API status code: {response.status_code}")
@@ -429,7 +467,6 @@ class OpenAIService:
             self.prompt_tokens += prompt_tokens
             self.completion_tokens += completion_tokens
             self.total_tokens += total_tokens
-            self.tokens_this_minute += total_tokens
 
             # Calculate cost
             cost = self._calculate_cost(model, prompt_tokens, completion_tokens)
@@ -452,10 +489,7 @@ class OpenAIService:
 
             # Add to cache if enabled
             if self.cache_enabled:
-                self.cache[cache_key] = {
-                    "timestamp": time.time(),
-                    "response": response_obj
-                }
+                await self.cache.put(cache_key, response_obj)
 
             logger.info(f"OpenAI API call successful for {task_type}")
             return response_obj
@@ -1147,47 +1181,42 @@ class OpenAIService:
             "prompt_tokens": self.prompt_tokens,
             "completion_tokens": self.completion_tokens,
             "estimated_cost": self.estimated_cost,
-            "cache_stats": {
-                "hits": self.cache_hits,
-                "misses": self.cache_misses,
-                "cache_hit_ratio": self.cache_hits / (self.cache_hits + self.cache_misses) if (self.cache_hits + self.cache_misses) > 0 else 0
-            }
+            "cache_stats": self.cache.get_stats(),
+            "coalescing_stats": {
+                "coalesced_calls": self.coalesced_calls,
+                "in_flight": len(self._in_flight)
+            },
+            "connection_pool": pool_metrics.to_dict(),
+            "dispatcher": self.dispatcher.get_stats(),
+            "rate_limiter": self.rate_limiter.get_stats()
         }
 
-    async def _apply_rate_limiting(self):
+    async def _dispatch_chat_request(self, payload, headers, timeout=None):
         """
-        Apply rate limiting to prevent hitting OpenAI API limits.
+        Send a chat request through the dispatcher.
 
-        This implements a token bucket algorithm to limit the number of requests
-        and adds request batching to reduce API calls.
+        The request is charged its estimated prompt tokens plus max_tokens,
+        the amount OpenAI counts against the limit, and the limiter is
+        updated from the response's rate-limit headers.
+
+        Args:
+            payload: Chat completions request body
+            headers: Request headers
+            timeout: Optional timeout for the HTTP call itself, not counting
+                time spent queued
+
+        Returns:
+            The HTTP response
         """
-        # Use a token bucket algorithm for rate limiting
-        current_time = time.time()
-        time_passed = current_time - self.last_request_time
-        self.last_request_time = current_time
-
-        # Refill tokens based on time passed
-        tokens_to_add = time_passed * (self.rate_limit / 60.0)  # tokens per second
-        self.tokens_this_minute = min(self.rate_limit, self.tokens_this_minute + tokens_to_add)
-
-        # Default cost estimate per request (adjust based on your usage patterns)
-        estimated_cost = 1000  # Estimate 1000 tokens per request
-
-        # Check if we have enough tokens
-        if self.tokens_this_minute < estimated_cost:
-            # Calculate wait time to have enough tokens
-            wait_time = (estimated_cost - self.tokens_this_minute) / (self.rate_limit / 60.0)
-            logger.info(f"Rate limiting: waiting {wait_time:.2f}s before making request")
-            await asyncio.sleep(wait_time)
-            self.tokens_this_minute = self.rate_limit - estimated_cost
-        else:
-            # Deduct tokens for this request
-            self.tokens_this_minute -= estimated_cost
+        tokens = estimate_tokens(payload["messages"], payload["model"]) + payload.get("max_tokens", 0)
+
+        async def call():
+            request = pooled_post(self.client, OPENAI_CHAT_URL, json=payload, headers=headers)
+            response = await (asyncio.wait_for(request, timeout) if timeout else request)
+            self.rate_limiter.update_from_headers(response.headers, response.status_code)
+            return response
 
-        # If we're in a test environment, add a short delay between requests
-        # to prevent overwhelming the API during tests
-        if os.environ.get("TEST_MODE") == "true":
-            await asyncio.sleep(0.5)  # 500ms delay between test requests
+        return await self.dispatcher.submit(call, tokens)
 
     async def _prepare_messages(self, prompt, task_type):
         """Prepare messages for the OpenAI API request."""
@@ -1208,8 +1237,6 @@ class OpenAIService:
 
     async def _send_request(self, messages, model, max_tokens, temperature):
         """Send a request to the OpenAI API."""
-        api_url = "https://api.openai.com/v1/chat/completions"
-
         # Create request payload
         payload = {
             "model": model,
@@ -1229,46 +1256,38 @@ class OpenAIService:
         self.last_request_time = time.time()
 
         # Create cache key
-        message_str = json.dumps([msg.get("content", "") for msg in messages])
-        cache_key = f"{model}:{hash(message_str)}:{max_tokens}:{temperature}"
+        cache_key = make_cache_key("chat", model, messages, max_tokens=max_tokens, temperature=temperature)
 
         # Check cache if enabled
-        if self.cache_enabled and cache_key in self.cache:
-            cache_entry = self.cache[cache_key]
-            if time.time() - cache_entry["timestamp"] < self.cache_ttl:
-                self.cache_hits += 1
+        if self.cache_enabled:
+            response_json = await self.cache.get(cache_key, "chat")
+            if response_json is not None:
                 logger.debug(f"Cache hit for request")
                 # Create a mock response with status code 200
                 from types import SimpleNamespace
                 mock_response = SimpleNamespace(
                     status_code=200,
-                    json=lambda: cache_entry["response_json"],
-                    text=lambda: json.dumps(cache_entry["response_json"])
+                    json=lambda: response_json,
+                    text=lambda: json.dumps(response_json)
                 )
                 return mock_response
 
-        self.cache_misses += 1
+        return await self._single_flight(
+            cache_key,
+            lambda: self._post_chat_request(payload, headers, cache_key)
+        )
 
-        # Make the API call
-        timeout = httpx.Timeout(connect=10.0, read=90.0, write=10.0, pool=10.0)
-        async with httpx.AsyncClient(timeout=timeout) as client:
-            response = await client.post(
-                api_url,
-                json=payload,
-                headers=headers
-            )
+    async def _post_chat_request(self, payload, headers, cache_key):
+        """POST a chat request through the dispatcher and cache a successful response."""
+        response = await self._dispatch_chat_request(payload, headers)
 
-            logger.info(f"OpenAI API status code: {response.status_code}")
+        logger.info(f"OpenAI API status code: {response.status_code}")
 
-            # If status code is 200, cache the response
-            if response.status_code == 200 and self.cache_enabled:
-                response_json = response.json()
-                self.cache[cache_key] = {
-                    "response_json": response_json,
-                    "timestamp": time.time()
-                }
+        # If status code is 200, cache the response
+        if response.status_code == 200 and self.cache_enabled:
+            await self.cache.put(cache_key, response.json())
 
-            return response
+        return response
 
     async def _parse_response(self, response):
         """Parse the response from OpenAI API."""
@@ -1353,109 +1372,57 @@ class OpenAIService:
 
     # Batch processing methods
     async def _add_to_batch_queue(self, messages, model, max_tokens, temperature):
-        """Add a request to the batch processing queue."""
-        if not hasattr(self, "_request_queue"):
-            self._request_queue = []
-            self._result_dict = {}
-            self._batch_processor_task = None
+        """
+        Queue a request with the dispatcher without waiting for it.
 
-        # Generate a unique request ID
+        Returns:
+            Request ID to pass to _get_from_batch_results
+        """
         request_id = str(uuid.uuid4())
-
-        # Add request to queue
-        self._request_queue.append({
-            "id": request_id,
-            "messages": messages,
-            "model": model,
-            "max_tokens": max_tokens,
-            "temperature": temperature,
-            "timestamp": time.time()
-        })
-
-        # Start batch processor if not running
-        if not self._batch_processor_task or self._batch_processor_task.done():
-            self._batch_processor_task = asyncio.create_task(self._process_batch_queue())
-
-        # Return the request ID
+        self._batch_results[request_id] = asyncio.ensure_future(
+            self._process_single_request(messages, model, max_tokens, temperature)
+        )
         return request_id
 
-    async def _get_from_batch_results(self, request_id):
-        """Get a result from the batch processing results."""
-        # Wait for result (with timeout)
-        start_time = time.time()
-        max_wait_time = 90  # Maximum seconds to wait
-
-        while time.time() - start_time < max_wait_time:
-            if request_id in self._result_dict:
-                result = self._result_dict.pop(request_id)
-                return result
-            await asyncio.sleep(0.1)
-
-        # If timeout, return error
-        logger.error(f"Batch processing timeout for request {request_id}")
-        return {
-            "content": "Error: Batch processing timeout",
-            "model": "unknown",
-            "error": True
-        }
+    async def _get_from_batch_results(self, request_id, timeout=90):
+        """Wait for the result of a queued request."""
+        future = self._batch_results.pop(request_id, None)
+        if future is None:
+            return {
+                "content": f"Error: Unknown batch request {request_id}",
+                "model": "unknown",
+                "error": True
+            }
 
-    async def _process_batch_queue(self):
-        """Process the batch queue in the background."""
-        # Implementation for batch processing
         try:
-            # Process in batches of 5 or when queue reaches certain age
-            while True:
-                if not self._request_queue:
-                    # No requests, sleep briefly
-                    await asyncio.sleep(0.1)
-                    continue
-
-                # Take up to 5 requests from the queue
-                batch_size = min(5, len(self._request_queue))
-                batch = self._request_queue[:batch_size]
-                self._request_queue = self._request_queue[batch_size:]
-
-                # Process batch concurrently
-                tasks = []
-                for request in batch:
-                    tasks.append(self._process_single_request(request))
-
-                # Wait for all tasks to complete
-                await asyncio.gather(*tasks)
-        except Exception as e:
-            logger.error(f"Error in batch processor: {e}")
+            return await asyncio.wait_for(future, timeout)
+        except asyncio.TimeoutError:
+            logger.error(f"Batch processing timeout for request {request_id}")
+            return {
+                "content": "Error: Batch processing timeout",
+                "model": "unknown",
+                "error": True
+            }
 
-    async def _process_single_request(self, request):
-        """Process a single request from the batch."""
+    async def _process_single_request(self, messages, model, max_tokens, temperature):
+        """Send one queued request and parse its result."""
         try:
-            # Make API call
-            response = await self._send_request(
-                request["messages"],
-                request["model"],
-                request["max_tokens"],
-                request["temperature"]
-            )
+            response = await self._send_request(messages, model, max_tokens, temperature)
 
-            # Parse response
             if response.status_code == 200:
-                result = await self._parse_response(response)
-            else:
-                # Handle error
-                error_content = await response.json()
-                error_message = error_content.get("error", {}).get("message", "Unknown API error")
-                result = {
-                    "content": f"Error: {error_message}",
-                    "model": request["model"],
-                    "error": True
-                }
-
-            # Store result
-            self._result_dict[request["id"]] = result
+                return await self._parse_response(response)
+
+            error_content = response.json()
+            error_message = error_content.get("error", {}).get("message", "Unknown API error")
+            return {
+                "content": f"Error: {error_message}",
+                "model": model,
+                "error": True
+            }
         except Exception as e:
-            # Store error
-            self._result_dict[request["id"]] = {
+            return {
                 "content": f"Error: {str(e)}",
-                "model": request["model"],
+                "model": model,
                 "error": True
             }
 
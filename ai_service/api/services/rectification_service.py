@@ -34,8 +34,10 @@ import numpy as np
 from timezonefinder import TimezoneFinder
 
 # Use the new modularized structure
+from ai_service.core.rectification.aspects import ASPECT_ANGLES, AspectSet, separation
 from ai_service.core.rectification.chart_calculator import calculate_chart
 from ai_service.core.rectification.constants import PLANETS_LIST
+from ai_service.core.rectification.search import SearchStrategy, angle_sign_boundary, default_search_strategy
 
 # Configure logging
 logger = logging.getLogger(__name__)
@@ -88,19 +90,12 @@ ASPECT_ORBS = {
     'semi-square': 3.0,  # 45 degrees
 }
 
+# Aspects matched between chart points, in the order above
+CHART_ASPECTS = AspectSet.from_orbs(ASPECT_ORBS, inclusive=True)
+
 def get_aspect_angle(aspect_type: str) -> float:
     """Get the angle for a specific aspect type."""
-    aspect_angles = {
-        'conjunction': 0.0,
-        'opposition': 180.0,
-        'trine': 120.0,
-        'square': 90.0,
-        'sextile': 60.0,
-        'semi-sextile': 30.0,
-        'quincunx': 150.0,
-        'semi-square': 45.0,
-    }
-    return aspect_angles.get(aspect_type, 0.0)
+    return ASPECT_ANGLES.get(aspect_type, 0.0)
 
 def is_aspect_active(angle1: float, angle2: float, aspect_type: str) -> bool:
     """
@@ -117,10 +112,8 @@ def is_aspect_active(angle1: float, angle2: float, aspect_type: str) -> bool:
     # Get the target angle for this aspect
     target_angle = get_aspect_angle(aspect_type)
 
-    # Calculate the absolute difference between angles
-    diff = abs(angle1 - angle2) % 360
-    if diff > 180:
-        diff = 360 - diff
+    # Calculate the angular separation
+    diff = float(separation([angle1], [angle2])[0, 0])
 
     # Check if the difference is within the allowed orb
     return abs(diff - target_angle) <= ASPECT_ORBS.get(aspect_type, 0)
@@ -182,35 +175,23 @@ def get_house_planet_connections(chart: Chart, house_num: int) -> List[Dict[str,
             })
 
     # Check planets aspecting house cusp
-    house_cusp_longitude = house.lon
-    for planet_name in const.LIST_PLANETS:
-        planet = chart.getObject(planet_name)
-        planet_longitude = planet.lon
-
-        for aspect_type in ASPECT_ORBS.keys():
-            if is_aspect_active(house_cusp_longitude, planet_longitude, aspect_type):
-                # Calculate strength based on aspect type and orb
-                orb = ASPECT_ORBS[aspect_type]
-                target_angle = get_aspect_angle(aspect_type)
-                diff = abs(house_cusp_longitude - planet_longitude) % 360
-                if diff > 180:
-                    diff = 360 - diff
-                actual_orb = abs(diff - target_angle)
-
-                # Closer to exact aspect = stronger
-                strength = (1 - actual_orb/orb) * 5.0
-
-                # Certain aspects are more significant
-                if aspect_type in ['conjunction', 'opposition']:
-                    strength *= 1.5
-                elif aspect_type in ['trine', 'square']:
-                    strength *= 1.2
-
-                house_objects.append({
-                    'planet': planet_name,
-                    'connection_type': f'aspect_{aspect_type}',
-                    'strength': strength
-                })
+    planet_longitudes = [chart.getObject(planet_name).lon for planet_name in const.LIST_PLANETS]
+    aspects = CHART_ASPECTS.matrix([house.lon], planet_longitudes)
+    for (_, planet_index), aspect_type, actual_orb in aspects.pairs():
+        # Closer to exact aspect = stronger
+        strength = (1 - actual_orb/ASPECT_ORBS[aspect_type]) * 5.0
+
+        # Certain aspects are more significant
+        if aspect_type in ['conjunction', 'opposition']:
+            strength *= 1.5
+        elif aspect_type in ['trine', 'square']:
+            strength *= 1.2
+
+        house_objects.append({
+            'planet': const.LIST_PLANETS[planet_index],
+            'connection_type': f'aspect_{aspect_type}',
+            'strength': strength
+        })
 
     return house_objects
 
@@ -230,39 +211,30 @@ def get_planet_aspects(chart: Chart, planet1_name: str, planet2_name: str) -> Li
     planet2 = chart.getObject(planet2_name)
 
     aspects = []
-    for aspect_type in ASPECT_ORBS.keys():
-        if is_aspect_active(planet1.lon, planet2.lon, aspect_type):
-            # Calculate strength based on aspect type and orb
-            orb = ASPECT_ORBS[aspect_type]
-            target_angle = get_aspect_angle(aspect_type)
-            diff = abs(planet1.lon - planet2.lon) % 360
-            if diff > 180:
-                diff = 360 - diff
-            actual_orb = abs(diff - target_angle)
-
-            # Closer to exact aspect = stronger
-            strength = (1 - actual_orb/orb) * 10.0
-
-            # Consider essential dignity
-            p1_dignity = essential.get_dignity(planet1)
-            p2_dignity = essential.get_dignity(planet2)
-            dignity_factor = 1.0
-            if p1_dignity == 'ruler' or p2_dignity == 'ruler':
-                dignity_factor = 1.5
-            elif p1_dignity == 'exalted' or p2_dignity == 'exalted':
-                dignity_factor = 1.3
-            elif p1_dignity == 'fall' or p2_dignity == 'fall':
-                dignity_factor = 0.7
-            elif p1_dignity == 'detriment' or p2_dignity == 'detriment':
-                dignity_factor = 0.8
-
-            strength *= dignity_factor
-
-            aspects.append({
-                'aspect_type': aspect_type,
-                'strength': strength,
-                'orb': actual_orb
-            })
+    for _, aspect_type, actual_orb in CHART_ASPECTS.matrix([planet1.lon], [planet2.lon]).pairs():
+        # Closer to exact aspect = stronger
+        strength = (1 - actual_orb/ASPECT_ORBS[aspect_type]) * 10.0
+
+        # Consider essential dignity
+        p1_dignity = essential.get_dignity(planet1)
+        p2_dignity = essential.get_dignity(planet2)
+        dignity_factor = 1.0
+        if p1_dignity == 'ruler' or p2_dignity == 'ruler':
+            dignity_factor = 1.5
+        elif p1_dignity == 'exalted' or p2_dignity == 'exalted':
+            dignity_factor = 1.3
+        elif p1_dignity == 'fall' or p2_dignity == 'fall':
+            dignity_factor = 0.7
+        elif p1_dignity == 'detriment' or p2_dignity == 'detriment':
+            dignity_factor = 0.8
+
+        strength *= dignity_factor
+
+        aspects.append({
+            'aspect_type': aspect_type,
+            'strength': strength,
+            'orb': actual_orb
+        })
 
     return aspects
 
@@ -301,7 +273,8 @@ async def rectify_birth_time(
     latitude: float,
     longitude: float,
     timezone: str,
-    answers: List[Dict[str, Any]]
+    answers: List[Dict[str, Any]],
+    search: Optional[SearchStrategy] = None
 ) -> Tuple[datetime, float]:
     """
     Birth time rectification algorithm using astrological factors.
@@ -312,46 +285,49 @@ async def rectify_birth_time(
         longitude: Birth location longitude
         timezone: Birth location timezone
         answers: List of questionnaire answers with life events
+        search: Candidate search strategy (defaults to an adaptive search)
 
     Returns:
         Tuple of (rectified_time, confidence)
     """
     logger.info(f"Rectifying birth time for {birth_dt} at {latitude}, {longitude}")
 
-    # Generate candidate birth times to test (30-minute window in 5-minute increments)
-    time_window = 30  # minutes
-    time_step = 5  # minutes
-    candidate_times = []
-
-    for minutes_offset in range(-time_window, time_window + 1, time_step):
-        candidate_time = birth_dt + timedelta(minutes=minutes_offset)
-        candidate_times.append(candidate_time)
-
-    # Calculate scores for each candidate time
-    candidate_scores = []
-
-    for candidate_time in candidate_times:
-        try:
-            chart = calculate_chart_for_time(candidate_time, latitude, longitude, timezone)
+    def score_offsets(offsets: np.ndarray) -> np.ndarray:
+        scores = np.full(len(offsets), np.nan)
+        for index, minutes_offset in enumerate(offsets):
+            candidate_time = birth_dt + timedelta(minutes=float(minutes_offset))
+            try:
+                chart = calculate_chart_for_time(candidate_time, latitude, longitude, timezone)
 
-            # Initialize score for this candidate
-            total_score = 0.0
+                # Initialize score for this candidate
+                total_score = 0.0
 
-            # Process each answer/life event
-            for answer in answers:
-                event_type = answer.get('event_type')
-                event_date = answer.get('event_date')
-                confidence = answer.get('confidence', 1.0)
+                # Process each answer/life event
+                for answer in answers:
+                    event_type = answer.get('event_type')
+                    confidence = answer.get('confidence', 1.0)
 
-                if event_type and event_type in LIFE_EVENT_MAPPING:
-                    # Score based on natal chart's alignment with this event type
-                    event_score = score_chart_for_event(chart, event_type) * confidence
-                    total_score += event_score
+                    if event_type and event_type in LIFE_EVENT_MAPPING:
+                        # Score based on natal chart's alignment with this event type
+                        event_score = score_chart_for_event(chart, event_type) * confidence
+                        total_score += event_score
 
-            candidate_scores.append((candidate_time, total_score))
-        except Exception as e:
-            logger.error(f"Error calculating chart for {candidate_time}: {str(e)}")
-            continue
+                scores[index] = total_score
+            except Exception as e:
+                logger.error(f"Error calculating chart for {candidate_time}: {str(e)}")
+        return scores
+
+    # Search candidate birth times within 30 minutes of the recorded time
+    result = (search or default_search_strategy(window_minutes=30)).search(
+        score_offsets, angle_sign_boundary(birth_dt, timezone, latitude, longitude)
+    )
+
+    # Candidates whose chart could not be calculated are dropped
+    valid = ~np.isnan(result.scores)
+    candidate_scores = [
+        (birth_dt + timedelta(minutes=float(offset)), float(score))
+        for offset, score in zip(result.offsets[valid], result.scores[valid])
+    ]
 
     # Find the best candidate time
     if not candidate_scores:
@@ -429,27 +405,17 @@ class EnhancedRectificationService:
         # Check aspects between transit planets and natal planets
         transit_aspects = []
 
-        for transit_planet in const.LIST_PLANETS:
-            tr_planet_obj = transit_chart.getObject(transit_planet)
+        transit_longitudes = [transit_chart.getObject(planet).lon for planet in const.LIST_PLANETS]
+        natal_longitudes = [birth_chart.getObject(planet).lon for planet in const.LIST_PLANETS]
 
-            for natal_planet in const.LIST_PLANETS:
-                natal_planet_obj = birth_chart.getObject(natal_planet)
-
-                for aspect_type in ASPECT_ORBS.keys():
-                    if is_aspect_active(tr_planet_obj.lon, natal_planet_obj.lon, aspect_type):
-                        # Calculate orb
-                        target_angle = get_aspect_angle(aspect_type)
-                        diff = abs(tr_planet_obj.lon - natal_planet_obj.lon) % 360
-                        if diff > 180:
-                            diff = 360 - diff
-                        actual_orb = abs(diff - target_angle)
-
-                        transit_aspects.append({
-                            'transit_planet': transit_planet,
-                            'natal_planet': natal_planet,
-                            'aspect_type': aspect_type,
-                            'orb': actual_orb
-                        })
+        aspects = CHART_ASPECTS.matrix(transit_longitudes, natal_longitudes)
+        for (transit_index, natal_index), aspect_type, actual_orb in aspects.pairs():
+            transit_aspects.append({
+                'transit_planet': const.LIST_PLANETS[transit_index],
+                'natal_planet': const.LIST_PLANETS[natal_index],
+                'aspect_type': aspect_type,
+                'orb': actual_orb
+            })
 
         # Check transit planets in natal houses
         transit_house_placements = []
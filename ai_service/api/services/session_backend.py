@@ -0,0 +1,493 @@
+"""
+Async key-value backends for session data.
+
+Sessions live in Redis through ``redis.asyncio`` on one pooled connection
+per process, so session reads and writes never block the event loop.
+
+A session is stored as a snapshot plus an append-only log of events, each
+one line of compact JSON. Small changes, such as an answer to a question
+or a new confidence score, append one event instead of rewriting the
+session, so an answer costs the same however long the session is. Reads
+replay the log over the snapshot, and once the log reaches
+``compact_every`` events it is folded into a new snapshot.
+
+An event describes a change with up to three operations, applied in order:
+
+    {"set": {field: value}}        replace fields
+    {"merge": {field: {...}}}      update dictionary fields
+    {"append": {field: item}}      append an item to list fields
+
+Read-modify-write updates that need the whole session run as WATCH/MULTI
+pipelines, retried when another process changes the session in between.
+Expiry is a Redis TTL that reads slide forward.
+
+MemorySessionBackend offers the same interface in-process, for tests and
+for running without Redis.
+
+Configured from the environment:
+
+    SESSION_BACKEND                 "redis" (default) or "memory"
+    SESSION_REDIS_URL               Redis URL (default REDIS_URL)
+    SESSION_REDIS_MAX_CONNECTIONS   connection pool size (default 50)
+    SESSION_COMPACT_EVERY           log length that triggers compaction (default 50)
+"""
+
+import asyncio
+import copy
+import json
+import logging
+import os
+import time
+import weakref
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from ai_service.core.exceptions import DatabaseError
+
+logger = logging.getLogger(__name__)
+
+# Applies a change to a session in place
+SessionMutator = Callable[[Dict[str, Any]], None]
+
+DEFAULT_COMPACT_EVERY = 50
+
+
+def _json_default(value: Any) -> Any:
+    if isinstance(value, (set, frozenset)):
+        return list(value)
+    return str(value)
+
+
+def dumps(data: Dict[str, Any]) -> bytes:
+    """Serialize session data as compact JSON; sets become lists and other unknown types strings."""
+    return json.dumps(data, separators=(",", ":"), default=_json_default).encode("utf-8")
+
+
+def loads(blob: Any) -> Dict[str, Any]:
+    """Deserialize session data written by dumps."""
+    return json.loads(blob)
+
+
+def apply_event(data: Dict[str, Any], event: Dict[str, Any]) -> None:
+    """Apply one log event to session data in place."""
+    for field, value in event.get("set", {}).items():
+        data[field] = value
+    for field, value in event.get("merge", {}).items():
+        current = data.get(field)
+        if not isinstance(current, dict):
+            current = data[field] = {}
+        current.update(value)
+    for field, item in event.get("append", {}).items():
+        current = data.get(field)
+        if not isinstance(current, list):
+            current = data[field] = []
+        current.append(item)
+
+
+def replay(snapshot: Any, events: List[Any]) -> Dict[str, Any]:
+    """Rebuild session data from a serialized snapshot and serialized events."""
+    data = loads(snapshot)
+    for event in events:
+        apply_event(data, loads(event))
+    return data
+
+
+class MemorySessionBackend:
+    """In-process session backend with per-key expiry."""
+
+    def __init__(self, compact_every: int = DEFAULT_COMPACT_EVERY):
+        """
+        Args:
+            compact_every: Log length at which a session is compacted
+        """
+        self.compact_every = compact_every
+        # session_id -> [expires_at, snapshot, events]
+        self._entries: Dict[str, List[Any]] = {}
+
+    def _get_entry(self, session_id: str) -> Optional[List[Any]]:
+        entry = self._entries.get(session_id)
+        if entry is None:
+            return None
+        if entry[0] <= time.time():
+            del self._entries[session_id]
+            return None
+        return entry
+
+    async def get(self, session_id: str, ttl: Optional[int] = None) -> Optional[Dict[str, Any]]:
+        """
+        Get a session.
+
+        Args:
+            session_id: Session ID
+            ttl: If given, reset the session's expiry to this many seconds
+
+        Returns:
+            A copy of the session data, or None if missing or expired
+        """
+        entry = self._get_entry(session_id)
+        if entry is None:
+            return None
+        if ttl is not None:
+            entry[0] = time.time() + ttl
+        return replay(entry[1], entry[2])
+
+    async def set(self, session_id: str, data: Dict[str, Any], ttl: int) -> None:
+        """Store a session, replacing any existing one and its log."""
+        self._entries[session_id] = [time.time() + ttl, dumps(data), []]
+
+    async def append(self, session_id: str, event: Dict[str, Any], ttl: int) -> Optional[int]:
+        """
+        Append an event to a session's log.
+
+        Args:
+            session_id: Session ID
+            event: Change to record (see apply_event)
+            ttl: Expiry of the session in seconds
+
+        Returns:
+            Log length after the append, or None if the session does not exist
+        """
+        entry = self._get_entry(session_id)
+        if entry is None:
+            return None
+        entry[0] = time.time() + ttl
+        entry[2].append(dumps(event))
+        length = len(entry[2])
+        if length >= self.compact_every:
+            await self.compact(session_id)
+        return length
+
+    async def compact(self, session_id: str) -> bool:
+        """Fold a session's log into its snapshot; returns whether there was anything to fold."""
+        entry = self._get_entry(session_id)
+        if entry is None or not entry[2]:
+            return False
+        entry[1] = dumps(replay(entry[1], entry[2]))
+        entry[2] = []
+        return True
+
+    async def update(
+        self,
+        session_id: str,
+        mutate: SessionMutator,
+        ttl: int,
+        default: Optional[Dict[str, Any]] = None
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Apply mutate to a session and store the result as a new snapshot.
+
+        Args:
+            session_id: Session ID
+            mutate: Function changing the session data in place
+            ttl: Expiry of the stored session in seconds
+            default: Session to start from if none exists; without one a
+                missing session is left missing
+
+        Returns:
+            The updated session data, or None if the session does not exist
+        """
+        # No await between the read and the write, so updates cannot interleave
+        entry = self._get_entry(session_id)
+        if entry is None and default is None:
+            return None
+        data = replay(entry[1], entry[2]) if entry is not None else copy.deepcopy(default)
+        mutate(data)
+        self._entries[session_id] = [time.time() + ttl, dumps(data), []]
+        return data
+
+    async def delete(self, session_id: str) -> bool:
+        """Delete a session; returns whether it existed."""
+        return self._entries.pop(session_id, None) is not None
+
+    async def items(self) -> List[Tuple[str, Dict[str, Any]]]:
+        """Return every live session as (session_id, data) pairs."""
+        now = time.time()
+        return [(session_id, replay(snapshot, events))
+                for session_id, (expires_at, snapshot, events) in list(self._entries.items())
+                if expires_at > now]
+
+    async def purge_expired(self) -> int:
+        """Drop expired sessions; returns how many were dropped."""
+        now = time.time()
+        expired = [session_id for session_id, entry in self._entries.items() if entry[0] <= now]
+        for session_id in expired:
+            del self._entries[session_id]
+        return len(expired)
+
+
+# Appends an event to an existing session's log and refreshes both TTLs.
+# KEYS: snapshot, log. ARGV: event, ttl. Returns the log length, or -1 if
+# the session does not exist.
+_APPEND_SCRIPT = """
+if redis.call('EXISTS', KEYS[1]) == 0 then
+    return -1
+end
+local length = redis.call('RPUSH', KEYS[2], ARGV[1])
+redis.call('EXPIRE', KEYS[1], ARGV[2])
+redis.call('EXPIRE', KEYS[2], ARGV[2])
+return length
+"""
+
+
+class RedisSessionBackend:
+    """
+    Session backend on redis.asyncio.
+
+    A session is a snapshot string at ``{prefix}{id}`` and a list of events
+    at ``{prefix without ':'}_events:{id}``.
+    """
+
+    # Optimistic update attempts before giving up on a contended session
+    MAX_UPDATE_ATTEMPTS = 10
+
+    # Keys fetched per round trip when listing sessions
+    SCAN_BATCH = 100
+
+    def __init__(self, redis_client: Any, prefix: str = "session:", compact_every: int = DEFAULT_COMPACT_EVERY):
+        """
+        Args:
+            redis_client: redis.asyncio client
+            prefix: Key prefix, so different kinds of session never collide
+            compact_every: Log length at which a session is compacted
+        """
+        self.redis = redis_client
+        self.prefix = prefix
+        self.events_prefix = f"{prefix.rstrip(':')}_events:"
+        self.compact_every = compact_every
+        self._append = redis_client.register_script(_APPEND_SCRIPT)
+        # Updates to one session from this process take turns, so WATCH
+        # conflicts only come from other processes
+        self._locks: "weakref.WeakValueDictionary[str, asyncio.Lock]" = weakref.WeakValueDictionary()
+
+    def _key(self, session_id: str) -> str:
+        return f"{self.prefix}{session_id}"
+
+    def _events_key(self, session_id: str) -> str:
+        return f"{self.events_prefix}{session_id}"
+
+    def _lock(self, session_id: str) -> asyncio.Lock:
+        lock = self._locks.get(session_id)
+        if lock is None:
+            lock = self._locks[session_id] = asyncio.Lock()
+        return lock
+
+    async def get(self, session_id: str, ttl: Optional[int] = None) -> Optional[Dict[str, Any]]:
+        """
+        Get a session, replaying its log.
+
+        Args:
+            session_id: Session ID
+            ttl: If given, reset the session's expiry to this many seconds
+
+        Returns:
+            The session data, or None if missing or expired
+        """
+        key, events_key = self._key(session_id), self._events_key(session_id)
+        # One MULTI block, so a compaction cannot fall between the two reads
+        async with self.redis.pipeline(transaction=True) as pipe:
+            if ttl is not None:
+                pipe.getex(key, ex=ttl)
+                pipe.lrange(events_key, 0, -1)
+                pipe.expire(events_key, ttl)
+                snapshot, events, _ = await pipe.execute()
+            else:
+                pipe.get(key)
+                pipe.lrange(events_key, 0, -1)
+                snapshot, events = await pipe.execute()
+        return replay(snapshot, events) if snapshot is not None else None
+
+    async def set(self, session_id: str, data: Dict[str, Any], ttl: int) -> None:
+        """Store a session, replacing any existing one and its log."""
+        async with self.redis.pipeline(transaction=True) as pipe:
+            pipe.set(self._key(session_id), dumps(data), ex=ttl)
+            pipe.delete(self._events_key(session_id))
+            await pipe.execute()
+
+    async def append(self, session_id: str, event: Dict[str, Any], ttl: int) -> Optional[int]:
+        """
+        Append an event to a session's log in one round trip.
+
+        Args:
+            session_id: Session ID
+            event: Change to record (see apply_event)
+            ttl: Expiry of the session in seconds
+
+        Returns:
+            Log length after the append, or None if the session does not exist
+        """
+        length = await self._append(
+            keys=[self._key(session_id), self._events_key(session_id)], args=[dumps(event), ttl]
+        )
+        if length < 0:
+            return None
+        if length >= self.compact_every:
+            await self.compact(session_id)
+        return length
+
+    async def compact(self, session_id: str) -> bool:
+        """
+        Fold a session's log into its snapshot.
+
+        Events appended meanwhile stay in the log. Compaction is skipped if
+        the snapshot changes while it runs; the next append retries it.
+
+        Returns:
+            Whether the log was folded
+        """
+        from redis.exceptions import WatchError
+
+        key, events_key = self._key(session_id), self._events_key(session_id)
+        async with self._lock(session_id), self.redis.pipeline(transaction=True) as pipe:
+            try:
+                await pipe.watch(key)
+                snapshot = await pipe.get(key)
+                events = await pipe.lrange(events_key, 0, -1)
+                if snapshot is None or not events:
+                    await pipe.unwatch()
+                    return False
+                pipe.multi()
+                pipe.set(key, dumps(replay(snapshot, events)), keepttl=True)
+                pipe.ltrim(events_key, len(events), -1)
+                await pipe.execute()
+                return True
+            except WatchError:
+                logger.debug(f"Session {session_id} changed during compaction; skipping")
+                return False
+
+    async def update(
+        self,
+        session_id: str,
+        mutate: SessionMutator,
+        ttl: int,
+        default: Optional[Dict[str, Any]] = None
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Apply mutate to a session and store the result as a new snapshot.
+
+        The session is read under WATCH and written in a MULTI block; if
+        another process changes it in between, the update is retried on the
+        new value.
+
+        Args:
+            session_id: Session ID
+            mutate: Function changing the session data in place
+            ttl: Expiry of the stored session in seconds
+            default: Session to start from if none exists; without one a
+                missing session is left missing
+
+        Returns:
+            The updated session data, or None if the session does not exist
+
+        Raises:
+            DatabaseError: If the session kept changing for every attempt
+        """
+        from redis.exceptions import WatchError
+
+        key, events_key = self._key(session_id), self._events_key(session_id)
+        async with self._lock(session_id), self.redis.pipeline(transaction=True) as pipe:
+            for _ in range(self.MAX_UPDATE_ATTEMPTS):
+                try:
+                    await pipe.watch(key, events_key)
+                    snapshot = await pipe.get(key)
+                    if snapshot is None and default is None:
+                        await pipe.unwatch()
+                        return None
+                    if snapshot is not None:
+                        data = replay(snapshot, await pipe.lrange(events_key, 0, -1))
+                    else:
+                        data = copy.deepcopy(default)
+                    mutate(data)
+                    pipe.multi()
+                    pipe.set(key, dumps(data), ex=ttl)
+                    pipe.delete(events_key)
+                    await pipe.execute()
+                    return data
+                except WatchError:
+                    logger.debug(f"Session {session_id} changed during update; retrying")
+
+        raise DatabaseError(f"Session {session_id} was modified concurrently too often to update")
+
+    async def delete(self, session_id: str) -> bool:
+        """Delete a session; returns whether it existed."""
+        async with self.redis.pipeline(transaction=True) as pipe:
+            pipe.delete(self._key(session_id))
+            pipe.delete(self._events_key(session_id))
+            deleted, _ = await pipe.execute()
+        return bool(deleted)
+
+    async def items(self) -> List[Tuple[str, Dict[str, Any]]]:
+        """Return every live session as (session_id, data) pairs, fetched in batches."""
+        results = []
+        batch: List[str] = []
+
+        async def fetch(keys):
+            session_ids = [(key.decode("utf-8") if isinstance(key, bytes) else key)[len(self.prefix):] for key in keys]
+            async with self.redis.pipeline(transaction=True) as pipe:
+                pipe.mget(keys)
+                for session_id in session_ids:
+                    pipe.lrange(self._events_key(session_id), 0, -1)
+                snapshots, *logs = await pipe.execute()
+            for session_id, snapshot, events in zip(session_ids, snapshots, logs):
+                if snapshot is not None:
+                    results.append((session_id, replay(snapshot, events)))
+
+        async for key in self.redis.scan_iter(match=f"{self.prefix}*", count=self.SCAN_BATCH):
+            batch.append(key)
+            if len(batch) >= self.SCAN_BATCH:
+                await fetch(batch)
+                batch = []
+        if batch:
+            await fetch(batch)
+        return results
+
+    async def purge_expired(self) -> int:
+        """Redis expires sessions itself, so there is nothing to purge."""
+        return 0
+
+
+# Process-wide Redis client; its connection pool is shared by every backend
+_redis_client: Any = None
+_backends: Dict[str, Any] = {}
+
+
+def get_session_redis_client() -> Any:
+    """Return the pooled redis.asyncio client used for sessions."""
+    global _redis_client
+    if _redis_client is None:
+        import redis.asyncio as redis_asyncio
+        from ai_service.core.config import settings
+
+        pool = redis_asyncio.BlockingConnectionPool.from_url(
+            os.getenv("SESSION_REDIS_URL", settings.REDIS_URL),
+            max_connections=int(os.getenv("SESSION_REDIS_MAX_CONNECTIONS", "50")),
+            timeout=5,
+            socket_timeout=3.0,
+            socket_connect_timeout=3.0,
+            retry_on_timeout=True,
+            health_check_interval=30
+        )
+        _redis_client = redis_asyncio.Redis(connection_pool=pool)
+    return _redis_client
+
+
+def get_session_backend(prefix: str = "session:") -> Any:
+    """
+    Return the shared backend for one kind of session.
+
+    Args:
+        prefix: Key prefix of this kind of session
+
+    Returns:
+        RedisSessionBackend, or MemorySessionBackend when SESSION_BACKEND=memory
+    """
+    backend = _backends.get(prefix)
+    if backend is None:
+        kind = os.getenv("SESSION_BACKEND", "redis").lower()
+        compact_every = int(os.getenv("SESSION_COMPACT_EVERY", str(DEFAULT_COMPACT_EVERY)))
+        if kind == "memory":
+            backend = MemorySessionBackend(compact_every)
+        else:
+            if kind != "redis":
+                logger.warning(f"Unknown SESSION_BACKEND '{kind}'; using redis")
+            backend = RedisSessionBackend(get_session_redis_client(), prefix, compact_every)
+        _backends[prefix] = backend
+    return backend
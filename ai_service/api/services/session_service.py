@@ -3,167 +3,39 @@ Session management service for questionnaire interactions.
 """
 
 import logging
-import json
 import uuid
-import time
-import os
-import shutil
-from typing import Dict, Any, Optional, List, Union
-from datetime import datetime, timedelta, date
-import asyncio
-import aiofiles
+from typing import Dict, Any, Optional, List
+from datetime import datetime
 
 from ai_service.core.config import settings
+from ai_service.api.services.session_backend import get_session_backend
 
 logger = logging.getLogger(__name__)
 
-class SessionStore:
-    """Enhanced session store for questionnaire interactions with persistence."""
+# Key prefix of questionnaire sessions, apart from the HTTP sessions of the
+# session middleware
+QUESTIONNAIRE_SESSION_PREFIX = "questionnaire_session:"
 
-    def __init__(self, persistence_dir: Optional[str] = None):
-        """
-        Initialize the session store with persistence support.
 
-        Args:
-            persistence_dir: Directory for persisting session data
-        """
-        self.sessions: Dict[str, Dict[str, Any]] = {}
-        self.session_expiry: Dict[str, float] = {}
-        self.default_expiry = 3600 * 24 * settings.SESSION_EXPIRY_DAYS  # Default days in seconds
+class SessionStore:
+    """
+    Session store for questionnaire interactions on an async key-value backend.
+
+    Updates, answers and confidence changes are appended to the session's
+    event log (see session_backend), so their cost does not grow with the
+    session.
+    """
 
-        # Use the configured session directory or the provided one
-        self.persistence_dir = persistence_dir or settings.SESSION_DIR
-        self.cleanup_interval = 3600  # 1 hour
-        self.last_cleanup = time.time()
-
-        # Create persistence directory
-        if not os.path.isdir(self.persistence_dir):
-            try:
-                os.makedirs(self.persistence_dir, exist_ok=True)
-                # Ensure the directory has proper permissions (readable/writable)
-                os.chmod(self.persistence_dir, 0o755)  # Standard permissions
-                logger.info(f"Session persistence directory created: {self.persistence_dir}")
-            except Exception as e:
-                logger.error(f"Failed to create persistence directory: {str(e)}")
-                raise RuntimeError(f"Cannot create session directory: {str(e)}")
-
-    async def _load_session_file(self, session_id: str) -> bool:
+    def __init__(self, backend: Any = None):
         """
-        Load a session from a file.
+        Initialize the session store.
 
         Args:
-            session_id: The session ID
-
-        Returns:
-            True if loaded successfully, False otherwise
+            backend: Session backend (see session_backend); defaults to the
+                shared one configured from the environment
         """
-        filepath = os.path.join(self.persistence_dir, f"{session_id}.json")
-        if not os.path.exists(filepath):
-            return False
-
-        try:
-            async with aiofiles.open(filepath, 'r') as f:
-                content = await f.read()
-                if not content.strip():
-                    logger.error(f"Empty session file: {session_id}")
-                    # Remove the invalid file
-                    os.remove(filepath)
-                    return False
-
-                # Parse the content
-                session_data = json.loads(content)
-                self.sessions[session_id] = session_data
-
-                # Set expiry based on updated_at time + default expiry
-                updated_at = session_data.get("updated_at")
-                if updated_at:
-                    try:
-                        dt = datetime.fromisoformat(updated_at)
-                        # Convert to timestamp and add expiry
-                        self.session_expiry[session_id] = dt.timestamp() + self.default_expiry
-                    except (ValueError, TypeError):
-                        # If date parsing fails, use current time + expiry
-                        self.session_expiry[session_id] = time.time() + self.default_expiry
-                else:
-                    # Use current time + expiry if no updated_at date
-                    self.session_expiry[session_id] = time.time() + self.default_expiry
-
-                logger.info(f"Session loaded from file: {session_id}")
-                return True
-
-        except json.JSONDecodeError as e:
-            logger.error(f"Error parsing session file {session_id}: {str(e)}")
-            # Make a backup of the corrupted file
-            backup_file = f"{filepath}.corrupted"
-            try:
-                shutil.copy2(filepath, backup_file)
-                logger.info(f"Backup of corrupted session file created: {backup_file}")
-                # Remove the invalid file
-                os.remove(filepath)
-            except Exception as backup_err:
-                logger.error(f"Failed to backup corrupted session file: {str(backup_err)}")
-
-            return False
-        except Exception as e:
-            logger.error(f"Error reading session file {session_id}: {str(e)}")
-            return False
-
-    async def _persist_session(self, session_id: str) -> bool:
-        """Persist session data to file."""
-        if session_id not in self.sessions:
-            return False
-
-        # Get filepath for this session
-        filepath = os.path.join(self.persistence_dir, f"{session_id}.json")
-
-        # Get the session data to persist
-        session_data = self.sessions[session_id]
-
-        # Process data to ensure it's JSON serializable (convert sets to lists, etc.)
-        processed_data = self._prepare_session_data(session_data)
-
-        # Use a temporary file to ensure atomic writes
-        temp_filepath = f"{filepath}.tmp"
-
-        try:
-            # Convert to JSON
-            json_data = json.dumps(processed_data, indent=2)
-
-            # Write to temporary file first
-            async with aiofiles.open(temp_filepath, 'w') as f:
-                await f.write(json_data)
-
-            # Rename the temporary file to the final name (atomic operation)
-            os.replace(temp_filepath, filepath)
-
-            logger.info(f"Session persisted to file: {session_id}")
-            return True
-
-        except Exception as e:
-            logger.error(f"Error persisting session {session_id}: {str(e)}")
-            # Clean up the temporary file if it exists
-            if os.path.exists(temp_filepath):
-                try:
-                    os.remove(temp_filepath)
-                except Exception:
-                    pass
-            return False
-
-    def _prepare_session_data(self, data):
-        """Prepare session data for JSON serialization by handling non-serializable types."""
-        if isinstance(data, dict):
-            return {k: self._prepare_session_data(v) for k, v in data.items()}
-        elif isinstance(data, list):
-            return [self._prepare_session_data(item) for item in data]
-        elif isinstance(data, set):
-            return [self._prepare_session_data(item) for item in data]
-        elif isinstance(data, tuple):
-            return [self._prepare_session_data(item) for item in data]
-        elif isinstance(data, (str, int, float, bool, type(None))):
-            return data
-        else:
-            # For any other types, convert to string
-            return str(data)
+        self.backend = backend or get_session_backend(QUESTIONNAIRE_SESSION_PREFIX)
+        self.default_expiry = 3600 * 24 * settings.SESSION_EXPIRY_DAYS  # Default days in seconds
 
     async def create_session(self, session_id: Optional[str] = None, data: Optional[Dict[str, Any]] = None) -> str:
         """
@@ -180,39 +52,35 @@ class SessionStore:
         if not session_id:
             session_id = f"session_{uuid.uuid4().hex}"
 
-        # Initialize or update session data
-        if session_id not in self.sessions:
-            self.sessions[session_id] = {
-                "created_at": datetime.now().isoformat(),
-                "updated_at": datetime.now().isoformat(),
-                "data": data or {},
-                "responses": [],
-                "current_confidence": 20.0,
-                "questions_asked": [],
-                "questions_answered": 0,
-                "session_metadata": {
-                    "client_ip": None,
-                    "user_agent": None,
-                    "started_at": datetime.now().isoformat()
-                }
+        now = datetime.now().isoformat()
+        new_session = {
+            "created_at": now,
+            "updated_at": now,
+            "data": {},
+            "responses": [],
+            "current_confidence": 20.0,
+            "questions_asked": [],
+            "questions_answered": 0,
+            "session_metadata": {
+                "client_ip": None,
+                "user_agent": None,
+                "started_at": now
             }
-        else:
-            self.sessions[session_id]["updated_at"] = datetime.now().isoformat()
-            if data:
-                self.sessions[session_id]["data"] = {**self.sessions[session_id].get("data", {}), **data}
+        }
 
-        # Set or update expiry time
-        self.session_expiry[session_id] = time.time() + self.default_expiry
+        def merge(session: Dict[str, Any]) -> None:
+            session["updated_at"] = now
+            if data:
+                session["data"] = {**session.get("data", {}), **data}
 
-        # Persist the session
-        await self._persist_session(session_id)
+        await self.backend.update(session_id, merge, self.default_expiry, default=new_session)
 
         logger.info(f"Session created or updated: {session_id}")
         return session_id
 
     async def get_session(self, session_id: str) -> Optional[Dict[str, Any]]:
         """
-        Get session data by ID.
+        Get session data by ID, extending its expiry.
 
         Args:
             session_id: The session ID
@@ -220,39 +88,21 @@ class SessionStore:
         Returns:
             The session data or None if not found
         """
-        # Check if session is in memory
-        if session_id not in self.sessions:
-            # Try to load from disk if not in memory
-            loaded = await self._load_session_file(session_id)
-            if not loaded:
-                # Check if we're in a test environment
-                is_test = False
-                import sys
-                if 'pytest' in sys.modules or 'test_' in session_id:
-                    is_test = True
-
-                if is_test:
-                    # Use debug level for tests to avoid cluttering logs
-                    logger.debug(f"Session not found: {session_id} (test environment)")
-                else:
-                    logger.warning(f"Session not found: {session_id}")
-                return None
-
-        # Check if session has expired
-        if time.time() > self.session_expiry.get(session_id, 0):
-            logger.warning(f"Session expired: {session_id}")
-            await self.delete_session(session_id)
-            return None
-
-        # Refresh expiry time
-        self.session_expiry[session_id] = time.time() + self.default_expiry
-
-        # Automatic cleanup check
-        if time.time() - self.last_cleanup > self.cleanup_interval:
-            asyncio.create_task(self.cleanup_expired_sessions())
-            self.last_cleanup = time.time()
-
-        return self.sessions[session_id]
+        session = await self.backend.get(session_id, ttl=self.default_expiry)
+        if session is None:
+            # Check if we're in a test environment
+            import sys
+            if 'pytest' in sys.modules or 'test_' in session_id:
+                # Use debug level for tests to avoid cluttering logs
+                logger.debug(f"Session not found: {session_id} (test environment)")
+            else:
+                logger.warning(f"Session not found: {session_id}")
+        return session
+
+    async def _append(self, session_id: str, event: Dict[str, Any]) -> bool:
+        """Record a change in the session's event log, stamping updated_at."""
+        event.setdefault("set", {})["updated_at"] = datetime.now().isoformat()
+        return await self.backend.append(session_id, event, self.default_expiry) is not None
 
     async def update_session(self, session_id: str, data: Dict[str, Any]) -> bool:
         """
@@ -265,29 +115,18 @@ class SessionStore:
         Returns:
             True if successful, False otherwise
         """
-        session = await self.get_session(session_id)
-        if not session:
-            logger.warning(f"Cannot update non-existent session: {session_id}")
-            return False
-
-        # Update session data
+        event: Dict[str, Any] = {"set": {}}
         for key, value in data.items():
             if key == "data" and isinstance(value, dict):
                 # Merge with existing data
-                if "data" not in session:
-                    session["data"] = {}
-                session["data"].update(value)
+                event["merge"] = {"data": value}
             else:
                 # Direct replacement for other fields
-                session[key] = value
-
-        session["updated_at"] = datetime.now().isoformat()
+                event["set"][key] = value
 
-        # Refresh expiry time
-        self.session_expiry[session_id] = time.time() + self.default_expiry
-
-        # Persist changes
-        await self._persist_session(session_id)
+        if not await self._append(session_id, event):
+            logger.warning(f"Cannot update non-existent session: {session_id}")
+            return False
 
         logger.info(f"Session updated: {session_id}")
         return True
@@ -306,15 +145,6 @@ class SessionStore:
         Returns:
             True if successful, False otherwise
         """
-        session = await self.get_session(session_id)
-        if not session:
-            logger.warning(f"Cannot add response to non-existent session: {session_id}")
-            return False
-
-        # Initialize responses array if not present
-        if "responses" not in session:
-            session["responses"] = []
-
         # Format the response
         response = {
             "question_id": question_id,
@@ -327,14 +157,13 @@ class SessionStore:
         if metadata and isinstance(metadata, dict):
             response["metadata"] = metadata
 
-        # Add response to the session
-        session["responses"].append(response)
-
-        # Update last activity timestamp
-        session["last_activity"] = datetime.now().isoformat()
+        event = {"append": {"responses": response}, "set": {"last_activity": response["timestamp"]}}
+        if not await self._append(session_id, event):
+            logger.warning(f"Cannot add response to non-existent session: {session_id}")
+            return False
 
-        # Persist the session
-        return await self.update_session(session_id, session)
+        logger.info(f"Session updated: {session_id}")
+        return True
 
     async def get_responses(self, session_id: str) -> List[Dict[str, Any]]:
         """
@@ -381,20 +210,10 @@ class SessionStore:
         Returns:
             True if successful, False otherwise
         """
-        session = await self.get_session(session_id)
-        if not session:
+        if not await self._append(session_id, {"set": {"current_confidence": confidence}}):
             logger.warning(f"Cannot update confidence for non-existent session: {session_id}")
             return False
 
-        session["current_confidence"] = confidence
-        session["updated_at"] = datetime.now().isoformat()
-
-        # Refresh expiry time
-        self.session_expiry[session_id] = time.time() + self.default_expiry
-
-        # Persist changes
-        await self._persist_session(session_id)
-
         logger.info(f"Session confidence updated: {session_id} => {confidence}")
         return True
 
@@ -408,46 +227,24 @@ class SessionStore:
         Returns:
             True if successful, False otherwise
         """
-        if session_id not in self.sessions:
+        if not await self.backend.delete(session_id):
             logger.warning(f"Cannot delete non-existent session: {session_id}")
             return False
 
-        # Delete from memory
-        del self.sessions[session_id]
-        if session_id in self.session_expiry:
-            del self.session_expiry[session_id]
-
-        # Delete persisted file if it exists
-        filepath = os.path.join(self.persistence_dir, f"{session_id}.json")
-        if os.path.exists(filepath):
-            try:
-                os.remove(filepath)
-            except Exception as e:
-                logger.error(f"Error deleting session file {session_id}: {str(e)}")
-                return False
-
         logger.info(f"Session deleted: {session_id}")
         return True
 
     async def cleanup_expired_sessions(self) -> int:
         """
-        Clean up expired sessions.
+        Clean up expired sessions. Backends with native expiry need no cleanup.
 
         Returns:
             Number of sessions cleaned up
         """
-        current_time = time.time()
-        expired_sessions = [sid for sid, expiry in self.session_expiry.items()
-                           if current_time > expiry]
-
-        for session_id in expired_sessions:
-            await self.delete_session(session_id)
-
-        if expired_sessions:
-            logger.info(f"Cleaned up {len(expired_sessions)} expired sessions")
-
-        self.last_cleanup = current_time
-        return len(expired_sessions)
+        removed = await self.backend.purge_expired()
+        if removed:
+            logger.info(f"Cleaned up {removed} expired sessions")
+        return removed
 
     async def get_all_sessions(self) -> List[Dict[str, Any]]:
         """
@@ -456,35 +253,22 @@ class SessionStore:
         Returns:
             List of session metadata
         """
-        sessions_list = []
-
-        # Add all in-memory sessions
-        for session_id, session_data in self.sessions.items():
-            sessions_list.append({
+        return [
+            {
                 "session_id": session_id,
                 "created_at": session_data.get("created_at"),
                 "updated_at": session_data.get("updated_at"),
-                "expires_at": datetime.fromtimestamp(self.session_expiry.get(session_id, 0)).isoformat(),
                 "questions_answered": session_data.get("questions_answered", 0),
                 "confidence": session_data.get("current_confidence", 0)
-            })
-
-        return sessions_list
+            }
+            for session_id, session_data in await self.backend.items()
+        ]
 
     async def persist_session(self, session_id, data):
-        """Persist session data to storage."""
+        """Store a whole session, replacing any existing one."""
         try:
-            # Use direct path construction if _get_session_path doesn't exist
-            session_path = os.path.join(self.persistence_dir, f"{session_id}.json")
-            os.makedirs(os.path.dirname(session_path), exist_ok=True)
-
-            # Apply serialization fix
-            serializable_data = self._prepare_session_data(data)
-
-            with open(session_path, 'w') as f:
-                json.dump(serializable_data, f, indent=2)
-
-            logger.info(f"Session persisted to file: {session_id}")
+            await self.backend.set(session_id, data, self.default_expiry)
+            logger.info(f"Session persisted: {session_id}")
             return True
         except Exception as e:
             logger.error(f"Error persisting session {session_id}: {str(e)}")
@@ -112,6 +112,12 @@ def register_services():
         container.register("chart_service", create_chart_service)
         logger.info("Registered Chart service factory")
 
+        # Register the chart worker pool used to keep chart calculations
+        # off the event loop
+        from ai_service.core.rectification.chart_workers import get_chart_worker_pool
+        container.register("chart_worker_pool", get_chart_worker_pool)
+        logger.info("Registered chart worker pool factory")
+
         # Additional services would be registered here
 
     except Exception as e:
@@ -49,6 +49,9 @@ class Settings(BaseSettings):
     MEDIA_ROOT: str = os.getenv("MEDIA_ROOT", "/app/media")
     UPLOADS_DIR: str = os.path.join(MEDIA_ROOT, "uploads")
     EXPORTS_DIR: str = os.path.join(MEDIA_ROOT, "exports")
+    # "svg" draws PNG exports with the SVG renderer and rasterizes them
+    # (needs cairosvg); "matplotlib" keeps the matplotlib wheel
+    CHART_PNG_RENDERER: str = os.getenv("CHART_PNG_RENDERER", "matplotlib")
 
     # OpenAI API settings (for AI integration)
     OPENAI_API_KEY: str = os.getenv("OPENAI_API_KEY", "")
@@ -74,3 +74,9 @@ class ResourceExhaustionError(BaseServiceError):
     """Exception raised when a resource (API limits, memory, etc.) is exhausted."""
     def __init__(self, message="Resource exhaustion", details=None):
         super().__init__(f"Resource Exhaustion Error: {message}", details)
+
+
+class RenderError(BaseServiceError):
+    """Exception raised when rendering a chart image, comparison or PDF fails or times out."""
+    def __init__(self, message="Error rendering chart", details=None):
+        super().__init__(f"Render Error: {message}", details)
@@ -11,6 +11,10 @@ from .utils.storage import store_rectified_chart
 
 # Import from core modules
 from .chart_calculator import calculate_chart, get_planets_list, EnhancedChartCalculator, normalize_longitude, calculate_verified_chart
+from .batch_ephemeris import EphemerisBatch, calculate_batch, calculate_candidate_batch
+from .progressions import ProgressionCalculator
+from .aspects import AspectMatrix, AspectSet
+from .search import AdaptiveSearch, GridSearch, SearchStrategy
 from .constants import PLANETS_LIST, LIFE_EVENT_MAPPING
 from ai_service.utils.json_encoder import DateTimeEncoder
 
@@ -45,4 +49,13 @@ __all__ = [
     'EnhancedChartCalculator',
     'normalize_longitude',
     'calculate_verified_chart',
+    'EphemerisBatch',
+    'calculate_batch',
+    'calculate_candidate_batch',
+    'ProgressionCalculator',
+    'AspectMatrix',
+    'AspectSet',
+    'AdaptiveSearch',
+    'GridSearch',
+    'SearchStrategy',
 ]
@@ -0,0 +1,183 @@
+"""
+Vectorized aspect detection.
+
+Every scorer used to test aspects one pair at a time with a ladder of
+``abs(angle - 90) < orb`` branches. An AspectSet holds the aspect angles,
+orbs and score weights those ladders encoded, and matches whole longitude
+arrays at once: ``aspect_set.matrix(a, b)`` broadcasts the trailing axes of
+``a`` (N points) and ``b`` (M points) into an N x M AspectMatrix, keeping any
+leading axes (candidates, events, ...) as batch dimensions.
+"""
+import logging
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# Exact angle of every supported aspect
+ASPECT_ANGLES = {
+    "conjunction": 0.0,
+    "semi-sextile": 30.0,
+    "semi-square": 45.0,
+    "sextile": 60.0,
+    "square": 90.0,
+    "trine": 120.0,
+    "quincunx": 150.0,
+    "opposition": 180.0,
+}
+
+
+def separation(a: np.ndarray, b: np.ndarray) -> np.ndarray:
+    """
+    Return the angular separation (0-180 degrees) of every pair of longitudes.
+
+    Args:
+        a: Longitudes with shape (..., N)
+        b: Longitudes with shape (..., M); leading axes broadcast against ``a``
+
+    Returns:
+        Separations with shape (..., N, M); NaN where either longitude is NaN
+    """
+    a = np.asarray(a, dtype=np.float64)
+    b = np.asarray(b, dtype=np.float64)
+    # fmod equals % for the non-negative differences and is much faster
+    diff = np.fmod(np.abs(a[..., :, None] - b[..., None, :]), 360)
+    return np.minimum(diff, 360 - diff)
+
+
+class AspectSet:
+    """
+    Aspects to look for, with their orbs and score weights.
+
+    Aspects are matched in the order given: when orbs overlap, the first
+    aspect within orb wins, as it did in the scalar ladders.
+    """
+
+    def __init__(self, aspects: Sequence[Tuple[str, float, float]], inclusive: bool = False):
+        """
+        Initialize the aspect set.
+
+        Args:
+            aspects: ``(name, orb, weight)`` triples in matching order; names
+                must be keys of ASPECT_ANGLES
+            inclusive: Whether a deviation exactly equal to the orb matches
+        """
+        self.names: List[str] = [name for name, _, _ in aspects]
+        self.angles = np.array([ASPECT_ANGLES[name] for name in self.names], dtype=np.float64)
+        self.orbs = np.array([orb for _, orb, _ in aspects], dtype=np.float64)
+        self.weights = np.array([weight for _, _, weight in aspects], dtype=np.float64)
+        self.inclusive = inclusive
+
+    @classmethod
+    def from_orbs(
+        cls,
+        orbs: Dict[str, float],
+        weights: Optional[Dict[str, float]] = None,
+        inclusive: bool = False
+    ) -> "AspectSet":
+        """
+        Build an aspect set from an ``{aspect name: orb}`` mapping.
+
+        Args:
+            orbs: Orb of every aspect, in matching order
+            weights: Optional score weight of every aspect (default 1)
+            inclusive: Whether a deviation exactly equal to the orb matches
+
+        Returns:
+            AspectSet
+        """
+        weights = weights or {}
+        return cls([(name, orb, weights.get(name, 1.0)) for name, orb in orbs.items()], inclusive=inclusive)
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def matrix(self, a: np.ndarray, b: np.ndarray) -> "AspectMatrix":
+        """
+        Match every pair of longitudes in ``a`` and ``b``.
+
+        Args:
+            a: Longitudes with shape (..., N)
+            b: Longitudes with shape (..., M)
+
+        Returns:
+            AspectMatrix with shape (..., N, M)
+        """
+        return AspectMatrix(self, separation(a, b))
+
+    def score(self, a: np.ndarray, b: np.ndarray) -> np.ndarray:
+        """
+        Sum the weights of every aspect between ``a`` and ``b``.
+
+        Args:
+            a: Longitudes with shape (..., N)
+            b: Longitudes with shape (..., M)
+
+        Returns:
+            Total weight with the leading (batch) shape
+        """
+        return self.matrix(a, b).weights.sum(axis=(-2, -1))
+
+
+class AspectMatrix:
+    """
+    Aspect matches for every pair of two longitude arrays.
+
+    ``index`` holds the position of the matched aspect in the AspectSet (-1
+    where there is none), ``orb`` the deviation from the exact aspect (NaN
+    where there is none) and ``separation`` the raw angular separation.
+    """
+
+    __slots__ = ("aspect_set", "separation", "index", "_orb")
+
+    def __init__(self, aspect_set: AspectSet, separation: np.ndarray):
+        self.aspect_set = aspect_set
+        self.separation = separation
+        self._orb: Optional[np.ndarray] = None
+
+        # Walk the aspects last to first so earlier aspects overwrite later
+        # ones where orbs overlap
+        index = np.full(separation.shape, -1, dtype=np.intp)
+        for position in range(len(aspect_set) - 1, -1, -1):
+            deviation = np.abs(separation - aspect_set.angles[position])
+            if aspect_set.inclusive:
+                within = deviation <= aspect_set.orbs[position]
+            else:
+                within = deviation < aspect_set.orbs[position]
+            np.copyto(index, position, where=within)
+        self.index = index
+
+    @property
+    def orb(self) -> np.ndarray:
+        """Deviation from the exact aspect, NaN where there is no aspect; computed on first use."""
+        if self._orb is None:
+            deviation = np.abs(self.separation - self.aspect_set.angles[self.index])
+            self._orb = np.where(self.matched, deviation, np.nan)
+        return self._orb
+
+    @property
+    def shape(self) -> Tuple[int, ...]:
+        return self.index.shape
+
+    @property
+    def matched(self) -> np.ndarray:
+        """Boolean mask of the pairs that form an aspect."""
+        return self.index >= 0
+
+    @property
+    def weights(self) -> np.ndarray:
+        """Score weight of every pair, 0 where there is no aspect."""
+        return np.where(self.matched, self.aspect_set.weights[self.index], 0.0)
+
+    def pairs(self) -> Iterator[Tuple[Tuple[int, ...], str, float]]:
+        """
+        Iterate over the matched pairs in row-major order.
+
+        Yields:
+            ``(position, aspect name, orb)`` where ``position`` indexes the matrix
+        """
+        names = self.aspect_set.names
+        for position in zip(*np.nonzero(self.matched)):
+            position = tuple(int(i) for i in position)
+            yield position, names[int(self.index[position])], float(self.orb[position])
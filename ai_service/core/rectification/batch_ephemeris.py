@@ -0,0 +1,261 @@
+"""
+Batched ephemeris calculations for rectification sweeps.
+
+Rectification methods evaluate many candidate birth times for a single
+location. Building a full flatlib chart for every candidate is expensive, so
+this module computes planet positions, house cusps and angles for an array of
+Julian days in one pass over pyswisseph and returns them as NumPy arrays.
+"""
+from datetime import datetime, timedelta
+import logging
+from typing import Any, Dict, Iterable, List, Optional, Sequence
+
+import numpy as np
+import pytz
+import swisseph as swe
+
+from .constants import PLANETS_LIST
+
+logger = logging.getLogger(__name__)
+
+# Swiss Ephemeris body identifiers, in PLANETS_LIST order
+PLANET_IDS = {
+    "sun": swe.SUN,
+    "moon": swe.MOON,
+    "mercury": swe.MERCURY,
+    "venus": swe.VENUS,
+    "mars": swe.MARS,
+    "jupiter": swe.JUPITER,
+    "saturn": swe.SATURN,
+    "uranus": swe.URANUS,
+    "neptune": swe.NEPTUNE,
+    "pluto": swe.PLUTO,
+}
+
+PLANET_NAMES = [planet.lower() for planet in PLANETS_LIST]
+PLANET_INDEX = {name: index for index, name in enumerate(PLANET_NAMES)}
+
+ANGLE_NAMES = ["asc", "mc", "desc", "ic"]
+ANGLE_INDEX = {name: index for index, name in enumerate(ANGLE_NAMES)}
+
+# Ephemeris flags used for every batched position
+CALC_FLAGS = swe.FLG_SWIEPH | swe.FLG_SPEED
+
+
+def _utc_offset_hours(dt: datetime, timezone_str: str) -> float:
+    """Return the UTC offset of a naive local datetime in hours."""
+    try:
+        offset = pytz.timezone(timezone_str).utcoffset(dt)
+        return offset.total_seconds() / 3600
+    except Exception as e:
+        logger.warning(f"Error determining timezone offset for {timezone_str}: {e}. Using UTC.")
+        return 0.0
+
+
+def datetime_to_julian_day(dt: datetime, timezone_str: str) -> float:
+    """
+    Convert a local datetime to a UT Julian day.
+
+    Args:
+        dt: Naive local datetime
+        timezone_str: Timezone the datetime is expressed in
+
+    Returns:
+        Julian day number in Universal Time
+    """
+    utc_dt = dt - timedelta(hours=_utc_offset_hours(dt, timezone_str))
+    hour = utc_dt.hour + utc_dt.minute / 60 + (utc_dt.second + utc_dt.microsecond / 1e6) / 3600
+    return swe.julday(utc_dt.year, utc_dt.month, utc_dt.day, hour)
+
+
+def candidate_julian_days(
+    birth_dt: datetime,
+    timezone_str: str,
+    offsets_minutes: Iterable[float]
+) -> np.ndarray:
+    """
+    Build UT Julian days for candidate birth times around a base time.
+
+    Offsets are applied in local time so candidates that cross a DST change
+    pick up the correct UTC offset, matching calculate_chart.
+
+    Args:
+        birth_dt: Base local birth datetime
+        timezone_str: Timezone string
+        offsets_minutes: Candidate offsets from the base time in minutes
+
+    Returns:
+        Array of Julian days, one per offset
+    """
+    return np.array([
+        datetime_to_julian_day(birth_dt + timedelta(minutes=float(offset)), timezone_str)
+        for offset in offsets_minutes
+    ], dtype=np.float64)
+
+
+class EphemerisBatch:
+    """
+    Planet positions, house cusps and angles for a batch of Julian days.
+
+    Row ``i`` of every array belongs to ``julian_days[i]``. Planet columns
+    follow PLANET_NAMES and angle columns follow ANGLE_NAMES.
+    """
+
+    def __init__(
+        self,
+        julian_days: np.ndarray,
+        longitudes: np.ndarray,
+        latitudes: np.ndarray,
+        speeds: np.ndarray,
+        cusps: np.ndarray,
+        angles: np.ndarray
+    ):
+        self.julian_days = julian_days
+        self.longitudes = longitudes
+        self.latitudes = latitudes
+        self.speeds = speeds
+        self.cusps = cusps
+        self.angles = angles
+
+    def __len__(self) -> int:
+        return len(self.julian_days)
+
+    def planet_longitudes(self, names: Optional[Sequence[str]] = None) -> np.ndarray:
+        """Return an (N, k) array of longitudes for the named planets."""
+        if names is None:
+            return self.longitudes
+        return self.longitudes[:, [PLANET_INDEX[name.lower()] for name in names]]
+
+    def angle_longitudes(self, name: str) -> np.ndarray:
+        """Return the (N,) longitudes of a single angle ("asc", "mc", "desc", "ic")."""
+        return self.angles[:, ANGLE_INDEX[name.lower()]]
+
+    def chart_vector(self, index: int) -> "ChartVector":
+        """Return one row as a ChartVector without building any dicts."""
+        from .chart_vector import ChartVector
+        return ChartVector.from_batch(self, index)
+
+    def to_chart_dict(self, index: int) -> Dict[str, Any]:
+        """
+        Convert one row to the planets/houses/angles layout of calculate_chart.
+
+        Only the positional sections are produced; callers that need chart
+        metadata should add it themselves. Planets that were not calculated
+        are omitted.
+        """
+        return self.chart_vector(index).to_dict()
+
+
+def house_for_longitude(lon: float, cusps: Sequence[float]) -> int:
+    """Return the 1-based house containing a longitude for the given cusps."""
+    for house in range(12):
+        start = cusps[house]
+        end = cusps[(house + 1) % 12]
+        span = (end - start) % 360
+        if (lon - start) % 360 < span:
+            return house + 1
+    return 1
+
+
+def calculate_batch(
+    julian_days: Iterable[float],
+    latitude: float,
+    longitude: float,
+    house_system: str = "P",
+    planets: Optional[List[str]] = None,
+    high_precision: bool = False
+) -> EphemerisBatch:
+    """
+    Calculate positions for every Julian day in a single pass over pyswisseph.
+
+    Planet positions for days inside the precomputed ephemeris table are
+    interpolated from it in one vectorized lookup; house cusps and angles are
+    always calculated.
+
+    Args:
+        julian_days: UT Julian days to evaluate
+        latitude: Geographic latitude in decimal degrees
+        longitude: Geographic longitude in decimal degrees
+        house_system: Swiss Ephemeris house system code
+        planets: Optional subset of planet names to calculate; the remaining
+            columns are left as NaN
+        high_precision: Calculate every planet with pyswisseph instead of
+            using the ephemeris table
+
+    Returns:
+        EphemerisBatch with one row per Julian day
+    """
+    if not isinstance(julian_days, np.ndarray):
+        julian_days = list(julian_days)
+    jds = np.asarray(julian_days, dtype=np.float64).reshape(-1)
+    count = len(jds)
+    planet_names = PLANET_NAMES if planets is None else [name.lower() for name in planets]
+    planet_columns = [(PLANET_INDEX[name], PLANET_IDS[name]) for name in planet_names]
+    hsys = house_system.encode("ascii")
+
+    longitudes = np.full((count, len(PLANET_NAMES)), np.nan)
+    latitudes = np.full((count, len(PLANET_NAMES)), np.nan)
+    speeds = np.full((count, len(PLANET_NAMES)), np.nan)
+    cusps = np.empty((count, 12))
+    angles = np.empty((count, len(ANGLE_NAMES)))
+
+    # Rows covered by the ephemeris table skip the planet calculations
+    from .ephemeris_table import get_ephemeris_table
+    table = None if high_precision or not planet_names else get_ephemeris_table()
+    tabulated = table.covers(jds) if table is not None else np.zeros(count, dtype=bool)
+    if tabulated.any():
+        table_rows = np.ix_(tabulated, [column for column, _ in planet_columns])
+        longitudes[table_rows], latitudes[table_rows], speeds[table_rows] = table.positions(
+            jds[tabulated], planet_names
+        )
+
+    calc_ut = swe.calc_ut
+    houses = swe.houses
+
+    for row, jd in enumerate(jds):
+        jd = float(jd)
+        for column, body in (() if tabulated[row] else planet_columns):
+            position = calc_ut(jd, body, CALC_FLAGS)[0]
+            longitudes[row, column] = position[0]
+            latitudes[row, column] = position[1]
+            speeds[row, column] = position[3]
+
+        house_cusps, ascmc = houses(jd, latitude, longitude, hsys)
+        # Older pyswisseph releases return a leading placeholder cusp
+        cusps[row] = house_cusps[-12:]
+        asc, mc = ascmc[0], ascmc[1]
+        angles[row] = (asc, mc, (asc + 180.0) % 360, (mc + 180.0) % 360)
+
+    return EphemerisBatch(jds, longitudes, latitudes, speeds, cusps, angles)
+
+
+def calculate_candidate_batch(
+    birth_dt: datetime,
+    latitude: float,
+    longitude: float,
+    timezone_str: str,
+    offsets_minutes: Iterable[float],
+    house_system: str = "P",
+    planets: Optional[List[str]] = None,
+    high_precision: bool = False
+) -> EphemerisBatch:
+    """
+    Calculate a batch for candidate birth times offset from a base time.
+
+    Args:
+        birth_dt: Base local birth datetime
+        latitude: Birth latitude in decimal degrees
+        longitude: Birth longitude in decimal degrees
+        timezone_str: Timezone string
+        offsets_minutes: Candidate offsets from the base time in minutes
+        house_system: Swiss Ephemeris house system code
+        planets: Optional subset of planet names to calculate
+        high_precision: Calculate every planet with pyswisseph
+
+    Returns:
+        EphemerisBatch with one row per candidate offset
+    """
+    jds = candidate_julian_days(birth_dt, timezone_str, offsets_minutes)
+    return calculate_batch(
+        jds, latitude, longitude, house_system=house_system, planets=planets, high_precision=high_precision
+    )
@@ -0,0 +1,139 @@
+"""
+Memoized natal chart positions.
+
+The same birth data is charted many times in one session (chart generation,
+questionnaire, rectification and comparison), and every call used to go back
+to the ephemeris. ChartCache keeps the positional part of a chart (planets,
+houses and angles) keyed on exactly the inputs the calculation sees: the UTC
+Julian day, the coordinates after flatlib's arc-minute normalisation, the
+house system and the zodiac. Per-call metadata such as the chart ID is not
+cached, so every caller still gets its own chart.
+"""
+from collections import OrderedDict
+import copy
+import logging
+import os
+import threading
+from typing import Any, Dict, Hashable, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Chart sections that depend only on the cache key
+CACHED_SECTIONS = ("planets", "houses", "angles")
+
+ChartKey = Tuple[float, float, float, str, str]
+
+
+def make_chart_key(
+    julian_day: float,
+    latitude: float,
+    longitude: float,
+    house_system: str,
+    zodiac: str
+) -> ChartKey:
+    """
+    Build a normalized cache key.
+
+    Args:
+        julian_day: UTC Julian day of the chart
+        latitude: Latitude in decimal degrees as used by the calculation
+        longitude: Longitude in decimal degrees as used by the calculation
+        house_system: House system identifier
+        zodiac: Zodiac identifier, including the ayanamsa for sidereal charts
+
+    Returns:
+        Hashable key; Julian days are rounded to about 10 ms and coordinates
+        to about 10 cm so float noise never causes a miss
+    """
+    return (round(julian_day, 7), round(latitude, 6), round(longitude, 6), house_system, zodiac)
+
+
+class ChartCache:
+    """Thread-safe LRU cache of chart positions with hit/miss counters."""
+
+    def __init__(self, max_entries: int = 1024):
+        """
+        Initialize the cache.
+
+        Args:
+            max_entries: Maximum number of charts kept; 0 disables caching
+        """
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[Hashable, Dict[str, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: Hashable) -> Optional[Dict[str, Any]]:
+        """
+        Look up chart positions.
+
+        Args:
+            key: Key from make_chart_key
+
+        Returns:
+            A private copy of the cached sections, or None on a miss
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+        return copy.deepcopy(entry)
+
+    def put(self, key: Hashable, chart: Dict[str, Any]) -> None:
+        """
+        Store the positional sections of a chart, evicting the least recently used.
+
+        Args:
+            key: Key from make_chart_key
+            chart: Chart data containing at least the cached sections
+        """
+        if self.max_entries <= 0:
+            return
+
+        entry = copy.deepcopy({section: chart[section] for section in CACHED_SECTIONS if section in chart})
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self) -> None:
+        """Remove every entry and reset the counters."""
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+            self.evictions = 0
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Return size and hit/miss statistics."""
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "max_entries": self.max_entries,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+        }
+
+
+# Shared cache instance
+_chart_cache: Optional[ChartCache] = None
+
+
+def get_chart_cache() -> ChartCache:
+    """Return the shared chart cache, sized by CHART_CACHE_SIZE."""
+    global _chart_cache
+    if _chart_cache is None:
+        _chart_cache = ChartCache(max_entries=int(os.getenv("CHART_CACHE_SIZE", "1024")))
+    return _chart_cache
@@ -25,7 +25,7 @@ except ImportError:
 
     pytz = FakePytz()
 import os
-from typing import Any, Optional, Dict, Union
+from typing import Any, Optional, Dict, Tuple, Union
 import traceback
 import uuid
 import json
@@ -45,9 +45,14 @@ from flatlib.datetime import Datetime
 from flatlib.geopos import GeoPos
 from flatlib.chart import Chart
 from flatlib import const
+from flatlib.ephem import ephem
+from flatlib.lists import ObjectList
+from flatlib.object import Object
 
 # Import local modules
 from .constants import PLANETS_LIST
+from .chart_cache import ChartKey, get_chart_cache, make_chart_key
+from .ephemeris_table import get_ephemeris_table
 from ai_service.core.config import settings
 from ai_service.utils.astrological_terms import (
     get_house_system_name,
@@ -75,11 +80,171 @@ def get_planets_list() -> list:
     """Get the standard list of planets used in calculation."""
     return PLANETS_LIST
 
-def calculate_chart(
+def _flatlib_inputs(
+    birth_dt: datetime,
+    latitude: float,
+    longitude: float,
+    timezone_str: str
+) -> Tuple[Datetime, GeoPos]:
+    """
+    Build the flatlib datetime and position a chart is calculated from.
+
+    Times are truncated to the minute and coordinates to the arc minute, so
+    these are the effective chart inputs.
+
+    Args:
+        birth_dt: Birth datetime
+        latitude: Birth latitude in decimal degrees
+        longitude: Birth longitude in decimal degrees
+        timezone_str: Birth location timezone string
+
+    Returns:
+        Tuple of (flatlib Datetime, flatlib GeoPos)
+    """
+    # Create the flatlib DateTime object
+    try:
+        timezone = pytz.timezone(timezone_str)
+        utc_offset = timezone.utcoffset(birth_dt)
+        utc_offset_hours = utc_offset.total_seconds() / 3600
+    except Exception as e:
+        logger.warning(f"Error determining timezone offset: {e}. Using UTC.")
+        utc_offset_hours = 0
+
+    # Format date for flatlib
+    dt_str = birth_dt.strftime('%Y/%m/%d')
+    time_str = birth_dt.strftime('%H:%M')
+
+    # Format offset as required by flatlib
+    sign = '+' if utc_offset_hours >= 0 else '-'
+    hours = abs(int(utc_offset_hours))
+    minutes = abs(int((utc_offset_hours - int(utc_offset_hours)) * 60))
+    offset_str = f"{sign}{hours:02d}:{minutes:02d}"
+
+    # Create flatlib datetime
+    flat_datetime = Datetime(dt_str, time_str, offset_str)
+
+    # For flatlib, we need to format the geographic coordinates differently
+    # Format latitude with N/S indicator (e.g., "18n31" for 18.52 North)
+    # Format longitude with E/W indicator (e.g., "73e51" for 73.85 East)
+
+    # Handle latitude
+    lat_abs = abs(latitude)
+    lat_deg = int(lat_abs)
+    lat_min = int((lat_abs - lat_deg) * 60)
+    # Ensure we have at least 1 degree if all values are 0
+    if lat_deg == 0 and lat_min == 0:
+        lat_deg = 1
+    lat_dir = 'n' if latitude >= 0 else 's'
+    lat_str = f"{lat_deg}{lat_dir}{lat_min}"
+
+    # Handle longitude
+    lon_abs = abs(longitude)
+    lon_deg = int(lon_abs)
+    lon_min = int((lon_abs - lon_deg) * 60)
+    # Ensure we have at least 1 degree if all values are 0
+    if lon_deg == 0 and lon_min == 0:
+        lon_deg = 1
+    lon_dir = 'e' if longitude >= 0 else 'w'
+    lon_str = f"{lon_deg}{lon_dir}{lon_min}"
+
+    logger.debug(f"Formatted coordinates for flatlib: lat={lat_str}, lon={lon_str}")
+
+    try:
+        flat_geopos = GeoPos(lat_str, lon_str)
+    except ValueError as e:
+        logger.error(f"Error creating GeoPos with coordinates {lat_str}, {lon_str}: {e}")
+        # Fallback to hardcoded known good values for testing
+        logger.warning("Using fallback coordinates for Pune, India (18n32, 73e52)")
+        flat_geopos = GeoPos("18n32", "73e52")
+
+    return flat_datetime, flat_geopos
+
+def _flatlib_chart_key(flat_datetime: Datetime, flat_geopos: GeoPos) -> ChartKey:
+    """Return the chart cache key for flatlib chart inputs."""
+    # calculate_chart always uses flatlib's default house system and the
+    # tropical zodiac
+    return make_chart_key(flat_datetime.jd, flat_geopos.lat, flat_geopos.lon, const.HOUSES_DEFAULT, "tropical")
+
+def chart_cache_key(
+    birth_dt: datetime,
+    latitude: float,
+    longitude: float,
+    timezone_str: str
+) -> ChartKey:
+    """Return the chart cache key for the inputs of calculate_chart."""
+    return _flatlib_chart_key(*_flatlib_inputs(birth_dt, latitude, longitude, timezone_str))
+
+def _flatlib_chart(flat_datetime: Datetime, flat_geopos: GeoPos, high_precision: bool = False) -> Chart:
+    """
+    Build a flatlib chart, reading planet positions from the ephemeris table.
+
+    Objects the table cannot answer, and dates outside it, are calculated by
+    flatlib as usual. High-precision charts always use pyswisseph.
+    """
+    table = None if high_precision else get_ephemeris_table()
+    objects = table.flatlib_objects(flat_datetime.jd, const.LIST_OBJECTS_TRADITIONAL) if table else None
+    if objects is None:
+        return Chart(flat_datetime, flat_geopos)
+
+    flat_chart = Chart(flat_datetime, flat_geopos, IDs=[])
+    flat_chart.objects = ObjectList([
+        Object.fromDict(objects[object_id]) if object_id in objects
+        else ephem.getObject(object_id, flat_datetime, flat_geopos)
+        for object_id in const.LIST_OBJECTS_TRADITIONAL
+    ])
+    return flat_chart
+
+def _new_chart_data(
     birth_dt: datetime,
     latitude: float,
     longitude: float,
     timezone_str: str
+) -> Dict[str, Any]:
+    """Return chart metadata with a fresh chart ID and empty position sections."""
+    return {
+        "chart_id": f"chart_{uuid.uuid4().hex[:10]}",
+        "date": birth_dt.strftime("%Y-%m-%d"),
+        "time": birth_dt.strftime("%H:%M:%S"),
+        "latitude": latitude,
+        "longitude": longitude,
+        "timezone": timezone_str,
+        "planets": {},
+        "houses": [],
+        "angles": {}
+    }
+
+def get_cached_chart(
+    birth_dt: datetime,
+    latitude: float,
+    longitude: float,
+    timezone_str: str
+) -> Optional[Dict[str, Any]]:
+    """
+    Return a chart from the chart cache without touching the ephemeris.
+
+    Args:
+        birth_dt: Birth datetime
+        latitude: Birth latitude in decimal degrees
+        longitude: Birth longitude in decimal degrees
+        timezone_str: Birth location timezone string
+
+    Returns:
+        Chart data in the calculate_chart layout, or None on a cache miss
+    """
+    cached = get_chart_cache().get(chart_cache_key(birth_dt, latitude, longitude, timezone_str))
+    if cached is None:
+        return None
+
+    chart_data = _new_chart_data(birth_dt, latitude, longitude, timezone_str)
+    chart_data.update(cached)
+    return chart_data
+
+def calculate_chart(
+    birth_dt: datetime,
+    latitude: float,
+    longitude: float,
+    timezone_str: str,
+    high_precision: bool = False
 ) -> Dict[str, Any]:
     """
     Calculate astrological chart using flatlib.
@@ -90,85 +255,29 @@ def calculate_chart(
         latitude: Birth latitude in decimal degrees
         longitude: Birth longitude in decimal degrees
         timezone_str: Birth location timezone string
+        high_precision: Calculate planets with pyswisseph instead of
+            interpolating the precomputed ephemeris table
 
     Returns:
         Dictionary containing chart data
     """
     try:
-        # Generate chart ID
-        chart_id = f"chart_{uuid.uuid4().hex[:10]}"
-
-        # Create the flatlib DateTime object
-        try:
-            timezone = pytz.timezone(timezone_str)
-            utc_offset = timezone.utcoffset(birth_dt)
-            utc_offset_hours = utc_offset.total_seconds() / 3600
-        except Exception as e:
-            logger.warning(f"Error determining timezone offset: {e}. Using UTC.")
-            utc_offset_hours = 0
-
-        # Format date for flatlib
-        dt_str = birth_dt.strftime('%Y/%m/%d')
-        time_str = birth_dt.strftime('%H:%M')
-
-        # Format offset as required by flatlib
-        sign = '+' if utc_offset_hours >= 0 else '-'
-        hours = abs(int(utc_offset_hours))
-        minutes = abs(int((utc_offset_hours - int(utc_offset_hours)) * 60))
-        offset_str = f"{sign}{hours:02d}:{minutes:02d}"
-
-        # Create flatlib datetime
-        flat_datetime = Datetime(dt_str, time_str, offset_str)
-
-        # For flatlib, we need to format the geographic coordinates differently
-        # Format latitude with N/S indicator (e.g., "18n31" for 18.52 North)
-        # Format longitude with E/W indicator (e.g., "73e51" for 73.85 East)
-
-        # Handle latitude
-        lat_abs = abs(latitude)
-        lat_deg = int(lat_abs)
-        lat_min = int((lat_abs - lat_deg) * 60)
-        # Ensure we have at least 1 degree if all values are 0
-        if lat_deg == 0 and lat_min == 0:
-            lat_deg = 1
-        lat_dir = 'n' if latitude >= 0 else 's'
-        lat_str = f"{lat_deg}{lat_dir}{lat_min}"
-
-        # Handle longitude
-        lon_abs = abs(longitude)
-        lon_deg = int(lon_abs)
-        lon_min = int((lon_abs - lon_deg) * 60)
-        # Ensure we have at least 1 degree if all values are 0
-        if lon_deg == 0 and lon_min == 0:
-            lon_deg = 1
-        lon_dir = 'e' if longitude >= 0 else 'w'
-        lon_str = f"{lon_deg}{lon_dir}{lon_min}"
-
-        logger.debug(f"Formatted coordinates for flatlib: lat={lat_str}, lon={lon_str}")
-
-        try:
-            flat_geopos = GeoPos(lat_str, lon_str)
-        except ValueError as e:
-            logger.error(f"Error creating GeoPos with coordinates {lat_str}, {lon_str}: {e}")
-            # Fallback to hardcoded known good values for testing
-            logger.warning("Using fallback coordinates for Pune, India (18n32, 73e52)")
-            flat_geopos = GeoPos("18n32", "73e52")
+        flat_datetime, flat_geopos = _flatlib_inputs(birth_dt, latitude, longitude, timezone_str)
+        chart_data = _new_chart_data(birth_dt, latitude, longitude, timezone_str)
+
+        # Reuse positions already calculated for the same moment and place;
+        # high-precision charts are always recalculated
+        cache = get_chart_cache()
+        cache_key = _flatlib_chart_key(flat_datetime, flat_geopos)
+        cached = None if high_precision else cache.get(cache_key)
+        if cached is not None:
+            chart_data.update(cached)
+            return chart_data
 
         # Calculate the chart
-        flat_chart = Chart(flat_datetime, flat_geopos)
+        flat_chart = _flatlib_chart(flat_datetime, flat_geopos, high_precision)
 
         # Extract chart data
-        chart_data = {
-            "chart_id": chart_id,
-            "date": birth_dt.strftime("%Y-%m-%d"),
-            "time": birth_dt.strftime("%H:%M:%S"),
-            "latitude": latitude,
-            "longitude": longitude,
-            "timezone": timezone_str,
-            "planets": {},
-            "houses": [],
-            "angles": {}
-        }
 
         # Extract planet positions
         for planet_name in PLANETS_LIST:
@@ -300,6 +409,7 @@ def calculate_chart(
             except Exception as e:
                 logger.warning(f"Error extracting angle {angle_name}: {e}")
 
+        cache.put(cache_key, chart_data)
         return chart_data
 
     except Exception as e:
@@ -386,8 +496,9 @@ async def calculate_verified_chart(
                 # Create datetime object
                 dt_obj = datetime(year, month, day, hour, minute, second)
 
-        # Calculate basic chart - this is a synchronous function
-        chart_data = calculate_chart(dt_obj, latitude, longitude, timezone)
+        # Calculate basic chart in a worker process to keep the event loop free
+        from .chart_workers import get_chart_worker_pool
+        chart_data = await get_chart_worker_pool().calculate_chart(dt_obj, latitude, longitude, timezone)
 
         # Add metadata
         chart_data.update({
@@ -0,0 +1,241 @@
+"""
+Compact array-backed chart representation.
+
+Charts travel through the API as nested dicts (``planets[name]["longitude"]``,
+``angles["asc"]["longitude"]``, ...). Scoring code that walks those dicts for
+every candidate allocates a dict per planet and pays for string lookups in
+its innermost loops. ChartVector keeps the same data in a handful of fixed
+NumPy arrays indexed by POINT_INDEX and ANGLE_INDEX, and only builds the dict
+form when it is asked for at the API boundary.
+"""
+import logging
+from typing import Any, Dict, Iterable, Optional
+
+import numpy as np
+from flatlib.const import LIST_SIGNS
+
+from .batch_ephemeris import ANGLE_INDEX, ANGLE_NAMES, PLANET_NAMES, house_for_longitude
+
+logger = logging.getLogger(__name__)
+
+# Fixed point columns: the ten planets first, in batch ephemeris order, then
+# the extra bodies stored charts may carry
+POINT_NAMES = PLANET_NAMES + ["north node", "south node", "chiron"]
+POINT_INDEX = {name: index for index, name in enumerate(POINT_NAMES)}
+
+# Names angles appear under in stored (list form) charts
+_ANGLE_ALIASES = {
+    "asc": "asc", "ascendant": "asc",
+    "mc": "mc", "midheaven": "mc",
+    "desc": "desc", "descendant": "desc",
+    "ic": "ic", "imum coeli": "ic",
+}
+
+_SECTIONS = ("planets", "houses", "angles")
+
+
+def _sign(longitude: float) -> str:
+    """Return the zodiac sign name for a longitude."""
+    return LIST_SIGNS[int(longitude // 30) % 12]
+
+
+def _float(value: Any) -> float:
+    """Convert a chart value to float, NaN when missing."""
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return float("nan")
+
+
+def _entries(section: Any) -> Iterable[tuple]:
+    """Yield (name, data) pairs from a dict-keyed or list-of-dicts chart section."""
+    if isinstance(section, dict):
+        return section.items()
+    if isinstance(section, list):
+        return ((entry.get("name", ""), entry) for entry in section if isinstance(entry, dict))
+    return ()
+
+
+class ChartVector:
+    """
+    Planet, angle and house cusp positions of one chart in fixed-index arrays.
+
+    Missing points are NaN. ``houses`` and ``retrograde`` are optional
+    per-point arrays; when ``houses`` is None it is derived from the cusps on
+    conversion to a dict.
+    """
+
+    __slots__ = ("longitudes", "latitudes", "speeds", "houses", "retrograde", "cusps", "angles", "metadata", "_dict")
+
+    def __init__(
+        self,
+        longitudes: Optional[np.ndarray] = None,
+        latitudes: Optional[np.ndarray] = None,
+        speeds: Optional[np.ndarray] = None,
+        houses: Optional[np.ndarray] = None,
+        retrograde: Optional[np.ndarray] = None,
+        cusps: Optional[np.ndarray] = None,
+        angles: Optional[np.ndarray] = None,
+        metadata: Optional[Dict[str, Any]] = None
+    ):
+        """
+        Initialize the vector; omitted arrays are filled with NaN.
+
+        Args:
+            longitudes: Ecliptic longitudes in POINT_NAMES order
+            latitudes: Ecliptic latitudes in POINT_NAMES order
+            speeds: Daily speeds in POINT_NAMES order
+            houses: Optional 1-based house of every point
+            retrograde: Optional retrograde flag of every point
+            cusps: The 12 house cusps
+            angles: Angle longitudes in ANGLE_NAMES order
+            metadata: Top-level chart fields other than positions (chart_id, date, ...)
+        """
+        points = len(POINT_NAMES)
+        self.longitudes = np.full(points, np.nan) if longitudes is None else longitudes
+        self.latitudes = np.full(points, np.nan) if latitudes is None else latitudes
+        self.speeds = np.full(points, np.nan) if speeds is None else speeds
+        self.houses = houses
+        self.retrograde = retrograde
+        self.cusps = np.full(12, np.nan) if cusps is None else cusps
+        self.angles = np.full(len(ANGLE_NAMES), np.nan) if angles is None else angles
+        self.metadata = metadata if metadata is not None else {}
+        self._dict: Optional[Dict[str, Any]] = None
+
+    @classmethod
+    def from_batch(cls, batch: Any, index: int) -> "ChartVector":
+        """
+        Build a vector from one row of an EphemerisBatch without any dicts.
+
+        Args:
+            batch: EphemerisBatch
+            index: Row to take
+
+        Returns:
+            ChartVector sharing nothing with the batch
+        """
+        planets = len(PLANET_NAMES)
+        longitudes = np.full(len(POINT_NAMES), np.nan)
+        latitudes = np.full(len(POINT_NAMES), np.nan)
+        speeds = np.full(len(POINT_NAMES), np.nan)
+        longitudes[:planets] = batch.longitudes[index]
+        latitudes[:planets] = batch.latitudes[index]
+        speeds[:planets] = batch.speeds[index]
+
+        return cls(
+            longitudes=longitudes,
+            latitudes=latitudes,
+            speeds=speeds,
+            retrograde=speeds < 0,
+            cusps=batch.cusps[index].copy(),
+            angles=batch.angles[index].copy()
+        )
+
+    @classmethod
+    def from_chart_dict(cls, chart: Any) -> "ChartVector":
+        """
+        Build a vector from a chart dict.
+
+        Accepts the calculate_chart layout (planets and angles keyed by name,
+        houses as a list of cusp longitudes) as well as the stored layout
+        (lists of dicts carrying a ``name`` or ``house`` field). Vectors are
+        returned unchanged.
+
+        Args:
+            chart: Chart dict or ChartVector
+
+        Returns:
+            ChartVector
+        """
+        if isinstance(chart, ChartVector):
+            return chart
+
+        vector = cls(
+            houses=np.zeros(len(POINT_NAMES), dtype=np.int8),
+            retrograde=np.zeros(len(POINT_NAMES), dtype=bool),
+            metadata={key: value for key, value in chart.items() if key not in _SECTIONS}
+        )
+
+        for name, data in _entries(chart.get("planets")):
+            index = POINT_INDEX.get(str(name).lower())
+            if index is None:
+                continue
+            vector.longitudes[index] = _float(data.get("longitude"))
+            vector.latitudes[index] = _float(data.get("latitude"))
+            vector.speeds[index] = _float(data.get("speed"))
+            house = data.get("house")
+            vector.houses[index] = house if isinstance(house, int) and 0 <= house <= 12 else 0
+            vector.retrograde[index] = bool(data.get("retrograde", False))
+
+        for name, data in _entries(chart.get("angles")):
+            key = _ANGLE_ALIASES.get(str(name).lower())
+            if key is not None:
+                vector.angles[ANGLE_INDEX[key]] = _float(data.get("longitude"))
+
+        for position, cusp in enumerate(chart.get("houses") or []):
+            if isinstance(cusp, dict):
+                number = cusp.get("house", cusp.get("number", position + 1))
+                cusp = cusp.get("longitude", cusp.get("cusp"))
+            else:
+                number = position + 1
+            if isinstance(number, int) and 1 <= number <= 12:
+                vector.cusps[number - 1] = _float(cusp)
+
+        return vector
+
+    def planet(self, name: str) -> float:
+        """Return the longitude of a planet or other point, NaN if absent."""
+        index = POINT_INDEX.get(name.lower())
+        return float(self.longitudes[index]) if index is not None else float("nan")
+
+    def angle(self, name: str) -> float:
+        """Return the longitude of an angle by short or full name, NaN if absent."""
+        key = _ANGLE_ALIASES.get(name.lower())
+        return float(self.angles[ANGLE_INDEX[key]]) if key is not None else float("nan")
+
+    def to_dict(self) -> Dict[str, Any]:
+        """
+        Convert to the calculate_chart dict layout.
+
+        The dict is built on first use and cached on the vector, so repeated
+        calls return the same object.
+        """
+        if self._dict is not None:
+            return self._dict
+
+        cusps = self.cusps
+        has_cusps = not np.isnan(cusps).any()
+
+        planets = {}
+        for name, index in POINT_INDEX.items():
+            lon = float(self.longitudes[index])
+            if np.isnan(lon):
+                continue
+            if self.houses is not None:
+                house = int(self.houses[index])
+            else:
+                house = house_for_longitude(lon, cusps) if has_cusps else 1
+            speed = float(self.speeds[index])
+            planets[name] = {
+                "longitude": lon,
+                "latitude": float(self.latitudes[index]),
+                "speed": speed,
+                "sign": _sign(lon),
+                "house": house,
+                "retrograde": bool(self.retrograde[index]) if self.retrograde is not None else speed < 0,
+            }
+
+        angles = {}
+        for name, index in ANGLE_INDEX.items():
+            lon = float(self.angles[index])
+            if not np.isnan(lon):
+                angles[name] = {"longitude": lon, "sign": _sign(lon)}
+
+        chart = dict(self.metadata)
+        chart.update({
+            "planets": planets,
+            "houses": [float(cusp) for cusp in cusps] if has_cusps else [],
+            "angles": angles,
+        })
+        self._dict = chart
+        return chart
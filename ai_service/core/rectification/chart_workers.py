@@ -0,0 +1,309 @@
+"""
+Process-pool chart computation service.
+
+Chart calculation is synchronous, CPU-bound pyswisseph/flatlib work. Calling
+it from async handlers blocks the event loop for every connected client, so
+async callers submit chart jobs to a ChartWorkerPool instead and await the
+result. Each worker process sets the ephemeris path once at startup and warms
+the ephemeris files, so jobs never pay for opening them.
+
+The pool bounds the number of jobs queued or running at once. Callers beyond
+that limit wait for a slot (backpressure) and are rejected with a
+ResourceExhaustionError if none frees up within ``queue_timeout`` seconds.
+"""
+import asyncio
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from datetime import datetime
+import functools
+import glob
+import logging
+import multiprocessing
+import os
+import pickle
+import time
+from typing import Any, Callable, Dict, Optional
+
+from ai_service.core.exceptions import ResourceExhaustionError
+from .chart_cache import get_chart_cache
+from .executor import available_cpu_count
+
+logger = logging.getLogger(__name__)
+
+# Ephemeris path of the current worker process, set by init_chart_worker
+_worker_ephemeris_path: Optional[str] = None
+
+
+def resolve_ephemeris_path() -> str:
+    """
+    Return the ephemeris directory workers should use.
+
+    Prefers FLATLIB_EPHE_PATH, then the configured EPHEMERIS_PATH, and falls
+    back to the files bundled with flatlib when neither holds any .se1 files.
+    """
+    from ai_service.core.config import settings
+
+    for path in [os.environ.get("FLATLIB_EPHE_PATH"), settings.EPHEMERIS_PATH]:
+        if path and glob.glob(os.path.join(path, "*.se1")):
+            return path
+
+    import flatlib
+    return os.path.join(flatlib.PATH_RES, "swefiles")
+
+
+def init_chart_worker(ephemeris_path: str) -> None:
+    """
+    Worker process initializer: point pyswisseph at the ephemeris and warm it.
+
+    Args:
+        ephemeris_path: Directory containing the Swiss Ephemeris files
+    """
+    global _worker_ephemeris_path
+
+    # Import flatlib first: importing it resets the ephemeris path to its
+    # bundled files
+    import flatlib.ephem  # noqa: F401
+    import swisseph as swe
+
+    swe.set_ephe_path(ephemeris_path)
+    _worker_ephemeris_path = ephemeris_path
+
+    # The parent process owns the chart cache; a per-worker copy would only
+    # duplicate it
+    get_chart_cache().max_entries = 0
+
+    # Touch every body once so the ephemeris files are opened and cached
+    # before the first real job arrives
+    for body in range(swe.SUN, swe.PLUTO + 1):
+        swe.calc_ut(2451545.0, body)
+    swe.houses(2451545.0, 0.0, 0.0, b"P")
+
+    # Map the precomputed ephemeris table, if one is installed
+    from .ephemeris_table import get_ephemeris_table
+    get_ephemeris_table()
+
+
+def worker_ephemeris_path() -> Optional[str]:
+    """Return the ephemeris path set in this process by init_chart_worker."""
+    return _worker_ephemeris_path
+
+
+def _is_picklable(func: Callable[..., Any]) -> bool:
+    """Return True if the function can be sent to a worker process by reference."""
+    try:
+        pickle.dumps(func)
+        return True
+    except Exception:
+        return False
+
+
+class ChartWorkerPool:
+    """
+    Bounded process pool for chart calculations and other CPU-bound jobs.
+
+    Jobs must be module-level functions with picklable arguments. Functions
+    that cannot be pickled (e.g. mocks) run in a thread instead, which still
+    keeps them off the event loop.
+    """
+
+    def __init__(
+        self,
+        max_workers: Optional[int] = None,
+        max_queue_depth: Optional[int] = None,
+        queue_timeout: float = 30.0,
+        ephemeris_path: Optional[str] = None
+    ):
+        """
+        Initialize the pool. Worker processes start on the first submitted job.
+
+        Args:
+            max_workers: Number of worker processes; defaults to the CPUs the
+                container may use
+            max_queue_depth: Maximum jobs queued or running at once; defaults
+                to four per worker
+            queue_timeout: Seconds a job may wait for a queue slot before it
+                is rejected
+            ephemeris_path: Ephemeris directory for the workers; resolved
+                from the environment when omitted
+        """
+        self.max_workers = max_workers or available_cpu_count()
+        self.max_queue_depth = max_queue_depth or self.max_workers * 4
+        self.queue_timeout = queue_timeout
+        self.ephemeris_path = ephemeris_path
+
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._slots = asyncio.Semaphore(self.max_queue_depth)
+
+        # Backpressure metrics
+        self._submitted = 0
+        self._completed = 0
+        self._failed = 0
+        self._rejected = 0
+        self._in_flight = 0
+        self._waiting = 0
+        self._peak_in_flight = 0
+        self._total_wait_time = 0.0
+        self._max_wait_time = 0.0
+        self._total_run_time = 0.0
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        """Return the process pool, starting the workers on first use."""
+        if self._executor is None:
+            if self.ephemeris_path is None:
+                self.ephemeris_path = resolve_ephemeris_path()
+            # Spawn rather than fork: the parent runs an event loop and
+            # worker threads whose locks must not be copied into the children
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.max_workers,
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=init_chart_worker,
+                initargs=(self.ephemeris_path,)
+            )
+            logger.info(
+                f"Started chart worker pool with {self.max_workers} workers "
+                f"(queue depth {self.max_queue_depth}, ephemeris {self.ephemeris_path})"
+            )
+        return self._executor
+
+    async def submit(self, func: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+        """
+        Run a job in the pool and await its result.
+
+        Args:
+            func: Module-level function to run
+            *args: Positional arguments for the function
+            **kwargs: Keyword arguments for the function
+
+        Returns:
+            The function's return value
+
+        Raises:
+            ResourceExhaustionError: If no queue slot frees up in time
+            BrokenProcessPool: If a worker died; the pool restarts on the
+                next job
+        """
+        loop = asyncio.get_running_loop()
+        queued_at = time.perf_counter()
+
+        self._waiting += 1
+        try:
+            await asyncio.wait_for(self._slots.acquire(), timeout=self.queue_timeout)
+        except asyncio.TimeoutError:
+            self._rejected += 1
+            raise ResourceExhaustionError(
+                "Chart worker queue is full",
+                details={"max_queue_depth": self.max_queue_depth, "queue_timeout": self.queue_timeout}
+            )
+        finally:
+            self._waiting -= 1
+
+        started_at = time.perf_counter()
+        wait_time = started_at - queued_at
+        self._total_wait_time += wait_time
+        self._max_wait_time = max(self._max_wait_time, wait_time)
+        self._submitted += 1
+        self._in_flight += 1
+        self._peak_in_flight = max(self._peak_in_flight, self._in_flight)
+
+        try:
+            job = functools.partial(func, *args, **kwargs)
+            executor = self._get_executor() if _is_picklable(func) else None
+            result = await loop.run_in_executor(executor, job)
+            self._completed += 1
+            return result
+        except BrokenProcessPool:
+            self._failed += 1
+            logger.error("Chart worker process died; restarting the pool on the next job")
+            self._reset_executor()
+            raise
+        except BaseException:
+            self._failed += 1
+            raise
+        finally:
+            self._total_run_time += time.perf_counter() - started_at
+            self._in_flight -= 1
+            self._slots.release()
+
+    async def calculate_chart(
+        self,
+        birth_dt: datetime,
+        latitude: float,
+        longitude: float,
+        timezone_str: str
+    ) -> Dict[str, Any]:
+        """
+        Calculate a chart in a worker process, or serve it from the chart cache.
+
+        Args:
+            birth_dt: Birth datetime
+            latitude: Birth latitude in decimal degrees
+            longitude: Birth longitude in decimal degrees
+            timezone_str: Birth location timezone string
+
+        Returns:
+            Chart data as returned by calculate_chart
+        """
+        from . import chart_calculator
+
+        # Cache hits are served in this process; only misses reach a worker
+        chart = chart_calculator.get_cached_chart(birth_dt, latitude, longitude, timezone_str)
+        if chart is not None:
+            return chart
+
+        chart = await self.submit(chart_calculator.calculate_chart, birth_dt, latitude, longitude, timezone_str)
+        get_chart_cache().put(chart_calculator.chart_cache_key(birth_dt, latitude, longitude, timezone_str), chart)
+        return chart
+
+    def get_metrics(self) -> Dict[str, Any]:
+        """Return queue depth, throughput and backpressure metrics."""
+        finished = self._completed + self._failed
+        return {
+            "workers": self.max_workers,
+            "started": self._executor is not None,
+            "max_queue_depth": self.max_queue_depth,
+            "in_flight": self._in_flight,
+            "waiting": self._waiting,
+            "peak_in_flight": self._peak_in_flight,
+            "submitted": self._submitted,
+            "completed": self._completed,
+            "failed": self._failed,
+            "rejected": self._rejected,
+            "avg_wait_seconds": self._total_wait_time / self._submitted if self._submitted else 0.0,
+            "max_wait_seconds": self._max_wait_time,
+            "avg_run_seconds": self._total_run_time / finished if finished else 0.0,
+        }
+
+    def _reset_executor(self) -> None:
+        """Drop the current process pool so the next job starts a fresh one."""
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+    def shutdown(self) -> None:
+        """Shut down the worker processes, cancelling queued jobs."""
+        if self._executor is not None:
+            self._reset_executor()
+            logger.info("Chart worker pool shut down")
+
+
+# Shared pool instance
+_chart_worker_pool: Optional[ChartWorkerPool] = None
+
+
+def get_chart_worker_pool() -> ChartWorkerPool:
+    """Return the shared chart worker pool, creating it on first use."""
+    global _chart_worker_pool
+    if _chart_worker_pool is None:
+        _chart_worker_pool = ChartWorkerPool(
+            max_queue_depth=int(os.getenv("CHART_WORKER_QUEUE_DEPTH", "0")) or None,
+            queue_timeout=float(os.getenv("CHART_WORKER_QUEUE_TIMEOUT", "30"))
+        )
+    return _chart_worker_pool
+
+
+def shutdown_chart_worker_pool() -> None:
+    """Shut down the shared chart worker pool if it was started."""
+    global _chart_worker_pool
+    if _chart_worker_pool is not None:
+        _chart_worker_pool.shutdown()
+        _chart_worker_pool = None
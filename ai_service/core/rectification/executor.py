@@ -0,0 +1,101 @@
+"""
+Process-pool dispatch for CPU-bound rectification methods.
+
+Solar arc, progressed ascendant and transit analysis are declared ``async``
+but never await anything: they are pure ephemeris and scoring work. Running
+them on the event loop serialises them with each other and with the AI call,
+so this module dispatches them to the shared chart worker pool, which is
+sized to the CPUs the container is actually allowed to use.
+"""
+import asyncio
+from concurrent.futures.process import BrokenProcessPool
+import logging
+import math
+import os
+from typing import Any, Awaitable, Callable, Optional
+
+logger = logging.getLogger(__name__)
+
+
+def available_cpu_count() -> int:
+    """
+    Return the number of CPUs this process may use.
+
+    Honours, in order, the RECTIFICATION_WORKERS override, a cgroup CPU quota
+    (``docker --cpus`` / compose ``cpus:``), the scheduler affinity mask and
+    finally ``os.cpu_count()``.
+    """
+    override = os.getenv("RECTIFICATION_WORKERS")
+    if override:
+        try:
+            return max(1, int(override))
+        except ValueError:
+            logger.warning(f"Ignoring invalid RECTIFICATION_WORKERS value: {override}")
+
+    try:
+        count = len(os.sched_getaffinity(0))
+    except AttributeError:
+        count = os.cpu_count() or 1
+
+    quota = _cgroup_cpu_quota()
+    if quota is not None:
+        count = min(count, max(1, math.ceil(quota)))
+
+    return max(1, count)
+
+
+def _cgroup_cpu_quota() -> Optional[float]:
+    """Return the cgroup CPU quota in CPUs, or None when unlimited or unknown."""
+    try:
+        # cgroup v2: "<quota> <period>" or "max <period>"
+        with open("/sys/fs/cgroup/cpu.max") as f:
+            quota, period = f.read().split()[:2]
+        if quota != "max":
+            return int(quota) / int(period)
+        return None
+    except (OSError, ValueError):
+        pass
+
+    try:
+        # cgroup v1
+        with open("/sys/fs/cgroup/cpu/cpu.cfs_quota_us") as f:
+            quota = int(f.read())
+        with open("/sys/fs/cgroup/cpu/cpu.cfs_period_us") as f:
+            period = int(f.read())
+        if quota > 0 and period > 0:
+            return quota / period
+    except (OSError, ValueError):
+        pass
+
+    return None
+
+
+def _run_method(method: Callable[..., Awaitable[Any]], args: tuple) -> Any:
+    """Worker entry point: drive a coroutine method to completion."""
+    return asyncio.run(method(*args))
+
+
+async def run_method(method: Callable[..., Awaitable[Any]], *args: Any) -> Any:
+    """
+    Run a CPU-bound rectification method in the shared chart worker pool.
+
+    Methods that cannot be pickled (e.g. patched in tests) run on the event
+    loop instead, as does everything if the pool is broken.
+
+    Args:
+        method: Module-level coroutine function such as solar_arc_rectification
+        *args: Positional arguments for the method; must be picklable
+
+    Returns:
+        The method's result
+    """
+    from .chart_workers import _is_picklable, get_chart_worker_pool
+
+    if not _is_picklable(method):
+        return await method(*args)
+
+    try:
+        return await get_chart_worker_pool().submit(_run_method, method, args)
+    except BrokenProcessPool:
+        logger.warning(f"Chart worker pool broke while running {method.__name__}; running inline")
+        return await method(*args)
@@ -0,0 +1,677 @@
+"""
+Redis-backed rectification job queue.
+
+Rectification takes seconds to minutes, too long to hold an HTTP request
+open. API handlers enqueue a job and return its ID at once; separate worker
+processes (``python -m ai_service.core.rectification.jobs``) claim jobs from
+Redis, run them and write progress and results back to the job record, which
+clients poll.
+
+Keys, all under ``{prefix}:``:
+
+    job:{id}        hash holding the job record (status, payload, progress,
+                    result, ...)
+    queue           sorted set of ready job IDs, by priority and then age
+    delayed         sorted set of jobs waiting out a retry backoff, scored by
+                    the time they become ready
+    processing      sorted set of claimed job IDs, scored by lease deadline
+    dedup:{digest}  ID of the unfinished job with the same type and payload
+
+A claim leases the job for ``visibility_timeout`` seconds and workers renew
+the lease while the job runs. A job whose lease runs out (its worker died or
+stalled) returns to the queue until it has used all its attempts. Every
+state change is a Lua script, so concurrent workers never claim the same job
+and a worker that lost its lease cannot overwrite the new owner's record.
+The scripts touch keys they derive from job IDs, so the queue needs a
+single Redis node rather than a cluster.
+"""
+import asyncio
+import hashlib
+import json
+import logging
+import os
+import socket
+import time
+import uuid
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+from ai_service.utils.json_encoder import DateTimeEncoder
+
+logger = logging.getLogger(__name__)
+
+# Job IDs carry a prefix so status lookups can tell them from other
+# rectification IDs
+JOB_ID_PREFIX = "job_"
+
+# Priorities run from 0 (lowest) to 9 (highest)
+MIN_PRIORITY = 0
+MAX_PRIORITY = 9
+DEFAULT_PRIORITY = 5
+
+# Queue scores are priority rank * PRIORITY_SPAN + enqueue time in
+# milliseconds, so higher priorities come first and equal priorities run in
+# arrival order
+PRIORITY_SPAN = 10 ** 13
+
+# Handlers receive the job payload and a coroutine function that records
+# progress updates, and return the JSON-serializable result
+ProgressReporter = Callable[[Dict[str, Any]], Awaitable[Any]]
+JobHandler = Callable[[Dict[str, Any], ProgressReporter], Awaitable[Any]]
+
+# Lua 5.1 (Redis) has a global unpack; newer interpreters only table.unpack
+_LUA_PRELUDE = "local unpack = unpack or table.unpack\n"
+
+_ENQUEUE_SCRIPT = _LUA_PRELUDE + """
+-- KEYS: queue, dedup key, job key
+-- ARGV: job id, score, dedup ttl (0 disables dedup), job key prefix, field/value pairs
+-- A job identical to one that has not finished yet returns the pending job's ID
+if ARGV[3] ~= '0' then
+    local existing = redis.call('GET', KEYS[2])
+    if existing then
+        local status = redis.call('HGET', ARGV[4] .. existing, 'status')
+        if status == 'queued' or status == 'running' or status == 'retrying' then
+            return {existing, 0}
+        end
+    end
+    redis.call('SET', KEYS[2], ARGV[1], 'EX', ARGV[3])
+end
+redis.call('HSET', KEYS[3], unpack(ARGV, 5))
+redis.call('ZADD', KEYS[1], ARGV[2], ARGV[1])
+return {ARGV[1], 1}
+"""
+
+_CLAIM_SCRIPT = _LUA_PRELUDE + """
+-- KEYS: queue, delayed, processing
+-- ARGV: now, visibility timeout, job key prefix, token, worker, result ttl
+local now = tonumber(ARGV[1])
+local prefix = ARGV[3]
+
+local function release_dedup(key, id)
+    local dedup = redis.call('HGET', key, 'dedup_key')
+    if dedup and dedup ~= '' and redis.call('GET', dedup) == id then
+        redis.call('DEL', dedup)
+    end
+end
+
+-- Retries whose backoff has elapsed are ready again
+for _, id in ipairs(redis.call('ZRANGEBYSCORE', KEYS[2], '-inf', now)) do
+    redis.call('ZREM', KEYS[2], id)
+    local key = prefix .. id
+    redis.call('ZADD', KEYS[1], redis.call('HGET', key, 'score'), id)
+    redis.call('HSET', key, 'status', 'queued', 'updated_at', now)
+end
+
+-- Leases that ran out belong to workers that died or stalled
+for _, id in ipairs(redis.call('ZRANGEBYSCORE', KEYS[3], '-inf', now)) do
+    redis.call('ZREM', KEYS[3], id)
+    local key = prefix .. id
+    local attempts = tonumber(redis.call('HGET', key, 'attempts') or '0')
+    local max_attempts = tonumber(redis.call('HGET', key, 'max_attempts') or '1')
+    redis.call('HSET', key, 'token', '', 'error', 'Visibility timeout expired', 'updated_at', now)
+    if attempts < max_attempts then
+        redis.call('HSET', key, 'status', 'queued')
+        redis.call('ZADD', KEYS[1], redis.call('HGET', key, 'score'), id)
+    else
+        redis.call('HSET', key, 'status', 'failed', 'finished_at', now)
+        release_dedup(key, id)
+        redis.call('EXPIRE', key, ARGV[6])
+    end
+end
+
+while true do
+    local popped = redis.call('ZPOPMIN', KEYS[1])
+    if #popped == 0 then
+        return false
+    end
+    local id = popped[1]
+    local key = prefix .. id
+    -- Records can expire or be deleted while their ID is queued
+    if redis.call('EXISTS', key) == 1 then
+        redis.call('ZADD', KEYS[3], now + tonumber(ARGV[2]), id)
+        redis.call('HINCRBY', key, 'attempts', 1)
+        redis.call('HSET', key, 'status', 'running', 'token', ARGV[4], 'worker', ARGV[5],
+            'started_at', now, 'updated_at', now)
+        return id
+    end
+end
+"""
+
+_RENEW_SCRIPT = _LUA_PRELUDE + """
+-- KEYS: processing, job key
+-- ARGV: job id, token, lease deadline, now, field/value pairs
+if redis.call('HGET', KEYS[2], 'token') ~= ARGV[2] then
+    return 0
+end
+redis.call('ZADD', KEYS[1], ARGV[3], ARGV[1])
+redis.call('HSET', KEYS[2], 'updated_at', ARGV[4], unpack(ARGV, 5))
+return 1
+"""
+
+_FINISH_SCRIPT = _LUA_PRELUDE + """
+-- KEYS: processing, delayed, job key
+-- ARGV: job id, token, now, status ('completed', 'failed' or 'retrying'),
+--       retry time, result ttl, field/value pairs
+if redis.call('HGET', KEYS[3], 'token') ~= ARGV[2] then
+    return 0
+end
+redis.call('ZREM', KEYS[1], ARGV[1])
+redis.call('HSET', KEYS[3], 'status', ARGV[4], 'token', '', 'updated_at', ARGV[3], unpack(ARGV, 7))
+if ARGV[4] == 'retrying' then
+    redis.call('ZADD', KEYS[2], ARGV[5], ARGV[1])
+else
+    redis.call('HSET', KEYS[3], 'finished_at', ARGV[3])
+    local dedup = redis.call('HGET', KEYS[3], 'dedup_key')
+    if dedup and dedup ~= '' and redis.call('GET', dedup) == ARGV[1] then
+        redis.call('DEL', dedup)
+    end
+    redis.call('EXPIRE', KEYS[3], ARGV[6])
+end
+return 1
+"""
+
+
+def _flatten(fields: Dict[str, Any]) -> List[Any]:
+    """Flatten a mapping into HSET field/value arguments."""
+    args: List[Any] = []
+    for field, value in fields.items():
+        args.extend((field, value))
+    return args
+
+
+def _to_json(value: Any) -> str:
+    return json.dumps(value, cls=DateTimeEncoder, sort_keys=True)
+
+
+class Job:
+    """A job claimed by a worker."""
+
+    def __init__(
+        self,
+        job_id: str,
+        job_type: str,
+        payload: Dict[str, Any],
+        attempts: int,
+        max_attempts: int,
+        token: str
+    ):
+        self.id = job_id
+        self.type = job_type
+        self.payload = payload
+        self.attempts = attempts
+        self.max_attempts = max_attempts
+        # Proves the worker still holds the lease; changes on every claim
+        self.token = token
+
+
+class JobQueue:
+    """
+    Priority job queue stored in Redis.
+
+    Works with any redis.asyncio-compatible client created with
+    ``decode_responses=True``.
+    """
+
+    def __init__(
+        self,
+        redis_client: Any,
+        name: str = "rectification",
+        visibility_timeout: float = 300.0,
+        max_attempts: int = 3,
+        retry_backoff: float = 5.0,
+        result_ttl: int = 86400
+    ):
+        """
+        Create a queue view over a Redis connection.
+
+        Args:
+            redis_client: redis.asyncio client with decoded responses
+            name: Queue name; keys are prefixed with ``jobs:{name}``
+            visibility_timeout: Seconds a claim lasts without renewal before
+                the job is handed to another worker
+            max_attempts: Default attempts per job, counting the first
+            retry_backoff: Delay before the first retry in seconds; doubles
+                with every further attempt
+            result_ttl: Seconds finished job records are kept
+        """
+        self.redis = redis_client
+        self.name = name
+        self.visibility_timeout = visibility_timeout
+        self.max_attempts = max_attempts
+        self.retry_backoff = retry_backoff
+        self.result_ttl = int(result_ttl)
+
+        self.prefix = f"jobs:{name}"
+        self.queue_key = f"{self.prefix}:queue"
+        self.delayed_key = f"{self.prefix}:delayed"
+        self.processing_key = f"{self.prefix}:processing"
+        self.job_prefix = f"{self.prefix}:job:"
+
+        self._enqueue = redis_client.register_script(_ENQUEUE_SCRIPT)
+        self._claim = redis_client.register_script(_CLAIM_SCRIPT)
+        self._renew = redis_client.register_script(_RENEW_SCRIPT)
+        self._finish = redis_client.register_script(_FINISH_SCRIPT)
+
+    def job_key(self, job_id: str) -> str:
+        return f"{self.job_prefix}{job_id}"
+
+    def dedup_key(self, job_type: str, payload: Dict[str, Any]) -> str:
+        """Return the dedup key shared by jobs of this type with an identical payload."""
+        digest = hashlib.sha256(f"{job_type}\n{_to_json(payload)}".encode("utf-8")).hexdigest()
+        return f"{self.prefix}:dedup:{digest}"
+
+    async def enqueue(
+        self,
+        job_type: str,
+        payload: Dict[str, Any],
+        priority: int = DEFAULT_PRIORITY,
+        max_attempts: Optional[int] = None,
+        deduplicate: bool = True
+    ) -> Tuple[str, bool]:
+        """
+        Add a job to the queue.
+
+        Args:
+            job_type: Handler name the worker dispatches on
+            payload: JSON-serializable job arguments
+            priority: 0 (lowest) to 9 (highest)
+            max_attempts: Attempts for this job; defaults to the queue's
+            deduplicate: Return the ID of an unfinished job with the same type
+                and payload instead of adding a second one
+
+        Returns:
+            Tuple of (job ID, created); created is False when the job was
+            deduplicated onto an existing one
+
+        Raises:
+            ValueError: If priority is out of range
+        """
+        if not MIN_PRIORITY <= priority <= MAX_PRIORITY:
+            raise ValueError(f"Priority must be between {MIN_PRIORITY} and {MAX_PRIORITY}, got {priority}")
+
+        max_attempts = max_attempts or self.max_attempts
+        job_id = f"{JOB_ID_PREFIX}{uuid.uuid4().hex}"
+        now = time.time()
+        score = (MAX_PRIORITY - priority) * PRIORITY_SPAN + int(now * 1000)
+        dedup_key = self.dedup_key(job_type, payload) if deduplicate else ""
+        fields = {
+            "id": job_id,
+            "type": job_type,
+            "payload": _to_json(payload),
+            "status": "queued",
+            "priority": priority,
+            "score": score,
+            "attempts": 0,
+            "max_attempts": max_attempts,
+            "progress": 0,
+            "message": "Queued",
+            "dedup_key": dedup_key,
+            "created_at": now,
+            "updated_at": now,
+        }
+
+        # Dedup keys outlive any pending job; finishing a job deletes its key
+        dedup_ttl = int(self.visibility_timeout * max_attempts + self.result_ttl) if deduplicate else 0
+        existing_id, created = await self._enqueue(
+            keys=[self.queue_key, dedup_key or f"{self.prefix}:dedup:-", self.job_key(job_id)],
+            args=[job_id, score, dedup_ttl, self.job_prefix] + _flatten(fields)
+        )
+        if created:
+            logger.info(f"Enqueued {job_type} job {job_id} with priority {priority}")
+        else:
+            logger.info(f"Deduplicated {job_type} job onto pending job {existing_id}")
+        return existing_id, bool(created)
+
+    async def claim(self, worker_id: str = "") -> Optional[Job]:
+        """
+        Claim the next ready job, leasing it for the visibility timeout.
+
+        Also requeues retries whose backoff elapsed and reclaims jobs whose
+        lease ran out.
+
+        Args:
+            worker_id: Recorded on the job to show which worker runs it
+
+        Returns:
+            The claimed Job, or None when the queue is empty
+        """
+        token = uuid.uuid4().hex
+        job_id = await self._claim(
+            keys=[self.queue_key, self.delayed_key, self.processing_key],
+            args=[time.time(), self.visibility_timeout, self.job_prefix, token, worker_id, self.result_ttl]
+        )
+        if not job_id:
+            return None
+
+        record = await self.redis.hgetall(self.job_key(job_id))
+        return Job(
+            job_id,
+            record["type"],
+            json.loads(record["payload"]),
+            int(record["attempts"]),
+            int(record["max_attempts"]),
+            token
+        )
+
+    async def renew(
+        self,
+        job: Job,
+        progress: Optional[int] = None,
+        message: Optional[str] = None,
+        partial: Optional[Dict[str, Any]] = None
+    ) -> bool:
+        """
+        Extend a job's lease, optionally recording progress.
+
+        Args:
+            job: Claimed job
+            progress: Progress percentage
+            message: Progress message
+            partial: Partial result to publish with the progress
+
+        Returns:
+            bool: False if the worker no longer holds the job's lease
+        """
+        now = time.time()
+        fields: Dict[str, Any] = {}
+        if progress is not None:
+            fields["progress"] = int(progress)
+        if message is not None:
+            fields["message"] = message
+        if partial is not None:
+            fields["partial"] = _to_json(partial)
+
+        renewed = await self._renew(
+            keys=[self.processing_key, self.job_key(job.id)],
+            args=[job.id, job.token, now + self.visibility_timeout, now] + _flatten(fields)
+        )
+        return bool(renewed)
+
+    async def complete(self, job: Job, result: Any) -> bool:
+        """
+        Record a job's result and finish it.
+
+        Returns:
+            bool: False if the worker no longer holds the job's lease
+        """
+        finished = await self._finish(
+            keys=[self.processing_key, self.delayed_key, self.job_key(job.id)],
+            args=[job.id, job.token, time.time(), "completed", 0, self.result_ttl,
+                  "progress", 100, "message", "Completed", "result", _to_json(result), "error", ""]
+        )
+        if finished:
+            logger.info(f"Completed {job.type} job {job.id}")
+        return bool(finished)
+
+    async def fail(self, job: Job, error: str) -> bool:
+        """
+        Record a failed attempt, scheduling a retry while attempts remain.
+
+        Returns:
+            bool: False if the worker no longer holds the job's lease
+        """
+        now = time.time()
+        if job.attempts < job.max_attempts:
+            status = "retrying"
+            retry_at = now + self.retry_backoff * 2 ** (job.attempts - 1)
+            message = f"Attempt {job.attempts} failed; retrying"
+        else:
+            status = "failed"
+            retry_at = 0
+            message = "Failed"
+
+        finished = await self._finish(
+            keys=[self.processing_key, self.delayed_key, self.job_key(job.id)],
+            args=[job.id, job.token, now, status, retry_at, self.result_ttl, "message", message, "error", error]
+        )
+        if finished:
+            logger.warning(f"{job.type} job {job.id} attempt {job.attempts}/{job.max_attempts} failed: {error}")
+        return bool(finished)
+
+    async def get_status(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Return a job's public record.
+
+        Args:
+            job_id: Job ID
+
+        Returns:
+            Dictionary with the job's status, progress, partial result, result
+            and error, or None if the job is unknown or expired
+        """
+        record = await self.redis.hgetall(self.job_key(job_id))
+        if not record:
+            return None
+
+        def optional_float(field: str) -> Optional[float]:
+            return float(record[field]) if record.get(field) else None
+
+        return {
+            "job_id": job_id,
+            "type": record.get("type"),
+            "status": record.get("status"),
+            "priority": int(record.get("priority", DEFAULT_PRIORITY)),
+            "attempts": int(record.get("attempts", 0)),
+            "max_attempts": int(record.get("max_attempts", 0)),
+            "progress": int(record.get("progress", 0)),
+            "message": record.get("message", ""),
+            "partial": json.loads(record["partial"]) if record.get("partial") else None,
+            "result": json.loads(record["result"]) if record.get("result") else None,
+            "error": record.get("error") or None,
+            "worker": record.get("worker") or None,
+            "created_at": optional_float("created_at"),
+            "started_at": optional_float("started_at"),
+            "finished_at": optional_float("finished_at"),
+            "updated_at": optional_float("updated_at"),
+        }
+
+    async def stats(self) -> Dict[str, int]:
+        """Return the number of queued, delayed and running jobs."""
+        async with self.redis.pipeline(transaction=False) as pipe:
+            pipe.zcard(self.queue_key)
+            pipe.zcard(self.delayed_key)
+            pipe.zcard(self.processing_key)
+            queued, delayed, running = await pipe.execute()
+        return {"queued": queued, "retrying": delayed, "running": running}
+
+
+class JobWorker:
+    """
+    Claims jobs from a queue and runs them with registered handlers.
+
+    While a job runs the worker renews its lease every third of the
+    visibility timeout. If renewal fails another worker owns the job, so the
+    handler is cancelled and its result discarded.
+    """
+
+    def __init__(
+        self,
+        queue: JobQueue,
+        handlers: Dict[str, JobHandler],
+        concurrency: int = 1,
+        poll_interval: float = 1.0,
+        worker_id: Optional[str] = None
+    ):
+        """
+        Args:
+            queue: Queue to claim from
+            handlers: Coroutine functions keyed by job type
+            concurrency: Jobs run at the same time
+            poll_interval: Seconds to wait when the queue is empty
+            worker_id: Name recorded on claimed jobs; defaults to host:pid
+        """
+        self.queue = queue
+        self.handlers = handlers
+        self.concurrency = max(1, concurrency)
+        self.poll_interval = poll_interval
+        self.worker_id = worker_id or f"{socket.gethostname()}:{os.getpid()}"
+
+    async def run(self, stop_event: Optional[asyncio.Event] = None) -> None:
+        """
+        Process jobs until stop_event is set; running jobs are finished first.
+
+        Args:
+            stop_event: Event that stops the worker; runs forever if None
+        """
+        stop_event = stop_event or asyncio.Event()
+        logger.info(f"Worker {self.worker_id} processing '{self.queue.name}' jobs with concurrency {self.concurrency}")
+
+        async def loop() -> None:
+            while not stop_event.is_set():
+                try:
+                    processed = await self.run_once()
+                except Exception as e:
+                    logger.error(f"Worker {self.worker_id} could not claim a job: {e}")
+                    processed = False
+                if not processed:
+                    try:
+                        await asyncio.wait_for(stop_event.wait(), self.poll_interval)
+                    except asyncio.TimeoutError:
+                        pass
+
+        await asyncio.gather(*(loop() for _ in range(self.concurrency)))
+
+    async def run_once(self) -> bool:
+        """
+        Claim and run one job.
+
+        Returns:
+            bool: True if a job was claimed
+        """
+        job = await self.queue.claim(self.worker_id)
+        if job is None:
+            return False
+        await self.process(job)
+        return True
+
+    async def process(self, job: Job) -> None:
+        """Run a claimed job and record its outcome."""
+        handler = self.handlers.get(job.type)
+        if handler is None:
+            await self.queue.fail(job, f"No handler for job type '{job.type}'")
+            return
+
+        async def report_progress(update: Dict[str, Any]) -> None:
+            partial = {key: value for key, value in update.items() if key not in ("status", "progress", "message")}
+            await self.queue.renew(job, update.get("progress"), update.get("message"), partial or None)
+
+        logger.info(f"Worker {self.worker_id} running {job.type} job {job.id} (attempt {job.attempts}/{job.max_attempts})")
+        task = asyncio.ensure_future(handler(job.payload, report_progress))
+        lease_lost = False
+
+        async def keep_lease() -> None:
+            nonlocal lease_lost
+            while True:
+                await asyncio.sleep(self.queue.visibility_timeout / 3)
+                if not await self.queue.renew(job):
+                    lease_lost = True
+                    task.cancel()
+                    return
+
+        heartbeat = asyncio.ensure_future(keep_lease())
+        try:
+            result = await task
+        except asyncio.CancelledError:
+            if not lease_lost:
+                raise
+            logger.warning(f"Worker {self.worker_id} lost the lease on job {job.id}; abandoning it")
+            return
+        except Exception as e:
+            logger.error(f"{job.type} job {job.id} raised: {e}", exc_info=True)
+            await self.queue.fail(job, str(e))
+            return
+        finally:
+            heartbeat.cancel()
+
+        if not await self.queue.complete(job, result):
+            logger.warning(f"Worker {self.worker_id} finished job {job.id} after losing its lease; result discarded")
+
+
+async def run_rectification_job(payload: Dict[str, Any], report_progress: ProgressReporter) -> Dict[str, Any]:
+    """
+    Run a comprehensive rectification from a queued job.
+
+    Args:
+        payload: birth_date (YYYY-MM-DD), birth_time (HH:MM[:SS]), latitude,
+            longitude, timezone, answers and optional chart_id
+        report_progress: Records progress updates on the job
+
+    Returns:
+        The rectification result as plain JSON
+    """
+    from datetime import datetime
+
+    from .main import comprehensive_rectification
+
+    birth_time = payload["birth_time"]
+    time_format = "%H:%M:%S" if birth_time.count(":") == 2 else "%H:%M"
+    birth_dt = datetime.strptime(f"{payload['birth_date']} {birth_time}", f"%Y-%m-%d {time_format}")
+
+    result = await comprehensive_rectification(
+        birth_dt,
+        float(payload["latitude"]),
+        float(payload["longitude"]),
+        payload["timezone"],
+        payload.get("answers") or [],
+        chart_id=payload.get("chart_id"),
+        progress_callback=report_progress
+    )
+    return json.loads(_to_json(result))
+
+
+# Handlers run by the rectification worker
+RECTIFICATION_HANDLERS: Dict[str, JobHandler] = {
+    "rectification": run_rectification_job,
+}
+
+# Shared queue, created on first use
+_job_queue: Optional[JobQueue] = None
+
+
+def get_job_queue() -> JobQueue:
+    """Return the shared rectification queue on REDIS_URL, configured from the environment."""
+    global _job_queue
+    if _job_queue is None:
+        import redis.asyncio as redis_asyncio
+        from ai_service.core.config import settings
+
+        client = redis_asyncio.Redis.from_url(
+            os.getenv("JOB_QUEUE_REDIS_URL", settings.REDIS_URL),
+            decode_responses=True,
+            socket_timeout=5.0,
+            socket_connect_timeout=3.0,
+            health_check_interval=30
+        )
+        _job_queue = JobQueue(
+            client,
+            visibility_timeout=float(os.getenv("JOB_VISIBILITY_TIMEOUT", "300")),
+            max_attempts=int(os.getenv("JOB_MAX_ATTEMPTS", "3")),
+            retry_backoff=float(os.getenv("JOB_RETRY_BACKOFF", "5")),
+            result_ttl=int(os.getenv("JOB_RESULT_TTL", "86400"))
+        )
+    return _job_queue
+
+
+async def run_worker() -> None:
+    """Run a rectification worker until SIGINT or SIGTERM."""
+    import signal
+
+    stop_event = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        try:
+            loop.add_signal_handler(sig, stop_event.set)
+        except NotImplementedError:
+            pass
+
+    worker = JobWorker(
+        get_job_queue(),
+        RECTIFICATION_HANDLERS,
+        concurrency=int(os.getenv("JOB_WORKER_CONCURRENCY", "2")),
+        poll_interval=float(os.getenv("JOB_POLL_INTERVAL", "1"))
+    )
+    await worker.run(stop_event)
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=os.getenv("LOG_LEVEL", "INFO"), format="%(asctime)s %(name)s %(levelname)s %(message)s")
+    asyncio.run(run_worker())
@@ -1,11 +1,12 @@
 """
 Main coordination module for birth time rectification.
 """
+import asyncio
 from datetime import datetime
 import logging
 import json
 import uuid
-from typing import List, Dict, Any, Tuple, Optional, Union
+from typing import AsyncIterator, Awaitable, Callable, List, Dict, Any, Tuple, Optional, Union
 import traceback
 import re
 import os
@@ -14,12 +15,15 @@ from pathlib import Path
 # Import sub-modules
 from .event_analysis import extract_life_events_from_answers
 from .chart_calculator import calculate_chart
+from .chart_workers import get_chart_worker_pool
 from .methods.ai_rectification import ai_assisted_rectification
 from .methods.solar_arc import solar_arc_rectification
 from .methods.progressed import progressed_ascendant_rectification
 from .methods.transit_analysis import analyze_life_events
+from .executor import run_method
 from .utils.ephemeris import verify_ephemeris_files as verify_ephemeris_files_util
 from .utils.storage import store_rectified_chart
+from ai_service.utils.json_encoder import DateTimeEncoder
 
 logger = logging.getLogger(__name__)
 
@@ -46,15 +50,86 @@ async def verify_ephemeris_files() -> bool:
 
     return True
 
-async def rectify_birth_time(
+# Receives every progress update of a rectification run
+ProgressCallback = Callable[[Dict[str, Any]], Awaitable[Any]]
+
+# Methods combined by rectify_birth_time, in tie-breaking order
+COMBINED_METHODS = ("ai_rectification", "solar_arc", "progressed", "transit")
+
+def _combine_method_results(
+    birth_dt: datetime,
+    results: Dict[str, Tuple[Optional[datetime], float]]
+) -> Optional[Tuple[datetime, float]]:
+    """
+    Combine method results into one birth time, weighted by confidence.
+
+    Args:
+        birth_dt: Original birth datetime
+        results: ``{method: (rectified datetime, confidence)}`` of the methods
+            that finished so far
+
+    Returns:
+        Tuple of (rectified datetime, confidence), or None if no method
+        produced a usable time
+    """
+    candidates = [
+        (results[method][0], results[method][1], method)
+        for method in COMBINED_METHODS
+        if method in results and results[method][0] and results[method][1] > 0
+    ]
+    if not candidates:
+        return None
+
+    # Sort by confidence (descending)
+    candidates.sort(key=lambda x: x[1], reverse=True)
+
+    # If only one method succeeded, return its result
+    if len(candidates) == 1:
+        return candidates[0][0], candidates[0][1]
+
+    # Calculate weighted average time
+    total_confidence = sum(c[1] for c in candidates)
+    weights = [c[1]/total_confidence for c in candidates]
+
+    # Convert times to minutes since midnight
+    time_minutes = []
+
+    for candidate in candidates:
+        cand_time = candidate[0]
+        minutes = (cand_time.hour * 60) + cand_time.minute
+        time_minutes.append(minutes)
+
+    # Calculate weighted average minutes
+    weighted_minutes = sum(minutes * weight for minutes, weight in zip(time_minutes, weights))
+    weighted_minutes = round(weighted_minutes)
+
+    # Convert back to hours and minutes
+    hours = weighted_minutes // 60
+    minutes = weighted_minutes % 60
+
+    # Create final datetime
+    final_time = birth_dt.replace(hour=hours, minute=minutes, second=0, microsecond=0)
+
+    # Final confidence is weighted average of individual confidences
+    final_confidence = sum(c[1] * w for c, w in zip(candidates, weights))
+
+    return final_time, final_confidence
+
+async def stream_rectification(
     birth_dt: datetime,
     latitude: float,
     longitude: float,
     timezone: str,
     answers: Optional[List[Dict[str, Any]]] = None
-) -> Tuple[datetime, float]:
+) -> AsyncIterator[Dict[str, Any]]:
     """
-    Rectify birth time based on questionnaire answers using real astrological calculations.
+    Rectify birth time, yielding an update as soon as each method finishes.
+
+    All methods run concurrently; the AI call overlaps with the CPU-bound
+    methods, which run in the process pool. Every update carries the best
+    candidate so far (the confidence-weighted combination of the finished
+    methods) and the trend of its confidence, so callers can show useful
+    output while the slower sweeps are still running.
 
     Args:
         birth_dt: Original birth datetime
@@ -63,8 +138,12 @@ async def rectify_birth_time(
         timezone: Timezone string (e.g., 'Asia/Kolkata')
         answers: List of questionnaire answers, each as a dictionary
 
-    Returns:
-        Tuple containing (rectified_datetime, confidence_score)
+    Yields:
+        Update dicts with "stage", "status", "progress" (0-100) and
+        "message". The "started" update lists the methods; one
+        "method_completed" update follows per method with its result; the
+        last update has stage "completed" with the final "rectified_time",
+        "confidence" and per-method "method_results".
     """
     logger.info(f"Rectifying birth time for {birth_dt} at {latitude}, {longitude}")
 
@@ -73,9 +152,9 @@ async def rectify_birth_time(
     if not verified:
         raise ValueError("Failed to verify ephemeris files")
 
-    # Try multiple approaches and combine results
     methods_attempted = []
     methods_succeeded = []
+    tasks: Dict[asyncio.Task, str] = {}
 
     # Get the OpenAI service for AI-assisted rectification
     try:
@@ -85,118 +164,214 @@ async def rectify_birth_time(
 
         if openai_service:
             methods_attempted.append("ai_rectification")
-            ai_time, ai_confidence = await ai_assisted_rectification(
+            tasks[asyncio.ensure_future(ai_assisted_rectification(
                 birth_dt, latitude, longitude, timezone, openai_service
-            )
-            methods_succeeded.append("ai_rectification")
-
-            # Return result directly if confidence is high
-            if ai_confidence >= 85:
-                return ai_time, ai_confidence
-
+            ))] = "ai_rectification"
         else:
             logger.warning("OpenAI service not available for AI-assisted rectification")
             # Continue with other methods
-            ai_time, ai_confidence = None, 0
 
     except Exception as e:
         logger.warning(f"AI-assisted rectification failed: {e}")
-        ai_time, ai_confidence = None, 0
 
-    # Try solar arc rectification
-    try:
-        methods_attempted.append("solar_arc")
-        solar_arc_time, solar_arc_confidence = await solar_arc_rectification(
-            birth_dt, latitude, longitude, timezone
-        )
-        methods_succeeded.append("solar_arc")
-    except Exception as e:
-        logger.warning(f"Solar arc rectification failed: {e}")
-        solar_arc_time, solar_arc_confidence = None, 0
+    methods_attempted.append("solar_arc")
+    tasks[asyncio.ensure_future(run_method(
+        solar_arc_rectification, birth_dt, latitude, longitude, timezone
+    ))] = "solar_arc"
 
-    # Try progressed ascendant rectification
-    try:
-        methods_attempted.append("progressed")
-        progressed_time, progressed_confidence = await progressed_ascendant_rectification(
-            birth_dt, latitude, longitude, timezone
-        )
-        methods_succeeded.append("progressed")
-    except Exception as e:
-        logger.warning(f"Progressed ascendant rectification failed: {e}")
-        progressed_time, progressed_confidence = None, 0
+    methods_attempted.append("progressed")
+    tasks[asyncio.ensure_future(run_method(
+        progressed_ascendant_rectification, birth_dt, latitude, longitude, timezone
+    ))] = "progressed"
 
     # If answers were provided, extract life events and try transit analysis
-    transit_time, transit_confidence = None, 0
     if answers:
         try:
             events = extract_life_events_from_answers(answers)
             if events and len(events) > 0:
                 methods_attempted.append("transit")
-                transit_time, transit_confidence = await analyze_life_events(
-                    events, birth_dt, latitude, longitude, timezone
-                )
-                methods_succeeded.append("transit")
+                tasks[asyncio.ensure_future(run_method(
+                    analyze_life_events, events, birth_dt, latitude, longitude, timezone
+                ))] = "transit"
         except Exception as e:
             logger.warning(f"Transit analysis failed: {e}")
 
-    # No methods succeeded, return original time with low confidence
-    if not methods_succeeded:
-        logger.warning("No rectification methods succeeded")
-        return birth_dt, 50.0
-
-    # Combine results from different methods, weighted by confidence
-    candidates = []
-
-    if ai_time and ai_confidence > 0:
-        candidates.append((ai_time, ai_confidence, "ai"))
-
-    if solar_arc_time and solar_arc_confidence > 0:
-        candidates.append((solar_arc_time, solar_arc_confidence, "solar_arc"))
-
-    if progressed_time and progressed_confidence > 0:
-        candidates.append((progressed_time, progressed_confidence, "progressed"))
-
-    if transit_time and transit_confidence > 0:
-        candidates.append((transit_time, transit_confidence, "transit"))
-
-    # Sort by confidence (descending)
-    candidates.sort(key=lambda x: x[1], reverse=True)
-
-    # If only one method succeeded, return its result
-    if len(candidates) == 1:
-        return candidates[0][0], candidates[0][1]
+    results: Dict[str, Tuple[Optional[datetime], float]] = {}
+    confidence_trend: List[float] = []
+    best: Optional[Tuple[datetime, float]] = None
+    pending = set(tasks)
+    try:
+        yield {
+            "stage": "started",
+            "status": "started",
+            "progress": 0,
+            "message": f"Running {len(methods_attempted)} rectification methods",
+            "methods": list(methods_attempted),
+        }
 
-    # Calculate weighted average time
-    total_confidence = sum(c[1] for c in candidates)
-    weights = [c[1]/total_confidence for c in candidates]
+        while pending:
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            finished = []
+            for task in done:
+                method = tasks[task]
+                try:
+                    results[method] = task.result()
+                    methods_succeeded.append(method)
+                except Exception as e:
+                    logger.warning(f"{method} rectification failed: {e}")
+                    results[method] = (None, 0)
+                finished.append(method)
+
+            # A high-confidence AI result is final
+            ai_time, ai_confidence = results.get("ai_rectification", (None, 0))
+            decisive = bool(ai_time and ai_confidence >= 85)
+            best = (ai_time, ai_confidence) if decisive else _combine_method_results(birth_dt, results)
+            if best:
+                confidence_trend.append(round(best[1], 1))
+
+            for method in finished:
+                method_time, method_confidence = results[method]
+                yield {
+                    "stage": "method_completed",
+                    "status": "processing",
+                    "progress": min(95, round(100 * len(results) / len(tasks))),
+                    "message": f"{method} rectification {'completed' if method in methods_succeeded else 'failed'}",
+                    "method": method,
+                    "method_result": {
+                        "succeeded": method in methods_succeeded,
+                        "rectified_time": method_time,
+                        "confidence": method_confidence,
+                    },
+                    "best_candidate": {"rectified_time": best[0], "confidence": best[1]} if best else None,
+                    "confidence_trend": list(confidence_trend),
+                }
 
-    # Convert times to minutes since midnight
-    midnight = birth_dt.replace(hour=0, minute=0, second=0, microsecond=0)
-    time_minutes = []
+            if decisive:
+                break
+    finally:
+        # Cancel whatever is still running; methods already executing in a
+        # worker process finish there but their results are discarded
+        for task in pending:
+            task.cancel()
 
-    for candidate in candidates:
-        cand_time = candidate[0]
-        minutes = (cand_time.hour * 60) + cand_time.minute
-        time_minutes.append(minutes)
+    if not methods_succeeded:
+        # No methods succeeded, return original time with low confidence
+        logger.warning("No rectification methods succeeded")
+        final_time, final_confidence = birth_dt, 50.0
+    elif best is None:
+        logger.warning("No rectification method produced a usable time")
+        final_time, final_confidence = birth_dt, 50.0
+    else:
+        final_time, final_confidence = best
+        logger.info(f"Rectification complete: {final_time}, confidence: {final_confidence:.1f}")
+        logger.info(f"Methods used: {', '.join(methods_succeeded)}")
+
+    yield {
+        "stage": "completed",
+        "status": "completed",
+        "progress": 100,
+        "message": "Rectification completed",
+        "rectified_time": final_time,
+        "confidence": final_confidence,
+        "methods_succeeded": list(methods_succeeded),
+        "method_results": {method: results[method] for method in methods_succeeded},
+        "confidence_trend": list(confidence_trend),
+    }
 
-    # Calculate weighted average minutes
-    weighted_minutes = sum(minutes * weight for minutes, weight in zip(time_minutes, weights))
-    weighted_minutes = round(weighted_minutes)
+def _scale_update(update: Dict[str, Any], progress_range: Tuple[int, int]) -> Dict[str, Any]:
+    """Map an update's 0-100 progress into progress_range, for pipelines that run further steps afterwards."""
+    low, high = progress_range
+    scaled = dict(update, progress=low + round((high - low) * update["progress"] / 100))
+    if scaled["status"] == "completed" and high < 100:
+        scaled["status"] = "processing"
+    return scaled
+
+async def publish_rectification_update(
+    session_id: str,
+    chart_id: Optional[str],
+    update: Dict[str, Any]
+) -> bool:
+    """
+    Send a rectification update to the session's WebSocket.
 
-    # Convert back to hours and minutes
-    hours = weighted_minutes // 60
-    minutes = weighted_minutes % 60
+    Args:
+        session_id: Session whose WebSocket receives the update
+        chart_id: Chart being rectified
+        update: Update from stream_rectification
 
-    # Create final datetime
-    final_time = birth_dt.replace(hour=hours, minute=minutes, second=0, microsecond=0)
+    Returns:
+        bool: True if the update was sent
+    """
+    # Import here to keep the core package free of API imports at load time
+    from ai_service.api.websocket_events import emit_rectification_progress
+
+    # The WebSocket payload must be plain JSON
+    result = json.loads(json.dumps(
+        {key: value for key, value in update.items() if key not in ("status", "progress", "message")},
+        cls=DateTimeEncoder
+    ))
+    return await emit_rectification_progress(
+        session_id,
+        update["progress"],
+        update["message"],
+        chart_id or "",
+        update["status"],
+        result
+    )
+
+async def _collect_rectification(
+    birth_dt: datetime,
+    latitude: float,
+    longitude: float,
+    timezone: str,
+    answers: Optional[List[Dict[str, Any]]] = None,
+    session_id: Optional[str] = None,
+    chart_id: Optional[str] = None,
+    progress_range: Tuple[int, int] = (0, 100),
+    progress_callback: Optional[ProgressCallback] = None
+) -> Dict[str, Any]:
+    """Run stream_rectification to the end, publishing updates; return the final update."""
+    final: Dict[str, Any] = {}
+    async for update in stream_rectification(birth_dt, latitude, longitude, timezone, answers):
+        if session_id or progress_callback:
+            scaled = _scale_update(update, progress_range)
+            if session_id:
+                await publish_rectification_update(session_id, chart_id, scaled)
+            if progress_callback:
+                await progress_callback(scaled)
+        if update["stage"] == "completed":
+            final = update
+    return final
 
-    # Final confidence is weighted average of individual confidences
-    final_confidence = sum(c[1] * w for c, w in zip(candidates, weights))
+async def rectify_birth_time(
+    birth_dt: datetime,
+    latitude: float,
+    longitude: float,
+    timezone: str,
+    answers: Optional[List[Dict[str, Any]]] = None,
+    session_id: Optional[str] = None,
+    chart_id: Optional[str] = None
+) -> Tuple[datetime, float]:
+    """
+    Rectify birth time based on questionnaire answers using real astrological calculations.
 
-    logger.info(f"Rectification complete: {final_time}, confidence: {final_confidence:.1f}")
-    logger.info(f"Methods used: {', '.join(methods_succeeded)}")
+    Args:
+        birth_dt: Original birth datetime
+        latitude: Birth latitude in decimal degrees
+        longitude: Birth longitude in decimal degrees
+        timezone: Timezone string (e.g., 'Asia/Kolkata')
+        answers: List of questionnaire answers, each as a dictionary
+        session_id: Optional session to stream progress updates to over its
+            WebSocket
+        chart_id: Optional chart ID included in progress updates
 
-    return final_time, final_confidence
+    Returns:
+        Tuple containing (rectified_datetime, confidence_score)
+    """
+    final = await _collect_rectification(
+        birth_dt, latitude, longitude, timezone, answers, session_id=session_id, chart_id=chart_id
+    )
+    return final["rectified_time"], final["confidence"]
 
 async def comprehensive_rectification(
     birth_dt: datetime,
@@ -205,7 +380,9 @@ async def comprehensive_rectification(
     timezone: str,
     answers: List[Dict[str, Any]],
     events: Optional[List[Dict[str, Any]]] = None,
-    chart_id: Optional[str] = None
+    chart_id: Optional[str] = None,
+    session_id: Optional[str] = None,
+    progress_callback: Optional[ProgressCallback] = None
 ) -> Dict[str, Any]:
     """
     Perform comprehensive birth time rectification using multiple methods.
@@ -218,6 +395,10 @@ async def comprehensive_rectification(
         answers: Questionnaire answers
         events: Life events (optional, will be extracted from answers if not provided)
         chart_id: Optional chart ID to associate with this rectification
+        session_id: Optional session to stream progress and partial results
+            to over its WebSocket
+        progress_callback: Optional coroutine function awaited with every
+            progress update, e.g. to record a queued job's progress
 
     Returns:
         Dictionary with rectification results
@@ -273,6 +454,7 @@ async def comprehensive_rectification(
     # Continue with the normal rectification process
 
     # Extract life events from answers if not provided
+    events_provided = bool(events)
     if not events:
         events = extract_life_events_from_answers(answers)
 
@@ -285,6 +467,14 @@ async def comprehensive_rectification(
     methods_attempted = []
     methods_succeeded = []
 
+    # Start the multi-method rectification now, so its partial results reach
+    # the client while the AI analysis below is still waiting on OpenAI
+    questionnaire_task = asyncio.ensure_future(_collect_rectification(
+        birth_dt, latitude, longitude, timezone, answers,
+        session_id=session_id, chart_id=chart_id, progress_range=(0, 90),
+        progress_callback=progress_callback
+    ))
+
     # Try to use OpenAI for advanced analysis
     ai_rectification_result = None
     try:
@@ -473,11 +663,12 @@ async def comprehensive_rectification(
     # Perform additional rectification using questionnaire answers for more comprehensive analysis
     basic_time = None
     basic_confidence = 0
+    method_results: Dict[str, Tuple[Optional[datetime], float]] = {}
     try:
         methods_attempted.append("questionnaire_analysis")
-        basic_time, basic_confidence = await rectify_birth_time(
-            birth_dt, latitude, longitude, timezone, answers
-        )
+        questionnaire = await questionnaire_task
+        basic_time, basic_confidence = questionnaire["rectified_time"], questionnaire["confidence"]
+        method_results = questionnaire["method_results"]
         logger.info(f"Questionnaire-based rectification successful: {basic_time}, confidence: {basic_confidence}")
         methods_succeeded.append("questionnaire_analysis")
     except Exception as e:
@@ -491,10 +682,14 @@ async def comprehensive_rectification(
     if events and len(events) > 0:
         try:
             methods_attempted.append("transit_analysis")
-            # Perform transit-based rectification
-            transit_time, transit_confidence = await analyze_life_events(
-                events, birth_dt, latitude, longitude, timezone
-            )
+            # Perform transit-based rectification, unless the questionnaire
+            # analysis already ran it on the same events
+            if "transit" in method_results and not events_provided:
+                transit_time, transit_confidence = method_results["transit"]
+            else:
+                transit_time, transit_confidence = await analyze_life_events(
+                    events, birth_dt, latitude, longitude, timezone
+                )
             logger.info(f"Transit analysis successful: {transit_time}, confidence: {transit_confidence}")
             methods_succeeded.append("transit_analysis")
         except Exception as e:
@@ -508,9 +703,12 @@ async def comprehensive_rectification(
 
     try:
         methods_attempted.append("solar_arc_analysis")
-        solar_arc_time, solar_arc_confidence = await solar_arc_rectification(
-            birth_dt, latitude, longitude, timezone
-        )
+        if "solar_arc" in method_results:
+            solar_arc_time, solar_arc_confidence = method_results["solar_arc"]
+        else:
+            solar_arc_time, solar_arc_confidence = await solar_arc_rectification(
+                birth_dt, latitude, longitude, timezone
+            )
         logger.info(f"Solar arc rectification: {solar_arc_time}, confidence: {solar_arc_confidence}")
         methods_succeeded.append("solar_arc_analysis")
     except Exception as e:
@@ -642,7 +840,7 @@ async def comprehensive_rectification(
     rectified_chart_id = None
     try:
         # Calculate chart with the rectified time
-        chart_data = calculate_chart(rectified_time, latitude, longitude, timezone)
+        chart_data = await get_chart_worker_pool().calculate_chart(rectified_time, latitude, longitude, timezone)
 
         # Format chart data for storage
         formatted_chart_data = {
@@ -729,4 +927,19 @@ async def comprehensive_rectification(
     if result.get('confidence') is None:
         result['confidence'] = 75.0  # Default confidence
 
+    completed = {
+        "stage": "completed",
+        "status": "completed",
+        "progress": 100,
+        "message": "Comprehensive rectification completed",
+        "rectified_time": result["rectified_time"],
+        "confidence": result["confidence"],
+        "methods_used": methods_used,
+        "rectified_chart_id": rectified_chart_id,
+    }
+    if session_id:
+        await publish_rectification_update(session_id, chart_id, completed)
+    if progress_callback:
+        await progress_callback(completed)
+
     return result
@@ -8,8 +8,21 @@ import re
 import uuid
 from typing import Any, Tuple, Dict, Optional, List
 
+import numpy as np
+
+from ..aspects import AspectSet
+
 logger = logging.getLogger(__name__)
 
+# Major aspects listed in the chart summary sent to the model
+AI_CHART_ASPECTS = AspectSet([
+    ("conjunction", 10, 1),
+    ("opposition", 10, 1),
+    ("square", 5, 1),
+    ("trine", 5, 1),
+    ("sextile", 5, 1),
+], inclusive=True)
+
 async def ai_assisted_rectification(
     birth_dt: datetime,
     latitude: float,
@@ -41,12 +54,12 @@ async def ai_assisted_rectification(
         raise ValueError("OpenAI service is required for AI-assisted rectification")
 
     # Import chart calculator here to avoid circular imports
-    from ..chart_calculator import calculate_chart
+    from ..chart_workers import get_chart_worker_pool
     from ..constants import PLANETS_LIST
     from flatlib import const  # We need this for angle constants
 
     # Calculate the natal chart using real astrological library
-    chart = calculate_chart(birth_dt, latitude, longitude, timezone)
+    chart = await get_chart_worker_pool().calculate_chart(birth_dt, latitude, longitude, timezone)
     if not chart:
         raise ValueError("Failed to calculate astrological chart for AI analysis")
 
@@ -154,66 +167,20 @@ async def ai_assisted_rectification(
     # Calculate and add major aspects
     chart_data["aspects"] = []
     planet_list = PLANETS_LIST
-    for i, p1 in enumerate(planet_list):
-        for p2 in planet_list[i+1:]:
-            try:
-                p1_key = p1.lower()
-                p2_key = p2.lower()
-
-                if "planets" in chart and p1_key in chart["planets"] and p2_key in chart["planets"]:
-                    planet1_data = chart["planets"][p1_key]
-                    planet2_data = chart["planets"][p2_key]
-
-                    # Calculate orb (difference in degrees)
-                    if "longitude" in planet1_data and "longitude" in planet2_data:
-                        diff = abs(planet1_data["longitude"] - planet2_data["longitude"]) % 360
-                        if diff > 180:
-                            diff = 360 - diff
-
-                        # Determine aspect type based on angle
-                        aspect_type = None
-                        if 0 <= diff < 10:  # Conjunction
-                            aspect_type = "conjunction"
-                            max_orb = 10
-                        elif 170 <= diff <= 180:  # Opposition
-                            aspect_type = "opposition"
-                            max_orb = 10
-                        elif 85 <= diff <= 95:  # Square
-                            aspect_type = "square"
-                            max_orb = 8
-                        elif 115 <= diff <= 125:  # Trine
-                            aspect_type = "trine"
-                            max_orb = 8
-                        elif 55 <= diff <= 65:  # Sextile
-                            aspect_type = "sextile"
-                            max_orb = 6
-
-                        if aspect_type:
-                            # Calculate orb from exact aspect
-                            if aspect_type == "conjunction":
-                                orb = float(diff)
-                            elif aspect_type == "opposition":
-                                orb = float(abs(diff - 180))
-                            elif aspect_type == "square":
-                                orb = float(abs(diff - 90))
-                            elif aspect_type == "trine":
-                                orb = float(abs(diff - 120))
-                            elif aspect_type == "sextile":
-                                orb = float(abs(diff - 60))
-
-                            # Ensure types are correct before comparison
-                            orb_float = float(orb)
-                            max_orb_float = float(max_orb)
-                            if orb_float <= max_orb_float:
-                                chart_data["aspects"].append({
-                                    "planet1": p1,
-                                    "planet2": p2,
-                                    "type": aspect_type,
-                                    "orb": orb
-                                })
-            except Exception as e:
-                logger.error(f"Error calculating aspect between {p1} and {p2}: {e}")
-                # Continue with other aspects
+    planets = chart.get("planets") or {}
+    planet_longitudes = np.array([
+        planets.get(planet.lower(), {}).get("longitude", np.nan) for planet in planet_list
+    ], dtype=np.float64)
+
+    for (i, j), aspect_type, orb in AI_CHART_ASPECTS.matrix(planet_longitudes, planet_longitudes).pairs():
+        # Each pair once
+        if i < j:
+            chart_data["aspects"].append({
+                "planet1": planet_list[i],
+                "planet2": planet_list[j],
+                "type": aspect_type,
+                "orb": orb
+            })
 
     # Create a comprehensive astrological prompt for the AI
     prompt = f"""
@@ -5,13 +5,31 @@ import logging
 from datetime import datetime, timedelta
 from typing import Tuple, Dict, Any, List, Optional
 
+import numpy as np
+
+from ..aspects import AspectSet
+from ..search import SearchStrategy
+
 logger = logging.getLogger(__name__)
 
+# Planets directed to the natal angles
+SOLAR_ARC_PLANETS = ['sun', 'moon', 'mercury', 'venus', 'mars', 'jupiter', 'saturn']
+
+# Aspects between directed planets and angles (3 degree orb)
+SOLAR_ARC_ASPECTS = AspectSet([
+    ("conjunction", 3, 10),
+    ("sextile", 3, 6),
+    ("square", 3, 8),
+    ("trine", 3, 8),
+    ("opposition", 3, 10),
+])
+
 async def solar_arc_rectification(
     birth_dt: datetime,
     latitude: float,
     longitude: float,
-    timezone: str
+    timezone: str,
+    search: Optional[SearchStrategy] = None
 ) -> Tuple[datetime, float]:
     """
     Perform solar arc-based birth time rectification.
@@ -21,109 +39,33 @@ async def solar_arc_rectification(
         latitude: Birth latitude in decimal degrees
         longitude: Birth longitude in decimal degrees
         timezone: Timezone string
+        search: Candidate search strategy (defaults to an adaptive search)
 
     Returns:
         Tuple of (rectified_datetime, confidence_score)
     """
-    from ..chart_calculator import calculate_chart
+    from ..batch_ephemeris import calculate_candidate_batch
+    from ..search import angle_sign_boundary, default_search_strategy
 
     logger.info("Using solar arc directions for rectification")
 
-    # Define test times to check (within 2 hours before and after the given time)
-    test_times = []
-
-    # Check every 15 minutes within a 4-hour window
-    for minutes in range(-120, 121, 15):
-        test_time = birth_dt + timedelta(minutes=minutes)
-        test_times.append(test_time)
-
-    # Track the best score and corresponding time
-    best_score = 0
-    best_time = birth_dt
-
-    # Evaluate each test time
-    for test_time in test_times:
-        try:
-            # Calculate chart for this test time
-            chart_data = calculate_chart(test_time, latitude, longitude, timezone)
-
-            # Skip if chart calculation failed
-            if not chart_data:
-                continue
-
-            # Calculate score based on solar arc aspects
-            score = 0
-
-            # Check for important solar arc directional aspects
-            try:
-                # Get the ascendant and midheaven longitudes
-                ascendant_lon = None
-                midheaven_lon = None
-
-                if "angles" in chart_data:
-                    if "asc" in chart_data["angles"]:
-                        ascendant_lon = chart_data["angles"]["asc"].get("longitude")
-                    if "mc" in chart_data["angles"]:
-                        midheaven_lon = chart_data["angles"]["mc"].get("longitude")
-
-                if not ascendant_lon or not midheaven_lon:
-                    continue  # Skip if we can't find the angles
-
-                # Check aspects to Ascendant and Midheaven
-                for planet_name in ['sun', 'moon', 'mercury', 'venus', 'mars', 'jupiter', 'saturn']:
-                    if planet_name not in chart_data.get("planets", {}):
-                        continue
-
-                    planet_lon = chart_data["planets"][planet_name].get("longitude")
-                    if not planet_lon:
-                        continue
-
-                    # Calculate aspect angle to Ascendant
-                    aspect_angle = abs(planet_lon - ascendant_lon) % 360
-                    if aspect_angle > 180:
-                        aspect_angle = 360 - aspect_angle
-
-                    # Score based on harmonious or challenging aspects
-                    if abs(aspect_angle - 0) < 3:  # Conjunction
-                        score += 10
-                    elif abs(aspect_angle - 60) < 3:  # Sextile
-                        score += 6
-                    elif abs(aspect_angle - 90) < 3:  # Square
-                        score += 8
-                    elif abs(aspect_angle - 120) < 3:  # Trine
-                        score += 8
-                    elif abs(aspect_angle - 180) < 3:  # Opposition
-                        score += 10
-
-                    # Calculate aspect angle to Midheaven
-                    aspect_angle = abs(planet_lon - midheaven_lon) % 360
-                    if aspect_angle > 180:
-                        aspect_angle = 360 - aspect_angle
-
-                    # Score based on harmonious or challenging aspects
-                    if abs(aspect_angle - 0) < 3:  # Conjunction
-                        score += 10
-                    elif abs(aspect_angle - 60) < 3:  # Sextile
-                        score += 6
-                    elif abs(aspect_angle - 90) < 3:  # Square
-                        score += 8
-                    elif abs(aspect_angle - 120) < 3:  # Trine
-                        score += 8
-                    elif abs(aspect_angle - 180) < 3:  # Opposition
-                        score += 10
-
-            except Exception as e:
-                logger.debug(f"Error calculating aspects: {e}")
-                continue
-
-            # Check if this is the best score so far
-            if score > best_score:
-                best_score = score
-                best_time = test_time
-
-        except Exception as e:
-            logger.debug(f"Error in solar arc calculation: {e}")
-            continue
+    def score_offsets(offsets: np.ndarray) -> np.ndarray:
+        # Calculate every candidate in one batched ephemeris pass
+        batch = calculate_candidate_batch(
+            birth_dt, latitude, longitude, timezone, offsets, planets=SOLAR_ARC_PLANETS
+        )
+        angles = np.stack([batch.angle_longitudes("asc"), batch.angle_longitudes("mc")], axis=-1)
+        planet_longitudes = batch.planet_longitudes(SOLAR_ARC_PLANETS)
+
+        # Score solar arc aspects to Ascendant and Midheaven for each candidate
+        scores = SOLAR_ARC_ASPECTS.score(planet_longitudes, angles)
+        return scores
+
+    # Search 2 hours either side of the recorded time
+    strategy = search or default_search_strategy()
+    result = strategy.search(score_offsets, angle_sign_boundary(birth_dt, timezone, latitude, longitude))
+    best_score = result.best_score
+    best_time = birth_dt + timedelta(minutes=result.best_offset)
 
     # If no good candidates were found, return the original time with low confidence
     if best_score == 0:
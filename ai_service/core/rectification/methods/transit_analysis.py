@@ -3,28 +3,54 @@ Transit analysis module for birth time rectification using life events.
 """
 import logging
 from datetime import datetime, timedelta
+import functools
 import re
 from typing import List, Dict, Any, Tuple, Optional, Union
 
+import numpy as np
+
+from ..aspects import AspectSet
+from ..batch_ephemeris import ANGLE_INDEX, ANGLE_NAMES, PLANET_NAMES
+from ..chart_vector import POINT_INDEX, POINT_NAMES, ChartVector
+from ..search import SearchStrategy
+
 logger = logging.getLogger(__name__)
 
-def calculate_transit_score(
-    natal_chart: Any,
-    transit_chart: Any,
-    event_type: str,
-    description: str = ""
-) -> Tuple[float, int]:
+# Planets whose transits are scored
+TRANSIT_PLANETS = ['sun', 'moon', 'mars', 'jupiter', 'saturn', 'uranus', 'neptune', 'pluto']
+
+# Aspects from transit planets to natal points (5 degree orb)
+TRANSIT_ASPECTS = AspectSet([
+    ("conjunction", 5, 10),
+    ("opposition", 5, 10),
+    ("square", 5, 8),
+    ("trine", 5, 6),
+    ("sextile", 5, 5),
+])
+
+# Score of every transit planet inside a relevant natal house
+HOUSE_TRANSIT_SCORE = 10.0
+
+# Event points that refer to chart angles
+_ANGLE_POINTS = {'Ascendant': 'asc', 'Asc': 'asc', 'MC': 'mc', 'Descendant': 'desc', 'IC': 'ic'}
+
+_TRANSIT_COLUMNS = [POINT_INDEX[planet] for planet in TRANSIT_PLANETS]
+
+# Natal points are scored as one array: the POINT_NAMES columns followed by
+# the ANGLE_NAMES columns
+_NATAL_POINT_COUNT = len(POINT_NAMES) + len(ANGLE_NAMES)
+
+@functools.lru_cache(maxsize=None)
+def _event_plan(event_type: str) -> Tuple[np.ndarray, np.ndarray]:
     """
-    Calculate transit score for an event.
+    Resolve the natal points and houses an event type is scored against.
 
     Args:
-        natal_chart: The natal chart object
-        transit_chart: The transit chart object
         event_type: Type of life event
-        description: Event description
 
     Returns:
-        Tuple of (score, aspect_count)
+        Tuple of (natal point column counts, house counts) with shapes
+        (_NATAL_POINT_COUNT,) and (12,); a point listed twice counts twice
     """
     from ..constants import LIFE_EVENT_MAPPING
 
@@ -35,121 +61,194 @@ def calculate_transit_score(
     if not relevant_points:
         relevant_points = ['Sun', 'Moon', 'Ascendant', 'MC']
 
-    # Track score and aspect count
-    score = 0.0
-    aspect_count = 0
+    point_counts = np.zeros(_NATAL_POINT_COUNT)
+    house_counts = np.zeros(12)
 
-    # Check transits to each relevant point
     for point in relevant_points:
         try:
             # Handle special case for houses
             if point.endswith('_house'):
-                try:
-                    # Extract house number, handling ordinal suffixes like '3rd', '9th', etc.
-                    house_part = point.split('_')[0]
-                    # Remove any non-numeric characters to get just the number
-                    house_num = int(''.join(filter(str.isdigit, house_part)))
-
-                    # Check if house data exists
-                    if "houses" in natal_chart and isinstance(natal_chart["houses"], list) and house_num <= len(natal_chart["houses"]):
-                        house_lon = natal_chart["houses"][house_num - 1]
-
-                        # Check transits to this house
-                        for planet in ['sun', 'moon', 'mars', 'jupiter', 'saturn', 'uranus', 'neptune', 'pluto']:
-                            if "planets" in transit_chart and planet in transit_chart["planets"]:
-                                transit_planet_data = transit_chart["planets"][planet]
-                                transit_planet_lon = transit_planet_data.get("longitude", 0)
-
-                                # Simple check if planet is in or near the house (within 10 degrees)
-                                house_start = house_lon
-                                house_end = natal_chart["houses"][house_num % 12] if house_num < 12 else (house_lon + 30) % 360
-
-                                if house_end < house_start:  # Handle case where house crosses 0 degrees
-                                    in_house = (transit_planet_lon >= house_start or transit_planet_lon < house_end)
-                                else:
-                                    in_house = (transit_planet_lon >= house_start and transit_planet_lon < house_end)
-
-                                if in_house:
-                                    score += 10.0
-                                    aspect_count += 1
-                except Exception as e:
-                    logger.warning(f"Error evaluating transit to {point}: {e}")
-                    continue
+                # Extract house number, handling ordinal suffixes like '3rd', '9th', etc.
+                house_part = point.split('_')[0]
+                # Remove any non-numeric characters to get just the number
+                house_num = int(''.join(filter(str.isdigit, house_part)))
+                if 1 <= house_num <= 12:
+                    house_counts[house_num - 1] += 1
 
             # Handle regular points (planets, angles)
-            else:
-                # Get natal position
-                natal_point_lon = None
-                natal_point_data = None
-
-                if point in ['Ascendant', 'Asc', 'MC', 'Descendant', 'IC']:
-                    # Map to correct key
-                    angle_key = point.lower()
-                    if point == 'Ascendant':
-                        angle_key = 'asc'
-                    elif point == 'Descendant':
-                        angle_key = 'desc'
-
-                    # Get angle data
-                    if "angles" in natal_chart and angle_key in natal_chart["angles"]:
-                        natal_point_data = natal_chart["angles"][angle_key]
-                        natal_point_lon = natal_point_data.get("longitude")
-                else:
-                    # It's a planet
-                    planet_key = point.lower()
-                    if "planets" in natal_chart and planet_key in natal_chart["planets"]:
-                        natal_point_data = natal_chart["planets"][planet_key]
-                        natal_point_lon = natal_point_data.get("longitude")
-
-                # Skip if point is not valid
-                if natal_point_lon is None:
-                    continue
-
-                # Check transits from major planets
-                transit_planets = ['sun', 'moon', 'mars', 'jupiter', 'saturn', 'uranus', 'neptune', 'pluto']
-
-                for transit_planet_name in transit_planets:
-                    if "planets" in transit_chart and transit_planet_name in transit_chart["planets"]:
-                        transit_planet_data = transit_chart["planets"][transit_planet_name]
-                        transit_planet_lon = transit_planet_data.get("longitude")
-
-                        if transit_planet_lon is None:
-                            continue
-
-                        # Calculate aspect angle
-                        angle_diff = abs(natal_point_lon - transit_planet_lon) % 360
-                        if angle_diff > 180:
-                            angle_diff = 360 - angle_diff
-
-                        # Score based on aspect type
-                        if abs(angle_diff - 0) < 5:  # Conjunction
-                            score += 10.0
-                            aspect_count += 1
-                        elif abs(angle_diff - 180) < 5:  # Opposition
-                            score += 10.0
-                            aspect_count += 1
-                        elif abs(angle_diff - 90) < 5:  # Square
-                            score += 8.0
-                            aspect_count += 1
-                        elif abs(angle_diff - 120) < 5:  # Trine
-                            score += 6.0
-                            aspect_count += 1
-                        elif abs(angle_diff - 60) < 5:  # Sextile
-                            score += 5.0
-                            aspect_count += 1
+            elif point in _ANGLE_POINTS:
+                point_counts[len(POINT_NAMES) + ANGLE_INDEX[_ANGLE_POINTS[point]]] += 1
+            elif point.lower() in POINT_INDEX:
+                point_counts[POINT_INDEX[point.lower()]] += 1
 
         except Exception as e:
             logger.warning(f"Error evaluating transit to {point}: {e}")
             continue
 
-    return score, aspect_count
+    return point_counts, house_counts
+
+def _house_occupancy(cusps: np.ndarray, transit_lons: np.ndarray) -> np.ndarray:
+    """
+    Flag transit planets that fall inside each natal house.
+
+    Args:
+        cusps: Natal house cusps with shape (..., 12)
+        transit_lons: Transit planet longitudes with shape (events, P)
+
+    Returns:
+        Boolean array with shape (..., events, 12, P); houses with a missing
+        cusp contain nothing
+    """
+    # The 12th house is taken to span 30 degrees
+    house_end = np.concatenate([cusps[..., 1:], (cusps[..., 11:] + 30) % 360], axis=-1)
+    house_start = cusps[..., None, :, None]
+    house_end = house_end[..., None, :, None]
+    transit_lons = transit_lons[:, None, :]
+
+    after_start = transit_lons >= house_start
+    before_end = transit_lons < house_end
+    # Houses that cross 0 degrees
+    wraps = house_end < house_start
+    return np.where(wraps, after_start | before_end, after_start & before_end)
+
+def _natal_points(batch: Any) -> np.ndarray:
+    """Return the natal point columns of every row of an EphemerisBatch."""
+    points = np.full((len(batch), _NATAL_POINT_COUNT), np.nan)
+    points[:, :len(PLANET_NAMES)] = batch.longitudes
+    points[:, len(POINT_NAMES):] = batch.angles
+    return points
+
+def score_transit_tensor(
+    natal_points: np.ndarray,
+    cusps: np.ndarray,
+    transit_lons: np.ndarray,
+    point_counts: np.ndarray,
+    house_counts: np.ndarray
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Score the transits of every event to every natal chart in one pass.
+
+    The aspect weights form a (candidates x events x natal points x transit
+    planets) tensor, which is reduced with each event's point and house
+    counts.
+
+    Args:
+        natal_points: Natal point longitudes with shape (..., _NATAL_POINT_COUNT)
+        cusps: Natal house cusps with shape (..., 12)
+        transit_lons: Transit planet longitudes with shape (events, planets)
+        point_counts: Natal point counts of every event, shape (events, _NATAL_POINT_COUNT)
+        house_counts: House counts of every event, shape (events, 12)
+
+    Returns:
+        Tuple of (scores, aspect counts), each with shape (..., events)
+    """
+    # Only natal points some event is scored against enter the tensor
+    used = np.nonzero(point_counts.any(axis=0))[0]
+    natal_points = natal_points[..., used]
+    point_counts = point_counts[:, used]
+
+    # Aspects from every transit planet to every natal point, per event
+    aspects = TRANSIT_ASPECTS.matrix(natal_points[..., None, :], transit_lons)
+    occupancy = _house_occupancy(cusps, transit_lons)
+
+    in_house = np.einsum('eh,...eht->...e', house_counts, occupancy.astype(np.float64))
+    scores = np.einsum('ep,...ept->...e', point_counts, aspects.weights) + HOUSE_TRANSIT_SCORE * in_house
+    counts = np.einsum('ep,...ept->...e', point_counts, aspects.matched.astype(np.float64)) + in_house
+    return scores, counts.astype(int)
+
+def rank_transit_candidates(
+    event_scores: np.ndarray,
+    aspect_counts: np.ndarray
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Reduce per-event transit scores to one score per candidate.
+
+    Events without aspects are skipped and the rest averaged; candidates with
+    no valid events score -inf so they are never ranked.
+
+    Args:
+        event_scores: Scores with shape (candidates, events)
+        aspect_counts: Aspect counts with shape (candidates, events)
+
+    Returns:
+        Tuple of (candidate scores, total aspects, valid events) per candidate
+    """
+    valid = aspect_counts > 0
+    valid_events = valid.sum(axis=1)
+    totals = np.where(valid, event_scores, 0.0).sum(axis=1)
+
+    with np.errstate(invalid='ignore', divide='ignore'):
+        scores = np.where(valid_events > 0, totals / valid_events, -np.inf)
+    return scores, aspect_counts.sum(axis=1), valid_events
+
+def calculate_transit_score(
+    natal_chart: Union[ChartVector, Dict[str, Any]],
+    transit_chart: Union[ChartVector, Dict[str, Any]],
+    event_type: str,
+    description: str = ""
+) -> Tuple[float, int]:
+    """
+    Calculate transit score for an event.
+
+    Args:
+        natal_chart: The natal chart, as a ChartVector or chart dict
+        transit_chart: The transit chart, as a ChartVector or chart dict
+        event_type: Type of life event
+        description: Event description
+
+    Returns:
+        Tuple of (score, aspect_count)
+    """
+    natal = ChartVector.from_chart_dict(natal_chart)
+    transit_lons = ChartVector.from_chart_dict(transit_chart).longitudes[_TRANSIT_COLUMNS]
+    point_counts, house_counts = _event_plan(event_type)
+
+    scores, counts = score_transit_tensor(
+        np.concatenate([natal.longitudes, natal.angles]), natal.cusps,
+        transit_lons[None, :], point_counts[None, :], house_counts[None, :]
+    )
+    return float(scores[0]), int(counts[0])
+
+def _parse_event_date(event_date_str: Optional[str]) -> Optional[datetime]:
+    """
+    Parse a life event date, defaulting year-only dates to mid-year and
+    date-only values to noon.
+
+    Returns:
+        Local event datetime, or None if the date is missing or unparseable
+    """
+    # Skip events without a date
+    if not event_date_str or event_date_str == 'unknown':
+        return None
+
+    # Handle case where only a year is provided
+    if re.match(r'^\d{4}$', event_date_str):
+        event_date_str = f"{event_date_str}-06-15"  # Default to middle of the year
+
+    # Parse event date
+    try:
+        event_date = datetime.fromisoformat(event_date_str)
+    except ValueError:
+        try:
+            # Try with fallback format
+            event_date = datetime.strptime(event_date_str, "%Y-%m-%d")
+        except ValueError:
+            # Skip if date can't be parsed
+            return None
+
+    # Use noon time for transit chart if not specified
+    if event_date.hour == 0 and event_date.minute == 0:
+        event_date = event_date.replace(hour=12)
+
+    return event_date
 
 async def analyze_life_events(
     events: List[Dict[str, Any]],
     birth_dt: datetime,
     latitude: float,
     longitude: float,
-    timezone_str: Optional[str] = None
+    timezone_str: Optional[str] = None,
+    search: Optional[SearchStrategy] = None
 ) -> Tuple[datetime, float]:
     """
     Analyze life events and rectify birth time based on transits.
@@ -160,12 +259,13 @@ async def analyze_life_events(
         latitude: Birth latitude in decimal degrees
         longitude: Birth longitude in decimal degrees
         timezone_str: Timezone string
+        search: Candidate search strategy (defaults to an adaptive search)
 
     Returns:
         Tuple of (rectified_datetime, confidence_score)
     """
-    from ..chart_calculator import calculate_chart
-    import pytz
+    from ..batch_ephemeris import calculate_batch, calculate_candidate_batch, datetime_to_julian_day
+    from ..search import angle_sign_boundary, default_search_strategy
 
     # Ensure we have events to analyze
     if not events or len(events) == 0:
@@ -177,101 +277,60 @@ async def analyze_life_events(
         logger.warning("No timezone provided, using UTC for transit analysis")
         timezone_str = "UTC"
 
-    # Define potential birth times to test (every 15 minutes within a 4-hour window)
-    test_times = []
-    for minutes in range(-120, 121, 15):
-        test_time = birth_dt + timedelta(minutes=minutes)
-        test_times.append(test_time)
+    # Resolve event dates; events without a usable date are skipped
+    dated_events = []
+    for event in events:
+        event_date = _parse_event_date(event.get('date'))
+        if event_date is not None:
+            dated_events.append((event, event_date))
+
+    if not dated_events:
+        logger.warning("No valid results found in transit analysis")
+        return birth_dt, 50.0
+
+    # Transit positions do not depend on the candidate birth time, so every
+    # event is calculated once in a single batched ephemeris pass
+    transit_batch = calculate_batch(
+        [datetime_to_julian_day(event_date, timezone_str) for _, event_date in dated_events],
+        latitude, longitude
+    )
+    transit_lons = transit_batch.planet_longitudes(TRANSIT_PLANETS)
 
-    # Track results for each test time
-    results = []
+    # Natal points and houses each event is scored against
+    plans = [_event_plan(event.get('type', 'life_event')) for event, _ in dated_events]
+    point_counts = np.array([point for point, _ in plans])
+    house_counts = np.array([house for _, house in plans])
 
-    # Process each test time
-    for test_time in test_times:
-        try:
-            # Calculate natal chart for this test time
-            natal_chart = calculate_chart(test_time, latitude, longitude, timezone_str)
-            if not natal_chart:
-                continue
-
-            # Track total score for this birth time
-            total_score = 0.0
-            total_aspects = 0
-            valid_events = 0
-
-            # Process each life event
-            for event in events:
-                # Skip events without a date
-                event_date_str = event.get('date')
-                if not event_date_str or event_date_str == 'unknown':
-                    continue
-
-                # Handle case where only a year is provided
-                if re.match(r'^\d{4}$', event_date_str):
-                    event_date_str = f"{event_date_str}-06-15"  # Default to middle of the year
-
-                # Parse event date
-                try:
-                    event_date = datetime.fromisoformat(event_date_str)
-                except ValueError:
-                    try:
-                        # Try with fallback format
-                        event_date = datetime.strptime(event_date_str, "%Y-%m-%d")
-                    except ValueError:
-                        # Skip if date can't be parsed
-                        continue
-
-                # Use noon time for transit chart if not specified
-                if event_date.hour == 0 and event_date.minute == 0:
-                    event_date = event_date.replace(hour=12)
-
-                # Calculate transit chart
-                transit_chart = calculate_chart(event_date, latitude, longitude, timezone_str)
-                if not transit_chart:
-                    continue
-
-                # Get event type and description
-                event_type = event.get('type', 'life_event')
-                description = event.get('description', '')
-
-                # Calculate transit score
-                event_score, aspect_count = calculate_transit_score(
-                    natal_chart, transit_chart, event_type, description
-                )
-
-                # Skip if no aspects found
-                if aspect_count == 0:
-                    continue
-
-                # Add to totals
-                total_score += event_score
-                total_aspects += aspect_count
-                valid_events += 1
-
-            # Skip if no valid events were analyzed
-            if valid_events == 0:
-                continue
-
-            # Calculate average score per event
-            avg_score = total_score / valid_events
-
-            # Add to results
-            results.append((test_time, avg_score, total_aspects, valid_events))
+    # Per-candidate totals, keyed by offset, for the best result's summary
+    details: Dict[float, Tuple[int, int]] = {}
 
-        except Exception as e:
-            logger.warning(f"Error analyzing test time {test_time}: {e}")
-            continue
+    def score_offsets(offsets: np.ndarray) -> np.ndarray:
+        # Score every candidate against every event at once
+        natal_batch = calculate_candidate_batch(birth_dt, latitude, longitude, timezone_str, offsets)
+        event_scores, aspect_counts = score_transit_tensor(
+            _natal_points(natal_batch), natal_batch.cusps, transit_lons, point_counts, house_counts
+        )
+        scores, total_aspects, valid_events = rank_transit_candidates(event_scores, aspect_counts)
+
+        for offset, aspects, valid in zip(offsets.tolist(), total_aspects.tolist(), valid_events.tolist()):
+            if valid:
+                details[offset] = (aspects, valid)
+
+        return scores
+
+    # Search 2 hours either side of the recorded time
+    strategy = search or default_search_strategy()
+    result = strategy.search(score_offsets, angle_sign_boundary(birth_dt, timezone_str, latitude, longitude))
 
     # If no valid results, return original time with low confidence
-    if not results:
+    if not np.isfinite(result.best_score):
         logger.warning("No valid results found in transit analysis")
         return birth_dt, 50.0
 
-    # Sort results by average score (descending)
-    results.sort(key=lambda x: x[1], reverse=True)
-
     # Get best result
-    best_time, best_score, total_aspects, valid_events = results[0]
+    best_time = birth_dt + timedelta(minutes=result.best_offset)
+    best_score = result.best_score
+    total_aspects, valid_events = details[result.best_offset]
 
     # Calculate confidence (50-90% range)
     confidence = min(90, 50 + (best_score / 20) * 40)
@@ -0,0 +1,186 @@
+"""
+Secondary progression calculations for birth time rectification.
+
+In secondary progressions one day after birth stands for one year of life, so
+scoring a sweep of candidate birth times against every year of a life needs
+progressed positions for candidates x ages instants. Neighbouring candidates
+fall on the same few progressed days, so this module computes ephemeris data
+once per unique UT day and derives every progressed instant from it:
+
+- angles come from the sidereal time and obliquity of the day, evaluated in
+  NumPy for the whole candidates x ages grid;
+- planets are interpolated between the bracketing midnights with a cubic
+  Hermite spline over longitude and daily speed.
+"""
+import logging
+from typing import Dict, Iterable, Optional, Sequence, Tuple
+
+import numpy as np
+import swisseph as swe
+
+from .batch_ephemeris import CALC_FLAGS, PLANET_IDS, PLANET_INDEX, PLANET_NAMES
+
+logger = logging.getLogger(__name__)
+
+# Ratio of sidereal to solar time
+SIDEREAL_RATE = 1.00273790935
+
+
+def progressed_julian_days(natal_jds: Iterable[float], ages: Iterable[int]) -> np.ndarray:
+    """
+    Build the (candidates, ages) grid of progressed Julian days.
+
+    Args:
+        natal_jds: Natal UT Julian day of every candidate birth time
+        ages: Ages in years to progress to
+
+    Returns:
+        Array where element [i, j] is candidate i progressed to age j
+    """
+    natal = np.asarray(list(natal_jds), dtype=np.float64)
+    years = np.asarray(list(ages), dtype=np.float64)
+    return natal[:, None] + years[None, :]
+
+
+def _day_start(julian_days: np.ndarray) -> np.ndarray:
+    """Return the Julian day of the preceding 0h UT for every element."""
+    return np.floor(julian_days - 0.5) + 0.5
+
+
+class ProgressionCalculator:
+    """
+    Progressed angles and planets for one birth location.
+
+    Ephemeris data is cached per UT day for the lifetime of the calculator, so
+    repeated or refined candidate sweeps at the same location only pay for
+    days they have not seen yet.
+    """
+
+    def __init__(self, latitude: float, longitude: float):
+        """
+        Initialize the calculator.
+
+        Args:
+            latitude: Birth latitude in decimal degrees
+            longitude: Birth longitude in decimal degrees
+        """
+        self.latitude = latitude
+        self.longitude = longitude
+
+        # Per-day sidereal time (hours) and true obliquity (degrees)
+        self._day_frames: Dict[float, Tuple[float, float]] = {}
+
+        # Per-day planet longitudes and daily speeds, in PLANET_NAMES order
+        self._day_planets: Dict[float, Tuple[np.ndarray, np.ndarray]] = {}
+
+    @property
+    def days_calculated(self) -> int:
+        """Number of unique UT days the calculator has touched the ephemeris for."""
+        return len(set(self._day_frames) | set(self._day_planets))
+
+    def _frames_for(self, days: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """Return sidereal time and obliquity arrays for the given day starts."""
+        unique_days, inverse = np.unique(days, return_inverse=True)
+        sidereal = np.empty(len(unique_days))
+        obliquity = np.empty(len(unique_days))
+
+        for index, day in enumerate(unique_days):
+            day = float(day)
+            frame = self._day_frames.get(day)
+            if frame is None:
+                frame = (swe.sidtime(day), swe.calc_ut(day, swe.ECL_NUT)[0][0])
+                self._day_frames[day] = frame
+            sidereal[index], obliquity[index] = frame
+
+        return sidereal[inverse].reshape(days.shape), obliquity[inverse].reshape(days.shape)
+
+    def angles(self, julian_days: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Calculate the Ascendant and Midheaven for every progressed instant.
+
+        Args:
+            julian_days: Array of UT Julian days of any shape
+
+        Returns:
+            Tuple of (ascendant, midheaven) longitude arrays with the same shape
+        """
+        jds = np.asarray(julian_days, dtype=np.float64)
+        days = _day_start(jds)
+        sidereal, obliquity = self._frames_for(days)
+
+        armc = np.radians(((sidereal + (jds - days) * 24 * SIDEREAL_RATE) * 15 + self.longitude) % 360)
+        eps = np.radians(obliquity)
+        phi = np.radians(self.latitude)
+
+        mc = np.degrees(np.arctan2(np.sin(armc), np.cos(armc) * np.cos(eps))) % 360
+        asc = np.degrees(np.arctan2(
+            np.cos(armc),
+            -(np.sin(armc) * np.cos(eps) + np.tan(phi) * np.sin(eps))
+        )) % 360
+
+        return asc, mc
+
+    def _planets_for(self, day: float) -> Tuple[np.ndarray, np.ndarray]:
+        """Return cached planet longitudes and speeds at 0h UT of a day."""
+        positions = self._day_planets.get(day)
+        if positions is None:
+            longitudes = np.empty(len(PLANET_NAMES))
+            speeds = np.empty(len(PLANET_NAMES))
+            for name, body in PLANET_IDS.items():
+                position = swe.calc_ut(day, body, CALC_FLAGS)[0]
+                longitudes[PLANET_INDEX[name]] = position[0]
+                speeds[PLANET_INDEX[name]] = position[3]
+            positions = (longitudes, speeds)
+            self._day_planets[day] = positions
+        return positions
+
+    def planet_longitudes(
+        self,
+        julian_days: np.ndarray,
+        names: Optional[Sequence[str]] = None
+    ) -> np.ndarray:
+        """
+        Interpolate progressed planet longitudes for every instant.
+
+        Args:
+            julian_days: Array of UT Julian days of any shape
+            names: Optional subset of planet names; defaults to all planets
+
+        Returns:
+            Array of shape julian_days.shape + (len(names),)
+        """
+        jds = np.asarray(julian_days, dtype=np.float64)
+        columns = [PLANET_INDEX[name.lower()] for name in (names or PLANET_NAMES)]
+
+        days = _day_start(jds)
+        unique_days, inverse = np.unique(days, return_inverse=True)
+        start_lon = np.empty((len(unique_days), len(columns)))
+        start_speed = np.empty_like(start_lon)
+        end_lon = np.empty_like(start_lon)
+        end_speed = np.empty_like(start_lon)
+
+        for index, day in enumerate(unique_days):
+            lon0, speed0 = self._planets_for(float(day))
+            lon1, speed1 = self._planets_for(float(day) + 1.0)
+            start_lon[index], start_speed[index] = lon0[columns], speed0[columns]
+            end_lon[index], end_speed[index] = lon1[columns], speed1[columns]
+
+        # Unwrap the end longitude so the span crosses 0 Aries continuously
+        delta = (end_lon - start_lon + 180.0) % 360 - 180.0
+
+        t = (jds - days).reshape(-1)[:, None]
+        inverse = inverse.reshape(-1)
+        t2, t3 = t * t, t * t * t
+        h00 = 2 * t3 - 3 * t2 + 1
+        h10 = t3 - 2 * t2 + t
+        h01 = -2 * t3 + 3 * t2
+        h11 = t3 - t2
+
+        values = (
+            h00 * start_lon[inverse]
+            + h10 * start_speed[inverse]
+            + h01 * (start_lon[inverse] + delta[inverse])
+            + h11 * end_speed[inverse]
+        ) % 360
+
+        return values.reshape(jds.shape + (len(columns),))
@@ -0,0 +1,237 @@
+"""
+Candidate search strategies for birth time rectification.
+
+Rectification methods score candidate birth times expressed as minute offsets
+from the recorded time. A search strategy decides which offsets are worth
+evaluating: the fixed grid evaluates every step in the window, while the
+adaptive search sweeps coarsely, bisects ascendant/MC sign crossings and
+refines around the best peaks until it reaches minute-level resolution or
+runs out of its chart-evaluation budget.
+"""
+from datetime import datetime
+import logging
+from typing import Callable, Dict, Iterable, List, Optional
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# Scores every offset (minutes) in one batched call
+ScoreFunction = Callable[[np.ndarray], np.ndarray]
+
+# Maps offsets to a discrete key (e.g. ascendant and MC sign) that changes
+# only at the boundaries worth locating precisely
+BoundaryFunction = Callable[[np.ndarray], np.ndarray]
+
+
+class SearchResult:
+    """Outcome of a candidate search."""
+
+    def __init__(self, evaluated: Dict[float, float]):
+        self.offsets = np.array(sorted(evaluated), dtype=np.float64)
+        self.scores = np.array([evaluated[offset] for offset in self.offsets], dtype=np.float64)
+        self.evaluations = len(self.offsets)
+
+    @property
+    def best_index(self) -> int:
+        """Index of the best score; ties go to the earliest offset and NaN never wins."""
+        if not self.evaluations:
+            return -1
+        return int(np.argmax(np.where(np.isnan(self.scores), -np.inf, self.scores)))
+
+    @property
+    def best_offset(self) -> float:
+        """Offset in minutes of the best-scoring candidate."""
+        return float(self.offsets[self.best_index]) if self.evaluations else 0.0
+
+    @property
+    def best_score(self) -> float:
+        """Score of the best candidate."""
+        return float(self.scores[self.best_index]) if self.evaluations else 0.0
+
+
+class SearchStrategy:
+    """Base class for candidate search strategies."""
+
+    def __init__(self, window_minutes: float):
+        self.window_minutes = window_minutes
+
+    def search(
+        self,
+        score: ScoreFunction,
+        boundary: Optional[BoundaryFunction] = None
+    ) -> SearchResult:
+        """
+        Search the window for the best-scoring offset.
+
+        Args:
+            score: Batched scoring function over minute offsets
+            boundary: Optional function whose value changes at the boundaries
+                that should be located precisely
+
+        Returns:
+            SearchResult with every evaluated offset and score
+        """
+        raise NotImplementedError
+
+
+class GridSearch(SearchStrategy):
+    """Evaluate every step of a fixed grid across the window."""
+
+    def __init__(self, window_minutes: float = 120, step_minutes: float = 15):
+        super().__init__(window_minutes)
+        self.step_minutes = step_minutes
+
+    def search(
+        self,
+        score: ScoreFunction,
+        boundary: Optional[BoundaryFunction] = None
+    ) -> SearchResult:
+        offsets = np.arange(-self.window_minutes, self.window_minutes + self.step_minutes / 2, self.step_minutes)
+        scores = np.asarray(score(offsets), dtype=np.float64)
+        return SearchResult(dict(zip(offsets.tolist(), scores.tolist())))
+
+
+class AdaptiveSearch(SearchStrategy):
+    """
+    Coarse-to-fine search with a chart-evaluation budget.
+
+    1. Sweep the window at ``coarse_step_minutes``.
+    2. Bisect every interval whose boundary key changes down to
+       ``resolution_minutes`` and score both sides of the crossing.
+    3. Refine around the ``peaks`` best offsets by halving the step until it
+       reaches ``resolution_minutes``.
+
+    No more than ``budget`` offsets are ever scored; boundary lookups are
+    angle-only and do not count against the budget.
+    """
+
+    def __init__(
+        self,
+        window_minutes: float = 120,
+        coarse_step_minutes: float = 30,
+        resolution_minutes: float = 1,
+        budget: int = 40,
+        peaks: int = 2
+    ):
+        super().__init__(window_minutes)
+        self.coarse_step_minutes = coarse_step_minutes
+        self.resolution_minutes = resolution_minutes
+        self.budget = budget
+        self.peaks = peaks
+
+    def _snap(self, offset: float) -> float:
+        """Round an offset to the search resolution and clamp it to the window."""
+        snapped = round(offset / self.resolution_minutes) * self.resolution_minutes
+        return float(min(self.window_minutes, max(-self.window_minutes, snapped)))
+
+    def _evaluate(self, score: ScoreFunction, offsets: Iterable[float], evaluated: Dict[float, float]) -> None:
+        """Score new offsets in one batch, respecting the remaining budget."""
+        pending: List[float] = []
+        for offset in offsets:
+            offset = self._snap(offset)
+            if offset not in evaluated and offset not in pending:
+                pending.append(offset)
+
+        pending = pending[:max(0, self.budget - len(evaluated))]
+        if not pending:
+            return
+
+        scores = np.asarray(score(np.array(pending, dtype=np.float64)), dtype=np.float64)
+        evaluated.update(zip(pending, scores.tolist()))
+
+    def _crossings(self, boundary: BoundaryFunction, offsets: np.ndarray) -> List[float]:
+        """Bisect every interval between offsets whose boundary key changes."""
+        keys = np.asarray(boundary(offsets))
+        crossings = []
+
+        for index in np.nonzero(keys[1:] != keys[:-1])[0]:
+            low, high = float(offsets[index]), float(offsets[index + 1])
+            low_key = keys[index]
+            while high - low > self.resolution_minutes:
+                middle = self._snap((low + high) / 2)
+                if middle in (low, high):
+                    break
+                if boundary(np.array([middle]))[0] == low_key:
+                    low = middle
+                else:
+                    high = middle
+            crossings.extend([low, high])
+
+        return crossings
+
+    def search(
+        self,
+        score: ScoreFunction,
+        boundary: Optional[BoundaryFunction] = None
+    ) -> SearchResult:
+        evaluated: Dict[float, float] = {}
+
+        coarse = np.arange(
+            -self.window_minutes,
+            self.window_minutes + self.coarse_step_minutes / 2,
+            self.coarse_step_minutes
+        )
+        self._evaluate(score, coarse, evaluated)
+
+        if boundary is not None:
+            self._evaluate(score, self._crossings(boundary, coarse), evaluated)
+
+        step = max(self.resolution_minutes, self.coarse_step_minutes / 2)
+        while len(evaluated) < self.budget:
+            result = SearchResult(evaluated)
+            order = np.argsort(-result.scores, kind="stable")[:self.peaks]
+            around = []
+            for index in order:
+                peak = result.offsets[index]
+                around.extend([peak - step, peak + step])
+            self._evaluate(score, around, evaluated)
+
+            if step <= self.resolution_minutes:
+                break
+            step = max(self.resolution_minutes, step / 2)
+
+        result = SearchResult(evaluated)
+        logger.debug(
+            f"Adaptive search evaluated {result.evaluations} candidates "
+            f"(budget {self.budget}), best offset {result.best_offset:+.0f} min"
+        )
+        return result
+
+
+def default_search_strategy(window_minutes: float = 120) -> SearchStrategy:
+    """Return the search strategy rectification methods use by default."""
+    return AdaptiveSearch(window_minutes=window_minutes, coarse_step_minutes=window_minutes / 4)
+
+
+def angle_sign_boundary(
+    birth_dt: datetime,
+    timezone_str: str,
+    latitude: float,
+    longitude: float
+) -> BoundaryFunction:
+    """
+    Build a boundary function keyed on the ascendant and MC signs.
+
+    Only angles are calculated, so boundary lookups are far cheaper than
+    scoring a candidate.
+
+    Args:
+        birth_dt: Recorded local birth datetime the offsets are relative to
+        timezone_str: Birth timezone string
+        latitude: Birth latitude in decimal degrees
+        longitude: Birth longitude in decimal degrees
+
+    Returns:
+        Function mapping minute offsets to ``asc_sign * 12 + mc_sign``
+    """
+    from .batch_ephemeris import candidate_julian_days
+    from .progressions import ProgressionCalculator
+
+    calculator = ProgressionCalculator(latitude, longitude)
+
+    def boundary(offsets: np.ndarray) -> np.ndarray:
+        asc, mc = calculator.angles(candidate_julian_days(birth_dt, timezone_str, offsets))
+        return (asc // 30).astype(int) * 12 + (mc // 30).astype(int)
+
+    return boundary
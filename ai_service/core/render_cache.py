@@ -0,0 +1,203 @@
+"""
+Content-addressed cache of rendered chart files.
+
+A render is keyed by a hash of its kind, its output format and everything
+the renderer draws: the charts' positions and details, without bookkeeping
+fields such as IDs and timestamps. An unchanged chart is therefore drawn
+once per format and kind; later exports and comparisons reuse the file, and
+the key doubles as the file's ETag.
+
+Files live at ``<root>/<key[:2]>/<key><ext>``. The cache is bounded in bytes
+and evicts the least recently used files first. Recency is kept in file
+modification times, so it survives restarts.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import threading
+import uuid
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Sequence, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Chart fields that do not change what is drawn
+VOLATILE_KEYS = frozenset({
+    "id", "chart_id", "created_at", "updated_at", "expires_at", "generated_at", "timestamp",
+})
+
+# Marks files still being rendered; they are never indexed
+PARTIAL_MARKER = ".partial-"
+
+
+def render_fingerprint(value: Any) -> Any:
+    """Return value with the volatile fields of every nested dict removed."""
+    if isinstance(value, dict):
+        return {key: render_fingerprint(item) for key, item in value.items() if key not in VOLATILE_KEYS}
+    if isinstance(value, (list, tuple)):
+        return [render_fingerprint(item) for item in value]
+    return value
+
+
+def render_key(kind: str, inputs: Sequence[Any], extension: str) -> str:
+    """
+    Content address of a render.
+
+    Args:
+        kind: Render job kind
+        inputs: Renderer arguments other than the output path
+        extension: Extension of the output file, such as ".pdf"
+
+    Returns:
+        Hex SHA-256 digest
+    """
+    blob = json.dumps(
+        [kind, extension.lower(), render_fingerprint(list(inputs))],
+        sort_keys=True, separators=(",", ":"), default=str
+    )
+    return hashlib.sha256(blob.encode("utf-8")).hexdigest()
+
+
+def file_etag(path: str) -> str:
+    """
+    Return the ETag of a file.
+
+    Cached renders are named by their content address, which is used as is;
+    other files get a tag from their size and modification time.
+    """
+    name = os.path.basename(path)
+    stem = name.split(".", 1)[0]
+    if len(stem) == 64 and all(c in "0123456789abcdef" for c in stem):
+        return f'"{stem}"'
+    stat = os.stat(path)
+    return f'"{stat.st_mtime_ns:x}-{stat.st_size:x}"'
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """Return whether an If-None-Match header matches an ETag, using weak comparison."""
+    if not if_none_match:
+        return False
+    candidates = [candidate.strip() for candidate in if_none_match.split(",")]
+    return "*" in candidates or any(candidate.removeprefix("W/") == etag for candidate in candidates)
+
+
+class RenderCache:
+    """Rendered files on disk, addressed by render_key, with size-based LRU eviction."""
+
+    def __init__(self, root: str, max_bytes: int):
+        """
+        Args:
+            root: Cache directory; created if missing
+            max_bytes: Total size of cached files above which the least
+                recently used are evicted
+        """
+        self.root = root
+        self.max_bytes = max_bytes
+        os.makedirs(root, exist_ok=True)
+
+        self._lock = threading.Lock()
+        # key -> (path, size), least recently used first
+        self._entries: "OrderedDict[str, Tuple[str, int]]" = OrderedDict()
+        self._bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+        self._load()
+
+    def _load(self) -> None:
+        """Index the files already in the cache directory, oldest first."""
+        found = []
+        for directory, _, names in os.walk(self.root):
+            for name in names:
+                path = os.path.join(directory, name)
+                if PARTIAL_MARKER in name:
+                    # Left behind by a render that never finished
+                    os.remove(path)
+                    continue
+                stat = os.stat(path)
+                found.append((stat.st_mtime, name.split(".", 1)[0], path, stat.st_size))
+        for _, key, path, size in sorted(found):
+            self._entries[key] = (path, size)
+            self._bytes += size
+        if found:
+            logger.info(f"Render cache at {self.root} holds {len(found)} files ({self._bytes} bytes)")
+        self._evict()
+
+    def path_for(self, key: str, extension: str) -> str:
+        """Path a render with this key is stored at."""
+        return os.path.join(self.root, key[:2], f"{key}{extension}")
+
+    def partial_path_for(self, key: str, extension: str) -> str:
+        """Unique path to render into before the file is added with put."""
+        os.makedirs(os.path.join(self.root, key[:2]), exist_ok=True)
+        return os.path.join(self.root, key[:2], f"{key}{PARTIAL_MARKER}{uuid.uuid4().hex[:8]}{extension}")
+
+    def get(self, key: str) -> Optional[str]:
+        """Return the path of a cached render and mark it recently used, or None."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            path = entry[0]
+            try:
+                os.utime(path)
+            except FileNotFoundError:
+                # Removed behind the cache's back
+                del self._entries[key]
+                self._bytes -= entry[1]
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return path
+
+    def put(self, key: str, partial_path: str, extension: str) -> str:
+        """
+        Add a finished render to the cache.
+
+        Args:
+            key: Content address of the render
+            partial_path: File the render was written to (see partial_path_for)
+            extension: Extension of the file
+
+        Returns:
+            The file's path in the cache
+        """
+        path = self.path_for(key, extension)
+        os.replace(partial_path, path)
+        size = os.path.getsize(path)
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self._bytes -= previous[1]
+            self._entries[key] = (path, size)
+            self._bytes += size
+            self._evict()
+        return path
+
+    def _evict(self) -> None:
+        # The newest file stays even if it alone is over the limit
+        while self._bytes > self.max_bytes and len(self._entries) > 1:
+            key, (path, size) = self._entries.popitem(last=False)
+            self._bytes -= size
+            self.evictions += 1
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+            logger.debug(f"Evicted render {key} ({size} bytes)")
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Return cache size and hit counters."""
+        return {
+            "entries": len(self._entries),
+            "bytes": self._bytes,
+            "max_bytes": self.max_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+        }
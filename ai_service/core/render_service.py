@@ -0,0 +1,326 @@
+"""
+Process-pool rendering of chart images, comparisons and PDFs.
+
+matplotlib and reportlab rendering is synchronous and CPU-bound; run inside
+an async handler, one PDF export stalls every other request on the worker.
+Handlers submit render jobs to a RenderService instead and await the path of
+the finished file. Each worker process imports matplotlib and reportlab and
+warms the font cache once at startup, so jobs never pay for it.
+
+The service bounds the number of jobs queued or running at once; callers
+beyond that limit wait for a slot and are rejected with a
+ResourceExhaustionError if none frees up within ``queue_timeout`` seconds.
+A render that runs past ``render_timeout`` raises a RenderError; its worker
+finishes it in the background and keeps its slot until then, so abandoned
+renders still count against the limit.
+
+Given a RenderCache, render() serves repeat renders of unchanged charts from
+disk, and identical renders requested at the same time share one job.
+"""
+import asyncio
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+import importlib
+import logging
+import multiprocessing
+import os
+import time
+from typing import Any, Dict, Optional
+
+from ai_service.core.exceptions import RenderError, ResourceExhaustionError
+from ai_service.core.render_cache import RenderCache, render_key
+from ai_service.core.rectification.executor import available_cpu_count
+
+logger = logging.getLogger(__name__)
+
+# Render job kinds and the function rendering each, as "module:function".
+# Every function takes the output path as its last argument and returns the
+# path it wrote.
+RENDERERS = {
+    "chart_pdf": "ai_service.utils.chart_visualizer:render_chart_pdf",
+    "chart_wheel": "ai_service.utils.chart_visualizer:render_chart_wheel",
+    "comparison": "ai_service.utils.chart_visualizer:generate_comparison_chart",
+    "vedic_square": "ai_service.utils.chart_visualizer:render_vedic_square_chart",
+    "chart_3d": "ai_service.utils.chart_visualizer:generate_3d_chart",
+    "planet_table": "ai_service.utils.chart_visualizer:generate_planet_table",
+    "chart_report_pdf": "ai_service.utils.chart_visualizer:save_chart_as_pdf",
+    # matplotlib-free renderers; only PNGs rasterized from them need a worker
+    "svg_wheel": "ai_service.utils.svg_chart:render_chart_wheel_svg",
+    "svg_vedic_square": "ai_service.utils.svg_chart:render_vedic_square_svg",
+    "svg_comparison": "ai_service.utils.svg_chart:render_comparison_svg",
+}
+
+
+def init_render_worker() -> None:
+    """Worker process initializer: import the rendering libraries and build the font cache."""
+    import matplotlib
+    matplotlib.use("Agg")
+    import matplotlib.pyplot  # noqa: F401
+    from matplotlib import font_manager
+    font_manager.findfont(font_manager.FontProperties(family="DejaVu Sans"))
+
+    from reportlab.lib.styles import getSampleStyleSheet
+    getSampleStyleSheet()
+
+    import ai_service.utils.chart_visualizer  # noqa: F401
+
+
+def run_render_job(renderer: str, args: tuple) -> str:
+    """Run one render job in a worker process; renderer is a RENDERERS value."""
+    module_name, function_name = renderer.split(":")
+    render = getattr(importlib.import_module(module_name), function_name)
+    try:
+        return render(*args)
+    finally:
+        # Workers are long-lived; a failed render must not leak its figures
+        import matplotlib.pyplot as plt
+        plt.close("all")
+
+
+class RenderService:
+    """Bounded process pool for chart rendering."""
+
+    def __init__(
+        self,
+        max_workers: Optional[int] = None,
+        max_queue_depth: Optional[int] = None,
+        queue_timeout: float = 30.0,
+        render_timeout: float = 60.0,
+        cache: Optional[RenderCache] = None
+    ):
+        """
+        Initialize the service. Worker processes start on the first render.
+
+        Args:
+            max_workers: Number of worker processes; defaults to the CPUs the
+                container may use, at most four
+            max_queue_depth: Maximum renders queued or running at once;
+                defaults to two per worker
+            queue_timeout: Seconds a render may wait for a queue slot before
+                it is rejected
+            render_timeout: Seconds a caller waits for a running render
+            cache: Cache of finished renders; without one every render is drawn
+        """
+        self.max_workers = max_workers or min(4, available_cpu_count())
+        self.max_queue_depth = max_queue_depth or self.max_workers * 2
+        self.queue_timeout = queue_timeout
+        self.render_timeout = render_timeout
+        self.cache = cache
+
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._slots = asyncio.Semaphore(self.max_queue_depth)
+        # Renders in progress by cache key, so identical requests share one
+        self._pending: Dict[str, "asyncio.Future[str]"] = {}
+
+        self._submitted = 0
+        self._completed = 0
+        self._failed = 0
+        self._rejected = 0
+        self._timed_out = 0
+        self._in_flight = 0
+        self._total_run_time = 0.0
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        """Return the process pool, starting the workers on first use."""
+        if self._executor is None:
+            # Spawn rather than fork: the parent runs an event loop and
+            # worker threads whose locks must not be copied into the children
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.max_workers,
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=init_render_worker
+            )
+            logger.info(f"Started render pool with {self.max_workers} workers (queue depth {self.max_queue_depth})")
+        return self._executor
+
+    def submit(self, kind: str, *args: Any, timeout: Optional[float] = None) -> "asyncio.Future[str]":
+        """
+        Queue a render job.
+
+        Args:
+            kind: Job kind, one of RENDERERS
+            *args: Arguments for the renderer, ending with the output path
+            timeout: Seconds to wait for the running render; defaults to
+                render_timeout
+
+        Returns:
+            Future resolving to the path of the rendered file
+
+        Raises:
+            RenderError: If the job kind is unknown
+        """
+        if kind not in RENDERERS:
+            raise RenderError(f"Unknown render job '{kind}'", details={"kind": kind})
+        return asyncio.ensure_future(self._run(kind, args, self.render_timeout if timeout is None else timeout))
+
+    async def render(self, kind: str, *args: Any, timeout: Optional[float] = None) -> str:
+        """
+        Render a file in a worker process and await its path.
+
+        With a cache, the file is looked up by content first and a new
+        render is written to the cache instead of the output path, whose
+        extension only selects the format.
+
+        Args:
+            kind: Job kind, one of RENDERERS
+            *args: Arguments for the renderer, ending with the output path
+            timeout: Seconds to wait for the running render; defaults to
+                render_timeout
+
+        Returns:
+            Path of the rendered file; always use it rather than the output
+            path passed in
+
+        Raises:
+            RenderError: If the job kind is unknown, the render timed out or
+                a worker died; the renderer's own errors are raised as is
+            ResourceExhaustionError: If no queue slot frees up in time
+        """
+        if self.cache is None:
+            return await self.submit(kind, *args, timeout=timeout)
+        if kind not in RENDERERS:
+            raise RenderError(f"Unknown render job '{kind}'", details={"kind": kind})
+
+        *inputs, output_path = args
+        extension = os.path.splitext(output_path)[1]
+        key = render_key(kind, inputs, extension)
+
+        cached = self.cache.get(key)
+        if cached is not None:
+            return cached
+
+        pending = self._pending.get(key)
+        if pending is None:
+            pending = asyncio.ensure_future(self._render_to_cache(kind, inputs, key, extension, timeout))
+            self._pending[key] = pending
+            pending.add_done_callback(lambda _: self._pending.pop(key, None))
+        # One caller giving up must not cancel the render for the others
+        return await asyncio.shield(pending)
+
+    async def _render_to_cache(
+        self,
+        kind: str,
+        inputs: list,
+        key: str,
+        extension: str,
+        timeout: Optional[float]
+    ) -> str:
+        partial_path = self.cache.partial_path_for(key, extension)
+        try:
+            await self.submit(kind, *inputs, partial_path, timeout=timeout)
+            return self.cache.put(key, partial_path, extension)
+        except BaseException:
+            if os.path.exists(partial_path):
+                os.remove(partial_path)
+            raise
+
+    async def _run(self, kind: str, args: tuple, timeout: float) -> str:
+        try:
+            await asyncio.wait_for(self._slots.acquire(), timeout=self.queue_timeout)
+        except asyncio.TimeoutError:
+            self._rejected += 1
+            raise ResourceExhaustionError(
+                "Render queue is full",
+                details={"max_queue_depth": self.max_queue_depth, "queue_timeout": self.queue_timeout}
+            )
+
+        self._submitted += 1
+        self._in_flight += 1
+        started_at = time.perf_counter()
+        try:
+            job = self._get_executor().submit(run_render_job, RENDERERS[kind], args)
+        except BaseException:
+            self._in_flight -= 1
+            self._slots.release()
+            raise
+        future = asyncio.wrap_future(job)
+
+        def finished(done: asyncio.Future) -> None:
+            # The slot is only free once the worker is, even if the caller
+            # stopped waiting earlier
+            self._total_run_time += time.perf_counter() - started_at
+            self._in_flight -= 1
+            self._slots.release()
+            if not done.cancelled() and done.exception() is not None:
+                self._failed += 1
+            elif not done.cancelled():
+                self._completed += 1
+
+        future.add_done_callback(finished)
+
+        try:
+            return await asyncio.wait_for(asyncio.shield(future), timeout=timeout)
+        except asyncio.TimeoutError:
+            # Drops the job if it has not started; a running one is left to finish
+            job.cancel()
+            self._timed_out += 1
+            raise RenderError(f"Rendering {kind} timed out", details={"kind": kind, "timeout": timeout})
+        except asyncio.CancelledError:
+            job.cancel()
+            raise
+        except BrokenProcessPool as e:
+            logger.error("Render worker process died; restarting the pool on the next job")
+            self._reset_executor()
+            raise RenderError(f"Render worker died while rendering {kind}", details={"kind": kind}) from e
+
+    def get_metrics(self) -> Dict[str, Any]:
+        """Return queue depth and throughput metrics."""
+        finished = self._completed + self._failed
+        return {
+            "workers": self.max_workers,
+            "started": self._executor is not None,
+            "max_queue_depth": self.max_queue_depth,
+            "in_flight": self._in_flight,
+            "submitted": self._submitted,
+            "completed": self._completed,
+            "failed": self._failed,
+            "rejected": self._rejected,
+            "timed_out": self._timed_out,
+            "avg_run_seconds": self._total_run_time / finished if finished else 0.0,
+            "cache": self.cache.get_stats() if self.cache is not None else None,
+        }
+
+    def _reset_executor(self) -> None:
+        """Drop the current process pool so the next job starts a fresh one."""
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+    def shutdown(self) -> None:
+        """Shut down the worker processes, cancelling queued jobs."""
+        if self._executor is not None:
+            self._reset_executor()
+            logger.info("Render pool shut down")
+
+
+# Shared service instance
+_render_service: Optional[RenderService] = None
+
+
+def get_render_service() -> RenderService:
+    """Return the shared render service, creating it on first use."""
+    global _render_service
+    if _render_service is None:
+        from ai_service.core.config import settings
+
+        cache_megabytes = int(os.getenv("RENDER_CACHE_MAX_MB", "512"))
+        cache = RenderCache(
+            os.getenv("RENDER_CACHE_DIR", os.path.join(settings.MEDIA_ROOT, "render_cache")),
+            max_bytes=cache_megabytes * 1024 * 1024
+        ) if cache_megabytes > 0 else None
+        _render_service = RenderService(
+            max_workers=int(os.getenv("RENDER_WORKERS", "0")) or None,
+            max_queue_depth=int(os.getenv("RENDER_QUEUE_DEPTH", "0")) or None,
+            queue_timeout=float(os.getenv("RENDER_QUEUE_TIMEOUT", "30")),
+            render_timeout=float(os.getenv("RENDER_TIMEOUT", "60")),
+            cache=cache
+        )
+    return _render_service
+
+
+def shutdown_render_service() -> None:
+    """Shut down the shared render service if it was started."""
+    global _render_service
+    if _render_service is not None:
+        _render_service.shutdown()
+        _render_service = None
@@ -0,0 +1,237 @@
+"""
+Indexed file storage for charts.
+
+Each chart body is one JSON file in a two-level directory tree sharded by a
+hash of its ID (``ab/cd/<chart_id>.json``), so no directory grows past a
+few hundred entries. A SQLite index next to the tree maps every chart ID to
+its file and a small metadata summary. Lookups are one index query and one
+file read, whatever the number of charts, and listings page through the
+index without opening chart bodies.
+
+Flat ``<chart_id>.json`` files left in the root by the previous layout are
+moved into the tree when the index is first created.
+"""
+
+import asyncio
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+import threading
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+INDEX_FILENAME = "charts_index.sqlite3"
+
+# Other records kept as flat files in the same directory
+_NON_CHART_PREFIXES = ("rectification_", "comparison_", "export_")
+
+_INDEX_SCHEMA = """
+CREATE TABLE IF NOT EXISTS charts (
+    chart_id TEXT PRIMARY KEY,
+    path TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    chart_type TEXT,
+    rectification_id TEXT,
+    birth_date TEXT,
+    birth_time TEXT,
+    created_at TEXT,
+    updated_at TEXT
+);
+CREATE INDEX IF NOT EXISTS charts_by_created ON charts (created_at, chart_id);
+CREATE INDEX IF NOT EXISTS charts_by_rectification ON charts (rectification_id);
+"""
+
+_SUMMARY_COLUMNS = ("chart_id", "chart_type", "rectification_id", "birth_date", "birth_time",
+                    "created_at", "updated_at", "size")
+
+
+def _summary_fields(chart_data: Dict[str, Any]) -> Dict[str, Any]:
+    """Pick the indexed metadata out of a chart."""
+    birth_details = chart_data.get("birth_details")
+    if not isinstance(birth_details, dict):
+        birth_details = {}
+    return {
+        "chart_type": chart_data.get("chart_type"),
+        "rectification_id": chart_data.get("rectification_id"),
+        "birth_date": birth_details.get("birth_date") or chart_data.get("birth_date"),
+        "birth_time": (birth_details.get("birth_time") or chart_data.get("birth_time")
+                       or chart_data.get("rectified_birth_time")),
+        "created_at": str(chart_data.get("created_at") or datetime.now().isoformat()),
+        "updated_at": str(chart_data.get("updated_at") or chart_data.get("created_at") or datetime.now().isoformat()),
+    }
+
+
+class ChartStore:
+    """Sharded chart files with a SQLite index."""
+
+    def __init__(self, root: str):
+        """
+        Args:
+            root: Directory holding the shard tree and the index; created if missing
+        """
+        self.root = root
+        os.makedirs(root, exist_ok=True)
+        index_path = os.path.join(root, INDEX_FILENAME)
+        is_new = not os.path.exists(index_path)
+
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(index_path, check_same_thread=False, timeout=10.0)
+        self._connection.row_factory = sqlite3.Row
+        with self._lock:
+            self._connection.execute("PRAGMA journal_mode=WAL")
+            self._connection.executescript(_INDEX_SCHEMA)
+            self._connection.commit()
+
+        if is_new:
+            self._import_flat_files()
+
+    def relative_path(self, chart_id: str) -> str:
+        """Path of a chart's file relative to the root."""
+        digest = hashlib.sha1(chart_id.encode("utf-8")).hexdigest()
+        return os.path.join(digest[:2], digest[2:4], f"{chart_id}.json")
+
+    def path_for(self, chart_id: str) -> str:
+        """Absolute path of a chart's file."""
+        return os.path.join(self.root, self.relative_path(chart_id))
+
+    def _write_file(self, chart_id: str, chart_data: Dict[str, Any]) -> Dict[str, Any]:
+        """Write a chart's file and return its index row."""
+        relative_path = self.relative_path(chart_id)
+        path = os.path.join(self.root, relative_path)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+
+        body = json.dumps(chart_data, default=str, separators=(",", ":")).encode("utf-8")
+        temp_path = f"{path}.tmp"
+        with open(temp_path, "wb") as f:
+            f.write(body)
+        os.replace(temp_path, path)
+
+        return dict(_summary_fields(chart_data), chart_id=chart_id, path=relative_path, size=len(body))
+
+    def _index(self, rows: List[Dict[str, Any]]) -> None:
+        with self._lock:
+            self._connection.executemany(
+                "INSERT OR REPLACE INTO charts (chart_id, path, size, chart_type, rectification_id, birth_date, "
+                "birth_time, created_at, updated_at) VALUES (:chart_id, :path, :size, :chart_type, "
+                ":rectification_id, :birth_date, :birth_time, :created_at, :updated_at)",
+                rows
+            )
+            self._connection.commit()
+
+    def _write(self, chart_id: str, chart_data: Dict[str, Any]) -> None:
+        self._index([self._write_file(chart_id, chart_data)])
+
+    def _write_many(self, charts: List[Tuple[str, Dict[str, Any]]]) -> None:
+        self._index([self._write_file(chart_id, chart_data) for chart_id, chart_data in charts])
+
+    def _read(self, chart_id: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            row = self._connection.execute("SELECT path FROM charts WHERE chart_id = ?", (chart_id,)).fetchone()
+        if row is None:
+            return None
+        try:
+            with open(os.path.join(self.root, row["path"]), "rb") as f:
+                return json.loads(f.read())
+        except FileNotFoundError:
+            logger.warning(f"Chart {chart_id} is indexed but its file is missing; dropping it from the index")
+            self._remove(chart_id)
+            return None
+
+    def _remove(self, chart_id: str) -> bool:
+        with self._lock:
+            row = self._connection.execute("SELECT path FROM charts WHERE chart_id = ?", (chart_id,)).fetchone()
+            if row is None:
+                return False
+            self._connection.execute("DELETE FROM charts WHERE chart_id = ?", (chart_id,))
+            self._connection.commit()
+        try:
+            os.remove(os.path.join(self.root, row["path"]))
+        except FileNotFoundError:
+            pass
+        return True
+
+    def _contains(self, chart_id: str) -> bool:
+        with self._lock:
+            return self._connection.execute("SELECT 1 FROM charts WHERE chart_id = ?", (chart_id,)).fetchone() is not None
+
+    def _list(self, limit: int, offset: int, rectification_id: Optional[str]) -> List[Dict[str, Any]]:
+        query = f"SELECT {', '.join(_SUMMARY_COLUMNS)} FROM charts"
+        params: List[Any] = []
+        if rectification_id is not None:
+            query += " WHERE rectification_id = ?"
+            params.append(rectification_id)
+        query += " ORDER BY created_at, chart_id LIMIT ? OFFSET ?"
+        params.extend([limit, offset])
+        with self._lock:
+            rows = self._connection.execute(query, params).fetchall()
+        return [dict(row, id=row["chart_id"]) for row in rows]
+
+    def _count(self) -> int:
+        with self._lock:
+            return self._connection.execute("SELECT COUNT(*) FROM charts").fetchone()[0]
+
+    def _import_flat_files(self) -> None:
+        """Move charts stored as flat files in the root into the shard tree."""
+        imported = 0
+        for entry in os.scandir(self.root):
+            if (not entry.is_file() or not entry.name.endswith(".json")
+                    or entry.name.startswith(_NON_CHART_PREFIXES)):
+                continue
+            try:
+                with open(entry.path, "r") as f:
+                    chart_data = json.load(f)
+                chart_id = chart_data.get("chart_id") or chart_data.get("id") or entry.name[:-len(".json")]
+                self._write(chart_id, chart_data)
+                os.remove(entry.path)
+                imported += 1
+            except Exception as e:
+                logger.warning(f"Could not import chart file {entry.path}: {e}")
+        if imported:
+            logger.info(f"Imported {imported} chart files into the indexed store at {self.root}")
+
+    async def put(self, chart_id: str, chart_data: Dict[str, Any]) -> None:
+        """Write a chart and index it, replacing any previous version."""
+        await asyncio.to_thread(self._write, chart_id, chart_data)
+
+    async def put_many(self, charts: List[Tuple[str, Dict[str, Any]]]) -> None:
+        """Write several charts and index them in one transaction."""
+        await asyncio.to_thread(self._write_many, charts)
+
+    async def get(self, chart_id: str) -> Optional[Dict[str, Any]]:
+        """Read a chart, or None if it is not stored."""
+        return await asyncio.to_thread(self._read, chart_id)
+
+    async def delete(self, chart_id: str) -> bool:
+        """Delete a chart; returns whether it was stored."""
+        return await asyncio.to_thread(self._remove, chart_id)
+
+    async def contains(self, chart_id: str) -> bool:
+        """Return whether a chart is stored, without reading it."""
+        return await asyncio.to_thread(self._contains, chart_id)
+
+    async def list(self, limit: int = 100, offset: int = 0, rectification_id: Optional[str] = None) -> List[Dict[str, Any]]:
+        """
+        Page through chart summaries from the index, oldest first.
+
+        Args:
+            limit: Maximum number of summaries
+            offset: Number of summaries to skip
+            rectification_id: Only charts produced by this rectification
+
+        Returns:
+            Summaries with chart_id (also as id), chart_type, rectification_id,
+            birth_date, birth_time, created_at, updated_at and size
+        """
+        return await asyncio.to_thread(self._list, limit, offset, rectification_id)
+
+    async def count(self) -> int:
+        """Number of stored charts."""
+        return await asyncio.to_thread(self._count)
+
+    def close(self) -> None:
+        with self._lock:
+            self._connection.close()
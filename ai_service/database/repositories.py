@@ -17,6 +17,7 @@ import traceback
 from pathlib import Path
 
 from ai_service.core.config import settings
+from ai_service.database.chart_store import ChartStore
 from ai_service.database.connection import acquire_pool, close_pool, get_db_pool
 from ai_service.database.initialization import initialize_database
 
@@ -27,6 +28,7 @@ class ChartRepository:
 
     db_pool: Optional[asyncpg.Pool]
     file_storage_path: str
+    chart_store: ChartStore
     _all_tasks: set
 
     def __init__(self, db_pool: Optional[asyncpg.Pool] = None, file_storage_path: Optional[str] = None):
@@ -57,6 +59,10 @@ class ChartRepository:
         # Create the directory if it doesn't exist
         os.makedirs(self.file_storage_path, exist_ok=True)
 
+        # Charts are kept in a sharded tree indexed by ID; rectifications,
+        # comparisons and exports stay as flat files alongside it
+        self.chart_store = ChartStore(self.file_storage_path)
+
         if not self.db_pool:
             # Only log as warning if not in a test environment
             if in_test_env:
@@ -192,9 +198,6 @@ class ChartRepository:
         Returns:
             The chart ID
         """
-        filepath = os.path.join(self.file_storage_path, f"{chart_id}.json")
-        os.makedirs(os.path.dirname(filepath), exist_ok=True)
-
         # Make a copy to avoid modifying the original
         local_data = chart_data.copy()
 
@@ -202,9 +205,8 @@ class ChartRepository:
         local_data["chart_id"] = chart_id
 
         try:
-            with open(filepath, 'w') as f:
-                json.dump(local_data, f, default=str, indent=2)
-            logger.info(f"Stored chart {chart_id} in file {filepath}")
+            await self.chart_store.put(chart_id, local_data)
+            logger.info(f"Stored chart {chart_id} in file {self.chart_store.path_for(chart_id)}")
             return chart_id
         except Exception as e:
             logger.error(f"Error storing chart {chart_id} to file: {e}")
@@ -288,6 +290,61 @@ class ChartRepository:
             logger.info(f"Using file storage for chart {chart_id}: {e}")
             return await self._store_chart_in_file(chart_id, chart_data)
 
+    async def store_charts(self, charts: List[Dict[str, Any]]) -> List[str]:
+        """
+        Store several charts in one write.
+
+        Charts are written in a single database round trip, or in a single
+        index transaction when file storage is used.
+
+        Args:
+            charts: The charts to store; IDs and timestamps are added as in store_chart
+
+        Returns:
+            The chart IDs, in order
+        """
+        now = datetime.now().isoformat()
+        for chart_data in charts:
+            if 'chart_id' not in chart_data:
+                chart_data['chart_id'] = f"chart_{uuid.uuid4().hex[:10]}"
+            chart_data.setdefault('created_at', now)
+            chart_data.setdefault('updated_at', now)
+        chart_ids = [chart_data['chart_id'] for chart_data in charts]
+
+        if self.db_pool:
+            try:
+                async def _store_charts_operation(db_pool: asyncpg.Pool, charts: List[Dict[str, Any]]):
+                    rows = [
+                        (
+                            chart_data['chart_id'],
+                            json.dumps(chart_data, default=str),
+                            datetime.fromisoformat(str(chart_data['created_at'])),
+                            datetime.fromisoformat(str(chart_data['updated_at']))
+                        )
+                        for chart_data in charts
+                    ]
+                    async with db_pool.acquire() as conn:
+                        await conn.executemany('''
+                            INSERT INTO charts (chart_id, chart_data, created_at, updated_at)
+                            VALUES ($1, $2, $3, $4)
+                            ON CONFLICT (chart_id)
+                            DO UPDATE SET chart_data = $2, updated_at = $4
+                        ''', rows)
+                    logger.info(f"Stored {len(rows)} charts in database")
+                    return chart_ids
+
+                return await self._execute_db_operation("store_charts", _store_charts_operation, charts)
+            except Exception as e:
+                logger.info(f"Using file storage for {len(charts)} charts: {e}")
+
+        try:
+            await self.chart_store.put_many([(chart_data['chart_id'], chart_data) for chart_data in charts])
+            logger.info(f"Stored {len(charts)} charts in file storage")
+            return chart_ids
+        except Exception as e:
+            logger.error(f"Error storing {len(charts)} charts to file: {e}")
+            raise ValueError(f"Failed to store charts: {e}")
+
     async def get_chart(self, chart_id: str) -> Optional[Dict[str, Any]]:
         """
         Retrieve a chart from the repository.
@@ -352,142 +409,40 @@ class ChartRepository:
             return await self._get_chart_from_file(chart_id)
 
     async def _get_chart_from_file(self, chart_id: str) -> Optional[Dict[str, Any]]:
-        """Retrieve a chart from a file."""
+        """Retrieve a chart from the indexed file store."""
         try:
-            # Create a file path for the chart
-            file_path = os.path.join(self.file_storage_path, f"{chart_id}.json")
-
-            # Log all the paths we're going to check
-            logger.debug(f"Attempting to retrieve chart {chart_id}, checking primary path: {file_path}")
-
-            # Check if the file exists
-            if not os.path.exists(file_path):
-                # Try alternative locations first
-                alternative_paths = [
-                    # Try main data directory
-                    os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "data", "charts", f"{chart_id}.json"),
-                    # Try app root data directory
-                    os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))), "data", "charts", f"{chart_id}.json"),
-                    # Check test directory for charts
-                    os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))), "tests", "test_data_source", "charts", f"{chart_id}.json"),
-                ]
-
-                # Special handling for rectified chart IDs - they have a specific format
-                if chart_id.startswith("rectified_chart_"):
-                    # Add more potential locations for rectified charts
-                    rectified_paths = [
-                        # Try rectified charts subdirectory
-                        os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "data", "rectified_charts", f"{chart_id}.json"),
-                        # Try app root rectified charts directory
-                        os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))), "data", "rectified_charts", f"{chart_id}.json"),
-                        # Try test rectified charts directory
-                        os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))), "tests", "test_data_source", "rectified_charts", f"{chart_id}.json"),
-                    ]
-                    alternative_paths.extend(rectified_paths)
-
-                logger.debug(f"Chart not found at primary path, checking alternative locations: {alternative_paths}")
-
-                for alt_path in alternative_paths:
-                    if os.path.exists(alt_path):
-                        logger.info(f"Found chart {chart_id} in alternative location: {alt_path}")
-                        with open(alt_path, 'r') as f:
-                            return json.loads(f.read())
-
-                # Also check if the chart is in the test database
-                test_db_path = os.environ.get('TEST_DB_FILE', os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))), "tests", "test_data_source", "test_db.json"))
-                if test_db_path and os.path.exists(test_db_path):
-                    logger.debug(f"Checking test database for chart: {test_db_path}")
-                    try:
-                        with open(test_db_path, 'r') as f:
-                            test_db = json.load(f)
-
-                            # Check standard charts collection
-                            if 'charts' in test_db and 'items' in test_db['charts']:
-                                for item in test_db['charts']['items']:
-                                    if item.get('id') == chart_id or item.get('chart_id') == chart_id:
-                                        logger.info(f"Found chart {chart_id} in test_db charts collection")
-                                        return item
-
-                            # Check rectified_charts collection
-                            if 'rectified_charts' in test_db and 'items' in test_db['rectified_charts']:
-                                for item in test_db['rectified_charts']['items']:
-                                    if item.get('id') == chart_id or item.get('chart_id') == chart_id:
-                                        logger.info(f"Found chart {chart_id} in test_db rectified_charts collection")
-                                        return item
-
-                            # Check rectifications collection which might contain or reference chart data
-                            if 'rectifications' in test_db and 'items' in test_db['rectifications']:
-                                for item in test_db['rectifications']['items']:
-                                    # Check if this item contains or references our chart
-                                    if item.get('rectified_chart_id') == chart_id:
-                                        # If chart_data is directly included in the rectification
-                                        if 'chart_data' in item:
-                                            logger.info(f"Found chart data for {chart_id} in rectification")
-                                            return item['chart_data']
-
-                                        # If we have the rectification data and can generate a chart
-                                        if 'rectified_time' in item and 'original_time' in item:
-                                            # Generate a basic chart structure with the ID
-                                            logger.info(f"Reconstructing chart {chart_id} from rectification data")
-                                            return {
-                                                "id": chart_id,
-                                                "rectified_birth_time": item.get('rectified_time'),
-                                                "original_birth_time": item.get('original_time'),
-                                                "chart_type": "rectified",
-                                                "created_at": datetime.now().isoformat(),
-                                                "rectification_id": item.get('rectification_id')
-                                            }
-
-                                    # If the rectification itself is what we're looking for
-                                    if item.get('rectification_id') in chart_id:
-                                        logger.info(f"Found rectification {item.get('rectification_id')} related to {chart_id}")
-                                        # Extract the chart ID if it exists
-                                        if 'chart_id' in item:
-                                            inner_chart_id = item.get('chart_id')
-                                            if inner_chart_id:
-                                                # Try to get the referenced chart first
-                                                inner_chart = await self._get_chart_from_file(inner_chart_id)
-                                                if inner_chart:
-                                                    return inner_chart
-                    except Exception as e:
-                        logger.warning(f"Error checking test DB for chart {chart_id}: {str(e)}")
-                        # Continue with other checks even if test DB fails
-
-                # Special handling for rectified charts - try to recreate from original chart
-                if chart_id.startswith("rectified_chart_"):
-                    try:
-                        # Extract rectification ID from chart ID
-                        parts = chart_id.split('_')
-                        if len(parts) >= 4:
-                            rectification_id = '_'.join(parts[2:-1])
-                            logger.info(f"Attempting to reconstruct rectified chart from rectification ID: {rectification_id}")
-
-                            # Try to find the rectification data
-                            rectification = await self.get_rectification(rectification_id)
-                            if rectification and 'rectified_time' in rectification:
-                                # Create a simplified chart with the rectified time
-                                logger.info(f"Reconstructed chart {chart_id} from rectification {rectification_id}")
-                                return {
-                                    "id": chart_id,
-                                    "rectified_birth_time": rectification.get('rectified_time'),
-                                    "original_birth_time": rectification.get('original_time'),
-                                    "chart_type": "rectified",
-                                    "created_at": datetime.now().isoformat(),
-                                    "rectification_id": rectification_id
-                                }
-                    except Exception as e:
-                        logger.warning(f"Failed to reconstruct chart from rectification: {str(e)}")
-
-                # If not found by now, log and return None
-                logger.warning(f"Chart {chart_id} not found in any location after exhaustive search")
-                return None
+            chart_data = await self.chart_store.get(chart_id)
+            if chart_data is not None:
+                logger.info(f"Retrieved chart {chart_id} from file storage")
+                return chart_data
 
-            # Read the chart data from the file
-            with open(file_path, 'r') as f:
-                chart_data = json.loads(f.read())
+            # Rectified charts that were never stored can be rebuilt from their rectification
+            if chart_id.startswith("rectified_chart_"):
+                try:
+                    # Extract rectification ID from chart ID
+                    parts = chart_id.split('_')
+                    if len(parts) >= 4:
+                        rectification_id = '_'.join(parts[2:-1])
+                        logger.info(f"Attempting to reconstruct rectified chart from rectification ID: {rectification_id}")
+
+                        # Try to find the rectification data
+                        rectification = await self.get_rectification(rectification_id)
+                        if rectification and 'rectified_time' in rectification:
+                            # Create a simplified chart with the rectified time
+                            logger.info(f"Reconstructed chart {chart_id} from rectification {rectification_id}")
+                            return {
+                                "id": chart_id,
+                                "rectified_birth_time": rectification.get('rectified_time'),
+                                "original_birth_time": rectification.get('original_time'),
+                                "chart_type": "rectified",
+                                "created_at": datetime.now().isoformat(),
+                                "rectification_id": rectification_id
+                            }
+                except Exception as e:
+                    logger.warning(f"Failed to reconstruct chart from rectification: {str(e)}")
 
-            logger.info(f"Retrieved chart {chart_id} from file {file_path}")
-            return chart_data
+            logger.debug(f"Chart {chart_id} not found in file storage")
+            return None
         except Exception as e:
             logger.error(f"Error retrieving chart {chart_id} from file: {str(e)}")
             return None
@@ -546,25 +501,23 @@ class ChartRepository:
             return await self._delete_chart_from_file(chart_id)
 
     async def _delete_chart_from_file(self, chart_id: str) -> bool:
-        """Delete a chart from a file."""
+        """Delete a chart from the indexed file store."""
         try:
-            # Create a file path for the chart
-            file_path = os.path.join(self.file_storage_path, f"{chart_id}.json")
-
-            # Check if the file exists
-            if not os.path.exists(file_path):
+            if not await self.chart_store.delete(chart_id):
                 return False
 
-            # Delete the file
-            os.remove(file_path)
-
-            logger.info("Deleted chart %s from file %s", chart_id, file_path)
+            logger.info("Deleted chart %s from file storage", chart_id)
             return True
         except Exception as e:
             logger.error("Error deleting chart %s from file: %s", chart_id, str(e))
             return False
 
-    async def list_charts(self, limit: int = 100, offset: int = 0) -> List[Dict[str, Any]]:
+    async def list_charts(
+        self,
+        limit: int = 100,
+        offset: int = 0,
+        rectification_id: Optional[str] = None
+    ) -> List[Dict[str, Any]]:
         """
         List charts from the repository.
 
@@ -573,9 +526,10 @@ class ChartRepository:
         Args:
             limit: Maximum number of charts to return
             offset: Number of charts to skip
+            rectification_id: Only list charts produced by this rectification
 
         Returns:
-            A list of chart data
+            A list of chart summaries, oldest first (see ChartStore.list)
         """
         try:
             if self.db_pool:
@@ -591,25 +545,17 @@ class ChartRepository:
         except Exception as e:
             # Fall back to file storage
             logger.warning("Falling back to file storage for listing charts: %s", str(e))
-            return await self._list_charts_from_files(limit, offset)
+            return await self._list_charts_from_files(limit, offset, rectification_id)
 
-    async def _list_charts_from_files(self, limit: int = 100, offset: int = 0) -> List[Dict[str, Any]]:
-        """List charts from files."""
+    async def _list_charts_from_files(
+        self,
+        limit: int = 100,
+        offset: int = 0,
+        rectification_id: Optional[str] = None
+    ) -> List[Dict[str, Any]]:
+        """List chart summaries from the file store index, without reading chart files."""
         try:
-            # Get a list of all chart files
-            chart_files = [f for f in os.listdir(self.file_storage_path) if f.endswith('.json')]
-
-            # Apply offset and limit
-            chart_files = chart_files[offset:offset + limit]
-
-            # Load each chart
-            charts = []
-            for chart_file in chart_files:
-                chart_id = chart_file.replace('.json', '')
-                chart_data = await self._get_chart_from_file(chart_id)
-                if chart_data:
-                    charts.append(chart_data)
-
+            charts = await self.chart_store.list(limit, offset, rectification_id)
             logger.info("Listed %d charts from files", len(charts))
             return charts
         except Exception as e:
@@ -796,10 +742,8 @@ class ChartRepository:
         try:
             # First check if the charts exist in file storage but not in database
             # This avoids trying database operations that will fail with foreign key constraints
-            chart1_file_path = os.path.join(self.file_storage_path, f"{chart1_id}.json")
-            chart2_file_path = os.path.join(self.file_storage_path, f"{chart2_id}.json")
-            chart1_in_file = os.path.exists(chart1_file_path)
-            chart2_in_file = os.path.exists(chart2_file_path)
+            chart1_in_file = await self.chart_store.contains(chart1_id)
+            chart2_in_file = await self.chart_store.contains(chart2_id)
 
             # If both or either chart only exists in file storage, we should skip database operations
             if (chart1_in_file or chart2_in_file) and not self.db_pool:
@@ -846,14 +790,12 @@ class ChartRepository:
 
                     # If charts don't exist in database, check if they exist as files
                     if not chart1_exists:
-                        chart1_file_path = os.path.join(self.file_storage_path, f"{chart1_id}.json")
-                        chart1_exists = os.path.exists(chart1_file_path)
+                        chart1_exists = await self.chart_store.contains(chart1_id)
                         if chart1_exists:
                             logger.info(f"Chart 1 with ID {chart1_id} exists in file storage")
 
                     if not chart2_exists:
-                        chart2_file_path = os.path.join(self.file_storage_path, f"{chart2_id}.json")
-                        chart2_exists = os.path.exists(chart2_file_path)
+                        chart2_exists = await self.chart_store.contains(chart2_id)
                         if chart2_exists:
                             logger.info(f"Chart 2 with ID {chart2_id} exists in file storage")
 
@@ -1073,8 +1015,7 @@ class ChartRepository:
         try:
             # First check if the chart exists in file storage but not in database
             # This avoids trying database operations that will fail with foreign key constraints
-            chart_file_path = os.path.join(self.file_storage_path, f"{chart_id}.json")
-            chart_in_file = os.path.exists(chart_file_path)
+            chart_in_file = bool(chart_id) and await self.chart_store.contains(chart_id)
 
             # If chart only exists in file storage and db not available, use file storage directly
             if chart_in_file and not self.db_pool:
@@ -1110,8 +1051,7 @@ class ChartRepository:
 
                     # If chart doesn't exist in database, check if it exists as a file
                     if not chart_exists:
-                        chart_file_path = os.path.join(self.file_storage_path, f"{chart_id}.json")
-                        chart_exists = os.path.exists(chart_file_path)
+                        chart_exists = await self.chart_store.contains(chart_id)
                         if chart_exists:
                             logger.info(f"Chart with ID {chart_id} exists in file storage")
 
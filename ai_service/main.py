@@ -75,6 +75,13 @@ async def startup_event():
         import traceback
         logger.critical(traceback.format_exc())
 
+@app.on_event("shutdown")
+async def shutdown_event():
+    from ai_service.core.rectification.chart_workers import shutdown_chart_worker_pool
+    from ai_service.core.render_service import shutdown_render_service
+    shutdown_chart_worker_pool()
+    shutdown_render_service()
+
 # Include routers
 from ai_service.api.routers import router
 app.include_router(router)
@@ -4,7 +4,6 @@ Handles AI-based analysis for birth time rectification.
 """
 
 import logging
-import time
 import json
 import re
 import os
@@ -14,6 +13,7 @@ from typing import Dict, List, Any, Optional, Union, Tuple
 
 # Import OpenAI service for AI-powered rectification
 from ai_service.api.services.openai import get_openai_service
+from ai_service.api.services.openai.response_cache import get_response_cache, make_cache_key
 
 # Configure logging
 logger = logging.getLogger(__name__)
@@ -35,10 +35,9 @@ class UnifiedRectificationModel:
         self.model_version = "1.0.0"
         self.is_initialized = True
 
-        # Initialize caching for improved performance
-        self.request_counter = 0
-        self.last_cache_clear = time.time()
-        self.response_cache = {}  # Simple cache for repeated queries
+        # Parsed rectification results are kept in the bounded LLM response
+        # cache, which evicts by size and TTL
+        self.response_cache = get_response_cache()
 
         # Initialize OpenAI service - required for operation
         self.openai_service = get_openai_service()
@@ -107,12 +106,16 @@ class UnifiedRectificationModel:
             Tuple of (adjustment_minutes, confidence)
         """
         # Create cache key based on input data
-        cache_key = f"{hash(str(birth_details))}-{hash(str(questionnaire_data))}"
+        cache_key = make_cache_key(
+            "unified_rectification", self.model_version, {"birth_details": birth_details, "questionnaire": questionnaire_data}
+        )
 
         # Check if result is in cache
-        if cache_key in self.response_cache:
+        cached = await self.response_cache.get(cache_key, "unified_rectification")
+        if cached is not None:
             logger.info("Using cached rectification result")
-            return self.response_cache[cache_key]
+            adjustment_minutes, confidence = cached
+            return adjustment_minutes, confidence
 
         # Format chart data and questionnaire responses
         prompt = self._prepare_rectification_prompt(birth_details, chart_data, questionnaire_data)
@@ -139,10 +142,7 @@ class UnifiedRectificationModel:
         confidence = parsed_result.get("confidence", 70.0)
 
         # Cache the result
-        self.response_cache[cache_key] = (adjustment_minutes, confidence)
-
-        # Update request counter and clear cache if needed
-        self._update_cache_management()
+        await self.response_cache.put(cache_key, [adjustment_minutes, confidence])
 
         return adjustment_minutes, confidence
 
@@ -497,19 +497,6 @@ class UnifiedRectificationModel:
         logger.error(f"All parsing methods failed for response content")
         raise ValueError("Unable to extract rectification data from AI response")
 
-    def _update_cache_management(self):
-        """Update request counter and manage cache size"""
-        self.request_counter += 1
-
-        # Clear cache periodically to prevent memory issues
-        current_time = time.time()
-        if (self.request_counter > 1000 or
-            (current_time - self.last_cache_clear > 3600)):  # 1 hour
-            self.response_cache.clear()
-            self.request_counter = 0
-            self.last_cache_clear = current_time
-            logger.info("Cache cleared due to size or time limit")
-
     async def rectify_birth_time(self, birth_details: Dict[str, Any],
                            questionnaire_data: Dict[str, Any],
                            original_chart: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
@@ -6,6 +6,8 @@ Provides functionality to compare original and rectified birth charts.
 import logging
 import uuid
 import math
+
+import numpy as np
 from typing import List, Dict, Any, Optional, Tuple
 from datetime import datetime
 
@@ -14,10 +16,27 @@ from ai_service.models.chart_comparison import (
     AspectData, ChartComparisonResponse
 )
 from ai_service.api.routers.consolidated_chart.utils import retrieve_chart
+from ai_service.core.rectification.aspects import AspectSet
+from ai_service.core.rectification.chart_vector import POINT_NAMES, ChartVector
 
 # Setup logging
 logger = logging.getLogger("birth-time-rectifier.chart-comparison")
 
+# Minimum movement in degrees reported for each planet, in POINT_NAMES order
+_PLANET_THRESHOLDS = np.array([
+    0.2 if name in ["sun", "moon"] else 0.3 if name in ["mercury", "venus", "mars"] else 0.1
+    for name in POINT_NAMES
+])
+
+# Aspects compared between charts
+_COMPARISON_ASPECTS = AspectSet.from_orbs({
+    "conjunction": 8.0,
+    "opposition": 8.0,
+    "trine": 7.0,
+    "square": 7.0,
+    "sextile": 6.0,
+}, inclusive=True)
+
 class ChartComparisonService:
     """Service for comparing astrological charts"""
 
@@ -328,20 +347,24 @@ class ChartComparisonService:
                 logger.warning("Charts are missing planetary data")
                 return differences
 
-            # Create lookup dictionaries
-            planets1 = {p.get("name", "").lower(): p for p in chart1["planets"]}
-            planets2 = {p.get("name", "").lower(): p for p in chart2["planets"]}
+            # Degree differences for every standard planet in one pass over
+            # the position arrays; planets missing from either chart are NaN
+            # and never pass the threshold
+            vector1 = ChartVector.from_chart_dict(chart1)
+            vector2 = ChartVector.from_chart_dict(chart2)
+            degree_diffs = np.abs(vector1.longitudes - vector2.longitudes) % 360
+            degree_diffs = np.where(degree_diffs > 180, 360 - degree_diffs, degree_diffs)
+            changed = np.nonzero(degree_diffs > _PLANET_THRESHOLDS)[0]
 
-            # Standard planet names to ensure we don't miss any
-            standard_planets = [
-                "sun", "moon", "mercury", "venus", "mars", "jupiter", "saturn",
-                "uranus", "neptune", "pluto", "north node", "south node", "chiron"
-            ]
+            if len(changed) == 0:
+                return differences
 
-            for planet_name in standard_planets:
-                if planet_name not in planets1 or planet_name not in planets2:
-                    continue
+            # Look up names and signs only for the planets that moved
+            planets1 = self._planet_lookup(chart1["planets"])
+            planets2 = self._planet_lookup(chart2["planets"])
 
+            for index in changed:
+                planet_name = POINT_NAMES[index]
                 p1 = planets1[planet_name]
                 p2 = planets2[planet_name]
 
@@ -351,21 +374,7 @@ class ChartComparisonService:
                 p2_lon = p2.get("longitude", 0)
                 p1_sign = p1.get("sign", "Unknown")
                 p2_sign = p2.get("sign", "Unknown")
-
-                # Calculate degree difference
-                degree_diff = abs(p1_lon - p2_lon)
-                degree_diff = self._normalize_degree_difference(degree_diff)
-
-                # Only create a difference if it's significant enough
-                # Different thresholds for different bodies
-                min_threshold = 0.1
-                if planet_name in ["sun", "moon"]:
-                    min_threshold = 0.2
-                elif planet_name in ["mercury", "venus", "mars"]:
-                    min_threshold = 0.3
-
-                if degree_diff <= min_threshold:
-                    continue
+                degree_diff = float(degree_diffs[index])
 
                 # Check if sign has changed
                 sign_changed = p1_sign != p2_sign
@@ -394,10 +403,20 @@ class ChartComparisonService:
             logger.warning(f"Error comparing planets: {str(e)}")
             return differences
 
+    def _planet_lookup(self, planets: Any) -> Dict[str, Dict[str, Any]]:
+        """Index a planets section (list of dicts or dict keyed by name) by lowercase name."""
+        if isinstance(planets, dict):
+            return {name.lower(): data for name, data in planets.items()}
+        return {p.get("name", "").lower(): p for p in planets}
+
     def _compare_aspects(self, chart1: Dict[str, Any], chart2: Dict[str, Any]) -> List[ChartDifference]:
         """
         Compare aspects between two charts.
 
+        Aspects are matched from the planet positions of both charts with
+        the same aspect set and orbs, so charts calculated at different
+        times or by different services compare consistently.
+
         Args:
             chart1: First chart data
             chart2: Second chart data
@@ -408,81 +427,83 @@ class ChartComparisonService:
         differences = []
 
         try:
-            if not (chart1.get("aspects") and chart2.get("aspects")):
-                # If either chart is missing aspects, return empty
+            if not (chart1.get("planets") and chart2.get("planets")):
+                # If either chart is missing planets, return empty
                 return differences
 
-            # Create lookup dictionaries
-            aspects1 = {f"{a.get('planet1', '')}-{a.get('planet2', '')}-{a.get('type', '')}": a
-                       for a in chart1.get("aspects", [])}
-            aspects2 = {f"{a.get('planet1', '')}-{a.get('planet2', '')}-{a.get('type', '')}": a
-                       for a in chart2.get("aspects", [])}
-
-            # Find aspects in chart1 that don't exist in chart2 (disappeared aspects)
-            for key, aspect in aspects1.items():
-                if key not in aspects2:
-                    planet1 = aspect.get("planet1", "Unknown")
-                    planet2 = aspect.get("planet2", "Unknown")
-                    aspect_type = aspect.get("type", "Unknown")
-
-                    difference = ChartDifference(
-                        element_type="aspect",
-                        element_name=f"{planet1}-{planet2}",
-                        difference_type=DifferenceType.ASPECT_REMOVED,
-                        description=f"{aspect_type.title()} aspect between {planet1.title()} and {planet2.title()} no longer present",
-                        original_value=f"{aspect_type.title()} ({aspect.get('orb', 0):.2f}° orb)",
-                        new_value="None",
-                        significance=self._get_aspect_significance(aspect_type, planet1, planet2)
-                    )
-                    differences.append(difference)
-
-            # Find aspects in chart2 that don't exist in chart1 (new aspects)
-            for key, aspect in aspects2.items():
-                if key not in aspects1:
-                    planet1 = aspect.get("planet1", "Unknown")
-                    planet2 = aspect.get("planet2", "Unknown")
-                    aspect_type = aspect.get("type", "Unknown")
-
-                    difference = ChartDifference(
-                        element_type="aspect",
-                        element_name=f"{planet1}-{planet2}",
-                        difference_type=DifferenceType.ASPECT_ADDED,
-                        description=f"New {aspect_type.title()} aspect between {planet1.title()} and {planet2.title()}",
-                        original_value="None",
-                        new_value=f"{aspect_type.title()} ({aspect.get('orb', 0):.2f}° orb)",
-                        significance=self._get_aspect_significance(aspect_type, planet1, planet2)
-                    )
-                    differences.append(difference)
-
-            # Find aspects that exist in both but have significant orb changes
-            for key in set(aspects1.keys()).intersection(aspects2.keys()):
-                aspect1 = aspects1[key]
-                aspect2 = aspects2[key]
-
-                orb1 = aspect1.get("orb", 0)
-                orb2 = aspect2.get("orb", 0)
+            # Only planets present in both charts are compared
+            longitudes1 = ChartVector.from_chart_dict(chart1).longitudes
+            longitudes2 = ChartVector.from_chart_dict(chart2).longitudes
+            present = ~(np.isnan(longitudes1) | np.isnan(longitudes2))
+            longitudes1 = np.where(present, longitudes1, np.nan)
+            longitudes2 = np.where(present, longitudes2, np.nan)
+
+            aspects1 = _COMPARISON_ASPECTS.matrix(longitudes1, longitudes1)
+            aspects2 = _COMPARISON_ASPECTS.matrix(longitudes2, longitudes2)
+
+            # Every planet pair once
+            pairs = np.triu(np.ones(aspects1.shape, dtype=bool), k=1)
+            same_type = aspects1.index == aspects2.index
+            removed = pairs & aspects1.matched & ~same_type
+            added = pairs & aspects2.matched & ~same_type
+            changed = pairs & aspects1.matched & same_type & (np.abs(aspects1.orb - aspects2.orb) > 0.5)
+
+            names = _COMPARISON_ASPECTS.names
+
+            # Aspects in chart1 that don't exist in chart2 (disappeared aspects)
+            for i, j in zip(*np.nonzero(removed)):
+                planet1, planet2 = POINT_NAMES[i].title(), POINT_NAMES[j].title()
+                aspect_type = names[aspects1.index[i, j]]
+
+                difference = ChartDifference(
+                    element_type="aspect",
+                    element_name=f"{planet1}-{planet2}",
+                    difference_type=DifferenceType.ASPECT_REMOVED,
+                    description=f"{aspect_type.title()} aspect between {planet1} and {planet2} no longer present",
+                    original_value=f"{aspect_type.title()} ({aspects1.orb[i, j]:.2f}° orb)",
+                    new_value="None",
+                    significance=self._get_aspect_significance(aspect_type, planet1, planet2)
+                )
+                differences.append(difference)
+
+            # Aspects in chart2 that don't exist in chart1 (new aspects)
+            for i, j in zip(*np.nonzero(added)):
+                planet1, planet2 = POINT_NAMES[i].title(), POINT_NAMES[j].title()
+                aspect_type = names[aspects2.index[i, j]]
+
+                difference = ChartDifference(
+                    element_type="aspect",
+                    element_name=f"{planet1}-{planet2}",
+                    difference_type=DifferenceType.ASPECT_ADDED,
+                    description=f"New {aspect_type.title()} aspect between {planet1} and {planet2}",
+                    original_value="None",
+                    new_value=f"{aspect_type.title()} ({aspects2.orb[i, j]:.2f}° orb)",
+                    significance=self._get_aspect_significance(aspect_type, planet1, planet2)
+                )
+                differences.append(difference)
+
+            # Aspects in both whose orb changed significantly (more than 0.5 degrees)
+            for i, j in zip(*np.nonzero(changed)):
+                planet1, planet2 = POINT_NAMES[i].title(), POINT_NAMES[j].title()
+                aspect_type = names[aspects1.index[i, j]]
+                orb1 = float(aspects1.orb[i, j])
+                orb2 = float(aspects2.orb[i, j])
                 orb_diff = abs(orb1 - orb2)
 
-                # Only report if orb changed significantly (more than 0.5 degrees)
-                if orb_diff > 0.5:
-                    planet1 = aspect1.get("planet1", "Unknown")
-                    planet2 = aspect1.get("planet2", "Unknown")
-                    aspect_type = aspect1.get("type", "Unknown")
-
-                    # Determine if aspect is strengthening or weakening
-                    strengthening = orb2 < orb1  # Lower orb is stronger
-
-                    difference = ChartDifference(
-                        element_type="aspect",
-                        element_name=f"{planet1}-{planet2}",
-                        difference_type=DifferenceType.ASPECT_CHANGED,
-                        description=f"{aspect_type.title()} aspect between {planet1.title()} and {planet2.title()} " +
-                                   (f"strengthened by {orb_diff:.2f}°" if strengthening else f"weakened by {orb_diff:.2f}°"),
-                        original_value=f"{orb1:.2f}° orb",
-                        new_value=f"{orb2:.2f}° orb",
-                        significance=min(100, max(0, self._get_aspect_significance(aspect_type, planet1, planet2) * orb_diff / 3))
-                    )
-                    differences.append(difference)
+                # Determine if aspect is strengthening or weakening
+                strengthening = orb2 < orb1  # Lower orb is stronger
+
+                difference = ChartDifference(
+                    element_type="aspect",
+                    element_name=f"{planet1}-{planet2}",
+                    difference_type=DifferenceType.ASPECT_CHANGED,
+                    description=f"{aspect_type.title()} aspect between {planet1} and {planet2} " +
+                               (f"strengthened by {orb_diff:.2f}°" if strengthening else f"weakened by {orb_diff:.2f}°"),
+                    original_value=f"{orb1:.2f}° orb",
+                    new_value=f"{orb2:.2f}° orb",
+                    significance=min(100, max(0, self._get_aspect_significance(aspect_type, planet1, planet2) * orb_diff / 3))
+                )
+                differences.append(difference)
 
             return differences
         except Exception as e:
@@ -7,7 +7,7 @@ It handles the business logic for astrological chart operations using real data
 
 import logging
 import uuid
-from typing import Dict, List, Any, Optional, Union, cast
+from typing import Any, AsyncIterable, AsyncIterator, Dict, List, Optional, Set, Tuple, Union, cast
 from datetime import datetime, timezone, UTC, timedelta, date
 import asyncio
 import os
@@ -35,6 +35,9 @@ from ai_service.core.config import settings
 from ai_service.core.rectification.main import comprehensive_rectification
 from ai_service.core.validators import validate_birth_details
 from ai_service.core.rectification.rectification_service import EnhancedRectificationService
+from ai_service.core.render_service import get_render_service
+from ai_service.utils.export_stream import write_json_export
+from ai_service.utils.svg_chart import RASTERIZE_AVAILABLE, render_chart_wheel_svg
 
 # Setup logging
 logger = logging.getLogger(__name__)
@@ -46,6 +49,23 @@ class DateTimeEncoder(json.JSONEncoder):
             return obj.isoformat()
         return super().default(obj)
 
+# How batch chart generation handles OpenAI verification
+BATCH_VERIFICATION_MODES = ("skip", "inline", "deferred")
+
+# Background verifications of batch-generated charts; referenced here so
+# they are not garbage collected while running
+_deferred_verifications: Set[asyncio.Task] = set()
+
+
+def _skipped_verification() -> Dict[str, Any]:
+    """Verification block of a chart generated without OpenAI verification."""
+    return {
+        "verified": True,
+        "confidence_score": 100.0,
+        "message": "Chart generated successfully (verification skipped)",
+        "corrections_applied": False
+    }
+
 class ChartVerifier:
     """
     Service for verifying astrological charts against Indian Vedic Astrological standards.
@@ -537,60 +557,12 @@ class ChartService:
         logger.info(f"Generating chart for: {birth_date} {birth_time} at {latitude}, {longitude}")
 
         try:
-            # Parse datetime and handle possible errors
-            birth_dt = self._parse_datetime(birth_date, birth_time, timezone)
-
-            # Get OpenAI service for verification
-            openai_service = get_openai_service()
-
-            # For chart calculation, use the appropriate calculator
-            from ai_service.core.rectification.chart_calculator import calculate_chart, EnhancedChartCalculator
-
-            # Use proper calculator object
-            calculator = EnhancedChartCalculator(use_openai=(openai_service is not None))
-
-            # Calculate chart using the correct calculator
-            chart_data = await calculator.calculate_chart(
-                birth_details={
-                    "date": birth_date,
-                    "time": birth_time,
-                    "latitude": latitude,
-                    "longitude": longitude,
-                    "timezone": timezone,
-                    "location": location
-                },
-                options={
-                    "house_system": house_system,
-                    "include_aspects": True,
-                    "include_houses": True
-                }
+            chart_data = await self._calculate_new_chart(
+                birth_date, birth_time, latitude, longitude, timezone,
+                house_system=house_system, zodiac_type=zodiac_type, ayanamsa=ayanamsa,
+                node_type=node_type, location=location
             )
 
-            # Add metadata to chart
-            chart_data["generated_at"] = datetime.now().isoformat()
-            chart_data["birth_details"] = {
-                "birth_date": birth_date,
-                "birth_time": birth_time,
-                "latitude": latitude,
-                "longitude": longitude,
-                "timezone": timezone,
-                "location": location
-            }
-
-            # Add settings information
-            chart_data["settings"] = {
-                "house_system": house_system,
-                "zodiac_type": zodiac_type,
-                "ayanamsa": ayanamsa,
-                "node_type": node_type
-            }
-
-            # Generate a unique chart ID
-            chart_id = f"chart_{uuid.uuid4().hex[:10]}"
-            chart_data["chart_id"] = chart_id
-            # Process chart data to normalize structure
-            chart_data = self._process_chart_data(chart_data)
-
             # If verification is enabled, verify the chart
             if verify_with_openai:
                 # Verify chart with OpenAI
@@ -604,12 +576,7 @@ class ChartService:
                 chart_data["verification"] = verification_result
             else:
                 # Add basic verification data if not verifying
-                chart_data["verification"] = {
-                    "verified": True,
-                    "confidence_score": 100.0,
-                    "message": "Chart generated successfully (verification skipped)",
-                    "corrections_applied": False
-                }
+                chart_data["verification"] = _skipped_verification()
 
             # Store the chart data
             await self.save_chart(chart_data)
@@ -620,6 +587,279 @@ class ChartService:
             logger.error(f"Error generating chart: {str(e)}")
             raise ValueError(f"Chart generation failed: {str(e)}")
 
+    async def _calculate_new_chart(
+        self,
+        birth_date: str,
+        birth_time: str,
+        latitude: float,
+        longitude: float,
+        timezone: str,
+        house_system: str = "P",
+        zodiac_type: str = "sidereal",
+        ayanamsa: float = 23.6647,
+        node_type: str = "true",
+        location: str = ""
+    ) -> Dict[str, Any]:
+        """
+        Calculate a chart and give it an ID, without verifying or storing it.
+
+        Returns:
+            Normalized chart data with birth details and settings
+        """
+        # Parse datetime and handle possible errors
+        birth_dt = self._parse_datetime(birth_date, birth_time, timezone)
+
+        # Get OpenAI service for verification
+        openai_service = get_openai_service()
+
+        # For chart calculation, use the appropriate calculator
+        from ai_service.core.rectification.chart_calculator import calculate_chart, EnhancedChartCalculator
+
+        # Use proper calculator object
+        calculator = EnhancedChartCalculator(use_openai=(openai_service is not None))
+
+        # Calculate chart using the correct calculator
+        chart_data = await calculator.calculate_chart(
+            birth_details={
+                "date": birth_date,
+                "time": birth_time,
+                "latitude": latitude,
+                "longitude": longitude,
+                "timezone": timezone,
+                "location": location
+            },
+            options={
+                "house_system": house_system,
+                "include_aspects": True,
+                "include_houses": True
+            }
+        )
+
+        # Add metadata to chart
+        chart_data["generated_at"] = datetime.now().isoformat()
+        chart_data["birth_details"] = {
+            "birth_date": birth_date,
+            "birth_time": birth_time,
+            "latitude": latitude,
+            "longitude": longitude,
+            "timezone": timezone,
+            "location": location
+        }
+
+        # Add settings information
+        chart_data["settings"] = {
+            "house_system": house_system,
+            "zodiac_type": zodiac_type,
+            "ayanamsa": ayanamsa,
+            "node_type": node_type
+        }
+
+        # Generate a unique chart ID
+        chart_id = f"chart_{uuid.uuid4().hex[:10]}"
+        chart_data["chart_id"] = chart_id
+        # Process chart data to normalize structure
+        return self._process_chart_data(chart_data)
+
+    async def generate_charts(
+        self,
+        records: AsyncIterable[Any],
+        verification: str = "skip",
+        batch_size: int = 50,
+        concurrency: Optional[int] = None
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Generate and store charts for a stream of birth records.
+
+        Records are calculated concurrently on the chart worker pool and
+        stored in batches; each result is yielded once its batch is stored,
+        in the order the charts finish. A record that fails yields an error
+        result and does not stop the others.
+
+        Args:
+            records: Birth records, each a dict with birth_date, birth_time,
+                latitude and longitude and optionally timezone, location and
+                house_system, either flat or under "birth_details". Records
+                that are not dicts are reported as invalid.
+            verification: "skip" to store charts unverified, "inline" to
+                verify each with OpenAI before it is stored, or "deferred" to
+                store charts at once and verify them in the background
+            batch_size: Maximum charts per repository write
+            concurrency: Maximum records in progress at once; defaults to the
+                chart worker pool's queue depth
+
+        Yields:
+            {"index", "status": "success", "chart_id", "chart"} or
+            {"index", "status": "error", "error"}, where index is the
+            record's position in the input
+        """
+        if verification not in BATCH_VERIFICATION_MODES:
+            raise ValueError(f"Unknown verification mode: {verification}")
+        if concurrency is None:
+            from ai_service.core.rectification.chart_workers import get_chart_worker_pool
+            concurrency = get_chart_worker_pool().max_queue_depth
+
+        slots = asyncio.Semaphore(concurrency)
+        finished: asyncio.Queue = asyncio.Queue()
+        timezones: Dict[Tuple[float, float], str] = {}
+        tasks: Set[asyncio.Task] = set()
+        submitted = 0
+
+        async def build(index: int, record: Any) -> None:
+            try:
+                chart_data = await self._chart_from_record(record, verification, timezones)
+                await finished.put((index, chart_data, None))
+            except Exception as e:
+                await finished.put((index, None, str(e)))
+            finally:
+                slots.release()
+
+        async def feed() -> None:
+            nonlocal submitted
+            async for record in records:
+                await slots.acquire()
+                task = asyncio.create_task(build(submitted, record))
+                tasks.add(task)
+                task.add_done_callback(tasks.discard)
+                submitted += 1
+
+        feeder = asyncio.create_task(feed())
+        received = 0
+        batch: List[Tuple[int, Dict[str, Any]]] = []
+        try:
+            while True:
+                if received == submitted and feeder.done():
+                    feeder.result()
+                    break
+                getter = asyncio.ensure_future(finished.get())
+                # Also wake up when the input ends, in case nothing is in progress
+                waiting = {getter} if feeder.done() else {getter, feeder}
+                await asyncio.wait(waiting, return_when=asyncio.FIRST_COMPLETED)
+                if not getter.done():
+                    getter.cancel()
+                    continue
+
+                index, chart_data, error = getter.result()
+                received += 1
+                if error is not None:
+                    yield {"index": index, "status": "error", "error": error}
+                else:
+                    batch.append((index, chart_data))
+
+                # Write when the batch is full or nothing else is ready, so
+                # writes are batched under load without holding results back
+                if batch and (len(batch) >= batch_size or finished.empty()):
+                    for result in await self._store_chart_batch(batch, verification):
+                        yield result
+                    batch = []
+        finally:
+            feeder.cancel()
+            for task in list(tasks):
+                task.cancel()
+
+    async def _chart_from_record(
+        self,
+        record: Any,
+        verification: str,
+        timezones: Dict[Tuple[float, float], str]
+    ) -> Dict[str, Any]:
+        """Validate one batch record and calculate its chart; raises ValueError if it is invalid."""
+        if not isinstance(record, dict):
+            raise ValueError("Record is not a JSON object")
+        details = record.get("birth_details") if isinstance(record.get("birth_details"), dict) else record
+        try:
+            birth_date = str(details["birth_date"])
+            birth_time = str(details["birth_time"])
+            latitude = float(details["latitude"])
+            longitude = float(details["longitude"])
+        except KeyError as e:
+            raise ValueError(f"Missing field: {e.args[0]}")
+        except (TypeError, ValueError):
+            raise ValueError("Latitude and longitude must be numbers")
+
+        timezone = details.get("timezone")
+        if not timezone:
+            # Records of one import often share a place
+            place = (round(latitude, 2), round(longitude, 2))
+            if place not in timezones:
+                timezones[place] = (await get_timezone_for_coordinates(latitude, longitude))["timezone"]
+            timezone = timezones[place]
+
+        validation = await validate_birth_details(birth_date, birth_time, latitude, longitude, timezone)
+        if not validation["valid"]:
+            raise ValueError("; ".join(validation["errors"]))
+
+        location = details.get("location") or ""
+        chart_data = await self._calculate_new_chart(
+            birth_date, birth_time, latitude, longitude, timezone,
+            house_system=details.get("house_system", "P"), location=location
+        )
+
+        if verification == "inline":
+            chart_data["verification"] = await self.verify_chart_with_openai(
+                chart_data=chart_data,
+                birth_date=birth_date,
+                birth_time=birth_time,
+                location=location or f"{latitude}, {longitude}"
+            )
+        elif verification == "deferred":
+            chart_data["verification"] = {
+                "verified": False,
+                "status": "pending",
+                "message": "Verification scheduled"
+            }
+        else:
+            chart_data["verification"] = _skipped_verification()
+        return chart_data
+
+    async def _store_chart_batch(
+        self,
+        batch: List[Tuple[int, Dict[str, Any]]],
+        verification: str
+    ) -> List[Dict[str, Any]]:
+        """Store a batch of generated charts and return their results."""
+        charts = [chart_data for _, chart_data in batch]
+        try:
+            if self.chart_repository is None:
+                raise ValueError("Chart repository is not initialized")
+            await self.chart_repository.store_charts(charts)
+        except Exception as e:
+            logger.error(f"Error storing a batch of {len(charts)} charts: {e}")
+            return [{"index": index, "status": "error", "error": f"Failed to store chart: {e}"} for index, _ in batch]
+
+        if verification == "deferred":
+            task = asyncio.create_task(self._verify_stored_charts(charts))
+            _deferred_verifications.add(task)
+            task.add_done_callback(_deferred_verifications.discard)
+
+        return [
+            {"index": index, "status": "success", "chart_id": chart_data["chart_id"], "chart": chart_data}
+            for index, chart_data in batch
+        ]
+
+    async def _verify_stored_charts(self, charts: List[Dict[str, Any]]) -> None:
+        """Verify stored charts with OpenAI and store them again with the results."""
+        verified = []
+        for chart_data in charts:
+            birth = chart_data.get("birth_details", {})
+            try:
+                result = await self.verify_chart_with_openai(
+                    chart_data=chart_data,
+                    birth_date=birth.get("birth_date", ""),
+                    birth_time=birth.get("birth_time", ""),
+                    location=birth.get("location") or f"{birth.get('latitude')}, {birth.get('longitude')}"
+                )
+            except Exception as e:
+                logger.warning(f"Deferred verification of chart {chart_data.get('chart_id')} failed: {e}")
+                continue
+            verified.append(dict(chart_data, verification=result, updated_at=datetime.now().isoformat()))
+
+        if verified:
+            try:
+                await self.chart_repository.store_charts(verified)
+                logger.info(f"Stored deferred verification results for {len(verified)} charts")
+            except Exception as e:
+                logger.error(f"Error storing deferred verification results: {e}")
+
     async def verify_chart_with_openai(
         self,
         chart_data: Dict[str, Any],
@@ -919,8 +1159,6 @@ class ChartService:
 
             # Generate comparison visualization
             if comparison_type.lower() in ["full", "with_visualization"]:
-                from ai_service.utils.chart_visualizer import generate_comparison_chart
-
                 # Create a unique filename for the comparison chart
                 visualization_dir = os.path.join(settings.MEDIA_ROOT, "comparisons")
                 os.makedirs(visualization_dir, exist_ok=True)
@@ -929,7 +1167,7 @@ class ChartService:
 
                 # Generate the comparison chart
                 try:
-                    chart_path = generate_comparison_chart(chart1, chart2, visualization_path)
+                    chart_path = await get_render_service().render("comparison", chart1, chart2, visualization_path)
 
                     # Add visualization URL to response
                     if os.path.exists(chart_path):
@@ -1423,6 +1661,55 @@ class ChartService:
             logger.error(traceback.format_exc())
             raise ValueError(f"Birth time rectification failed: {str(e)}")
 
+    async def enqueue_rectification(
+        self,
+        chart_id: str,
+        answers: List[Dict[str, Any]],
+        priority: int = 5
+    ) -> Dict[str, Any]:
+        """
+        Queue a comprehensive rectification for a rectification worker.
+
+        Args:
+            chart_id: The ID of the chart to rectify
+            answers: List of questionnaire answers
+            priority: Job priority from 0 (lowest) to 9 (highest)
+
+        Returns:
+            Dictionary with the job ID, its status and whether it was
+            deduplicated onto an identical pending job
+        """
+        from ai_service.core.rectification.jobs import get_job_queue
+
+        original_chart = await self.get_chart(chart_id)
+        if not original_chart:
+            raise ValueError(f"Chart not found: {chart_id}")
+
+        birth_details = original_chart.get("birth_details", {})
+        birth_date_str = birth_details.get("birth_date", birth_details.get("date", ""))
+        birth_time_str = birth_details.get("birth_time", birth_details.get("time", ""))
+        if not birth_date_str or not birth_time_str:
+            raise ValueError("Birth date or time missing in original chart")
+
+        payload = {
+            "chart_id": chart_id,
+            "birth_date": str(birth_date_str)[:10],
+            "birth_time": str(birth_time_str),
+            "latitude": birth_details.get("latitude", 0.0),
+            "longitude": birth_details.get("longitude", 0.0),
+            "timezone": birth_details.get("timezone", "UTC"),
+            "answers": answers,
+        }
+        job_id, created = await get_job_queue().enqueue("rectification", payload, priority=priority)
+
+        return {
+            "status": "queued",
+            "job_id": job_id,
+            "rectification_id": job_id,
+            "chart_id": chart_id,
+            "deduplicated": not created,
+        }
+
     async def get_rectification_status(self, rectification_id: str) -> Dict[str, Any]:
         """
         Get the status of a chart rectification.
@@ -1434,6 +1721,19 @@ class ChartService:
             Dictionary with rectification status and details
         """
         try:
+            # Queued rectifications are tracked by the job queue
+            from ai_service.core.rectification.jobs import JOB_ID_PREFIX, get_job_queue
+
+            if rectification_id.startswith(JOB_ID_PREFIX):
+                job = await get_job_queue().get_status(rectification_id)
+                if not job:
+                    return {
+                        "status": "not_found",
+                        "rectification_id": rectification_id,
+                        "error": "Rectification job not found"
+                    }
+                return dict(job, rectification_id=rectification_id)
+
             # Retrieve from repository
             if self.chart_repository is None:
                 logger.error("Chart repository is not initialized")
@@ -1447,7 +1747,7 @@ class ChartService:
                     logger.error("Chart repository is not initialized")
                     return {"status": "error", "message": "Chart repository is not available"}
 
-                charts = await self.chart_repository.list_charts()
+                charts = await self.chart_repository.list_charts(limit=1, rectification_id=rectification_id)
                 for chart in charts:
                     if chart.get("rectification_id") == rectification_id:
                         rectification_data = {
@@ -1522,21 +1822,8 @@ class ChartService:
             }
 
             # Depending on format, generate the export file
-            if format.lower() == "pdf":
-                # Generate a PDF file
-                self._generate_chart_pdf(chart_data, file_path)
-            elif format.lower() == "png":
-                # Generate a PNG file
-                self._generate_chart_image(chart_data, file_path, format="png")
-            elif format.lower() == "svg":
-                # Generate an SVG file
-                self._generate_chart_image(chart_data, file_path, format="svg")
-            elif format.lower() == "json":
-                # Generate a JSON file
-                with open(file_path, "w") as f:
-                    json.dump(chart_data, f, indent=2, cls=DateTimeEncoder)
-            else:
-                raise ValueError(f"Unsupported export format: {format}")
+            file_path = await self.render_export_file(chart_data, format, file_path)
+            export_metadata["file_path"] = file_path
 
             # Check if the file was created
             if not os.path.exists(file_path):
@@ -1559,6 +1846,7 @@ class ChartService:
                 "status": "success",
                 "export_id": export_id,
                 "download_url": download_url,
+                "file_path": file_path,
                 "format": format,
                 "message": "Export successfully generated"
             }
@@ -1571,6 +1859,41 @@ class ChartService:
                 "message": f"Failed to export chart: {str(e)}"
             }
 
+    async def render_export_file(self, chart_data: Dict[str, Any], format: str, file_path: str) -> str:
+        """
+        Render the export file of a chart.
+
+        SVGs are drawn directly by the SVG chart renderer. PNGs and PDFs are
+        rendered off the event loop and may be served from the render cache,
+        in which case the returned path differs from file_path; PNGs come
+        from matplotlib unless settings.CHART_PNG_RENDERER is "svg".
+
+        Args:
+            chart_data: Chart to export
+            format: The format to export to (pdf, png, svg, json)
+            file_path: Path for the export file
+
+        Returns:
+            Path of the export file
+        """
+        if format.lower() == "pdf":
+            # Generate a PDF file
+            return await get_render_service().render("chart_pdf", chart_data, file_path)
+        elif format.lower() == "svg":
+            # Vector output needs no matplotlib and takes under a millisecond
+            return await asyncio.to_thread(render_chart_wheel_svg, chart_data, file_path)
+        elif format.lower() == "png":
+            if settings.CHART_PNG_RENDERER.lower() == "svg":
+                if RASTERIZE_AVAILABLE:
+                    return await get_render_service().render("svg_wheel", chart_data, file_path)
+                logger.warning("CHART_PNG_RENDERER is 'svg' but cairosvg is not installed; using matplotlib")
+            return await get_render_service().render("chart_wheel", chart_data, file_path)
+        elif format.lower() == "json":
+            # Encoded and written chunk by chunk
+            return await asyncio.to_thread(write_json_export, chart_data, file_path)
+        else:
+            raise ValueError(f"Unsupported export format: {format}")
+
     async def calculate_chart(self, birth_details, options, chart_id=None):
         """
         Calculate an astrological chart with the provided birth details.
@@ -2061,346 +2384,6 @@ class ChartService:
                 "partial_interpretation": "A comprehensive chart interpretation requires proper astrological analysis."
             }
 
-    def _generate_chart_pdf(self, chart_data: Dict[str, Any], file_path: str) -> None:
-        """
-        Generate a PDF file containing the chart data.
-
-        Args:
-            chart_data: Chart data to include in the PDF
-            file_path: File path where to save the PDF
-        """
-        try:
-            # Import PDF generation libraries
-            from reportlab.lib.pagesizes import letter
-            from reportlab.pdfgen import canvas
-            from reportlab.lib.styles import getSampleStyleSheet
-            from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Table, TableStyle
-            from reportlab.lib import colors
-            import os
-
-            # Ensure directory exists
-            os.makedirs(os.path.dirname(file_path), exist_ok=True)
-
-            # Create PDF document
-            doc = SimpleDocTemplate(file_path, pagesize=letter)
-            styles = getSampleStyleSheet()
-            story = []
-
-            # Add title
-            title = "Astrological Chart"
-            if "birth_details" in chart_data and "full_name" in chart_data["birth_details"]:
-                full_name = chart_data["birth_details"]["full_name"]
-                if full_name:
-                    title = f"Astrological Chart for {full_name}"
-
-            story.append(Paragraph(title, styles["Title"]))
-            story.append(Spacer(1, 12))
-
-            # Add birth details
-            if "birth_details" in chart_data:
-                birth = chart_data["birth_details"]
-                story.append(Paragraph("Birth Details", styles["Heading2"]))
-
-                birth_data = []
-                if "birth_date" in birth:
-                    birth_data.append(["Date", birth.get("birth_date", "")])
-                if "birth_time" in birth:
-                    birth_data.append(["Time", birth.get("birth_time", "")])
-                if "location" in birth:
-                    birth_data.append(["Location", birth.get("location", "")])
-                if "latitude" in birth and "longitude" in birth:
-                    birth_data.append(["Coordinates", f"{birth.get('latitude', '')}, {birth.get('longitude', '')}"])
-
-                if birth_data:
-                    table = Table(birth_data, colWidths=[100, 300])
-                    table.setStyle(TableStyle([
-                        ('GRID', (0, 0), (-1, -1), 0.5, colors.grey),
-                        ('BACKGROUND', (0, 0), (0, -1), colors.lightgrey),
-                    ]))
-                    story.append(table)
-                    story.append(Spacer(1, 12))
-
-            # Add planet positions
-            if "planets" in chart_data:
-                story.append(Paragraph("Planetary Positions", styles["Heading2"]))
-                planets = chart_data["planets"]
-
-                planet_data = [["Planet", "Sign", "Degree", "House"]]
-                for planet, details in planets.items():
-                    if isinstance(details, dict):
-                        sign = details.get("sign", "")
-                        degree = f"{details.get('degree', 0):.2f}" if "degree" in details else ""
-                        house = str(details.get("house", "")) if "house" in details else ""
-                        planet_data.append([planet, sign, degree, house])
-
-                if len(planet_data) > 1:
-                    table = Table(planet_data, colWidths=[80, 100, 80, 80])
-                    table.setStyle(TableStyle([
-                        ('GRID', (0, 0), (-1, -1), 0.5, colors.grey),
-                        ('BACKGROUND', (0, 0), (-1, 0), colors.lightgrey),
-                    ]))
-                    story.append(table)
-                    story.append(Spacer(1, 12))
-
-            # Add house cusps
-            if "houses" in chart_data:
-                story.append(Paragraph("House Cusps", styles["Heading2"]))
-                houses = chart_data["houses"]
-
-                house_data = [["House", "Sign", "Degree"]]
-
-                # Handle both dictionary format and list format
-                if isinstance(houses, dict):
-                    for house_num, details in houses.items():
-                        if isinstance(details, dict):
-                            sign = details.get("sign", "")
-                            degree = f"{details.get('degree', 0):.2f}" if "degree" in details else ""
-                            house_data.append([str(house_num), sign, degree])
-                elif isinstance(houses, list):
-                    for i, house in enumerate(houses):
-                        if isinstance(house, dict):
-                            sign = house.get("sign", "")
-                            degree = f"{house.get('degree', 0):.2f}" if "degree" in house else ""
-                            house_data.append([str(i+1), sign, degree])
-
-                if len(house_data) > 1:
-                    table = Table(house_data, colWidths=[80, 100, 80])
-                    table.setStyle(TableStyle([
-                        ('GRID', (0, 0), (-1, -1), 0.5, colors.grey),
-                        ('BACKGROUND', (0, 0), (-1, 0), colors.lightgrey),
-                    ]))
-                    story.append(table)
-                    story.append(Spacer(1, 12))
-
-            # Add aspects
-            if "aspects" in chart_data:
-                story.append(Paragraph("Major Aspects", styles["Heading2"]))
-                aspects = chart_data["aspects"]
-
-                aspect_data = [["Planet 1", "Aspect", "Planet 2", "Orb"]]
-                for aspect in aspects:
-                    if isinstance(aspect, dict):
-                        planet1 = aspect.get("planet1", "")
-                        planet2 = aspect.get("planet2", "")
-                        aspect_type = aspect.get("type", "")
-                        orb = f"{aspect.get('orb', 0):.2f}" if "orb" in aspect else ""
-                        aspect_data.append([planet1, aspect_type, planet2, orb])
-
-                if len(aspect_data) > 1:
-                    table = Table(aspect_data, colWidths=[80, 80, 80, 80])
-                    table.setStyle(TableStyle([
-                        ('GRID', (0, 0), (-1, -1), 0.5, colors.grey),
-                        ('BACKGROUND', (0, 0), (-1, 0), colors.lightgrey),
-                    ]))
-                    story.append(table)
-                    story.append(Spacer(1, 12))
-
-            # Add verification info if available
-            if "verification" in chart_data:
-                verification = chart_data["verification"]
-                if isinstance(verification, dict):
-                    story.append(Paragraph("Chart Verification", styles["Heading2"]))
-
-                    verified = verification.get("verified", False)
-                    confidence = verification.get("confidence", 0)
-                    message = verification.get("message", "")
-
-                    verification_text = f"Verified: {'Yes' if verified else 'No'}"
-                    if confidence:
-                        verification_text += f", Confidence: {confidence}%"
-
-                    story.append(Paragraph(verification_text, styles["Normal"]))
-                    if message:
-                        story.append(Paragraph(message, styles["Normal"]))
-
-            # Build the PDF
-            doc.build(story)
-            logger.info(f"Generated chart PDF: {file_path}")
-
-        except Exception as e:
-            logger.error(f"Error generating chart PDF: {e}", exc_info=True)
-
-            # Create a JSON error report instead
-            error_file_path = file_path.replace(".pdf", "_error.json")
-            try:
-                with open(error_file_path, "w") as f:
-                    error_data = {
-                        "error": f"Failed to generate PDF: {str(e)}",
-                        "timestamp": datetime.now().isoformat()
-                    }
-                    json.dump(error_data, f, indent=2)
-            except Exception:
-                pass  # Ignore errors in error reporting
-
-            # Re-raise the exception
-            raise ValueError(f"Failed to generate chart PDF: {e}")
-
-    def _generate_chart_image(self, chart_data: Dict[str, Any], file_path: str, format: str = "png") -> None:
-        """
-        Generate an image file (PNG or SVG) containing the chart visualization.
-
-        Args:
-            chart_data: Chart data to visualize
-            file_path: File path where to save the image
-            format: Image format (png or svg)
-        """
-        try:
-            # Import visualization libraries
-            import matplotlib.pyplot as plt
-            import matplotlib as mpl
-            from matplotlib.patches import Circle, Wedge, Rectangle
-            import numpy as np
-            import os
-
-            # Ensure directory exists
-            os.makedirs(os.path.dirname(file_path), exist_ok=True)
-
-            # Create figure with polar projection
-            fig, ax = plt.subplots(subplot_kw={'projection': 'polar'}, figsize=(10, 10))
-            fig.set_facecolor('white')
-
-            # Set polar chart orientation properly
-            ax.set_xlim(0, 2*np.pi)
-            # These are valid matplotlib methods for polar plots
-            # Using explicit string notation to prevent linter errors
-            getattr(ax, "set_theta_zero_location")('N')
-            getattr(ax, "set_theta_direction")(-1)
-
-            # Draw the chart wheel - Outer circle
-            circle = Circle((0, 0), 1, fill=False, edgecolor='black', linewidth=2, transform=ax.transData)
-            ax.add_artist(circle)
-
-            # House wedges
-            houses = chart_data.get("houses", {})
-            if houses:
-                # Convert houses to a list format if it's a dictionary
-                houses_list = []
-                if isinstance(houses, dict):
-                    for i in range(1, 13):
-                        house_key = str(i)
-                        if house_key in houses:
-                            house_data = houses[house_key]
-                            if "longitude" in house_data:
-                                houses_list.append((i, house_data["longitude"]))
-                else:
-                    # Assume it's already a list
-                    for i, house in enumerate(houses):
-                        if isinstance(house, dict) and "longitude" in house:
-                            houses_list.append((i+1, house["longitude"]))
-
-                # Sort by house number
-                houses_list.sort(key=lambda x: x[0])
-
-                # Draw house wedges
-                if houses_list:
-                    for i in range(len(houses_list)):
-                        house_num, start_long = houses_list[i]
-                        _, end_long = houses_list[(i + 1) % len(houses_list)]
-
-                        # Convert to radians (0 at east, going counterclockwise)
-                        start_rad = np.radians(90 - start_long)
-                        end_rad = np.radians(90 - end_long)
-
-                        # If end is less than start, it wraps around 360 degrees
-                        if end_rad > start_rad:
-                            end_rad -= 2 * np.pi
-
-                        # Draw wedge
-                        wedge = Wedge((0, 0), 0.95, np.degrees(start_rad), np.degrees(end_rad),
-                                    width=0.3, alpha=0.2, edgecolor='black', linewidth=1)
-                        ax.add_patch(wedge)
-
-                        # Add house number
-                        mid_rad = (start_rad + end_rad) / 2
-                        ax.text(mid_rad, 0.8, str(house_num), ha='center', va='center',
-                               fontsize=12, fontweight='bold')
-
-            # Draw planets
-            planets = chart_data.get("planets", {})
-            if planets:
-                # Define planet symbols or use first letter
-                planet_symbols = {
-                    "Sun": "☉", "Moon": "☽", "Mercury": "☿", "Venus": "♀", "Mars": "♂",
-                    "Jupiter": "♃", "Saturn": "♄", "Uranus": "♅", "Neptune": "♆", "Pluto": "♇"
-                }
-
-                # Plot each planet
-                planet_positions = []
-                for planet_name, planet_data in planets.items():
-                    if isinstance(planet_data, dict) and "longitude" in planet_data:
-                        longitude = planet_data["longitude"]
-
-                        # Convert to radians (0 at east, going counterclockwise)
-                        rad = np.radians(90 - longitude)
-
-                        # Calculate position (different radius for each planet to avoid overlap)
-                        radius = 0.6  # Default radius
-
-                        # Check for planet clustering and adjust radius if needed
-                        for pos in planet_positions:
-                            pos_rad, pos_radius = pos
-                            if abs(rad - pos_rad) < 0.2:  # If planets are close
-                                radius = pos_radius - 0.08  # Adjust radius to avoid overlap
-
-                        planet_positions.append((rad, radius))
-
-                        # Get the planet symbol or use first letter
-                        symbol = planet_symbols.get(planet_name, planet_name[0])
-
-                        # Plot the planet
-                        ax.text(rad, radius, symbol, ha='center', va='center',
-                               fontsize=16, fontweight='bold')
-
-                        # Draw line to the wheel
-                        ax.plot([rad, rad], [radius, 0.95], color='black', linestyle='-', linewidth=0.5)
-
-            # Add title
-            title = "Astrological Chart"
-            if "birth_details" in chart_data:
-                birth_details = chart_data["birth_details"]
-                if "full_name" in birth_details and birth_details["full_name"]:
-                    title += f" for {birth_details['full_name']}"
-                elif "birth_date" in birth_details and "birth_time" in birth_details:
-                    title += f" - {birth_details['birth_date']} {birth_details['birth_time']}"
-
-            plt.title(title, fontsize=16, pad=20)
-
-            # Remove axis ticks and labels
-            ax.set_xticklabels([])
-            ax.set_yticklabels([])
-            ax.set_xticks([])
-            ax.set_yticks([])
-
-            # Hide the grid and axis
-            ax.grid(False)
-            for spine in ax.spines.values():
-                spine.set_visible(False)
-
-            # Save the chart
-            plt.tight_layout()
-            plt.savefig(file_path, format=format.lower(), dpi=300 if format.lower() == 'png' else 100)
-            plt.close()
-
-            logger.info(f"Generated chart image: {file_path}")
-
-        except Exception as e:
-            logger.error(f"Error generating chart image: {e}", exc_info=True)
-
-            # Create a JSON error report instead
-            error_file_path = file_path.replace(f".{format.lower()}", "_error.json")
-            try:
-                with open(error_file_path, "w") as f:
-                    error_data = {
-                        "error": f"Failed to generate image: {str(e)}",
-                        "timestamp": datetime.now().isoformat()
-                    }
-                    json.dump(error_data, f, indent=2)
-            except Exception:
-                pass  # Ignore errors in error reporting
-
-            # Re-raise the exception
-            raise ValueError(f"Failed to generate chart image: {e}")
-
     async def store_rectification_result(
         self,
         chart_id: str,
@@ -52,64 +52,11 @@ import matplotlib.font_manager as fm  # type: ignore
 from PIL import Image as PILImage  # type: ignore
 
 from ai_service.core.chart_calculator import normalize_longitude
+from ai_service.utils.constants import ZODIAC_SIGNS, ZODIAC_SYMBOLS, PLANET_SYMBOLS, PLANET_COLORS
 
 # Configure logging
 logger = logging.getLogger(__name__)
 
-# Constants for chart visualization
-ZODIAC_SIGNS = [
-    "Aries", "Taurus", "Gemini", "Cancer",
-    "Leo", "Virgo", "Libra", "Scorpio",
-    "Sagittarius", "Capricorn", "Aquarius", "Pisces"
-]
-
-ZODIAC_SYMBOLS = {
-    "Aries": "♈",
-    "Taurus": "♉",
-    "Gemini": "♊",
-    "Cancer": "♋",
-    "Leo": "♌",
-    "Virgo": "♍",
-    "Libra": "♎",
-    "Scorpio": "♏",
-    "Sagittarius": "♐",
-    "Capricorn": "♑",
-    "Aquarius": "♒",
-    "Pisces": "♓"
-}
-
-PLANET_SYMBOLS = {
-    "Sun": "☉",
-    "Moon": "☽",
-    "Mercury": "☿",
-    "Venus": "♀",
-    "Mars": "♂",
-    "Jupiter": "♃",
-    "Saturn": "♄",
-    "Uranus": "♅",
-    "Neptune": "♆",
-    "Pluto": "♇",
-    "Rahu": "☊",
-    "Ketu": "☋",
-    "Ascendant": "Asc"
-}
-
-PLANET_COLORS = {
-    "Sun": "#FFB900",
-    "Moon": "#C0C0C0",
-    "Mercury": "#9999FF",
-    "Venus": "#00C000",
-    "Mars": "#FF0000",
-    "Jupiter": "#FFA500",
-    "Saturn": "#0000A0",
-    "Uranus": "#00FFFF",
-    "Neptune": "#800080",
-    "Pluto": "#A52A2A",
-    "Rahu": "#708090",
-    "Ketu": "#808000",
-    "Ascendant": "#000000" # Black
-}
-
 # Remove duplicate type definition
 # Axes3DType = plt.Axes  # type: ignore
 
@@ -1173,3 +1120,353 @@ def save_chart_as_pdf(chart_data: Dict[str, Any], output_path: str) -> str:
         doc.build(elements)
 
         return output_path
+
+
+def render_chart_pdf(chart_data: Dict[str, Any], file_path: str) -> str:
+    """
+    Generate a PDF file containing the chart data.
+
+    Args:
+        chart_data: Chart data to include in the PDF
+        file_path: File path where to save the PDF
+
+    Returns:
+        Path to the generated PDF
+    """
+    try:
+        # Import PDF generation libraries
+        from reportlab.lib.pagesizes import letter
+        from reportlab.pdfgen import canvas
+        from reportlab.lib.styles import getSampleStyleSheet
+        from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Table, TableStyle
+        from reportlab.lib import colors
+
+        # Ensure directory exists
+        os.makedirs(os.path.dirname(file_path), exist_ok=True)
+
+        # Create PDF document
+        doc = SimpleDocTemplate(file_path, pagesize=letter)
+        styles = getSampleStyleSheet()
+        story = []
+
+        # Add title
+        title = "Astrological Chart"
+        if "birth_details" in chart_data and "full_name" in chart_data["birth_details"]:
+            full_name = chart_data["birth_details"]["full_name"]
+            if full_name:
+                title = f"Astrological Chart for {full_name}"
+
+        story.append(Paragraph(title, styles["Title"]))
+        story.append(Spacer(1, 12))
+
+        # Add birth details
+        if "birth_details" in chart_data:
+            birth = chart_data["birth_details"]
+            story.append(Paragraph("Birth Details", styles["Heading2"]))
+
+            birth_data = []
+            if "birth_date" in birth:
+                birth_data.append(["Date", birth.get("birth_date", "")])
+            if "birth_time" in birth:
+                birth_data.append(["Time", birth.get("birth_time", "")])
+            if "location" in birth:
+                birth_data.append(["Location", birth.get("location", "")])
+            if "latitude" in birth and "longitude" in birth:
+                birth_data.append(["Coordinates", f"{birth.get('latitude', '')}, {birth.get('longitude', '')}"])
+
+            if birth_data:
+                table = Table(birth_data, colWidths=[100, 300])
+                table.setStyle(TableStyle([
+                    ('GRID', (0, 0), (-1, -1), 0.5, colors.grey),
+                    ('BACKGROUND', (0, 0), (0, -1), colors.lightgrey),
+                ]))
+                story.append(table)
+                story.append(Spacer(1, 12))
+
+        # Add planet positions
+        if "planets" in chart_data:
+            story.append(Paragraph("Planetary Positions", styles["Heading2"]))
+            planets = chart_data["planets"]
+
+            planet_data = [["Planet", "Sign", "Degree", "House"]]
+            for planet, details in planets.items():
+                if isinstance(details, dict):
+                    sign = details.get("sign", "")
+                    degree = f"{details.get('degree', 0):.2f}" if "degree" in details else ""
+                    house = str(details.get("house", "")) if "house" in details else ""
+                    planet_data.append([planet, sign, degree, house])
+
+            if len(planet_data) > 1:
+                table = Table(planet_data, colWidths=[80, 100, 80, 80])
+                table.setStyle(TableStyle([
+                    ('GRID', (0, 0), (-1, -1), 0.5, colors.grey),
+                    ('BACKGROUND', (0, 0), (-1, 0), colors.lightgrey),
+                ]))
+                story.append(table)
+                story.append(Spacer(1, 12))
+
+        # Add house cusps
+        if "houses" in chart_data:
+            story.append(Paragraph("House Cusps", styles["Heading2"]))
+            houses = chart_data["houses"]
+
+            house_data = [["House", "Sign", "Degree"]]
+
+            # Handle both dictionary format and list format
+            if isinstance(houses, dict):
+                for house_num, details in houses.items():
+                    if isinstance(details, dict):
+                        sign = details.get("sign", "")
+                        degree = f"{details.get('degree', 0):.2f}" if "degree" in details else ""
+                        house_data.append([str(house_num), sign, degree])
+            elif isinstance(houses, list):
+                for i, house in enumerate(houses):
+                    if isinstance(house, dict):
+                        sign = house.get("sign", "")
+                        degree = f"{house.get('degree', 0):.2f}" if "degree" in house else ""
+                        house_data.append([str(i+1), sign, degree])
+
+            if len(house_data) > 1:
+                table = Table(house_data, colWidths=[80, 100, 80])
+                table.setStyle(TableStyle([
+                    ('GRID', (0, 0), (-1, -1), 0.5, colors.grey),
+                    ('BACKGROUND', (0, 0), (-1, 0), colors.lightgrey),
+                ]))
+                story.append(table)
+                story.append(Spacer(1, 12))
+
+        # Add aspects
+        if "aspects" in chart_data:
+            story.append(Paragraph("Major Aspects", styles["Heading2"]))
+            aspects = chart_data["aspects"]
+
+            aspect_data = [["Planet 1", "Aspect", "Planet 2", "Orb"]]
+            for aspect in aspects:
+                if isinstance(aspect, dict):
+                    planet1 = aspect.get("planet1", "")
+                    planet2 = aspect.get("planet2", "")
+                    aspect_type = aspect.get("type", "")
+                    orb = f"{aspect.get('orb', 0):.2f}" if "orb" in aspect else ""
+                    aspect_data.append([planet1, aspect_type, planet2, orb])
+
+            if len(aspect_data) > 1:
+                table = Table(aspect_data, colWidths=[80, 80, 80, 80])
+                table.setStyle(TableStyle([
+                    ('GRID', (0, 0), (-1, -1), 0.5, colors.grey),
+                    ('BACKGROUND', (0, 0), (-1, 0), colors.lightgrey),
+                ]))
+                story.append(table)
+                story.append(Spacer(1, 12))
+
+        # Add verification info if available
+        if "verification" in chart_data:
+            verification = chart_data["verification"]
+            if isinstance(verification, dict):
+                story.append(Paragraph("Chart Verification", styles["Heading2"]))
+
+                verified = verification.get("verified", False)
+                confidence = verification.get("confidence", 0)
+                message = verification.get("message", "")
+
+                verification_text = f"Verified: {'Yes' if verified else 'No'}"
+                if confidence:
+                    verification_text += f", Confidence: {confidence}%"
+
+                story.append(Paragraph(verification_text, styles["Normal"]))
+                if message:
+                    story.append(Paragraph(message, styles["Normal"]))
+
+        # Build the PDF
+        doc.build(story)
+        logger.info(f"Generated chart PDF: {file_path}")
+        return file_path
+
+    except Exception as e:
+        logger.error(f"Error generating chart PDF: {e}", exc_info=True)
+
+        # Create a JSON error report instead
+        error_file_path = file_path.replace(".pdf", "_error.json")
+        try:
+            with open(error_file_path, "w") as f:
+                error_data = {
+                    "error": f"Failed to generate PDF: {str(e)}",
+                    "timestamp": datetime.now().isoformat()
+                }
+                json.dump(error_data, f, indent=2)
+        except Exception:
+            pass  # Ignore errors in error reporting
+
+        # Re-raise the exception
+        raise ValueError(f"Failed to generate chart PDF: {e}")
+
+
+def render_chart_wheel(chart_data: Dict[str, Any], file_path: str, format: Optional[str] = None) -> str:
+    """
+    Generate an image file (PNG or SVG) containing the chart visualization.
+
+    Args:
+        chart_data: Chart data to visualize
+        file_path: File path where to save the image
+        format: Image format (png or svg); defaults to the file's extension
+
+    Returns:
+        Path to the generated image
+    """
+    format = format or os.path.splitext(file_path)[1].lstrip(".") or "png"
+
+    try:
+        # Import visualization libraries
+        import matplotlib.pyplot as plt
+        import matplotlib as mpl
+        from matplotlib.patches import Circle, Wedge, Rectangle
+        import numpy as np
+
+        # Ensure directory exists
+        os.makedirs(os.path.dirname(file_path), exist_ok=True)
+
+        # Create figure with polar projection
+        fig, ax = plt.subplots(subplot_kw={'projection': 'polar'}, figsize=(10, 10))
+        fig.set_facecolor('white')
+
+        # Set polar chart orientation properly
+        ax.set_xlim(0, 2*np.pi)
+        # These are valid matplotlib methods for polar plots
+        # Using explicit string notation to prevent linter errors
+        getattr(ax, "set_theta_zero_location")('N')
+        getattr(ax, "set_theta_direction")(-1)
+
+        # Draw the chart wheel - Outer circle
+        circle = Circle((0, 0), 1, fill=False, edgecolor='black', linewidth=2, transform=ax.transData)
+        ax.add_artist(circle)
+
+        # House wedges
+        houses = chart_data.get("houses", {})
+        if houses:
+            # Convert houses to a list format if it's a dictionary
+            houses_list = []
+            if isinstance(houses, dict):
+                for i in range(1, 13):
+                    house_key = str(i)
+                    if house_key in houses:
+                        house_data = houses[house_key]
+                        if "longitude" in house_data:
+                            houses_list.append((i, house_data["longitude"]))
+            else:
+                # Assume it's already a list
+                for i, house in enumerate(houses):
+                    if isinstance(house, dict) and "longitude" in house:
+                        houses_list.append((i+1, house["longitude"]))
+
+            # Sort by house number
+            houses_list.sort(key=lambda x: x[0])
+
+            # Draw house wedges
+            if houses_list:
+                for i in range(len(houses_list)):
+                    house_num, start_long = houses_list[i]
+                    _, end_long = houses_list[(i + 1) % len(houses_list)]
+
+                    # Convert to radians (0 at east, going counterclockwise)
+                    start_rad = np.radians(90 - start_long)
+                    end_rad = np.radians(90 - end_long)
+
+                    # If end is less than start, it wraps around 360 degrees
+                    if end_rad > start_rad:
+                        end_rad -= 2 * np.pi
+
+                    # Draw wedge
+                    wedge = Wedge((0, 0), 0.95, np.degrees(start_rad), np.degrees(end_rad),
+                                width=0.3, alpha=0.2, edgecolor='black', linewidth=1)
+                    ax.add_patch(wedge)
+
+                    # Add house number
+                    mid_rad = (start_rad + end_rad) / 2
+                    ax.text(mid_rad, 0.8, str(house_num), ha='center', va='center',
+                           fontsize=12, fontweight='bold')
+
+        # Draw planets
+        planets = chart_data.get("planets", {})
+        if planets:
+            # Define planet symbols or use first letter
+            planet_symbols = {
+                "Sun": "☉", "Moon": "☽", "Mercury": "☿", "Venus": "♀", "Mars": "♂",
+                "Jupiter": "♃", "Saturn": "♄", "Uranus": "♅", "Neptune": "♆", "Pluto": "♇"
+            }
+
+            # Plot each planet
+            planet_positions = []
+            for planet_name, planet_data in planets.items():
+                if isinstance(planet_data, dict) and "longitude" in planet_data:
+                    longitude = planet_data["longitude"]
+
+                    # Convert to radians (0 at east, going counterclockwise)
+                    rad = np.radians(90 - longitude)
+
+                    # Calculate position (different radius for each planet to avoid overlap)
+                    radius = 0.6  # Default radius
+
+                    # Check for planet clustering and adjust radius if needed
+                    for pos in planet_positions:
+                        pos_rad, pos_radius = pos
+                        if abs(rad - pos_rad) < 0.2:  # If planets are close
+                            radius = pos_radius - 0.08  # Adjust radius to avoid overlap
+
+                    planet_positions.append((rad, radius))
+
+                    # Get the planet symbol or use first letter
+                    symbol = planet_symbols.get(planet_name, planet_name[0])
+
+                    # Plot the planet
+                    ax.text(rad, radius, symbol, ha='center', va='center',
+                           fontsize=16, fontweight='bold')
+
+                    # Draw line to the wheel
+                    ax.plot([rad, rad], [radius, 0.95], color='black', linestyle='-', linewidth=0.5)
+
+        # Add title
+        title = "Astrological Chart"
+        if "birth_details" in chart_data:
+            birth_details = chart_data["birth_details"]
+            if "full_name" in birth_details and birth_details["full_name"]:
+                title += f" for {birth_details['full_name']}"
+            elif "birth_date" in birth_details and "birth_time" in birth_details:
+                title += f" - {birth_details['birth_date']} {birth_details['birth_time']}"
+
+        plt.title(title, fontsize=16, pad=20)
+
+        # Remove axis ticks and labels
+        ax.set_xticklabels([])
+        ax.set_yticklabels([])
+        ax.set_xticks([])
+        ax.set_yticks([])
+
+        # Hide the grid and axis
+        ax.grid(False)
+        for spine in ax.spines.values():
+            spine.set_visible(False)
+
+        # Save the chart
+        plt.tight_layout()
+        plt.savefig(file_path, format=format.lower(), dpi=300 if format.lower() == 'png' else 100)
+        plt.close()
+
+        logger.info(f"Generated chart image: {file_path}")
+        return file_path
+
+    except Exception as e:
+        logger.error(f"Error generating chart image: {e}", exc_info=True)
+
+        # Create a JSON error report instead
+        error_file_path = file_path.replace(f".{format.lower()}", "_error.json")
+        try:
+            with open(error_file_path, "w") as f:
+                error_data = {
+                    "error": f"Failed to generate image: {str(e)}",
+                    "timestamp": datetime.now().isoformat()
+                }
+                json.dump(error_data, f, indent=2)
+        except Exception:
+            pass  # Ignore errors in error reporting
+
+        # Re-raise the exception
+        raise ValueError(f"Failed to generate chart image: {e}")
@@ -9,6 +9,54 @@ ZODIAC_SIGNS = [
     "Sagittarius", "Capricorn", "Aquarius", "Pisces"
 ]
 
+# Glyphs and colors used when drawing charts
+ZODIAC_SYMBOLS = {
+    "Aries": "♈",
+    "Taurus": "♉",
+    "Gemini": "♊",
+    "Cancer": "♋",
+    "Leo": "♌",
+    "Virgo": "♍",
+    "Libra": "♎",
+    "Scorpio": "♏",
+    "Sagittarius": "♐",
+    "Capricorn": "♑",
+    "Aquarius": "♒",
+    "Pisces": "♓"
+}
+
+PLANET_SYMBOLS = {
+    "Sun": "☉",
+    "Moon": "☽",
+    "Mercury": "☿",
+    "Venus": "♀",
+    "Mars": "♂",
+    "Jupiter": "♃",
+    "Saturn": "♄",
+    "Uranus": "♅",
+    "Neptune": "♆",
+    "Pluto": "♇",
+    "Rahu": "☊",
+    "Ketu": "☋",
+    "Ascendant": "Asc"
+}
+
+PLANET_COLORS = {
+    "Sun": "#FFB900",
+    "Moon": "#C0C0C0",
+    "Mercury": "#9999FF",
+    "Venus": "#00C000",
+    "Mars": "#FF0000",
+    "Jupiter": "#FFA500",
+    "Saturn": "#0000A0",
+    "Uranus": "#00FFFF",
+    "Neptune": "#800080",
+    "Pluto": "#A52A2A",
+    "Rahu": "#708090",
+    "Ketu": "#808000",
+    "Ascendant": "#000000" # Black
+}
+
 # House systems
 PLACIDUS = "P"
 KOCH = "K"
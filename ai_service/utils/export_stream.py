@@ -0,0 +1,163 @@
+"""
+Chunked, optionally compressed streaming of chart exports.
+
+Exports are sent as a sequence of fixed-size chunks, so the memory a
+download needs does not grow with the size of the export: JSON is encoded
+piece by piece from the chart rather than built as one string, and files
+are read a chunk at a time. Chunks can be compressed on the fly with gzip,
+or with zstd when the optional ``zstandard`` package is installed, chosen
+from the client's Accept-Encoding.
+
+All iterators here are synchronous; Starlette runs them in its threadpool,
+so encoding, compression and file reads stay off the event loop.
+"""
+
+import importlib.util
+import zlib
+from typing import Any, Iterable, Iterator, Optional
+
+from ai_service.utils.json_encoder import DateTimeEncoder
+
+# zstd needs the optional zstandard package
+ZSTD_AVAILABLE = importlib.util.find_spec("zstandard") is not None
+
+CHUNK_SIZE = 64 * 1024
+
+# Content types that are compressed already and gain nothing from gzip;
+# reportlab deflates the page streams of the PDFs it writes
+PRECOMPRESSED_TYPES = frozenset({
+    "application/pdf", "image/png", "image/jpeg", "application/zip", "application/gzip",
+})
+
+
+def iter_json(data: Any, chunk_size: int = CHUNK_SIZE) -> Iterator[bytes]:
+    """
+    Encode data as indented JSON, chunk by chunk.
+
+    Args:
+        data: Value to encode; dates and datetimes become ISO strings
+        chunk_size: Approximate size of each chunk in bytes
+
+    Returns:
+        Iterator of UTF-8 encoded chunks
+    """
+    encoder = DateTimeEncoder(indent=2)
+    buffer = []
+    buffered = 0
+    for piece in encoder.iterencode(data):
+        buffer.append(piece)
+        buffered += len(piece)
+        if buffered >= chunk_size:
+            yield "".join(buffer).encode("utf-8")
+            buffer = []
+            buffered = 0
+    if buffer:
+        yield "".join(buffer).encode("utf-8")
+
+
+def iter_text(text: str, chunk_size: int = CHUNK_SIZE) -> Iterator[bytes]:
+    """Split a document into UTF-8 encoded chunks."""
+    for start in range(0, len(text), chunk_size):
+        yield text[start:start + chunk_size].encode("utf-8")
+
+
+def iter_file(path: str, chunk_size: int = CHUNK_SIZE) -> Iterator[bytes]:
+    """Read a file chunk by chunk."""
+    with open(path, "rb") as f:
+        while True:
+            chunk = f.read(chunk_size)
+            if not chunk:
+                return
+            yield chunk
+
+
+def write_json_export(data: Any, file_path: str) -> str:
+    """
+    Write data to a JSON file without building the whole document in memory.
+
+    Returns:
+        file_path
+    """
+    with open(file_path, "wb") as f:
+        for chunk in iter_json(data):
+            f.write(chunk)
+    return file_path
+
+
+def choose_encoding(accept_encoding: Optional[str], media_type: str) -> Optional[str]:
+    """
+    Pick the content coding for a response from the request's Accept-Encoding.
+
+    Args:
+        accept_encoding: Accept-Encoding header, if any
+        media_type: Content type of the response
+
+    Returns:
+        "zstd", "gzip" or None to send the content as is
+    """
+    if not accept_encoding or media_type in PRECOMPRESSED_TYPES:
+        return None
+    accepted = {}
+    for item in accept_encoding.split(","):
+        coding, _, parameters = item.strip().partition(";")
+        quality = 1.0
+        parameter = parameters.strip()
+        if parameter.startswith("q="):
+            try:
+                quality = float(parameter[2:])
+            except ValueError:
+                quality = 0.0
+        accepted[coding.strip().lower()] = quality
+
+    # zstd is preferred when available: it compresses better and faster
+    for coding in ("zstd", "gzip"):
+        if coding == "zstd" and not ZSTD_AVAILABLE:
+            continue
+        if accepted.get(coding, accepted.get("*", 0.0)) > 0:
+            return coding
+    return None
+
+
+def compress_chunks(chunks: Iterable[bytes], encoding: Optional[str]) -> Iterator[bytes]:
+    """
+    Compress a stream of chunks.
+
+    Each input chunk is flushed through the compressor, so the client
+    receives data as soon as it is produced.
+
+    Args:
+        chunks: Uncompressed chunks
+        encoding: "gzip", "zstd" or None to pass the chunks through
+
+    Returns:
+        Iterator of compressed chunks
+    """
+    if encoding is None:
+        yield from chunks
+        return
+
+    if encoding == "gzip":
+        compressor = zlib.compressobj(6, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+        for chunk in chunks:
+            data = compressor.compress(chunk) + compressor.flush(zlib.Z_SYNC_FLUSH)
+            if data:
+                yield data
+        yield compressor.flush()
+    elif encoding == "zstd":
+        import zstandard
+
+        compressor = zstandard.ZstdCompressor().compressobj()
+        for chunk in chunks:
+            data = compressor.compress(chunk) + compressor.flush(zstandard.COMPRESSOBJ_FLUSH_BLOCK)
+            if data:
+                yield data
+        yield compressor.flush()
+    else:
+        raise ValueError(f"Unsupported content encoding: {encoding}")
+
+
+def encoded_etag(etag: str, encoding: Optional[str]) -> str:
+    """ETag of a compressed representation, distinct from the uncompressed one."""
+    if encoding is None:
+        return etag
+    return f'{etag[:-1]}-{encoding}"'
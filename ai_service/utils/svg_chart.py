@@ -0,0 +1,455 @@
+"""
+Vector chart rendering without matplotlib.
+
+Draws the North Indian square chart, the chart wheel and the comparison
+overlay by writing SVG markup directly. Everything that does not depend on
+the chart -- the square's lines, the zodiac ring with its ticks and sign
+glyphs, the positions of the house labels -- is computed once at import as
+ready-made markup and anchor tables, so a render only formats the houses
+and planets of one chart. A render takes well under a millisecond and the
+module imports nothing beyond the standard library.
+
+PNG output rasterizes the SVG with CairoSVG, an optional dependency, and
+is only used when a PNG is asked for explicitly (see
+``settings.CHART_PNG_RENDERER``).
+"""
+
+import importlib.util
+import logging
+import math
+import os
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+from xml.sax.saxutils import escape
+
+from ai_service.core.exceptions import RenderError
+from ai_service.utils.constants import PLANET_COLORS, PLANET_SYMBOLS, ZODIAC_SIGNS, ZODIAC_SYMBOLS
+
+logger = logging.getLogger(__name__)
+
+RASTERIZE_AVAILABLE = importlib.util.find_spec("cairosvg") is not None
+
+FONT_FAMILY = "DejaVu Sans, Segoe UI Symbol, sans-serif"
+
+# Colors of the aspect lines drawn inside the wheel
+ASPECT_COLORS = {
+    "conjunction": "#808080",
+    "opposition": "#D03030",
+    "square": "#D03030",
+    "trine": "#3060D0",
+    "sextile": "#30A060",
+}
+
+# Colors of the two charts in a comparison overlay
+ORIGINAL_COLOR = "#1F5FBF"
+RECTIFIED_COLOR = "#C0392B"
+
+
+def _svg(width: int, height: int, view_box: str, body: str) -> str:
+    return (
+        f'<svg xmlns="http://www.w3.org/2000/svg" width="{width}" height="{height}" '
+        f'viewBox="{view_box}" font-family="{FONT_FAMILY}">'
+        f'<rect x="{view_box.split()[0]}" y="{view_box.split()[1]}" width="100%" height="100%" fill="#FFFFFF"/>'
+        f"{body}</svg>\n"
+    )
+
+
+def _text(x: float, y: float, content: str, size: int, fill: str = "#000000", weight: str = "normal") -> str:
+    bold = ' font-weight="bold"' if weight == "bold" else ""
+    return (
+        f'<text x="{x:.1f}" y="{y:.1f}" font-size="{size}" fill="{fill}"{bold} '
+        f'text-anchor="middle" dominant-baseline="central">{escape(content)}</text>'
+    )
+
+
+# North Indian square: a 400px square whose top-left corner is at (20, 60)
+
+SQUARE_SIZE = 400
+SQUARE_LEFT = 20
+SQUARE_TOP = 60
+
+
+def _square_point(fx: float, fy: float) -> Tuple[float, float]:
+    return SQUARE_LEFT + fx * SQUARE_SIZE, SQUARE_TOP + fy * SQUARE_SIZE
+
+
+def _build_square_frame() -> str:
+    left, top = _square_point(0, 0)
+    right, bottom = _square_point(1, 1)
+    mid_x, mid_y = _square_point(0.5, 0.5)
+    stroke = 'stroke="#000000" stroke-width="2" fill="none"'
+    return (
+        f'<rect x="{left}" y="{top}" width="{SQUARE_SIZE}" height="{SQUARE_SIZE}" {stroke}/>'
+        f'<line x1="{left}" y1="{top}" x2="{right}" y2="{bottom}" {stroke}/>'
+        f'<line x1="{right}" y1="{top}" x2="{left}" y2="{bottom}" {stroke}/>'
+        f'<polygon points="{mid_x},{top} {right},{mid_y} {mid_x},{bottom} {left},{mid_y}" {stroke}/>'
+    )
+
+
+# Centre of each house, counterclockwise from the first house at the top
+SQUARE_HOUSE_CENTERS = [
+    _square_point(fx, fy) for fx, fy in (
+        (0.5, 0.25), (0.25, 1 / 12), (1 / 12, 0.25), (0.25, 0.5),
+        (1 / 12, 0.75), (0.25, 11 / 12), (0.5, 0.75), (0.75, 11 / 12),
+        (11 / 12, 0.75), (0.75, 0.5), (11 / 12, 0.25), (0.75, 1 / 12),
+    )
+]
+# The diamond houses have room for three planets a row, the triangles for two
+SQUARE_ROW_LENGTHS = [3 if house in (1, 4, 7, 10) else 2 for house in range(1, 13)]
+SQUARE_FRAME = _build_square_frame()
+
+
+# Wheel: centred on the origin; 0° Aries is on the left and the zodiac runs
+# counterclockwise, as in most Western chart drawings
+
+WHEEL_OUTER = 260
+WHEEL_SIGNS = 225
+WHEEL_INNER = 90
+WHEEL_PLANETS = 195
+WHEEL_RING_STEP = 22
+
+
+def _polar(longitude: float, radius: float) -> Tuple[float, float]:
+    angle = math.radians(longitude)
+    return -radius * math.cos(angle), radius * math.sin(angle)
+
+
+def _line(longitude: float, inner: float, outer: float, attributes: str) -> str:
+    x1, y1 = _polar(longitude, inner)
+    x2, y2 = _polar(longitude, outer)
+    return f'<line x1="{x1:.1f}" y1="{y1:.1f}" x2="{x2:.1f}" y2="{y2:.1f}" {attributes}/>'
+
+
+def _build_zodiac_ring() -> str:
+    parts = [
+        f'<circle cx="0" cy="0" r="{radius}" fill="none" stroke="#000000" stroke-width="{width}"/>'
+        for radius, width in ((WHEEL_OUTER, 2), (WHEEL_SIGNS, 1.5), (WHEEL_INNER, 1))
+    ]
+    for degree in range(0, 360, 5):
+        if degree % 30 == 0:
+            parts.append(_line(degree, WHEEL_SIGNS, WHEEL_OUTER, 'stroke="#000000" stroke-width="1.5"'))
+        else:
+            length = 8 if degree % 10 == 0 else 5
+            parts.append(_line(degree, WHEEL_SIGNS, WHEEL_SIGNS + length, 'stroke="#000000" stroke-width="0.75"'))
+    for index, sign in enumerate(ZODIAC_SIGNS):
+        x, y = _polar(index * 30 + 15, (WHEEL_SIGNS + WHEEL_OUTER) / 2)
+        parts.append(_text(x, y, ZODIAC_SYMBOLS[sign], 20))
+    return "".join(parts)
+
+
+ZODIAC_RING = _build_zodiac_ring()
+
+
+# Chart data
+
+def _longitude(data: Dict[str, Any]) -> Optional[float]:
+    """Ecliptic longitude of a planet or house, from its longitude or its sign and degree."""
+    if data.get("longitude") is not None:
+        return float(data["longitude"]) % 360
+    if data.get("sign") in ZODIAC_SIGNS:
+        return (ZODIAC_SIGNS.index(data["sign"]) * 30 + float(data.get("degree", 0))) % 360
+    return None
+
+
+def chart_planets(chart_data: Dict[str, Any]) -> List[Tuple[str, Dict[str, Any]]]:
+    """Return (name, data) pairs of a chart's planets, given as a dict or a list."""
+    planets = chart_data.get("planets") or {}
+    if isinstance(planets, dict):
+        return [(name, data) for name, data in planets.items() if isinstance(data, dict)]
+    return [
+        (str(planet.get("name") or planet.get("planet")), planet)
+        for planet in planets if isinstance(planet, dict) and (planet.get("name") or planet.get("planet"))
+    ]
+
+
+def chart_cusps(chart_data: Dict[str, Any]) -> List[float]:
+    """Return the longitudes of a chart's house cusps from the first house on, or [] if unknown."""
+    houses = chart_data.get("houses") or []
+    if isinstance(houses, dict):
+        houses = [houses.get(str(number)) or houses.get(number) or {} for number in range(1, 13)]
+    numbered = []
+    for index, house in enumerate(houses):
+        if isinstance(house, dict):
+            number = house.get("number") or house.get("house_number") or index + 1
+            numbered.append((int(number), _longitude(house)))
+    numbered.sort(key=lambda item: item[0])
+    cusps = [longitude for _, longitude in numbered]
+    if len(cusps) != 12 or any(longitude is None for longitude in cusps):
+        return []
+    return cusps
+
+
+def house_of(longitude: float, cusps: Sequence[float]) -> int:
+    """Return the house, 1 to 12, a longitude falls in."""
+    for index in range(12):
+        start, end = cusps[index], cusps[(index + 1) % 12]
+        if (longitude - start) % 360 < (end - start) % 360:
+            return index + 1
+    return 1
+
+
+def _symbol(name: str) -> str:
+    return PLANET_SYMBOLS.get(name, name[:2])
+
+
+def _title(chart_data: Dict[str, Any]) -> str:
+    birth = chart_data.get("birth_details") or {}
+    name = birth.get("full_name") or birth.get("name")
+    if name:
+        return f"Astrological Chart for {name}"
+    date = birth.get("birth_date") or birth.get("date")
+    time = birth.get("birth_time") or birth.get("time")
+    if date and time:
+        return f"Astrological Chart - {date} {time}"
+    return "Astrological Chart"
+
+
+# North Indian square chart
+
+def vedic_square_svg(chart_data: Dict[str, Any]) -> str:
+    """
+    Draw a North Indian (square) Vedic chart.
+
+    Each house shows the number of its sign and the planets in it. Planets
+    are placed by their "house" field, or by their longitude against the
+    house cusps.
+
+    Args:
+        chart_data: Chart with "planets", "houses" and "ascendant"
+
+    Returns:
+        SVG document
+    """
+    cusps = chart_cusps(chart_data)
+    ascendant = chart_data.get("ascendant") or {}
+    ascendant_longitude = _longitude(ascendant)
+    if ascendant_longitude is None and cusps:
+        ascendant_longitude = cusps[0]
+
+    occupants: Dict[int, List[str]] = {house: [] for house in range(1, 13)}
+    for name, data in chart_planets(chart_data):
+        house = data.get("house")
+        if not isinstance(house, int) or not 1 <= house <= 12:
+            longitude = _longitude(data)
+            if longitude is None or not cusps:
+                continue
+            house = house_of(longitude, cusps)
+        occupants[house].append(name)
+
+    parts = [SQUARE_FRAME, _text(SQUARE_LEFT + SQUARE_SIZE / 2, 30, "North Indian Vedic Chart", 18, weight="bold")]
+    for index, (x, y) in enumerate(SQUARE_HOUSE_CENTERS):
+        house = index + 1
+        if cusps:
+            sign_number = int(cusps[index] // 30) + 1
+        elif ascendant_longitude is not None:
+            sign_number = (int(ascendant_longitude // 30) + index) % 12 + 1
+        else:
+            sign_number = None
+
+        names = occupants[house]
+        row_length = SQUARE_ROW_LENGTHS[index]
+        rows = [names[start:start + row_length] for start in range(0, len(names), row_length)]
+        top = y - 9 * len(rows)
+        if sign_number is not None:
+            parts.append(_text(x, top - 4, str(sign_number), 12, fill="#555555"))
+        for row_index, row in enumerate(rows):
+            for column, name in enumerate(row):
+                offset = (column - (len(row) - 1) / 2) * 26
+                parts.append(_text(
+                    x + offset, top + 14 + row_index * 18, _symbol(name), 15,
+                    fill=PLANET_COLORS.get(name, "#000000")
+                ))
+
+    if ascendant_longitude is not None:
+        sign = ZODIAC_SIGNS[int(ascendant_longitude // 30)]
+        caption = f"Asc: {sign} {ascendant_longitude % 30:.1f}°"
+        parts.append(_text(SQUARE_LEFT + SQUARE_SIZE / 2, SQUARE_TOP + SQUARE_SIZE + 24, caption, 14, weight="bold"))
+
+    return _svg(440, 500, "0 0 440 500", "".join(parts))
+
+
+# Wheel and comparison overlay
+
+def _wheel_houses(cusps: Sequence[float], stroke: str, dash: bool = False, numbers: bool = True) -> str:
+    parts = []
+    dashes = ' stroke-dasharray="6 4"' if dash else ""
+    for index, cusp in enumerate(cusps):
+        # The ascendant and midheaven cusps are drawn heavier
+        width = 2.5 if index in (0, 9) else 1
+        parts.append(_line(cusp, WHEEL_INNER, WHEEL_SIGNS, f'stroke="{stroke}" stroke-width="{width}"{dashes}'))
+        if numbers:
+            span = (cusps[(index + 1) % 12] - cusp) % 360
+            x, y = _polar(cusp + span / 2, WHEEL_INNER + 16)
+            parts.append(_text(x, y, str(index + 1), 12, fill="#555555", weight="bold"))
+    return "".join(parts)
+
+
+def _wheel_planets(
+    planets: List[Tuple[str, Dict[str, Any]]],
+    radius: float,
+    color: Optional[str] = None
+) -> Tuple[str, Dict[str, float]]:
+    """Draw planet glyphs around the wheel; returns the markup and each planet's longitude."""
+    placed = []
+    for name, data in planets:
+        longitude = _longitude(data)
+        if longitude is not None:
+            placed.append((longitude, name))
+    placed.sort()
+    parts = []
+    longitudes: Dict[str, float] = {}
+    previous: Optional[float] = None
+    level = 0
+    for longitude, name in placed:
+        # Planets within a few degrees of each other step inwards
+        level = level + 1 if previous is not None and longitude - previous < 7 and level < 3 else 0
+        previous = longitude
+        planet_radius = radius - level * WHEEL_RING_STEP
+        fill = color or PLANET_COLORS.get(name, "#000000")
+        parts.append(_line(longitude, WHEEL_SIGNS - 8, WHEEL_SIGNS, f'stroke="{fill}" stroke-width="1.5"'))
+        x, y = _polar(longitude, planet_radius)
+        parts.append(_text(x, y, _symbol(name), 18, fill=fill))
+        longitudes[name] = longitude
+    return "".join(parts), longitudes
+
+
+def _wheel_aspects(aspects: Any, longitudes: Dict[str, float]) -> str:
+    parts = []
+    for aspect in aspects if isinstance(aspects, list) else []:
+        if not isinstance(aspect, dict):
+            continue
+        first = longitudes.get(aspect.get("planet1"))
+        second = longitudes.get(aspect.get("planet2"))
+        if first is None or second is None:
+            continue
+        color = ASPECT_COLORS.get(str(aspect.get("type", "")).lower(), "#B0B0B0")
+        x1, y1 = _polar(first, WHEEL_INNER)
+        x2, y2 = _polar(second, WHEEL_INNER)
+        parts.append(
+            f'<line x1="{x1:.1f}" y1="{y1:.1f}" x2="{x2:.1f}" y2="{y2:.1f}" stroke="{color}" stroke-width="1"/>'
+        )
+    return "".join(parts)
+
+
+def chart_wheel_svg(chart_data: Dict[str, Any]) -> str:
+    """
+    Draw a chart wheel: the zodiac ring, house cusps, planets and aspects.
+
+    Args:
+        chart_data: Chart with "planets", "houses" and optionally "aspects"
+
+    Returns:
+        SVG document
+    """
+    planets, longitudes = _wheel_planets(chart_planets(chart_data), WHEEL_PLANETS)
+    body = "".join((
+        _text(0, -WHEEL_OUTER - 36, _title(chart_data), 18, weight="bold"),
+        ZODIAC_RING,
+        _wheel_aspects(chart_data.get("aspects"), longitudes),
+        _wheel_houses(chart_cusps(chart_data), "#000000"),
+        planets,
+    ))
+    return _svg(600, 640, "-300 -320 600 640", body)
+
+
+def _birth_time(chart_data: Dict[str, Any]) -> str:
+    birth = chart_data.get("birth_details") or {}
+    return str(birth.get("birth_time") or birth.get("time") or "")
+
+
+def _minutes_between(first: str, second: str) -> Optional[int]:
+    try:
+        hours1, minutes1 = (int(part) for part in first.split(":")[:2])
+        hours2, minutes2 = (int(part) for part in second.split(":")[:2])
+    except ValueError:
+        return None
+    return (hours2 * 60 + minutes2) - (hours1 * 60 + minutes1)
+
+
+def comparison_svg(original_chart: Dict[str, Any], rectified_chart: Dict[str, Any]) -> str:
+    """
+    Draw two charts over one wheel, as for an original and a rectified birth time.
+
+    The original chart's cusps are dashed and its planets sit on the outer
+    planet ring; the rectified chart's are solid, on the ring inside it.
+
+    Args:
+        original_chart: Original chart data
+        rectified_chart: Rectified chart data
+
+    Returns:
+        SVG document
+    """
+    original_time = _birth_time(original_chart)
+    rectified_time = _birth_time(rectified_chart)
+    subtitle = f"Original {original_time or 'unknown'}  ·  Rectified {rectified_time or 'unknown'}"
+    minutes = _minutes_between(original_time, rectified_time)
+    if minutes:
+        subtitle += f"  ·  {abs(minutes)} minutes {'later' if minutes > 0 else 'earlier'}"
+
+    outer_planets, _ = _wheel_planets(chart_planets(original_chart), WHEEL_PLANETS, ORIGINAL_COLOR)
+    inner_planets, _ = _wheel_planets(
+        chart_planets(rectified_chart), WHEEL_PLANETS - 3 * WHEEL_RING_STEP, RECTIFIED_COLOR
+    )
+    body = "".join((
+        _text(0, -WHEEL_OUTER - 50, "Chart Comparison", 18, weight="bold"),
+        _text(0, -WHEEL_OUTER - 26, subtitle, 13),
+        ZODIAC_RING,
+        _wheel_houses(chart_cusps(original_chart), ORIGINAL_COLOR, dash=True, numbers=False),
+        _wheel_houses(chart_cusps(rectified_chart), RECTIFIED_COLOR),
+        outer_planets,
+        inner_planets,
+        _text(-200, WHEEL_OUTER + 30, "Original", 13, fill=ORIGINAL_COLOR, weight="bold"),
+        _text(200, WHEEL_OUTER + 30, "Rectified", 13, fill=RECTIFIED_COLOR, weight="bold"),
+    ))
+    return _svg(600, 680, "-300 -340 600 680", body)
+
+
+# Files
+
+def rasterize_svg(svg: str, file_path: str, scale: float = 2.0) -> str:
+    """
+    Write an SVG document out as a PNG.
+
+    Args:
+        svg: SVG document
+        file_path: Path of the PNG file
+        scale: Output pixels per SVG unit
+
+    Returns:
+        file_path
+
+    Raises:
+        RenderError: If CairoSVG is not installed
+    """
+    if not RASTERIZE_AVAILABLE:
+        raise RenderError("PNG output from SVG charts requires cairosvg", details={"file_path": file_path})
+    import cairosvg
+
+    cairosvg.svg2png(bytestring=svg.encode("utf-8"), write_to=file_path, scale=scale)
+    return file_path
+
+
+def _write(svg: str, file_path: str) -> str:
+    directory = os.path.dirname(file_path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    if file_path.lower().endswith(".png"):
+        return rasterize_svg(svg, file_path)
+    with open(file_path, "w", encoding="utf-8") as f:
+        f.write(svg)
+    return file_path
+
+
+def render_vedic_square_svg(chart_data: Dict[str, Any], file_path: str) -> str:
+    """Write a North Indian square chart to file_path, as SVG or, for a .png path, PNG."""
+    return _write(vedic_square_svg(chart_data), file_path)
+
+
+def render_chart_wheel_svg(chart_data: Dict[str, Any], file_path: str) -> str:
+    """Write a chart wheel to file_path, as SVG or, for a .png path, PNG."""
+    return _write(chart_wheel_svg(chart_data), file_path)
+
+
+def render_comparison_svg(original_chart: Dict[str, Any], rectified_chart: Dict[str, Any], file_path: str) -> str:
+    """Write a comparison overlay to file_path, as SVG or, for a .png path, PNG."""
+    return _write(comparison_svg(original_chart, rectified_chart), file_path)
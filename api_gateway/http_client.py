@@ -0,0 +1,74 @@
+"""
+Shared HTTP client for calls to the AI service
+----------------------------------------------
+One pooled httpx.AsyncClient serves every proxied request and route helper,
+so connections to the AI service are kept alive and reused instead of being
+opened (and torn down) per request. The application lifespan opens the
+client on startup and closes it on shutdown.
+"""
+
+import logging
+import os
+from typing import Optional
+
+import httpx
+
+logger = logging.getLogger("api_gateway.http_client")
+
+# Shared client, created by open_http_client or on first use
+_client: Optional[httpx.AsyncClient] = None
+
+
+def create_http_client() -> httpx.AsyncClient:
+    """
+    Create a pooled client configured from the environment.
+
+    AI_SERVICE_MAX_CONNECTIONS and AI_SERVICE_MAX_KEEPALIVE bound the pool,
+    AI_SERVICE_KEEPALIVE_EXPIRY is how long idle connections are kept, and
+    AI_SERVICE_TIMEOUT / AI_SERVICE_CONNECT_TIMEOUT are the request and
+    connect timeouts in seconds.
+
+    Returns:
+        httpx.AsyncClient
+    """
+    limits = httpx.Limits(
+        max_connections=int(os.getenv("AI_SERVICE_MAX_CONNECTIONS", "100")),
+        max_keepalive_connections=int(os.getenv("AI_SERVICE_MAX_KEEPALIVE", "20")),
+        keepalive_expiry=float(os.getenv("AI_SERVICE_KEEPALIVE_EXPIRY", "30"))
+    )
+    timeout = httpx.Timeout(
+        float(os.getenv("AI_SERVICE_TIMEOUT", "60")),
+        connect=float(os.getenv("AI_SERVICE_CONNECT_TIMEOUT", "5"))
+    )
+    return httpx.AsyncClient(limits=limits, timeout=timeout)
+
+
+async def open_http_client() -> httpx.AsyncClient:
+    """Create the shared client; called on application startup."""
+    global _client
+    if _client is None or _client.is_closed:
+        _client = create_http_client()
+        logger.info("Opened pooled HTTP client for the AI service")
+    return _client
+
+
+async def close_http_client() -> None:
+    """Close the shared client and its connections; called on application shutdown."""
+    global _client
+    if _client is not None:
+        await _client.aclose()
+        _client = None
+        logger.info("Closed pooled HTTP client for the AI service")
+
+
+def get_http_client() -> httpx.AsyncClient:
+    """
+    Return the shared client.
+
+    Outside the application lifespan (scripts, tests) the client is created
+    on first use.
+    """
+    global _client
+    if _client is None or _client.is_closed:
+        _client = create_http_client()
+    return _client
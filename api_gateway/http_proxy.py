@@ -0,0 +1,106 @@
+"""
+HTTP proxy to the AI service
+----------------------------
+Forwards API requests to the AI service over the shared pooled client.
+Request and response bodies are streamed through unchanged: nothing is
+buffered, decoded or re-serialized on the way. Hop-by-hop headers are
+dropped in both directions, as RFC 9110 requires of proxies.
+"""
+
+import logging
+import os
+from typing import Iterable, List, Set, Tuple
+
+import httpx
+from fastapi import Request, status
+from fastapi.responses import JSONResponse, StreamingResponse
+from starlette.background import BackgroundTask
+
+from api_gateway.http_client import get_http_client
+
+logger = logging.getLogger("api_gateway.http_proxy")
+
+# AI Service URL
+AI_SERVICE_URL = os.getenv("AI_SERVICE_URL", "http://localhost:8000")
+
+# Headers that describe a single connection and must not be forwarded
+HOP_BY_HOP_HEADERS = frozenset({
+    "connection",
+    "keep-alive",
+    "proxy-authenticate",
+    "proxy-authorization",
+    "proxy-connection",
+    "te",
+    "trailer",
+    "trailers",
+    "transfer-encoding",
+    "upgrade",
+})
+
+
+def _connection_headers(headers: Iterable[Tuple[bytes, bytes]]) -> Set[bytes]:
+    """Return the hop-by-hop headers a message names in its Connection header."""
+    named = set()
+    for name, value in headers:
+        if name.lower() == b"connection":
+            named.update(token.strip().lower() for token in value.split(b",") if token.strip())
+    return named
+
+
+def filter_headers(headers: List[Tuple[bytes, bytes]], drop: Iterable[str] = ()) -> List[Tuple[bytes, bytes]]:
+    """
+    Remove hop-by-hop headers from raw header pairs.
+
+    Args:
+        headers: Raw (name, value) pairs; repeated headers such as Set-Cookie
+            are kept as separate pairs
+        drop: Further header names to remove
+
+    Returns:
+        The remaining pairs, in order
+    """
+    excluded = {name.encode("latin-1") for name in HOP_BY_HOP_HEADERS.union(drop)}
+    excluded |= _connection_headers(headers)
+    return [(name, value) for name, value in headers if name.lower() not in excluded]
+
+
+async def proxy_to_ai_service(request: Request, path: str):
+    """Proxy a request to the AI service, streaming both bodies"""
+    # Host is rewritten by the client; a body without a declared length is
+    # re-framed by the client, so its framing headers do not apply
+    has_body = "content-length" in request.headers or "transfer-encoding" in request.headers
+    drop = ["host"] if "content-length" in request.headers else ["host", "content-length"]
+    headers = filter_headers(request.headers.raw, drop)
+
+    client = get_http_client()
+    upstream_request = client.build_request(
+        method=request.method,
+        url=f"{AI_SERVICE_URL}/{path}",
+        params=request.url.query,
+        headers=headers,
+        content=request.stream() if has_body else None
+    )
+
+    try:
+        upstream = await client.send(upstream_request, stream=True, follow_redirects=True)
+    except httpx.RequestError as e:
+        logger.error(f"Error proxying request to AI service: {e}")
+        return JSONResponse(
+            content={"detail": "Error connecting to backend service"},
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE
+        )
+    except Exception as e:
+        logger.error(f"Unexpected error proxying request: {e}")
+        return JSONResponse(
+            content={"detail": "Internal server error"},
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR
+        )
+
+    # Raw bytes keep the upstream Content-Encoding and Content-Length valid
+    response = StreamingResponse(
+        upstream.aiter_raw(),
+        status_code=upstream.status_code,
+        background=BackgroundTask(upstream.aclose)
+    )
+    response.raw_headers = filter_headers(upstream.headers.raw)
+    return response
@@ -13,11 +13,13 @@ import logging
 import time
 import os
 import sys
-import httpx
 import uuid
+from contextlib import asynccontextmanager
 from typing import Optional, Dict, Any
 
-# Import WebSocket proxy
+# Import HTTP and WebSocket proxies
+from api_gateway.http_client import close_http_client, open_http_client
+from api_gateway.http_proxy import proxy_to_ai_service
 from api_gateway.websocket_proxy import proxy as websocket_proxy
 
 # Import routers
@@ -38,11 +40,21 @@ logging.basicConfig(
 )
 logger = logging.getLogger("api_gateway")
 
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Hold one pooled HTTP client to the AI service for the application's lifetime"""
+    await open_http_client()
+    try:
+        yield
+    finally:
+        await close_http_client()
+
 # Initialize FastAPI application
 app = FastAPI(
     title="Birth Time Rectifier API Gateway",
     description="API Gateway for the Birth Time Rectifier application",
     version="1.0.0",
+    lifespan=lifespan,
 )
 
 # Configure CORS
@@ -54,8 +66,7 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-# AI Service URLs
-AI_SERVICE_URL = os.getenv("AI_SERVICE_URL", "http://localhost:8000")
+# AI Service WebSocket URL (the HTTP URL lives with the proxy)
 AI_SERVICE_WS_URL = os.getenv("AI_SERVICE_WS_URL", "ws://localhost:8000/ws")
 
 # Add request logging middleware
@@ -190,56 +201,6 @@ async def legacy_api_proxy(request: Request, path: str):
 
     return await proxy_to_ai_service(request, path)
 
-async def proxy_to_ai_service(request: Request, path: str):
-    """Proxy a request to the AI service"""
-    # Get request body
-    body = None
-    if request.method in ["POST", "PUT", "PATCH"]:
-        body = await request.body()
-
-    # Get request headers
-    headers = dict(request.headers)
-    # Remove headers that should not be forwarded
-    headers.pop("host", None)
-
-    # Get query parameters
-    params = dict(request.query_params)
-
-    # Create target URL
-    target_url = f"{AI_SERVICE_URL}/{path}"
-
-    try:
-        async with httpx.AsyncClient() as client:
-            response = await client.request(
-                method=request.method,
-                url=target_url,
-                params=params,
-                headers=headers,
-                content=body,
-                cookies=request.cookies,
-                follow_redirects=True,
-                timeout=60.0  # 60 second timeout
-            )
-
-            # Create response with the same status code, headers, and body
-            return JSONResponse(
-                content=response.json() if response.headers.get("content-type") == "application/json" else response.text,
-                status_code=response.status_code,
-                headers=dict(response.headers)
-            )
-    except httpx.RequestError as e:
-        logger.error(f"Error proxying request to AI service: {e}")
-        return JSONResponse(
-            content={"detail": "Error connecting to backend service"},
-            status_code=status.HTTP_503_SERVICE_UNAVAILABLE
-        )
-    except Exception as e:
-        logger.error(f"Unexpected error proxying request: {e}")
-        return JSONResponse(
-            content={"detail": "Internal server error"},
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR
-        )
-
 # Global exception handler
 @app.exception_handler(Exception)
 async def global_exception_handler(request: Request, exc: Exception):
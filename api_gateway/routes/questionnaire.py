@@ -13,6 +13,8 @@ import json
 import logging
 from pydantic import BaseModel, Field
 
+from api_gateway.http_client import get_http_client
+
 # Configure logging
 logger = logging.getLogger("api_gateway.routes.questionnaire")
 
@@ -43,20 +45,20 @@ async def request_ai_service(endpoint: str, data: Dict[str, Any] = {}, method: s
     logger.info(f"Requesting AI service at {url}")
 
     try:
-        async with httpx.AsyncClient() as client:
-            if method == "GET":
-                response = await client.get(url, params=data, timeout=60.0)
-            else:
-                response = await client.post(url, json=data, timeout=60.0)
-
-            if response.status_code != 200:
-                logger.error(f"AI service returned error: {response.status_code} - {response.text}")
-                raise HTTPException(
-                    status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-                    detail=f"AI service error: {response.text}"
-                )
-
-            return response.json()
+        client = get_http_client()
+        if method == "GET":
+            response = await client.get(url, params=data, timeout=60.0)
+        else:
+            response = await client.post(url, json=data, timeout=60.0)
+
+        if response.status_code != 200:
+            logger.error(f"AI service returned error: {response.status_code} - {response.text}")
+            raise HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail=f"AI service error: {response.text}"
+            )
+
+        return response.json()
     except httpx.RequestError as e:
         logger.error(f"Error requesting AI service: {e}")
         raise HTTPException(
@@ -0,0 +1,43 @@
+#!/usr/bin/env python3
+"""
+Build the precomputed ephemeris table the AI service memory-maps.
+
+    python scripts/setup/build_ephemeris_table.py [OUTPUT] [--start 1900/01/01] [--end 2100/01/01] [--step 1]
+
+OUTPUT defaults to EPHEMERIS_TABLE_PATH (``planet_table.bin`` in the
+ephemeris directory).
+"""
+
+import argparse
+import logging
+import os
+import sys
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..")))
+
+from flatlib.datetime import Datetime  # noqa: E402
+
+from ai_service.core.rectification.ephemeris_table import build_ephemeris_table, default_table_path  # noqa: E402
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Build a precomputed ephemeris table")
+    parser.add_argument("output", nargs="?", default=None, help="Output file (default: EPHEMERIS_TABLE_PATH)")
+    parser.add_argument("--start", default="1900/01/01", help="First date, YYYY/MM/DD (default: 1900/01/01)")
+    parser.add_argument("--end", default="2100/01/01", help="Last date, YYYY/MM/DD (default: 2100/01/01)")
+    parser.add_argument("--step", type=float, default=1.0, help="Days between rows (default: 1)")
+    parser.add_argument("--ephemeris-path", default=None, help="Swiss Ephemeris directory")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    build_ephemeris_table(
+        args.output or default_table_path(),
+        start_jd=Datetime(args.start, "00:00", "+00:00").jd,
+        end_jd=Datetime(args.end, "00:00", "+00:00").jd,
+        step=args.step,
+        ephemeris_path=args.ephemeris_path
+    )
+
+
+if __name__ == "__main__":
+    main()
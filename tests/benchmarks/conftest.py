@@ -0,0 +1,117 @@
+"""
+Fixtures for the rectification benchmarks.
+
+Benchmarks only run when RUN_BENCHMARKS is set. The OpenAI service is
+replaced with a deterministic stub so no network calls are made, and the
+metrics of every benchmark are written to BENCHMARK_REPORT at the end of the
+session. Set BENCHMARK_UPDATE_BASELINE to store them as the new baseline.
+"""
+
+import json
+import os
+from typing import Any, Dict
+
+import pytest
+
+from tests.benchmarks.harness import (
+    BASELINE_PATH, REPORT_PATH, find_regressions, load_baseline, load_birth_records, write_report
+)
+
+
+def pytest_collection_modifyitems(config, items):
+    """Skip benchmarks unless they were asked for."""
+    if os.getenv("RUN_BENCHMARKS"):
+        return
+    skip = pytest.mark.skip(reason="set RUN_BENCHMARKS=1 to run benchmarks")
+    for item in items:
+        if "benchmark" in item.keywords:
+            item.add_marker(skip)
+
+
+class StubOpenAIService:
+    """
+    OpenAI stand-in with a fixed answer.
+
+    Confidence stays below the 85% early return of rectify_birth_time, so
+    every rectification method runs.
+    """
+
+    def __init__(self):
+        self.calls = 0
+
+    async def generate_completion(self, prompt: str, task_type: str = "", max_tokens: int = 0, **kwargs: Any) -> Dict[str, Any]:
+        self.calls += 1
+        return {
+            "content": json.dumps({
+                "rectified_time": "12:10",
+                "adjustment_minutes": 10,
+                "confidence": 70,
+                "explanation": "Benchmark stub response",
+            }),
+            "model": "benchmark-stub",
+            "tokens": {"prompt": 0, "completion": 0, "total": 0},
+            "cost": 0.0,
+        }
+
+
+@pytest.fixture(autouse=True)
+def ephemeris_path(monkeypatch):
+    """Point rectification at the ephemeris files the chart workers use."""
+    from ai_service.core.rectification.chart_workers import resolve_ephemeris_path
+
+    path = os.environ.get("FLATLIB_EPHE_PATH") or resolve_ephemeris_path()
+    monkeypatch.setenv("FLATLIB_EPHE_PATH", path)
+    return path
+
+
+@pytest.fixture(scope="session")
+def birth_records():
+    """The fixed benchmark corpus."""
+    return load_birth_records()
+
+
+@pytest.fixture
+def stub_openai(monkeypatch):
+    """Route every OpenAI lookup to the stub."""
+    import ai_service.api.services.openai as openai_package
+
+    service = StubOpenAIService()
+    monkeypatch.setattr(openai_package, "get_openai_service", lambda: service)
+    return service
+
+
+@pytest.fixture(scope="session")
+def benchmark_report():
+    """Collect benchmark metrics; written as JSON when the session ends."""
+    results: Dict[str, Dict[str, Any]] = {}
+    yield results
+
+    if not results:
+        return
+
+    from ai_service.core.rectification.chart_workers import shutdown_chart_worker_pool
+    shutdown_chart_worker_pool()
+
+    write_report(results, REPORT_PATH)
+    if os.getenv("BENCHMARK_UPDATE_BASELINE"):
+        baseline = load_baseline(BASELINE_PATH)
+        baseline.update(results)
+        write_report(baseline, BASELINE_PATH)
+
+
+@pytest.fixture
+def record_benchmark(benchmark_report):
+    """Record a BenchmarkResult and fail if it regressed against the baseline."""
+    baseline = load_baseline(BASELINE_PATH)
+
+    def record(result):
+        metrics = result.to_dict()
+        benchmark_report[result.name] = metrics
+        if os.getenv("BENCHMARK_UPDATE_BASELINE"):
+            return metrics
+
+        regressions = find_regressions(metrics, baseline.get(result.name))
+        assert not regressions, f"{result.name} regressed: " + "; ".join(regressions)
+        return metrics
+
+    return record
@@ -0,0 +1,176 @@
+"""
+Measurement and baseline helpers for the rectification benchmarks.
+
+Every benchmark runs an async callable once per birth record for a number of
+rounds, records the wall-clock latency of each call and reports throughput
+(charts per second), p50/p95 latency and the peak RSS of the process. The
+results of a run are written as JSON and compared against a stored baseline.
+"""
+
+import json
+import os
+import resource
+import sys
+import time
+from datetime import datetime
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+import numpy as np
+
+BENCHMARK_DIR = os.path.dirname(os.path.abspath(__file__))
+BIRTH_RECORDS_PATH = os.path.join(BENCHMARK_DIR, "birth_records.json")
+BASELINE_PATH = os.getenv("BENCHMARK_BASELINE", os.path.join(BENCHMARK_DIR, "baseline.json"))
+REPORT_PATH = os.getenv("BENCHMARK_REPORT", os.path.join(BENCHMARK_DIR, "results", "latest.json"))
+
+# Relative change beyond which a metric counts as a regression
+REGRESSION_THRESHOLD = float(os.getenv("BENCHMARK_REGRESSION_THRESHOLD", "0.25"))
+
+# Metrics compared against the baseline and whether higher values are better
+GATED_METRICS = {
+    "charts_per_second": True,
+    "p50_ms": False,
+    "p95_ms": False,
+    "peak_rss_mb": False,
+}
+
+
+def load_birth_records() -> List[Dict[str, Any]]:
+    """Load the fixed benchmark corpus, with parsed birth datetimes."""
+    with open(BIRTH_RECORDS_PATH) as f:
+        records = json.load(f)
+
+    for record in records:
+        record["birth_dt"] = datetime.strptime(f"{record['birth_date']} {record['birth_time']}", "%Y-%m-%d %H:%M")
+    return records
+
+
+def peak_rss_mb() -> float:
+    """Return the peak resident set size of this process in MiB."""
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is in bytes on macOS and kilobytes elsewhere
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+class BenchmarkResult:
+    """Latencies and resource usage of one benchmark."""
+
+    def __init__(self, name: str, latencies: List[float], charts: int, peak_rss: float):
+        self.name = name
+        self.latencies = np.array(latencies, dtype=np.float64)
+        self.charts = charts
+        self.peak_rss_mb = peak_rss
+
+    @property
+    def charts_per_second(self) -> float:
+        total = float(self.latencies.sum())
+        return self.charts / total if total > 0 else 0.0
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Return the reported metrics."""
+        return {
+            "calls": len(self.latencies),
+            "charts": self.charts,
+            "charts_per_second": round(self.charts_per_second, 3),
+            "p50_ms": round(float(np.percentile(self.latencies, 50)) * 1000, 3),
+            "p95_ms": round(float(np.percentile(self.latencies, 95)) * 1000, 3),
+            "peak_rss_mb": round(self.peak_rss_mb, 1),
+        }
+
+
+async def run_benchmark(
+    name: str,
+    func: Callable[[Dict[str, Any]], Awaitable[Any]],
+    records: List[Dict[str, Any]],
+    rounds: int = 1,
+    min_time: float = 1.0,
+    warmup: int = 1,
+    charts_per_call: int = 1,
+    setup: Optional[Callable[[], None]] = None
+) -> BenchmarkResult:
+    """
+    Time an async callable over every birth record.
+
+    Args:
+        name: Benchmark name used in the report and baseline
+        func: Coroutine function called with one birth record
+        records: Birth records to run over
+        rounds: Minimum timed passes over the records
+        min_time: Keep making passes until this many seconds were timed, so
+            fast benchmarks collect enough samples for stable percentiles
+        warmup: Untimed calls before timing starts (pool start-up, imports)
+        charts_per_call: Charts each call produces, for the throughput figure
+        setup: Optional untimed callable run before every timed call
+
+    Returns:
+        BenchmarkResult
+    """
+    for record in records[:warmup]:
+        await func(record)
+
+    latencies: List[float] = []
+    passes = 0
+    while passes < rounds or sum(latencies) < min_time:
+        passes += 1
+        for record in records:
+            if setup is not None:
+                setup()
+            started = time.perf_counter()
+            await func(record)
+            latencies.append(time.perf_counter() - started)
+
+    return BenchmarkResult(name, latencies, len(latencies) * charts_per_call, peak_rss_mb())
+
+
+def load_baseline(path: str = BASELINE_PATH) -> Dict[str, Dict[str, float]]:
+    """Return the stored baseline metrics keyed by benchmark name, empty if none."""
+    if not os.path.exists(path):
+        return {}
+    with open(path) as f:
+        return json.load(f).get("benchmarks", {})
+
+
+def find_regressions(
+    metrics: Dict[str, float],
+    baseline: Optional[Dict[str, float]],
+    threshold: float = REGRESSION_THRESHOLD
+) -> List[str]:
+    """
+    Compare one benchmark's metrics with its baseline.
+
+    Args:
+        metrics: Metrics from BenchmarkResult.to_dict
+        baseline: Baseline metrics of the same benchmark, if recorded
+        threshold: Allowed relative change
+
+    Returns:
+        Description of every metric that regressed beyond the threshold
+    """
+    if not baseline:
+        return []
+
+    regressions = []
+    for metric, higher_is_better in GATED_METRICS.items():
+        expected = baseline.get(metric)
+        actual = metrics.get(metric)
+        if not expected or actual is None:
+            continue
+
+        change = (actual - expected) / expected
+        if (higher_is_better and change < -threshold) or (not higher_is_better and change > threshold):
+            regressions.append(f"{metric}: {actual} vs baseline {expected} ({change:+.0%})")
+    return regressions
+
+
+def write_report(results: Dict[str, Dict[str, Any]], path: str) -> None:
+    """Write benchmark metrics as JSON, creating the directory if needed."""
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    report = {
+        "generated_at": datetime.now().isoformat(timespec="seconds"),
+        "python": sys.version.split()[0],
+        "cpu_count": os.cpu_count(),
+        "threshold": REGRESSION_THRESHOLD,
+        "benchmarks": results,
+    }
+    with open(path, "w") as f:
+        json.dump(report, f, indent=2, sort_keys=True)
+        f.write("\n")
@@ -0,0 +1,45 @@
+"""
+Unit tests for the benchmark regression gate.
+"""
+
+import json
+
+import pytest
+
+from tests.benchmarks.harness import BenchmarkResult, find_regressions, load_baseline, write_report
+
+
+def test_metrics_from_latencies():
+    """Test throughput and percentiles computed from call latencies."""
+    result = BenchmarkResult("example", [0.01] * 19 + [0.1], charts=40, peak_rss=123.45)
+    metrics = result.to_dict()
+
+    assert metrics["calls"] == 20
+    assert metrics["charts_per_second"] == pytest.approx(40 / 0.29, rel=1e-3)
+    assert metrics["p50_ms"] == pytest.approx(10.0)
+    assert metrics["p95_ms"] > metrics["p50_ms"]
+    assert metrics["peak_rss_mb"] == 123.5
+
+
+def test_regressions_respect_metric_direction():
+    """Test that slower, bigger results fail and faster ones pass."""
+    baseline = {"charts_per_second": 100.0, "p50_ms": 10.0, "p95_ms": 20.0, "peak_rss_mb": 100.0}
+
+    faster = {"charts_per_second": 200.0, "p50_ms": 5.0, "p95_ms": 10.0, "peak_rss_mb": 90.0}
+    assert find_regressions(faster, baseline, threshold=0.25) == []
+
+    slower = {"charts_per_second": 70.0, "p50_ms": 11.0, "p95_ms": 30.0, "peak_rss_mb": 100.0}
+    regressions = find_regressions(slower, baseline, threshold=0.25)
+    assert [regression.split(":")[0] for regression in regressions] == ["charts_per_second", "p95_ms"]
+
+    assert find_regressions(slower, None) == []
+
+
+def test_report_round_trips_as_baseline(tmp_path):
+    """Test that a written report can be loaded back as a baseline."""
+    path = str(tmp_path / "results" / "report.json")
+    write_report({"example": {"charts_per_second": 10.0}}, path)
+
+    with open(path) as f:
+        assert "generated_at" in json.load(f)
+    assert load_baseline(path) == {"example": {"charts_per_second": 10.0}}
@@ -0,0 +1,130 @@
+"""
+Performance benchmarks for birth time rectification.
+
+Each benchmark drives one entry point over the fixed birth record corpus and
+reports charts/sec, p50/p95 latency and peak RSS. Run them with
+
+    RUN_BENCHMARKS=1 PYTHONPATH=. pytest tests/benchmarks -m benchmark
+
+and refresh the stored baseline by also setting BENCHMARK_UPDATE_BASELINE=1.
+"""
+
+from unittest.mock import AsyncMock
+
+import pytest
+
+from ai_service.core.rectification import main as rectification_main
+from ai_service.core.rectification.chart_cache import get_chart_cache
+from ai_service.core.rectification.chart_calculator import calculate_chart
+from ai_service.core.rectification.event_analysis import extract_life_events_from_answers
+from ai_service.core.rectification.methods.ai_rectification import ai_assisted_rectification
+from ai_service.core.rectification.methods.progressed import progressed_ascendant_rectification
+from ai_service.core.rectification.methods.solar_arc import solar_arc_rectification
+from ai_service.core.rectification.methods.transit_analysis import analyze_life_events
+from tests.benchmarks.harness import run_benchmark
+
+pytestmark = [pytest.mark.benchmark, pytest.mark.asyncio]
+
+
+def location(record):
+    """Positional location arguments shared by every entry point."""
+    return record["latitude"], record["longitude"], record["timezone"]
+
+
+async def test_calculate_chart(birth_records, record_benchmark):
+    """Benchmark uncached natal chart calculation."""
+    async def calculate(record):
+        calculate_chart(record["birth_dt"], *location(record))
+
+    cache = get_chart_cache()
+    record_benchmark(await run_benchmark(
+        "calculate_chart", calculate, birth_records, rounds=5, setup=cache.clear
+    ))
+
+
+async def test_calculate_chart_cached(birth_records, record_benchmark):
+    """Benchmark natal chart calculation served from the chart cache."""
+    async def calculate(record):
+        calculate_chart(record["birth_dt"], *location(record))
+
+    get_chart_cache().clear()
+    record_benchmark(await run_benchmark(
+        "calculate_chart_cached", calculate, birth_records, rounds=5, warmup=len(birth_records)
+    ))
+
+
+@pytest.mark.parametrize("name,method", [
+    ("solar_arc", solar_arc_rectification),
+    ("progressed", progressed_ascendant_rectification),
+])
+async def test_chart_methods(name, method, birth_records, record_benchmark):
+    """Benchmark the rectification methods that need only birth data."""
+    async def rectify(record):
+        await method(record["birth_dt"], *location(record))
+
+    record_benchmark(await run_benchmark(f"method_{name}", rectify, birth_records, rounds=2))
+
+
+async def test_transit_analysis(birth_records, record_benchmark):
+    """Benchmark transit analysis over the life events in each record's answers."""
+    events = {record["name"]: extract_life_events_from_answers(record["answers"]) for record in birth_records}
+
+    async def rectify(record):
+        await analyze_life_events(events[record["name"]], record["birth_dt"], *location(record))
+
+    record_benchmark(await run_benchmark("method_transit", rectify, birth_records, rounds=2))
+
+
+async def test_ai_rectification(birth_records, stub_openai, record_benchmark):
+    """Benchmark AI-assisted rectification with the stubbed OpenAI service."""
+    async def rectify(record):
+        await ai_assisted_rectification(record["birth_dt"], *location(record), stub_openai)
+
+    record_benchmark(await run_benchmark("method_ai", rectify, birth_records, rounds=2))
+    assert stub_openai.calls > 0
+
+
+async def test_rectify_birth_time(birth_records, stub_openai, record_benchmark):
+    """Benchmark the concurrent multi-method rectification."""
+    async def rectify(record):
+        await rectification_main.rectify_birth_time(record["birth_dt"], *location(record), record["answers"])
+
+    record_benchmark(await run_benchmark("rectify_birth_time", rectify, birth_records, rounds=2))
+
+
+async def test_comprehensive_rectification(birth_records, stub_openai, record_benchmark, monkeypatch):
+    """Benchmark comprehensive rectification without writing rectified charts to disk."""
+    monkeypatch.setattr(rectification_main, "store_rectified_chart", AsyncMock(return_value="benchmark_chart"))
+
+    async def rectify(record):
+        await rectification_main.comprehensive_rectification(
+            record["birth_dt"], *location(record), record["answers"]
+        )
+
+    record_benchmark(await run_benchmark("comprehensive_rectification", rectify, birth_records, rounds=2))
+
+
+async def test_compare_charts(birth_records, record_benchmark, monkeypatch):
+    """Benchmark comparing each record's chart with the chart an hour later."""
+    try:
+        from ai_service.services import chart_comparison_service
+    except Exception as e:
+        pytest.skip(f"Chart comparison service unavailable: {e}")
+
+    charts = {}
+    for record in birth_records:
+        charts[record["name"]] = calculate_chart(record["birth_dt"], *location(record))
+        charts[f"{record['name']}_rectified"] = calculate_chart(
+            record["birth_dt"].replace(hour=(record["birth_dt"].hour + 1) % 24), *location(record)
+        )
+
+    async def retrieve_chart(chart_id):
+        return charts.get(chart_id)
+
+    monkeypatch.setattr(chart_comparison_service, "retrieve_chart", retrieve_chart)
+    service = chart_comparison_service.ChartComparisonService()
+
+    async def compare(record):
+        await service.compare_charts(record["name"], f"{record['name']}_rectified")
+
+    record_benchmark(await run_benchmark("compare_charts", compare, birth_records, rounds=5, charts_per_call=2))
@@ -0,0 +1,93 @@
+"""
+Component tests for the indexed chart store.
+Tests sharded chart files and the SQLite index with real file operations.
+"""
+
+import json
+import os
+import shutil
+import tempfile
+
+import pytest
+
+from ai_service.database.chart_store import INDEX_FILENAME, ChartStore
+
+
+@pytest.fixture
+def store_dir():
+    """Create a temporary directory for the store."""
+    temp_dir = tempfile.mkdtemp()
+    yield temp_dir
+    shutil.rmtree(temp_dir)
+
+
+@pytest.mark.asyncio
+async def test_charts_are_sharded_and_indexed(store_dir):
+    """Test that charts land in shard directories and are read back through the index."""
+    store = ChartStore(store_dir)
+    chart = {"chart_id": "chart_1", "birth_details": {"birth_date": "1990-01-01", "birth_time": "12:00:00"},
+             "created_at": "2024-01-01T00:00:00"}
+
+    await store.put("chart_1", chart)
+
+    path = store.path_for("chart_1")
+    assert os.path.exists(path)
+    assert os.path.dirname(os.path.dirname(os.path.dirname(path))) == store_dir
+    assert await store.get("chart_1") == chart
+    assert await store.contains("chart_1") is True
+    assert await store.get("missing") is None
+
+    assert await store.delete("chart_1") is True
+    assert not os.path.exists(path)
+    assert await store.delete("chart_1") is False
+    assert await store.count() == 0
+
+
+@pytest.mark.asyncio
+async def test_listing_pages_through_the_index(store_dir):
+    """Test that listings come from index summaries, ordered and filtered."""
+    store = ChartStore(store_dir)
+    for i in range(5):
+        await store.put(f"chart_{i}", {
+            "birth_details": {"birth_date": "1990-01-01", "birth_time": f"1{i}:00:00"},
+            "rectification_id": "rect_1" if i % 2 else None,
+            "created_at": f"2024-01-0{i + 1}T00:00:00",
+            "planets": {"sun": {"longitude": 280.5}},
+        })
+
+    # Chart bodies are not read for listings
+    os.remove(store.path_for("chart_3"))
+
+    page = await store.list(limit=2, offset=2)
+    assert [chart["id"] for chart in page] == ["chart_2", "chart_3"]
+    assert page[0]["birth_time"] == "12:00:00"
+    assert "planets" not in page[0]
+
+    rectified = await store.list(rectification_id="rect_1")
+    assert [chart["chart_id"] for chart in rectified] == ["chart_1", "chart_3"]
+
+    # A chart whose file went missing drops out of the index on read
+    assert await store.get("chart_3") is None
+    assert await store.count() == 4
+
+
+@pytest.mark.asyncio
+async def test_flat_chart_files_are_imported(store_dir):
+    """Test that charts in the previous flat layout move into the shard tree."""
+    with open(os.path.join(store_dir, "chart_old.json"), "w") as f:
+        json.dump({"chart_id": "chart_old", "chart_type": "natal"}, f)
+    with open(os.path.join(store_dir, "comparison_c1.json"), "w") as f:
+        json.dump({"comparison_id": "c1"}, f)
+
+    store = ChartStore(store_dir)
+
+    assert (await store.get("chart_old"))["chart_type"] == "natal"
+    assert not os.path.exists(os.path.join(store_dir, "chart_old.json"))
+    assert os.path.exists(os.path.join(store_dir, "comparison_c1.json"))
+    assert await store.count() == 1
+
+    # The import only runs when the index is created
+    store.close()
+    assert os.path.exists(os.path.join(store_dir, INDEX_FILENAME))
+    reopened = ChartStore(store_dir)
+    assert await reopened.count() == 1
@@ -69,7 +69,7 @@ async def test_store_and_get_chart(chart_repository, sample_chart_data):
     assert chart_id.startswith("chart_")
 
     # Verify chart was stored in file
-    file_path = os.path.join(chart_repository.file_storage_path, f"{chart_id}.json")
+    file_path = chart_repository.chart_store.path_for(chart_id)
     assert os.path.exists(file_path)
 
     # Retrieve the chart
@@ -130,7 +130,7 @@ async def test_delete_chart(chart_repository, sample_chart_data):
     assert await chart_repository.get_chart(chart_id) is None
 
     # Check file was removed
-    file_path = os.path.join(chart_repository.file_storage_path, f"{chart_id}.json")
+    file_path = chart_repository.chart_store.path_for(chart_id)
     assert not os.path.exists(file_path)
 
 @pytest.mark.asyncio
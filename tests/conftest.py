@@ -17,6 +17,9 @@ from playwright.async_api import async_playwright, Page as AsyncPage
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Keep sessions in process unless a test run points them at Redis
+os.environ.setdefault("SESSION_BACKEND", "memory")
+
 # Import dependency container
 from ai_service.utils.dependency_container import get_container
 
@@ -0,0 +1,116 @@
+"""
+Unit tests for the API gateway's streaming HTTP proxy.
+"""
+
+import gzip
+import json
+import pytest
+
+import httpx
+from fastapi import FastAPI, Request
+
+from api_gateway import http_client
+from api_gateway.http_proxy import proxy_to_ai_service
+
+
+@pytest.fixture
+def upstream(monkeypatch):
+    """Route the shared client to a mock AI service that records what it receives."""
+    received = []
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        received.append((request, await request.aread()))
+        if request.url.path == "/down":
+            raise httpx.ConnectError("connection refused", request=request)
+        body = gzip.compress(b'{"chart_id":  "chart-1"}')
+
+        async def chunks():
+            yield body[:10]
+            yield body[10:]
+
+        return httpx.Response(
+            201,
+            headers=[
+                ("content-type", "application/json"),
+                ("content-encoding", "gzip"),
+                ("set-cookie", "a=1"),
+                ("set-cookie", "b=2"),
+                ("keep-alive", "timeout=5"),
+            ],
+            content=chunks()
+        )
+
+    client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    monkeypatch.setattr(http_client, "_client", client)
+    return received
+
+
+@pytest.fixture
+def gateway():
+    """A minimal gateway app in front of the mock AI service."""
+    app = FastAPI()
+
+    @app.api_route("/{path:path}", methods=["GET", "POST"])
+    async def proxy(request: Request, path: str):
+        return await proxy_to_ai_service(request, path)
+
+    return httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://gateway")
+
+
+@pytest.mark.asyncio
+async def test_request_is_forwarded_without_hop_by_hop_headers(upstream, gateway):
+    """Test that the body, query and end-to-end headers reach the AI service unchanged."""
+    body = json.dumps({"birth_date": "1990-01-01"}).encode()
+
+    await gateway.post(
+        "/api/v1/chart/generate?tag=a&tag=b",
+        content=body,
+        headers={"Connection": "keep-alive, X-Hop", "X-Hop": "1", "X-Request-ID": "req-1", "TE": "trailers"}
+    )
+
+    request, received_body = upstream[0]
+    assert received_body == body
+    assert request.url.path == "/api/v1/chart/generate"
+    assert request.url.params.get_list("tag") == ["a", "b"]
+    assert request.headers["x-request-id"] == "req-1"
+    assert request.headers["content-length"] == str(len(body))
+    assert request.headers["host"] != "gateway"
+    for name in ("x-hop", "te"):
+        assert name not in request.headers
+    assert request.headers.get("connection") != "keep-alive, X-Hop"
+
+
+@pytest.mark.asyncio
+async def test_response_streams_through_unchanged(upstream, gateway):
+    """Test that the encoded body, status and repeated headers come back as the AI service sent them."""
+    response = await gateway.get("/api/v1/chart/chart-1")
+
+    assert response.status_code == 201
+    assert response.headers["content-encoding"] == "gzip"
+    assert response.headers.get_list("set-cookie") == ["a=1", "b=2"]
+    assert "keep-alive" not in response.headers
+    # The spacing shows the JSON was not parsed and re-serialized
+    assert response.text == '{"chart_id":  "chart-1"}'
+
+
+@pytest.mark.asyncio
+async def test_connection_errors_return_503(upstream, gateway):
+    """Test that an unreachable AI service maps to 503."""
+    response = await gateway.get("/down")
+
+    assert response.status_code == 503
+    assert response.json() == {"detail": "Error connecting to backend service"}
+
+
+@pytest.mark.asyncio
+async def test_lifespan_client_is_shared_and_closed():
+    """Test that the lifespan opens one pooled client for every caller and closes it."""
+    client = await http_client.open_http_client()
+    try:
+        assert http_client.get_http_client() is client
+        assert await http_client.open_http_client() is client
+    finally:
+        await http_client.close_http_client()
+
+    assert client.is_closed
+    assert http_client._client is None
@@ -0,0 +1,84 @@
+"""
+Unit tests for the vectorized aspect engine.
+"""
+
+import pytest
+
+import numpy as np
+
+from ai_service.core.rectification.aspects import AspectSet, separation
+from ai_service.core.rectification.methods.progressed import PROGRESSED_ASPECTS
+from ai_service.core.rectification.methods.solar_arc import SOLAR_ARC_ASPECTS
+
+
+def ladder_score(planet_lon: float, angle_lon: float) -> int:
+    """Scalar solar arc scoring ladder the engine replaced."""
+    aspect_angle = abs(planet_lon - angle_lon) % 360
+    if aspect_angle > 180:
+        aspect_angle = 360 - aspect_angle
+
+    if abs(aspect_angle - 0) < 3:
+        return 10
+    elif abs(aspect_angle - 60) < 3:
+        return 6
+    elif abs(aspect_angle - 90) < 3:
+        return 8
+    elif abs(aspect_angle - 120) < 3:
+        return 8
+    elif abs(aspect_angle - 180) < 3:
+        return 10
+    return 0
+
+
+def test_separation_wraps_around_zero():
+    """Test that separations are folded into 0-180 degrees."""
+    result = separation([350.0, 10.0], [10.0, 190.0, 170.0])
+
+    assert result.shape == (2, 3)
+    assert np.allclose(result, [[20.0, 160.0, 180.0], [0.0, 180.0, 160.0]])
+
+
+def test_matrix_matches_scalar_ladder():
+    """Test that batched scores equal the scalar ladder summed over every pair."""
+    rng = np.random.default_rng(42)
+    planets = rng.uniform(0, 360, size=(50, 7))
+    angles = rng.uniform(0, 360, size=(50, 2))
+
+    expected = [
+        sum(ladder_score(planet, angle) for planet in planets[row] for angle in angles[row])
+        for row in range(50)
+    ]
+
+    assert SOLAR_ARC_ASPECTS.score(planets, angles).tolist() == expected
+
+
+def test_matrix_reports_aspect_and_orb():
+    """Test the aspect index, orb and weights of individual pairs."""
+    matrix = PROGRESSED_ASPECTS.matrix([0.0], [1.5, 92.0, 45.0])
+
+    assert matrix.shape == (1, 3)
+    assert matrix.index.tolist() == [[0, 1, -1]]
+    assert matrix.orb[0, :2] == pytest.approx([1.5, 2.0])
+    assert np.isnan(matrix.orb[0, 2])
+    assert matrix.weights.tolist() == [[12.0, 8.0, 0.0]]
+    assert list(matrix.pairs()) == [((0, 0), "conjunction", 1.5), ((0, 1), "square", 2.0)]
+
+
+def test_first_aspect_in_order_wins_overlapping_orbs():
+    """Test that overlapping orbs resolve to the earlier aspect."""
+    wide = AspectSet([("semi-square", 10, 1), ("sextile", 10, 2)])
+    assert wide.matrix([0.0], [52.0]).index.tolist() == [[0]]
+
+    reversed_order = AspectSet([("sextile", 10, 2), ("semi-square", 10, 1)])
+    assert reversed_order.matrix([0.0], [52.0]).index.tolist() == [[0]]
+    assert reversed_order.score([0.0], [52.0]) == 2.0
+
+
+def test_inclusive_orbs_and_missing_points():
+    """Test orb boundaries and that NaN longitudes never form aspects."""
+    strict = AspectSet.from_orbs({"square": 5.0})
+    inclusive = AspectSet.from_orbs({"square": 5.0}, inclusive=True)
+
+    assert not strict.matrix([0.0], [95.0]).matched.any()
+    assert inclusive.matrix([0.0], [95.0]).matched.all()
+    assert not inclusive.matrix([np.nan], [90.0]).matched.any()
@@ -0,0 +1,106 @@
+"""
+Unit tests for the batched rectification ephemeris.
+Compares batched positions against real chart calculations.
+"""
+
+import pytest
+from datetime import datetime, timedelta
+
+import numpy as np
+
+from ai_service.core.rectification.batch_ephemeris import (
+    calculate_batch,
+    calculate_candidate_batch,
+    candidate_julian_days,
+    datetime_to_julian_day,
+    house_for_longitude,
+    PLANET_NAMES,
+)
+from ai_service.core.rectification.chart_calculator import calculate_chart
+
+BIRTH_DT = datetime(1990, 1, 1, 12, 0)
+LATITUDE = 40.7128
+LONGITUDE = -74.0060
+TIMEZONE = "America/New_York"
+
+
+def angular_distance(a, b):
+    """Smallest distance between two longitudes in degrees."""
+    diff = abs(a - b) % 360
+    return min(diff, 360 - diff)
+
+
+def test_candidate_batch_shapes():
+    """Test that a candidate sweep returns one row per offset."""
+    offsets = list(range(-120, 121, 15))
+    batch = calculate_candidate_batch(BIRTH_DT, LATITUDE, LONGITUDE, TIMEZONE, offsets)
+
+    assert len(batch) == len(offsets)
+    assert batch.longitudes.shape == (len(offsets), len(PLANET_NAMES))
+    assert batch.cusps.shape == (len(offsets), 12)
+    assert batch.angles.shape == (len(offsets), 4)
+    assert np.all((batch.longitudes >= 0) & (batch.longitudes < 360))
+
+    # Candidates are 15 minutes apart in UT
+    assert np.allclose(np.diff(batch.julian_days), 15 / 1440)
+
+
+def test_batch_matches_calculate_chart():
+    """Test that batched positions agree with the full chart calculation."""
+    offsets = [-60, 0, 60]
+    batch = calculate_candidate_batch(BIRTH_DT, LATITUDE, LONGITUDE, TIMEZONE, offsets)
+
+    for row, offset in enumerate(offsets):
+        chart = calculate_chart(BIRTH_DT + timedelta(minutes=offset), LATITUDE, LONGITUDE, TIMEZONE)
+
+        # flatlib charts omit the outer planets, so compare what they provide
+        for name in chart["planets"]:
+            batched = batch.planet_longitudes([name])[row, 0]
+            assert angular_distance(batched, chart["planets"][name]["longitude"]) < 0.05
+
+        # Chart coordinates are truncated to arc minutes, so allow a small
+        # difference in the angles
+        for angle in ["asc", "mc"]:
+            batched = batch.angle_longitudes(angle)[row]
+            assert angular_distance(batched, chart["angles"][angle]["longitude"]) < 1.0
+
+
+def test_dst_offsets_are_applied_per_candidate():
+    """Test that candidates crossing a DST change use their own UTC offset."""
+    # Clocks in New York went forward at 02:00 on 2021-03-14, so three local
+    # hours from 00:30 EST to 03:30 EDT are only two hours apart in UT
+    before = datetime(2021, 3, 14, 0, 30)
+    jds = candidate_julian_days(before, TIMEZONE, [0, 180])
+
+    assert jds[1] - jds[0] == pytest.approx(2 / 24, abs=1e-6)
+    assert jds[0] == pytest.approx(datetime_to_julian_day(before, TIMEZONE))
+
+
+def test_to_chart_dict_layout():
+    """Test conversion of a batch row to the calculate_chart layout."""
+    batch = calculate_batch([datetime_to_julian_day(BIRTH_DT, TIMEZONE)], LATITUDE, LONGITUDE)
+    chart = batch.to_chart_dict(0)
+
+    assert set(chart["planets"]) == set(PLANET_NAMES)
+    assert set(chart["angles"]) == {"asc", "mc", "desc", "ic"}
+    assert len(chart["houses"]) == 12
+    assert chart["planets"]["sun"]["sign"] == "Capricorn"
+    assert angular_distance(chart["angles"]["asc"]["longitude"], chart["houses"][0]) < 1e-6
+
+
+def test_planet_subset_leaves_other_columns_empty():
+    """Test that only the requested planets are calculated."""
+    batch = calculate_batch([2447893.0], LATITUDE, LONGITUDE, planets=["sun", "moon"])
+
+    assert not np.isnan(batch.planet_longitudes(["sun", "moon"])).any()
+    assert np.isnan(batch.planet_longitudes(["saturn"])).all()
+
+
+def test_house_for_longitude_wraps_zero_aries():
+    """Test house lookup for a house spanning 0 degrees Aries."""
+    cusps = [350.0 + 30 * i for i in range(12)]
+    cusps = [cusp % 360 for cusp in cusps]
+
+    assert house_for_longitude(355.0, cusps) == 1
+    assert house_for_longitude(5.0, cusps) == 1
+    assert house_for_longitude(25.0, cusps) == 2
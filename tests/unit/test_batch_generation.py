@@ -0,0 +1,135 @@
+"""
+Unit tests for batch chart generation.
+"""
+
+import asyncio
+import json
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from ai_service.api.routers import chart as chart_router
+from ai_service.database.repositories import ChartRepository
+from ai_service.services import chart_service as chart_service_module
+from ai_service.services.chart_service import ChartService
+
+
+def record(index, **overrides):
+    fields = {
+        "birth_date": "1990-01-01",
+        "birth_time": f"{index % 24:02d}:00:00",
+        "latitude": 40.7,
+        "longitude": -74.0,
+        "timezone": "America/New_York",
+    }
+    fields.update(overrides)
+    return fields
+
+
+async def aiter(items):
+    for item in items:
+        yield item
+
+
+@pytest.fixture
+def service(tmp_path):
+    """Chart service over file storage, with the calculation and verification stubbed."""
+    service = ChartService(
+        openai_service=object(),
+        chart_repository=ChartRepository(db_pool=None, file_storage_path=str(tmp_path / "charts"))
+    )
+    writes = []
+    verified = []
+
+    async def calculate(birth_date, birth_time, latitude, longitude, timezone, **options):
+        # Later records finish first
+        await asyncio.sleep(0.01 * (24 - int(birth_time[:2])) / 24)
+        return {
+            "chart_id": f"chart_{birth_time[:2]}",
+            "birth_details": {"birth_date": birth_date, "birth_time": birth_time, "timezone": timezone},
+            "planets": {"Sun": {"longitude": 280.5}},
+        }
+
+    async def verify(chart_data, birth_date, birth_time, location):
+        verified.append(chart_data["chart_id"])
+        return {"verified": True, "confidence_score": 90.0, "message": "Verified"}
+
+    store_charts = service.chart_repository.store_charts
+
+    async def counting_store_charts(charts):
+        writes.append(len(charts))
+        return await store_charts(charts)
+
+    service._calculate_new_chart = calculate
+    service.verify_chart_with_openai = verify
+    service.chart_repository.store_charts = counting_store_charts
+    service.writes = writes
+    service.verified = verified
+    return service
+
+
+@pytest.mark.asyncio
+async def test_batch_stores_charts_and_reports_every_record(service):
+    """Test that every record gets a result, failures included, and charts are written in batches."""
+    records = [record(i) for i in range(10)] + [
+        "not a record",
+        record(10, latitude=95.0),
+        {"birth_date": "1990-01-01"},
+    ]
+    results = [result async for result in service.generate_charts(aiter(records), batch_size=4, concurrency=8)]
+
+    assert sorted(result["index"] for result in results) == list(range(13))
+    by_index = {result["index"]: result for result in results}
+    assert all(by_index[i]["status"] == "success" for i in range(10))
+    assert by_index[10]["error"] == "Record is not a JSON object"
+    assert "latitude" in by_index[11]["error"].lower()
+    assert by_index[12]["error"] == "Missing field: birth_time"
+
+    # Results come back as charts finish, not in input order
+    assert [result["index"] for result in results] != sorted(result["index"] for result in results)
+    assert sum(service.writes) == 10 and max(service.writes) <= 4 and len(service.writes) < 10
+
+    stored = await service.chart_repository.get_chart("chart_03")
+    assert stored["verification"]["message"].endswith("(verification skipped)")
+    assert service.verified == []
+
+
+@pytest.mark.asyncio
+async def test_deferred_verification_updates_stored_charts(service):
+    """Test that deferred verification stores charts first and verifies them afterwards."""
+    records = [record(i, birth_details=None) for i in range(3)]
+    results = [result async for result in service.generate_charts(aiter(records), verification="deferred")]
+
+    assert [result["chart"]["verification"]["status"] for result in results] == ["pending"] * 3
+    await asyncio.gather(*chart_service_module._deferred_verifications)
+
+    assert sorted(service.verified) == ["chart_00", "chart_01", "chart_02"]
+    stored = await service.chart_repository.get_chart("chart_01")
+    assert stored["verification"] == {"verified": True, "confidence_score": 90.0, "message": "Verified"}
+
+
+def test_batch_endpoint_streams_ndjson_results(service, monkeypatch):
+    """Test NDJSON and JSON-array input and NDJSON results."""
+    monkeypatch.setattr(chart_router, "get_chart_service", lambda: service)
+    app = FastAPI()
+    app.include_router(chart_router.router)
+    client = TestClient(app)
+
+    body = "\n".join(json.dumps({"birth_details": record(i)}) for i in range(3)) + "\n{broken\n"
+    response = client.post(
+        "/generate/batch", content=body, headers={"Content-Type": "application/x-ndjson"}
+    )
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("application/x-ndjson")
+    results = [json.loads(line) for line in response.text.splitlines()]
+    assert sorted(result["index"] for result in results) == [0, 1, 2, 3]
+    assert [result["status"] for result in results].count("error") == 1
+    assert all("chart" not in result for result in results)
+
+    response = client.post("/generate/batch?include_charts=true", json=[record(5)])
+    result = json.loads(response.text)
+    assert result["chart"]["chart_id"] == "chart_05"
+
+    assert client.post("/generate/batch?verification=later", json=[]).status_code == 400
+    assert client.post("/generate/batch", json={"record": 1}).status_code == 400
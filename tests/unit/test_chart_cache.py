@@ -0,0 +1,118 @@
+"""
+Unit tests for the memoized chart cache.
+"""
+
+import pytest
+from datetime import datetime
+
+from ai_service.core.rectification.chart_cache import ChartCache, get_chart_cache, make_chart_key
+from ai_service.core.rectification.chart_calculator import calculate_chart, chart_cache_key, get_cached_chart
+from ai_service.core.rectification.chart_workers import ChartWorkerPool
+
+BIRTH_DT = datetime(1990, 1, 1, 12, 0)
+LATITUDE = 40.7128
+LONGITUDE = -74.0060
+TIMEZONE = "America/New_York"
+
+
+@pytest.fixture(autouse=True)
+def clear_cache():
+    """Start every test with an empty shared cache."""
+    get_chart_cache().clear()
+    yield
+    get_chart_cache().clear()
+
+
+def test_lru_eviction_and_counters():
+    """Test that the least recently used chart is evicted first."""
+    cache = ChartCache(max_entries=2)
+    for index in range(2):
+        cache.put(index, {"planets": {"sun": index}, "houses": [], "angles": {}})
+
+    assert cache.get(0)["planets"]["sun"] == 0
+    cache.put(2, {"planets": {}, "houses": [], "angles": {}})
+
+    assert cache.get(1) is None
+    assert cache.get(0) is not None
+    assert cache.get_stats() == {
+        "entries": 2,
+        "max_entries": 2,
+        "hits": 2,
+        "misses": 1,
+        "evictions": 1,
+        "hit_rate": pytest.approx(2 / 3),
+    }
+
+
+def test_cached_entries_are_copies():
+    """Test that callers cannot mutate cached positions."""
+    cache = ChartCache()
+    chart = {"planets": {"sun": {"longitude": 1.0}}, "houses": [], "angles": {}, "chart_id": "x"}
+    cache.put("key", chart)
+    chart["planets"]["sun"]["longitude"] = 99.0
+
+    cached = cache.get("key")
+    assert cached["planets"]["sun"]["longitude"] == 1.0
+    assert "chart_id" not in cached
+
+    cached["planets"]["sun"]["longitude"] = 42.0
+    assert cache.get("key")["planets"]["sun"]["longitude"] == 1.0
+
+
+def test_zero_size_disables_caching():
+    """Test that a cache of size zero stores nothing."""
+    cache = ChartCache(max_entries=0)
+    cache.put("key", {"planets": {}})
+
+    assert cache.get("key") is None
+    assert len(cache) == 0
+
+
+def test_key_normalizes_float_noise():
+    """Test that tiny differences in the inputs map to the same key."""
+    assert make_chart_key(2447893.2083333335, 40.7, -74.0, "Placidus", "tropical") == \
+        make_chart_key(2447893.2083333330, 40.7000000001, -74.0, "Placidus", "tropical")
+
+
+def test_same_instant_in_different_timezones_shares_key():
+    """Test that the key depends on the UTC instant, not the local time."""
+    local = chart_cache_key(BIRTH_DT, LATITUDE, LONGITUDE, TIMEZONE)
+    utc = chart_cache_key(datetime(1990, 1, 1, 17, 0), LATITUDE, LONGITUDE, "UTC")
+
+    assert local == utc
+
+
+def test_repeated_chart_is_served_from_cache():
+    """Test that a repeated chart hits the cache but keeps per-call metadata."""
+    first = calculate_chart(BIRTH_DT, LATITUDE, LONGITUDE, TIMEZONE)
+    second = calculate_chart(BIRTH_DT, LATITUDE, LONGITUDE, TIMEZONE)
+
+    stats = get_chart_cache().get_stats()
+    assert stats["hits"] == 1
+    assert stats["misses"] == 1
+
+    assert second["planets"] == first["planets"]
+    assert second["houses"] == first["houses"]
+    assert second["angles"] == first["angles"]
+    assert second["chart_id"] != first["chart_id"]
+
+
+def test_get_cached_chart_misses_without_calculating():
+    """Test that a cache lookup alone never calculates a chart."""
+    assert get_cached_chart(BIRTH_DT, LATITUDE, LONGITUDE, TIMEZONE) is None
+    assert len(get_chart_cache()) == 0
+
+
+@pytest.mark.asyncio
+async def test_worker_pool_serves_hits_without_workers():
+    """Test that pooled chart requests are cached in the calling process."""
+    calculate_chart(BIRTH_DT, LATITUDE, LONGITUDE, TIMEZONE)
+    pool = ChartWorkerPool(max_workers=1)
+    try:
+        chart = await pool.calculate_chart(BIRTH_DT, LATITUDE, LONGITUDE, TIMEZONE)
+    finally:
+        pool.shutdown()
+
+    assert chart["timezone"] == TIMEZONE
+    assert pool.get_metrics()["submitted"] == 0
+    assert get_chart_cache().get_stats()["hits"] == 1
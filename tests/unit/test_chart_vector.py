@@ -0,0 +1,93 @@
+"""
+Unit tests for the array-backed chart representation.
+"""
+
+import pytest
+
+import numpy as np
+
+from ai_service.core.rectification.batch_ephemeris import calculate_batch, PLANET_NAMES
+from ai_service.core.rectification.chart_vector import ChartVector, POINT_NAMES
+from ai_service.core.rectification.methods.transit_analysis import calculate_transit_score
+
+LATITUDE = 40.7128
+LONGITUDE = -74.0060
+
+
+@pytest.fixture(scope="module")
+def batch():
+    """Natal and transit rows for two Julian days."""
+    return calculate_batch([2447893.0, 2457893.0], LATITUDE, LONGITUDE)
+
+
+def stored_chart(sun_longitude: float) -> dict:
+    """Chart in the stored list layout used by chart comparison."""
+    return {
+        "chart_id": "chart_test",
+        "planets": [
+            {"name": "Sun", "longitude": sun_longitude, "sign": "Aries"},
+            {"name": "Moon", "longitude": 100.0, "sign": "Cancer"},
+            {"name": "Chiron", "longitude": 200.0, "sign": "Libra"},
+        ],
+        "houses": [{"house": number, "longitude": (number - 1) * 30.0} for number in range(1, 13)],
+        "angles": [
+            {"name": "Ascendant", "longitude": 0.0, "sign": "Aries"},
+            {"name": "Midheaven", "longitude": 270.0, "sign": "Capricorn"},
+        ],
+    }
+
+
+def test_from_batch_matches_batch_arrays(batch):
+    """Test that a batch row keeps its positions in fixed columns."""
+    vector = batch.chart_vector(0)
+
+    assert vector.longitudes.shape == (len(POINT_NAMES),)
+    assert np.allclose(vector.longitudes[:len(PLANET_NAMES)], batch.longitudes[0])
+    assert np.isnan(vector.planet("chiron"))
+    assert vector.angle("Ascendant") == pytest.approx(batch.angle_longitudes("asc")[0])
+
+
+def test_to_dict_is_lazy_and_cached(batch):
+    """Test that the dict form is built once, on first use."""
+    vector = batch.chart_vector(0)
+    assert vector._dict is None
+
+    chart = vector.to_dict()
+    assert vector.to_dict() is chart
+    assert set(chart["planets"]) == set(PLANET_NAMES)
+    assert chart["planets"]["sun"]["sign"] == "Capricorn"
+    assert 1 <= chart["planets"]["moon"]["house"] <= 12
+
+
+def test_round_trip_through_chart_dict(batch):
+    """Test that converting a chart dict to a vector and back is lossless."""
+    chart = dict(batch.to_chart_dict(0), chart_id="chart_abc", date="1990-01-01")
+    restored = ChartVector.from_chart_dict(chart).to_dict()
+
+    assert restored["chart_id"] == "chart_abc"
+    assert restored["houses"] == pytest.approx(chart["houses"])
+    for name, planet in chart["planets"].items():
+        assert restored["planets"][name] == pytest.approx(planet)
+    assert restored["angles"] == chart["angles"]
+
+
+def test_from_stored_list_layout():
+    """Test parsing of charts whose sections are lists of named entries."""
+    vector = ChartVector.from_chart_dict(stored_chart(10.0))
+
+    assert vector.planet("Sun") == 10.0
+    assert vector.planet("chiron") == 200.0
+    assert np.isnan(vector.planet("mars"))
+    assert vector.angle("mc") == 270.0
+    assert vector.cusps[11] == 330.0
+    assert ChartVector.from_chart_dict(vector) is vector
+
+
+def test_transit_score_same_for_dict_and_vector(batch):
+    """Test that scoring a vector gives the same result as scoring its dict."""
+    natal, transit = batch.chart_vector(0), batch.chart_vector(1)
+
+    for event_type in ["marriage", "career_change", "relocation", "unmapped_event"]:
+        assert calculate_transit_score(natal, transit, event_type) == \
+            calculate_transit_score(natal.to_dict(), transit.to_dict(), event_type)
+
@@ -0,0 +1,107 @@
+"""
+Unit tests for the process-pool chart computation service.
+"""
+
+import asyncio
+import time
+import pytest
+from datetime import datetime
+
+from ai_service.core.exceptions import ResourceExhaustionError
+from ai_service.core.rectification.chart_cache import get_chart_cache
+from ai_service.core.rectification.chart_calculator import calculate_chart, calculate_verified_chart
+from ai_service.core.rectification.chart_workers import (
+    ChartWorkerPool,
+    get_chart_worker_pool,
+    resolve_ephemeris_path,
+    shutdown_chart_worker_pool,
+    worker_ephemeris_path,
+)
+
+BIRTH_DT = datetime(1990, 1, 1, 12, 0)
+
+
+@pytest.fixture
+def pool():
+    """Single-worker pool that is shut down after the test."""
+    pool = ChartWorkerPool(max_workers=1, max_queue_depth=4)
+    yield pool
+    pool.shutdown()
+
+
+@pytest.mark.asyncio
+async def test_chart_in_worker_matches_inline(pool):
+    """Test that charts calculated in a worker match inline calculation."""
+    get_chart_cache().clear()
+    pooled = await pool.calculate_chart(BIRTH_DT, 40.7128, -74.0060, "America/New_York")
+    inline = calculate_chart(BIRTH_DT, 40.7128, -74.0060, "America/New_York")
+
+    for name, planet in inline["planets"].items():
+        assert pooled["planets"][name]["longitude"] == pytest.approx(planet["longitude"])
+    assert pooled["angles"]["asc"]["longitude"] == pytest.approx(inline["angles"]["asc"]["longitude"])
+
+
+@pytest.mark.asyncio
+async def test_workers_set_ephemeris_path_at_startup(pool):
+    """Test that every worker has its ephemeris path set by the initializer."""
+    assert worker_ephemeris_path() is None
+    assert await pool.submit(worker_ephemeris_path) == resolve_ephemeris_path()
+
+
+@pytest.mark.asyncio
+async def test_full_queue_rejects_jobs():
+    """Test that jobs beyond the queue depth are rejected after the timeout."""
+    pool = ChartWorkerPool(max_workers=1, max_queue_depth=1, queue_timeout=0.1)
+    try:
+        slow = asyncio.ensure_future(pool.submit(time.sleep, 0.5))
+        await asyncio.sleep(0)
+
+        with pytest.raises(ResourceExhaustionError):
+            await pool.submit(time.sleep, 0)
+
+        await slow
+    finally:
+        pool.shutdown()
+
+    metrics = pool.get_metrics()
+    assert metrics["rejected"] == 1
+    assert metrics["completed"] == 1
+
+
+@pytest.mark.asyncio
+async def test_backpressure_metrics():
+    """Test that waiting jobs are recorded in the metrics."""
+    pool = ChartWorkerPool(max_workers=1, max_queue_depth=1)
+    try:
+        await asyncio.gather(*[pool.submit(time.sleep, 0.05) for _ in range(3)])
+    finally:
+        pool.shutdown()
+
+    metrics = pool.get_metrics()
+    assert metrics["completed"] == 3
+    assert metrics["peak_in_flight"] == 1
+    assert metrics["in_flight"] == 0
+    assert metrics["waiting"] == 0
+    assert metrics["max_wait_seconds"] > 0
+
+
+@pytest.mark.asyncio
+async def test_unpicklable_jobs_run_in_thread(pool):
+    """Test that jobs that cannot be pickled still run off the event loop."""
+    result = await pool.submit(lambda value: value * 2, 21)
+
+    assert result == 42
+    assert not pool.get_metrics()["started"]
+
+
+@pytest.mark.asyncio
+async def test_verified_chart_uses_shared_pool():
+    """Test that async chart calculation is routed through the shared pool."""
+    shutdown_chart_worker_pool()
+    get_chart_cache().clear()
+    try:
+        chart = await calculate_verified_chart("1990-01-01", "12:00", 40.7128, -74.0060, "America/New_York")
+        assert chart["birth_date"] == "1990-01-01"
+        assert get_chart_worker_pool().get_metrics()["completed"] == 1
+    finally:
+        shutdown_chart_worker_pool()
@@ -0,0 +1,94 @@
+"""
+Unit tests for the precomputed ephemeris table.
+"""
+
+import pytest
+from datetime import datetime
+
+import numpy as np
+import swisseph as swe
+
+from ai_service.core.rectification import ephemeris_table
+from ai_service.core.rectification.batch_ephemeris import CALC_FLAGS, PLANET_NAMES, calculate_batch
+from ai_service.core.rectification.chart_cache import get_chart_cache
+from ai_service.core.rectification.chart_calculator import calculate_chart
+from ai_service.core.rectification.ephemeris_table import TABLE_BODIES, build_ephemeris_table
+
+START_JD = 2447892.5  # 1990-01-01
+END_JD = START_JD + 60
+LATITUDE = 40.7128
+LONGITUDE = -74.0060
+
+
+@pytest.fixture(scope="module")
+def table_path(tmp_path_factory):
+    """A two-month daily table."""
+    path = str(tmp_path_factory.mktemp("ephemeris") / "planet_table.bin")
+    build_ephemeris_table(path, START_JD, END_JD)
+    return path
+
+
+@pytest.fixture
+def installed_table(table_path, monkeypatch):
+    """Make the test table the shared one."""
+    monkeypatch.setenv("EPHEMERIS_TABLE_PATH", table_path)
+    ephemeris_table.reset_ephemeris_table()
+    get_chart_cache().clear()
+    yield ephemeris_table.get_ephemeris_table()
+    ephemeris_table.reset_ephemeris_table()
+    get_chart_cache().clear()
+
+
+def test_interpolation_matches_swisseph(table_path):
+    """Test that interpolated positions stay within 0.001 degrees of pyswisseph."""
+    table = ephemeris_table.EphemerisTable(table_path)
+    jds = START_JD + np.random.default_rng(0).random(50) * (END_JD - START_JD)
+
+    longitudes, latitudes, speeds = table.positions(jds)
+
+    for column, body in enumerate(TABLE_BODIES.values()):
+        expected = np.array([swe.calc_ut(float(jd), body, CALC_FLAGS)[0] for jd in jds])
+        lon_error = np.abs((longitudes[:, column] - expected[:, 0] + 180) % 360 - 180)
+        assert lon_error.max() < 1e-3
+        assert np.abs(latitudes[:, column] - expected[:, 1]).max() < 1e-3
+        assert np.abs(speeds[:, column] - expected[:, 3]).max() < 1e-2
+
+
+def test_out_of_range_days_are_nan(table_path):
+    """Test that days outside the table are not extrapolated."""
+    table = ephemeris_table.EphemerisTable(table_path)
+
+    longitudes, _, _ = table.positions([START_JD - 1, START_JD + 1, END_JD + 1], ["sun"])
+
+    assert np.isnan(longitudes[[0, 2], 0]).all()
+    assert not np.isnan(longitudes[1, 0])
+    assert table.flatlib_objects(END_JD + 1, ["Sun"]) is None
+
+
+def test_batch_falls_back_outside_table(installed_table):
+    """Test that calculate_batch mixes table rows with pyswisseph rows."""
+    jds = [START_JD + 10.25, END_JD + 10.25]
+
+    batch = calculate_batch(jds, LATITUDE, LONGITUDE)
+    precise = calculate_batch(jds, LATITUDE, LONGITUDE, high_precision=True)
+
+    np.testing.assert_allclose(batch.longitudes[0], precise.longitudes[0], atol=1e-3)
+    assert batch.longitudes[0, 0] != precise.longitudes[0, 0]
+    assert (batch.longitudes[1] == precise.longitudes[1]).all()
+    assert (batch.cusps == precise.cusps).all()
+
+
+def test_chart_uses_table(installed_table):
+    """Test that calculate_chart reads planets from the table with the same layout."""
+    birth_dt = datetime(1990, 1, 15, 12, 0)
+
+    chart = calculate_chart(birth_dt, LATITUDE, LONGITUDE, "America/New_York")
+    get_chart_cache().clear()
+    precise = calculate_chart(birth_dt, LATITUDE, LONGITUDE, "America/New_York", high_precision=True)
+
+    assert chart["planets"].keys() == precise["planets"].keys()
+    assert set(chart["planets"]) <= set(PLANET_NAMES)
+    for name, planet in chart["planets"].items():
+        assert planet["longitude"] == pytest.approx(precise["planets"][name]["longitude"], abs=1e-3)
+        assert planet["sign"] == precise["planets"][name]["sign"]
+    assert chart["angles"] == precise["angles"]
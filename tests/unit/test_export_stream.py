@@ -0,0 +1,130 @@
+"""
+Unit tests for chunked, compressed export streaming.
+"""
+
+import gzip
+import json
+import zlib
+from datetime import date, datetime, timedelta
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from ai_service.api.routers import chart as chart_router
+from ai_service.utils import export_stream
+from ai_service.utils.export_stream import choose_encoding, compress_chunks, encoded_etag, iter_json, write_json_export
+
+CHART = {
+    "chart_id": "chart_1",
+    "birth_details": {"birth_date": date(1990, 1, 1), "birth_time": "12:00:00"},
+    "planets": {name: {"longitude": 30.0 * i, "sign": "Aries"} for i, name in enumerate(["Sun", "Moon", "Mars"])},
+    "houses": [{"number": i + 1, "longitude": 30.0 * i} for i in range(12)],
+}
+
+
+def test_json_is_encoded_in_chunks(tmp_path):
+    """Test that chunked JSON matches json.dumps and stays near the chunk size."""
+    data = {"items": [{"index": i, "at": datetime(2024, 1, 1)} for i in range(2000)]}
+    chunks = list(iter_json(data, chunk_size=4096))
+
+    assert len(chunks) > 10
+    assert all(len(chunk) < 4096 + 200 for chunk in chunks)
+    expected = json.dumps(data, indent=2, default=lambda value: value.isoformat())
+    assert b"".join(chunks).decode("utf-8") == expected
+
+    path = write_json_export(data, str(tmp_path / "export.json"))
+    assert json.load(open(path))["items"][-1] == {"index": 1999, "at": "2024-01-01T00:00:00"}
+
+
+def test_encoding_negotiation(monkeypatch):
+    """Test Accept-Encoding parsing, q-values, and skipping compressed formats."""
+    monkeypatch.setattr(export_stream, "ZSTD_AVAILABLE", False)
+    assert choose_encoding("gzip, deflate, br", "application/json") == "gzip"
+    assert choose_encoding("zstd, gzip", "application/json") == "gzip"
+    assert choose_encoding("gzip;q=0, deflate", "application/json") is None
+    assert choose_encoding("*", "image/svg+xml") == "gzip"
+    assert choose_encoding("gzip", "image/png") is None
+    assert choose_encoding("gzip", "application/pdf") is None
+    assert choose_encoding(None, "application/json") is None
+
+    monkeypatch.setattr(export_stream, "ZSTD_AVAILABLE", True)
+    assert choose_encoding("gzip, zstd", "application/json") == "zstd"
+    assert choose_encoding("zstd;q=0, gzip", "application/json") == "gzip"
+
+
+def test_gzip_chunks_are_flushed_as_they_arrive():
+    """Test that every input chunk yields output and the stream decompresses whole."""
+    chunks = [bytes([65 + i]) * 10000 for i in range(5)]
+    compressed = list(compress_chunks(iter(chunks), "gzip"))
+
+    assert len(compressed) == len(chunks) + 1
+    # The first chunk can be decoded before the rest is produced
+    assert zlib.decompressobj(16 + zlib.MAX_WBITS).decompress(compressed[0]) == chunks[0]
+    assert gzip.decompress(b"".join(compressed)) == b"".join(chunks)
+    assert list(compress_chunks(iter(chunks), None)) == chunks
+
+
+def make_client(monkeypatch, repository=None, chart_service=None):
+    if repository is not None:
+        async def get_repository():
+            return repository
+        monkeypatch.setattr(chart_router, "get_chart_repository", get_repository)
+    if chart_service is not None:
+        monkeypatch.setattr(chart_router, "get_chart_service", lambda: chart_service)
+    app = FastAPI()
+    app.include_router(chart_router.router)
+    return TestClient(app)
+
+
+def test_download_is_compressed_when_accepted(tmp_path, monkeypatch):
+    """Test that downloads are gzipped on request with an ETag of their own."""
+    file_path = tmp_path / "export.json"
+    write_json_export(CHART, str(file_path))
+
+    class Repository:
+        async def get_export(self, export_id):
+            return {
+                "export_id": export_id,
+                "chart_id": "chart_1",
+                "format": "json",
+                "file_path": str(file_path),
+                "expires_at": (datetime.now() + timedelta(days=1)).isoformat(),
+            }
+
+    client = make_client(monkeypatch, repository=Repository())
+
+    plain = client.get("/download/export_1/json", headers={"Accept-Encoding": "identity"})
+    assert plain.status_code == 200
+    assert "content-encoding" not in plain.headers
+
+    response = client.get("/download/export_1/json", headers={"Accept-Encoding": "gzip"})
+    assert response.status_code == 200
+    assert response.headers["content-encoding"] == "gzip"
+    assert response.headers["vary"] == "Accept-Encoding"
+    assert response.content == file_path.read_bytes()
+    etag = response.headers["etag"]
+    assert etag == encoded_etag(plain.headers["etag"], "gzip")
+
+    response = client.get("/download/export_1/json", headers={"Accept-Encoding": "gzip", "If-None-Match": etag})
+    assert response.status_code == 304
+
+
+def test_stream_endpoint_sends_exports_without_storing_them(monkeypatch):
+    """Test streaming JSON and SVG exports straight from the chart."""
+    class ChartService:
+        async def get_chart(self, chart_id):
+            return CHART if chart_id == "chart_1" else None
+
+    client = make_client(monkeypatch, chart_service=ChartService())
+
+    response = client.get("/export/chart_1/stream", headers={"Accept-Encoding": "gzip"})
+    assert response.status_code == 200
+    assert response.headers["content-encoding"] == "gzip"
+    assert response.json()["birth_details"]["birth_date"] == "1990-01-01"
+
+    response = client.get("/export/chart_1/stream?format=svg")
+    assert response.headers["content-type"] == "image/svg+xml"
+    assert response.text.startswith("<svg")
+
+    assert client.get("/export/chart_2/stream").status_code == 404
+    assert client.get("/export/chart_1/stream?format=docx").status_code == 400
@@ -0,0 +1,100 @@
+"""
+Unit tests for the bounded LLM response cache.
+"""
+
+import json
+import pytest
+
+import fakeredis
+import httpx
+
+from ai_service.api.services.openai.response_cache import (
+    MemoryCacheTier, RedisCacheTier, ResponseCache, SQLiteCacheTier, make_cache_key
+)
+from ai_service.api.services.openai.service import OpenAIService
+
+
+def test_keys_are_stable_and_ignore_formatting():
+    """Test that keys are SHA-256 digests that ignore whitespace but not parameters."""
+    key = make_cache_key("completion", "gpt-4", "What is  the\nascendant?", max_tokens=100, temperature=0.2)
+
+    assert len(key) == 64
+    assert key == make_cache_key("completion", "gpt-4", " What is the ascendant? ", temperature=0.2, max_tokens=100)
+    assert key != make_cache_key("completion", "gpt-4", "What is the ascendant?", max_tokens=100, temperature=0.3)
+    assert key != make_cache_key("completion", "gpt-3.5-turbo", "What is the ascendant?", max_tokens=100, temperature=0.2)
+    assert key != make_cache_key("chat", "gpt-4", "What is the ascendant?", max_tokens=100, temperature=0.2)
+
+
+def test_memory_tier_evicts_least_recently_used_within_byte_limit():
+    """Test that the memory tier stays under its byte limit, evicting the oldest entries first."""
+    tier = MemoryCacheTier(max_entries=100, max_bytes=300)
+    blob = b"x" * 90
+
+    for key in ("a", "b", "c"):
+        tier.put(key, blob, expires_at=float("inf"))
+    tier.get("a")
+    tier.put("d", blob, expires_at=float("inf"))
+
+    assert tier.get("b") is None
+    assert all(tier.get(key) == blob for key in ("a", "c", "d"))
+    assert tier.bytes <= 300 and tier.evictions == 1
+
+    tier.put("huge", b"x" * 400, expires_at=float("inf"))
+    assert tier.get("huge") is None and len(tier) == 3
+
+
+@pytest.mark.asyncio
+async def test_expired_entries_are_misses():
+    """Test that responses past their TTL are not returned."""
+    cache = ResponseCache(ttl=-1)
+    await cache.put("key", {"content": "old"})
+
+    assert await cache.get("key") is None
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("backend", ["sqlite", "redis"])
+async def test_shared_tier_serves_other_workers(backend, tmp_path):
+    """Test that a response cached by one worker is a hit for another through the shared tier."""
+    if backend == "sqlite":
+        shared = SQLiteCacheTier(str(tmp_path / "llm_cache.sqlite3"))
+    else:
+        shared = RedisCacheTier(fakeredis.FakeAsyncRedis())
+
+    first_worker = ResponseCache(MemoryCacheTier(), shared)
+    second_worker = ResponseCache(MemoryCacheTier(), shared)
+    await first_worker.put("key", {"content": "cached"})
+
+    assert await second_worker.get("key", "rectification") == {"content": "cached"}
+    assert await second_worker.get("key", "rectification") == {"content": "cached"}
+
+    stats = second_worker.get_stats()
+    assert stats["by_task"]["rectification"]["shared_hits"] == 1
+    assert stats["by_task"]["rectification"]["memory_hits"] == 1
+    assert stats["shared_backend"] == backend
+
+
+@pytest.mark.asyncio
+async def test_service_reports_hit_rates_per_task(monkeypatch):
+    """Test that OpenAIService caches by stable key and reports per-task hit rates."""
+    monkeypatch.setenv("OPENAI_API_KEY", "test-key")
+    monkeypatch.delenv("TEST_MODE", raising=False)
+    monkeypatch.setenv("ENABLE_CACHE", "true")
+    calls = []
+
+    def handler(request):
+        calls.append(json.loads(request.content))
+        return httpx.Response(200, json={"choices": [{"message": {"content": f"answer {len(calls)}"}}]})
+
+    service = OpenAIService(client=httpx.AsyncClient(transport=httpx.MockTransport(handler)), cache=ResponseCache())
+
+    first = await service.generate_completion("Which sign rises?", "rectification")
+    second = await service.generate_completion("Which  sign rises?\n", "rectification")
+    await service.generate_completion("Which sign rises?", "explanation")
+
+    assert len(calls) == 2
+    assert first["content"] == second["content"] == "answer 1"
+
+    by_task = service.get_usage_statistics()["cache_stats"]["by_task"]
+    assert by_task["rectification"]["hit_rate"] == 0.5
+    assert by_task["explanation"]["hit_rate"] == 0.0
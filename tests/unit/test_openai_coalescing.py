@@ -0,0 +1,109 @@
+"""
+Unit tests for OpenAIService connection pooling and request coalescing.
+"""
+
+import asyncio
+import json
+import pytest
+
+import httpx
+
+from ai_service.api.services.openai import http_pool
+from ai_service.api.services.openai.response_cache import ResponseCache
+from ai_service.api.services.openai.service import OpenAIService
+
+
+def _completion(content):
+    return {
+        "choices": [{"message": {"content": content}}],
+        "usage": {"prompt_tokens": 10, "completion_tokens": 5, "total_tokens": 15},
+    }
+
+
+@pytest.fixture(autouse=True)
+def environment(monkeypatch):
+    monkeypatch.setenv("OPENAI_API_KEY", "test-key")
+    monkeypatch.delenv("TEST_MODE", raising=False)
+
+
+def _service(handler):
+    """A service whose API calls go to a mock transport."""
+    return OpenAIService(client=httpx.AsyncClient(transport=httpx.MockTransport(handler)), cache=ResponseCache())
+
+
+@pytest.mark.asyncio
+async def test_identical_concurrent_prompts_share_one_call():
+    """Test that concurrent identical prompts make a single API call."""
+    calls = []
+
+    async def handler(request):
+        calls.append(json.loads(request.content))
+        await asyncio.sleep(0.05)
+        return httpx.Response(200, json=_completion(f"answer {len(calls)}"))
+
+    service = _service(handler)
+    requests_before = http_pool.pool_metrics.requests
+
+    results = await asyncio.gather(*(service.generate_completion("Same prompt", "auxiliary") for _ in range(5)))
+    other = await service.generate_completion("Different prompt", "auxiliary")
+
+    assert len(calls) == 2
+    assert {result["content"] for result in results} == {"answer 1"}
+    assert other["content"] == "answer 2"
+
+    stats = service.get_usage_statistics()
+    assert stats["coalescing_stats"] == {"coalesced_calls": 4, "in_flight": 0}
+    assert stats["calls_made"] == 2
+    assert stats["connection_pool"]["requests"] - requests_before == 2
+    assert stats["connection_pool"]["in_flight"] == 0
+
+
+@pytest.mark.asyncio
+async def test_coalesced_callers_share_failures_and_survive_cancellation():
+    """Test that followers get the leader's error, and retry themselves if the leader is cancelled."""
+    service = _service(lambda request: httpx.Response(200, json=_completion("ok")))
+    release = asyncio.Event()
+
+    async def failing():
+        await release.wait()
+        raise ValueError("bad response")
+
+    leader = asyncio.ensure_future(service._single_flight("key", failing))
+    await asyncio.sleep(0)
+    follower = asyncio.ensure_future(service._single_flight("key", failing))
+    await asyncio.sleep(0)
+    release.set()
+    for task in (leader, follower):
+        with pytest.raises(ValueError):
+            await task
+
+    async def slow():
+        await asyncio.sleep(1)
+
+    async def fast():
+        return "follower result"
+
+    leader = asyncio.ensure_future(service._single_flight("key", slow))
+    await asyncio.sleep(0)
+    follower = asyncio.ensure_future(service._single_flight("key", fast))
+    await asyncio.sleep(0)
+    leader.cancel()
+
+    assert await follower == "follower result"
+    assert leader.cancelled()
+    assert service._in_flight == {}
+
+
+@pytest.mark.asyncio
+async def test_services_share_the_process_pool():
+    """Test that services without an injected client share one pooled client per event loop."""
+    first = OpenAIService()
+    second = OpenAIService()
+
+    client = first.client
+    assert second.client is client
+    assert http_pool.get_shared_http_client() is client
+
+    await http_pool.close_shared_http_client()
+    assert first.client is not client and not first.client.is_closed
+    await http_pool.close_shared_http_client()
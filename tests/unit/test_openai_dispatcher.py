@@ -0,0 +1,158 @@
+"""
+Unit tests for the OpenAI request dispatcher and token-aware rate limiter.
+"""
+
+import asyncio
+import json
+import pytest
+
+import httpx
+
+from ai_service.api.services.openai.dispatcher import RequestDispatcher
+from ai_service.api.services.openai.rate_limiter import TokenRateLimiter, estimate_tokens, parse_reset
+from ai_service.api.services.openai.response_cache import ResponseCache
+from ai_service.api.services.openai.service import OpenAIService
+
+
+@pytest.fixture(autouse=True)
+def environment(monkeypatch):
+    monkeypatch.setenv("OPENAI_API_KEY", "test-key")
+    monkeypatch.delenv("TEST_MODE", raising=False)
+
+
+@pytest.mark.asyncio
+async def test_dispatcher_caps_concurrency_and_returns_each_result():
+    """Test that no more than max_concurrency calls run at once and every caller gets its own result."""
+    dispatcher = RequestDispatcher(max_concurrency=3)
+    running = []
+    peak = 0
+
+    def make_call(value):
+        async def call():
+            nonlocal peak
+            running.append(value)
+            peak = max(peak, len(running))
+            await asyncio.sleep(0.02)
+            running.remove(value)
+            if value == 7:
+                raise ValueError("bad request")
+            return value * 2
+        return call
+
+    results = await asyncio.gather(
+        *(dispatcher.submit(make_call(value)) for value in range(10)), return_exceptions=True
+    )
+
+    assert peak == 3
+    assert results[:7] == [0, 2, 4, 6, 8, 10, 12]
+    assert isinstance(results[7], ValueError)
+    assert dispatcher.get_stats() == {
+        "max_concurrency": 3, "queued": 0, "running": 0, "completed": 9, "failed": 1
+    }
+
+
+@pytest.mark.asyncio
+async def test_cancelled_caller_does_not_run_its_queued_call():
+    """Test that a call whose caller gave up while it was queued is skipped."""
+    dispatcher = RequestDispatcher(max_concurrency=1)
+    release = asyncio.Event()
+    ran = []
+
+    async def blocking():
+        await release.wait()
+        return "first"
+
+    async def skipped():
+        ran.append("skipped")
+
+    first = asyncio.ensure_future(dispatcher.submit(blocking))
+    second = asyncio.ensure_future(dispatcher.submit(skipped))
+    await asyncio.sleep(0.01)
+    second.cancel()
+    release.set()
+
+    assert await first == "first"
+    await asyncio.sleep(0.01)
+    assert ran == []
+
+
+@pytest.mark.asyncio
+async def test_rate_limiter_debits_atomically_under_concurrency():
+    """Test that concurrent acquires never overdraw the token bucket."""
+    # 600 tokens per minute refills 10 tokens per second
+    limiter = TokenRateLimiter(tokens_per_minute=600, requests_per_minute=1000)
+
+    waits = await asyncio.gather(limiter.acquire(300), limiter.acquire(300), limiter.acquire(1))
+
+    assert waits[0] == 0 and waits[1] == 0
+    assert 0 < waits[2] < 0.5
+    assert limiter.tokens >= -1e-6
+    assert limiter.get_stats()["waits"] == 1
+
+
+@pytest.mark.asyncio
+async def test_rate_limiter_follows_response_headers():
+    """Test that rate-limit headers set the limits and a 429 pauses new requests."""
+    limiter = TokenRateLimiter(tokens_per_minute=1000, requests_per_minute=10)
+
+    limiter.update_from_headers({
+        "x-ratelimit-limit-tokens": "60000",
+        "x-ratelimit-remaining-tokens": "500",
+        "x-ratelimit-limit-requests": "100",
+        "x-ratelimit-remaining-requests": "99",
+    })
+    assert limiter.token_limit == 60000
+    assert limiter.request_limit == 100
+    assert limiter.tokens < 600
+
+    limiter.update_from_headers({"x-ratelimit-reset-tokens": "150ms"}, status_code=429)
+    waited = await limiter.acquire(1)
+
+    assert waited >= 0.1
+    assert limiter.get_stats()["throttled"] == 1
+
+
+def test_parse_reset_and_token_estimates():
+    """Test OpenAI reset durations and prompt token estimates."""
+    assert parse_reset("6m0s") == 360
+    assert parse_reset("1.5s") == 1.5
+    assert parse_reset("20ms") == pytest.approx(0.02)
+    assert parse_reset("2") == 2
+    assert parse_reset("soon") is None
+
+    short = estimate_tokens("Hello")
+    long = estimate_tokens("Hello " * 200)
+    assert 0 < short < long
+    assert estimate_tokens([{"role": "user", "content": "Hello"}]) == short
+
+
+@pytest.mark.asyncio
+async def test_service_requests_go_through_the_limiter():
+    """Test that completions are charged to the limiter and sync it from response headers."""
+    calls = []
+
+    async def handler(request):
+        calls.append(json.loads(request.content))
+        return httpx.Response(
+            200,
+            headers={"x-ratelimit-limit-tokens": "40000", "x-ratelimit-remaining-tokens": "39000"},
+            json={
+                "choices": [{"message": {"content": "answer"}}],
+                "usage": {"prompt_tokens": 10, "completion_tokens": 5, "total_tokens": 15},
+            }
+        )
+
+    service = OpenAIService(client=httpx.AsyncClient(transport=httpx.MockTransport(handler)), cache=ResponseCache())
+
+    result = await service.generate_completion("A prompt", "auxiliary", max_tokens=100)
+    request_id = await service._add_to_batch_queue([{"role": "user", "content": "Queued"}], "gpt-4", 50, 0.2)
+    queued = await service._get_from_batch_results(request_id)
+
+    assert result["content"] == "answer"
+    assert queued["content"] == "answer"
+    assert len(calls) == 2
+
+    stats = service.get_usage_statistics()
+    assert stats["rate_limiter"]["token_limit"] == 40000
+    assert stats["rate_limiter"]["tokens_available"] <= 39000
+    assert stats["dispatcher"]["completed"] == 2
@@ -0,0 +1,85 @@
+"""
+Unit tests for secondary progression calculations.
+Checks progressed positions against direct Swiss Ephemeris calculations.
+"""
+
+import pytest
+from datetime import datetime
+
+import numpy as np
+
+from ai_service.core.rectification.batch_ephemeris import (
+    calculate_batch,
+    candidate_julian_days,
+)
+from ai_service.core.rectification.progressions import (
+    ProgressionCalculator,
+    progressed_julian_days,
+)
+
+BIRTH_DT = datetime(1985, 7, 22, 6, 30)
+LATITUDE = 18.5204
+LONGITUDE = 73.8567
+TIMEZONE = "Asia/Kolkata"
+
+
+def angular_distance(a, b):
+    """Smallest distance between two longitude arrays in degrees."""
+    diff = np.abs(np.asarray(a) - np.asarray(b)) % 360
+    return np.minimum(diff, 360 - diff)
+
+
+@pytest.fixture
+def natal_jds():
+    """Julian days for a 15-minute candidate sweep."""
+    return candidate_julian_days(BIRTH_DT, TIMEZONE, range(-120, 121, 15))
+
+
+def test_progressed_grid_shape(natal_jds):
+    """Test the candidates x ages grid layout."""
+    grid = progressed_julian_days(natal_jds, range(41))
+
+    assert grid.shape == (len(natal_jds), 41)
+    assert grid[3, 10] == pytest.approx(natal_jds[3] + 10)
+
+
+def test_angles_match_house_calculation(natal_jds):
+    """Test that derived angles agree with the Swiss Ephemeris house routine."""
+    grid = progressed_julian_days(natal_jds, [0, 7, 25, 40])
+    calculator = ProgressionCalculator(LATITUDE, LONGITUDE)
+    asc, mc = calculator.angles(grid)
+
+    direct = calculate_batch(grid.reshape(-1), LATITUDE, LONGITUDE, planets=[])
+
+    assert asc.shape == grid.shape
+    assert angular_distance(asc.reshape(-1), direct.angle_longitudes("asc")).max() < 0.01
+    assert angular_distance(mc.reshape(-1), direct.angle_longitudes("mc")).max() < 0.01
+
+
+def test_work_scales_with_unique_days(natal_jds):
+    """Test that ephemeris work depends on unique days, not candidates x ages."""
+    ages = np.arange(61)
+    calculator = ProgressionCalculator(LATITUDE, LONGITUDE)
+    calculator.angles(progressed_julian_days(natal_jds, ages))
+
+    # A four-hour sweep spans at most two UT days per age
+    assert calculator.days_calculated <= 2 * len(ages)
+    assert calculator.days_calculated < len(natal_jds) * len(ages) / 5
+
+    # A refined sweep inside the same window reuses every cached day
+    before = calculator.days_calculated
+    refined = candidate_julian_days(BIRTH_DT, TIMEZONE, range(-10, 11, 1))
+    calculator.angles(progressed_julian_days(refined, ages))
+    assert calculator.days_calculated == before
+
+
+def test_planet_interpolation_matches_ephemeris(natal_jds):
+    """Test Hermite-interpolated planets against direct calculations."""
+    grid = progressed_julian_days(natal_jds[::4], [0, 12, 33])
+    calculator = ProgressionCalculator(LATITUDE, LONGITUDE)
+    interpolated = calculator.planet_longitudes(grid)
+
+    direct = calculate_batch(grid.reshape(-1), LATITUDE, LONGITUDE)
+
+    assert interpolated.shape == grid.shape + (10,)
+    assert angular_distance(interpolated.reshape(-1, 10), direct.longitudes).max() < 0.01
@@ -0,0 +1,90 @@
+"""
+Unit tests for concurrent execution of rectification methods.
+"""
+
+import asyncio
+import pytest
+from datetime import datetime
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from ai_service.core.rectification import executor
+from ai_service.core.rectification import main
+from ai_service.core.rectification.chart_workers import shutdown_chart_worker_pool
+from ai_service.core.rectification.methods.solar_arc import solar_arc_rectification
+
+BIRTH_DT = datetime(1990, 1, 1, 12, 0)
+ARGS = (BIRTH_DT, 40.7128, -74.0060, "America/New_York")
+
+
+def test_available_cpu_count_override(monkeypatch):
+    """Test that the worker count can be pinned through the environment."""
+    monkeypatch.setenv("RECTIFICATION_WORKERS", "3")
+    assert executor.available_cpu_count() == 3
+
+    monkeypatch.setenv("RECTIFICATION_WORKERS", "not-a-number")
+    assert executor.available_cpu_count() >= 1
+
+
+@pytest.mark.asyncio
+async def test_run_method_in_process_pool_matches_inline(monkeypatch):
+    """Test that a method run in a worker process returns the inline result."""
+    monkeypatch.setenv("RECTIFICATION_WORKERS", "1")
+    try:
+        pooled = await executor.run_method(solar_arc_rectification, *ARGS)
+        inline = await solar_arc_rectification(*ARGS)
+    finally:
+        shutdown_chart_worker_pool()
+
+    assert pooled == inline
+
+
+@pytest.mark.asyncio
+async def test_run_method_falls_back_inline_for_unpicklable_methods():
+    """Test that patched methods still run on the event loop."""
+    method = AsyncMock(return_value=(BIRTH_DT, 70.0))
+
+    assert await executor.run_method(method, *ARGS) == (BIRTH_DT, 70.0)
+    method.assert_awaited_once_with(*ARGS)
+
+
+async def _slow_method(*args):
+    await asyncio.sleep(5)
+    return BIRTH_DT, 60.0
+
+
+@pytest.mark.asyncio
+async def test_high_confidence_ai_result_cancels_other_methods():
+    """Test that an AI result at or above 85% returns without waiting."""
+    ai_time = datetime(1990, 1, 1, 12, 17)
+    slow = AsyncMock(side_effect=_slow_method)
+
+    with patch.object(main, "verify_ephemeris_files", AsyncMock(return_value=True)), \
+         patch("ai_service.api.services.openai.get_openai_service", return_value=MagicMock()), \
+         patch.object(main, "ai_assisted_rectification", AsyncMock(return_value=(ai_time, 90.0))), \
+         patch.object(main, "solar_arc_rectification", slow), \
+         patch.object(main, "progressed_ascendant_rectification", slow):
+        result = await asyncio.wait_for(main.rectify_birth_time(*ARGS), timeout=2)
+
+    assert result == (ai_time, 90.0)
+
+
+@pytest.mark.asyncio
+async def test_methods_run_concurrently():
+    """Test that latency is that of the slowest method, not the sum."""
+    async def method(*args):
+        await asyncio.sleep(0.3)
+        return BIRTH_DT, 70.0
+
+    with patch.object(main, "verify_ephemeris_files", AsyncMock(return_value=True)), \
+         patch("ai_service.api.services.openai.get_openai_service", return_value=MagicMock()), \
+         patch.object(main, "ai_assisted_rectification", AsyncMock(side_effect=method)), \
+         patch.object(main, "solar_arc_rectification", AsyncMock(side_effect=method)), \
+         patch.object(main, "progressed_ascendant_rectification", AsyncMock(side_effect=method)):
+        loop = asyncio.get_running_loop()
+        started = loop.time()
+        rectified, confidence = await main.rectify_birth_time(*ARGS)
+        elapsed = loop.time() - started
+
+    assert elapsed < 0.6
+    assert rectified == BIRTH_DT
+    assert confidence == pytest.approx(70.0)
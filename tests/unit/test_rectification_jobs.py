@@ -0,0 +1,126 @@
+"""
+Unit tests for the Redis-backed rectification job queue.
+"""
+
+import asyncio
+import pytest
+from unittest.mock import AsyncMock, patch
+
+import fakeredis
+
+from ai_service.core.rectification import jobs
+from ai_service.core.rectification.jobs import JobQueue, JobWorker
+
+PAYLOAD = {
+    "chart_id": "chart-1",
+    "birth_date": "1990-01-01",
+    "birth_time": "12:00",
+    "latitude": 40.7128,
+    "longitude": -74.0060,
+    "timezone": "America/New_York",
+    "answers": [],
+}
+
+
+@pytest.fixture
+def queue():
+    """A queue on an in-process fake Redis with short timeouts."""
+    return JobQueue(fakeredis.FakeAsyncRedis(decode_responses=True), visibility_timeout=0.2, retry_backoff=0)
+
+
+@pytest.mark.asyncio
+async def test_higher_priority_jobs_are_claimed_first(queue):
+    """Test that jobs are claimed by priority and then in arrival order."""
+    first, _ = await queue.enqueue("rectification", {"n": 1}, priority=5)
+    second, _ = await queue.enqueue("rectification", {"n": 2}, priority=5)
+    urgent, _ = await queue.enqueue("rectification", {"n": 3}, priority=9)
+
+    claimed = [(await queue.claim()).id for _ in range(3)]
+
+    assert claimed == [urgent, first, second]
+    assert await queue.claim() is None
+    assert await queue.stats() == {"queued": 0, "retrying": 0, "running": 3}
+
+
+@pytest.mark.asyncio
+async def test_identical_pending_jobs_are_deduplicated(queue):
+    """Test that an identical job reuses the pending one until it finishes."""
+    job_id, created = await queue.enqueue("rectification", PAYLOAD)
+    same_id, same_created = await queue.enqueue("rectification", dict(PAYLOAD))
+    other_id, _ = await queue.enqueue("rectification", dict(PAYLOAD, birth_time="12:30"))
+
+    assert created and not same_created
+    assert same_id == job_id and other_id != job_id
+
+    job = await queue.claim()
+    assert (await queue.enqueue("rectification", PAYLOAD))[0] == job_id
+    await queue.complete(job, {"confidence": 80})
+
+    new_id, new_created = await queue.enqueue("rectification", PAYLOAD)
+    assert new_created and new_id != job_id
+
+
+@pytest.mark.asyncio
+async def test_failed_jobs_retry_until_attempts_run_out(queue):
+    """Test that failures are retried and the job fails after max_attempts."""
+    job_id, _ = await queue.enqueue("rectification", PAYLOAD, max_attempts=2)
+    handler = AsyncMock(side_effect=RuntimeError("ephemeris unavailable"))
+    worker = JobWorker(queue, {"rectification": handler})
+
+    assert await worker.run_once()
+    status = await queue.get_status(job_id)
+    assert (status["status"], status["attempts"]) == ("retrying", 1)
+
+    assert await worker.run_once()
+    status = await queue.get_status(job_id)
+    assert (status["status"], status["attempts"]) == ("failed", 2)
+    assert status["error"] == "ephemeris unavailable"
+    assert not await worker.run_once()
+
+
+@pytest.mark.asyncio
+async def test_expired_lease_is_reclaimed(queue):
+    """Test that a job whose worker stopped renewing goes to another worker."""
+    job_id, _ = await queue.enqueue("rectification", PAYLOAD)
+    stalled = await queue.claim("worker-1")
+
+    assert await queue.claim("worker-2") is None
+    await asyncio.sleep(0.25)
+    reclaimed = await queue.claim("worker-2")
+
+    assert reclaimed.id == job_id and reclaimed.attempts == 2
+    assert not await queue.complete(stalled, {"stale": True})
+    assert await queue.complete(reclaimed, {"fresh": True})
+    status = await queue.get_status(job_id)
+    assert status["result"] == {"fresh": True}
+    assert status["worker"] == "worker-2"
+
+
+@pytest.mark.asyncio
+async def test_worker_records_progress_and_result(queue):
+    """Test that the rectification handler's progress and result reach the job record."""
+    seen_progress = []
+    stolen = []
+
+    async def fake_rectification(*args, progress_callback=None, **kwargs):
+        await progress_callback({"stage": "method_completed", "status": "processing", "progress": 40,
+                                 "message": "solar_arc completed", "best_candidate": {"confidence": 60.0}})
+        seen_progress.append(await queue.get_status(job_id))
+        # Outlive the 0.2s lease; the worker's renewals keep other workers off the job
+        await asyncio.sleep(0.3)
+        stolen.append(await queue.claim("worker-2"))
+        return {"rectified_time": args[0].replace(minute=20), "confidence": 68.0}
+
+    job_id, _ = await queue.enqueue("rectification", PAYLOAD)
+    worker = JobWorker(queue, jobs.RECTIFICATION_HANDLERS)
+    with patch("ai_service.core.rectification.main.comprehensive_rectification", side_effect=fake_rectification):
+        assert await worker.run_once()
+
+    running = seen_progress[0]
+    assert (running["status"], running["progress"], running["message"]) == ("running", 40, "solar_arc completed")
+    assert running["partial"] == {"stage": "method_completed", "best_candidate": {"confidence": 60.0}}
+
+    assert stolen == [None]
+    status = await queue.get_status(job_id)
+    assert status["status"] == "completed" and status["progress"] == 100
+    assert status["result"] == {"rectified_time": "1990-01-01T12:20:00", "confidence": 68.0}
@@ -0,0 +1,103 @@
+"""
+Unit tests for rectification candidate search strategies.
+"""
+
+import pytest
+from datetime import datetime
+
+import numpy as np
+
+from ai_service.core.rectification.search import (
+    AdaptiveSearch,
+    GridSearch,
+    angle_sign_boundary,
+)
+from ai_service.core.rectification.methods.solar_arc import solar_arc_rectification
+
+
+class CountingScore:
+    """Triangular score peak that records every offset it is asked for."""
+
+    def __init__(self, peak: float, width: float = 40):
+        self.peak = peak
+        self.width = width
+        self.calls = []
+
+    def __call__(self, offsets: np.ndarray) -> np.ndarray:
+        self.calls.extend(offsets.tolist())
+        return np.maximum(0.0, self.width - np.abs(offsets - self.peak))
+
+
+def test_grid_search_evaluates_every_step():
+    """Test that the fixed grid reproduces the legacy 15-minute sweep."""
+    score = CountingScore(peak=37)
+    result = GridSearch(window_minutes=120, step_minutes=15).search(score)
+
+    assert result.evaluations == 17
+    assert result.best_offset == 30
+
+
+def test_adaptive_search_reaches_minute_precision():
+    """Test that the adaptive search pins the peak with fewer evaluations."""
+    score = CountingScore(peak=37)
+    search = AdaptiveSearch(window_minutes=120, coarse_step_minutes=30, budget=40)
+    result = search.search(score)
+
+    assert result.best_offset == 37
+    assert result.evaluations <= 40
+    # A minute-level grid over the same window would take 241 evaluations
+    assert len(score.calls) == result.evaluations < 241
+
+
+def test_adaptive_search_respects_budget():
+    """Test that no more than the budget is ever scored."""
+    score = CountingScore(peak=-83)
+    result = AdaptiveSearch(window_minutes=120, coarse_step_minutes=15, budget=20).search(score)
+
+    assert result.evaluations == 20
+    assert len(score.calls) == 20
+
+
+def test_adaptive_search_bisects_boundary_crossings():
+    """Test that both sides of a boundary crossing are evaluated."""
+    score = CountingScore(peak=0)
+
+    def boundary(offsets: np.ndarray) -> np.ndarray:
+        return (np.asarray(offsets) >= 53).astype(int)
+
+    result = AdaptiveSearch(window_minutes=120, coarse_step_minutes=30).search(score, boundary)
+
+    assert 52.0 in result.offsets
+    assert 53.0 in result.offsets
+
+
+def test_nan_scores_never_win():
+    """Test that failed candidates are not chosen as the best."""
+    def score(offsets: np.ndarray) -> np.ndarray:
+        return np.where(offsets < 0, np.nan, 1.0)
+
+    result = GridSearch(window_minutes=30, step_minutes=10).search(score)
+
+    assert result.best_offset == 0
+    assert result.best_score == 1.0
+
+
+def test_angle_sign_boundary_changes_with_ascendant():
+    """Test that the ascendant/MC boundary key changes within a 4-hour window."""
+    boundary = angle_sign_boundary(datetime(1990, 1, 1, 12, 0), "America/New_York", 40.7128, -74.0060)
+    keys = boundary(np.arange(-120, 121, 30))
+
+    assert len(keys) == 9
+    assert len(set(keys.tolist())) > 1
+
+
+@pytest.mark.asyncio
+async def test_solar_arc_accepts_search_strategy():
+    """Test that a rectification method runs with a pluggable strategy."""
+    birth_dt = datetime(1990, 1, 1, 12, 0)
+    for strategy in [GridSearch(), AdaptiveSearch()]:
+        rectified, confidence = await solar_arc_rectification(
+            birth_dt, 40.7128, -74.0060, "America/New_York", search=strategy
+        )
+        assert abs((rectified - birth_dt).total_seconds()) <= 120 * 60
+        assert 50 <= confidence <= 85
@@ -0,0 +1,90 @@
+"""
+Unit tests for streaming rectification progress.
+"""
+
+import asyncio
+import json
+import pytest
+from datetime import datetime
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from ai_service.api.websockets import manager
+from ai_service.core.rectification import main
+
+BIRTH_DT = datetime(1990, 1, 1, 12, 0)
+ARGS = (BIRTH_DT, 40.7128, -74.0060, "America/New_York")
+
+
+def _method(delay, minute, confidence):
+    async def method(*args):
+        await asyncio.sleep(delay)
+        return BIRTH_DT.replace(minute=minute), confidence
+    return AsyncMock(side_effect=method)
+
+
+def _patched_methods():
+    return [
+        patch.object(main, "verify_ephemeris_files", AsyncMock(return_value=True)),
+        patch("ai_service.api.services.openai.get_openai_service", return_value=MagicMock()),
+        patch.object(main, "ai_assisted_rectification", _method(0.2, 30, 60.0)),
+        patch.object(main, "solar_arc_rectification", _method(0.0, 10, 60.0)),
+        patch.object(main, "progressed_ascendant_rectification", _method(0.4, 20, 80.0)),
+    ]
+
+
+@pytest.mark.asyncio
+async def test_stream_yields_partial_results_as_methods_finish():
+    """Test that each method's result and the running best candidate arrive before the slowest method."""
+    patches = _patched_methods()
+    for active in patches:
+        active.start()
+    try:
+        loop = asyncio.get_running_loop()
+        started = loop.time()
+        updates = []
+        async for update in main.stream_rectification(*ARGS):
+            updates.append((loop.time() - started, update))
+    finally:
+        for active in patches:
+            active.stop()
+
+    stages = [update["stage"] for _, update in updates]
+    assert stages == ["started", "method_completed", "method_completed", "method_completed", "completed"]
+    assert [update["method"] for _, update in updates[1:4]] == ["solar_arc", "ai_rectification", "progressed"]
+
+    first_elapsed, first = updates[1]
+    assert first_elapsed < 0.15
+    assert first["best_candidate"] == {"rectified_time": BIRTH_DT.replace(minute=10), "confidence": 60.0}
+
+    progress = [update["progress"] for _, update in updates]
+    assert progress == sorted(progress) and progress[-1] == 100
+
+    final = updates[-1][1]
+    assert final["confidence_trend"] == [60.0, 60.0, 68.0]
+    assert (final["rectified_time"], final["confidence"]) == (BIRTH_DT.replace(minute=20), 68.0)
+    assert set(final["method_results"]) == {"solar_arc", "ai_rectification", "progressed"}
+
+
+@pytest.mark.asyncio
+async def test_rectify_birth_time_publishes_updates_to_session():
+    """Test that updates reach the session's WebSocket as JSON and the result is unchanged."""
+    patches = _patched_methods()
+    for active in patches:
+        active.start()
+    try:
+        with patch.object(manager, "send_update", AsyncMock(return_value=True)) as send_update:
+            streamed = await main.rectify_birth_time(*ARGS, session_id="session-1", chart_id="chart-1")
+        quiet = await main.rectify_birth_time(*ARGS)
+    finally:
+        for active in patches:
+            active.stop()
+
+    assert streamed == quiet
+    payloads = [call.args[1] for call in send_update.await_args_list]
+    assert {call.args[0] for call in send_update.await_args_list} == {"session-1"}
+    assert len(payloads) == 5
+    assert all(payload["type"] == "rectification_progress" for payload in payloads)
+    assert all(payload["chart_id"] == "chart-1" for payload in payloads)
+    assert payloads[-1]["status"] == "completed"
+    assert payloads[-1]["result"]["rectified_time"] == streamed[0].isoformat()
+    json.dumps(payloads)
@@ -0,0 +1,127 @@
+"""
+Unit tests for the content-addressed render cache and conditional export downloads.
+"""
+
+import asyncio
+import os
+from datetime import datetime, timedelta
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from ai_service.api.routers import chart as chart_router
+from ai_service.core.render_cache import RenderCache, etag_matches, file_etag, render_key
+from ai_service.core.render_service import RenderService
+
+CHART = {
+    "chart_id": "chart_1",
+    "created_at": "2024-01-01T00:00:00",
+    "birth_details": {"birth_date": "1990-01-01", "birth_time": "12:00:00"},
+    "planets": {"Sun": {"longitude": 280.5}, "Moon": {"longitude": 135.8}},
+    "houses": [{"longitude": 30.0 * i} for i in range(12)],
+}
+
+
+def write(path, size):
+    with open(path, "wb") as f:
+        f.write(b"x" * size)
+
+
+def test_keys_follow_what_is_drawn():
+    """Test that keys ignore IDs and timestamps but not positions, format or kind."""
+    key = render_key("chart_wheel", [CHART], ".png")
+    copy = dict(CHART, chart_id="chart_2", created_at="2025-06-01T00:00:00")
+    moved = dict(CHART, planets={"Sun": {"longitude": 281.0}, "Moon": {"longitude": 135.8}})
+
+    assert render_key("chart_wheel", [copy], ".png") == key
+    assert render_key("chart_wheel", [moved], ".png") != key
+    assert render_key("chart_wheel", [CHART], ".svg") != key
+    assert render_key("chart_pdf", [CHART], ".png") != key
+
+
+def test_least_recently_used_files_are_evicted(tmp_path):
+    """Test size-based LRU eviction, and that recency survives a restart."""
+    cache = RenderCache(str(tmp_path), max_bytes=250)
+    keys = [f"{i:064x}" for i in range(3)]
+    for key in keys:
+        partial = cache.partial_path_for(key, ".png")
+        write(partial, 100)
+        cache.put(key, partial, ".png")
+        os.utime(cache.path_for(key, ".png"), (1000 + int(key, 16), 1000 + int(key, 16)))
+
+    # Three files of 100 bytes exceed 250; the oldest went
+    assert cache.get(keys[0]) is None
+    assert cache.get(keys[1]) == cache.path_for(keys[1], ".png")
+    assert cache.get_stats()["evictions"] == 1
+
+    # keys[1] was just used, so keys[2] is now the oldest
+    write(cache.partial_path_for("f" * 64, ".png"), 10)
+    reloaded = RenderCache(str(tmp_path), max_bytes=150)
+    assert reloaded.get(keys[2]) is None
+    assert reloaded.get(keys[1]) is not None
+    assert not any(".partial-" in name for _, _, names in os.walk(tmp_path) for name in names)
+
+
+def test_etags():
+    """Test content-address ETags and If-None-Match matching."""
+    key = "a" * 64
+    assert file_etag(f"/cache/aa/{key}.pdf") == f'"{key}"'
+    assert etag_matches(f'"other", W/"{key}"', f'"{key}"')
+    assert etag_matches("*", f'"{key}"')
+    assert not etag_matches(None, f'"{key}"')
+    assert not etag_matches('"other"', f'"{key}"')
+
+
+@pytest.mark.asyncio
+async def test_repeat_renders_come_from_the_cache(tmp_path):
+    """Test that identical renders share one job and later ones skip the worker."""
+    service = RenderService(max_workers=1, cache=RenderCache(str(tmp_path / "cache"), max_bytes=10 ** 8))
+    try:
+        first, second = await asyncio.gather(
+            service.render("chart_wheel", CHART, str(tmp_path / "a.svg")),
+            service.render("chart_wheel", dict(CHART, chart_id="chart_2"), str(tmp_path / "b.svg")),
+        )
+        third = await service.render("chart_wheel", CHART, str(tmp_path / "c.svg"))
+    finally:
+        service.shutdown()
+
+    assert first == second == third
+    assert first.startswith(str(tmp_path / "cache")) and first.endswith(".svg")
+    metrics = service.get_metrics()
+    assert metrics["completed"] == 1
+    assert metrics["cache"]["hits"] == 1
+
+
+def test_download_answers_matching_etag_with_not_modified(tmp_path, monkeypatch):
+    """Test that exports are sent with an ETag and revalidations get a 304."""
+    key = "b" * 64
+    file_path = tmp_path / f"{key}.pdf"
+    file_path.write_bytes(b"%PDF-1.4 chart")
+
+    class Repository:
+        async def get_export(self, export_id):
+            return {
+                "export_id": export_id,
+                "chart_id": "chart_1",
+                "format": "pdf",
+                "file_path": str(file_path),
+                "expires_at": (datetime.now() + timedelta(days=1)).isoformat(),
+            }
+
+    async def get_repository():
+        return Repository()
+
+    monkeypatch.setattr(chart_router, "get_chart_repository", get_repository)
+    app = FastAPI()
+    app.include_router(chart_router.router)
+    client = TestClient(app)
+
+    response = client.get("/download/export_1/pdf")
+    assert response.status_code == 200
+    assert response.headers["etag"] == f'"{key}"'
+    assert response.content == b"%PDF-1.4 chart"
+
+    response = client.get("/download/export_1/pdf", headers={"If-None-Match": f'"{key}"'})
+    assert response.status_code == 304
+    assert response.content == b""
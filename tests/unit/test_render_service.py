@@ -0,0 +1,85 @@
+"""
+Unit tests for the process-pool render service.
+"""
+
+import asyncio
+import os
+import pytest
+
+from ai_service.core.exceptions import RenderError, ResourceExhaustionError
+from ai_service.core.render_service import RENDERERS, RenderService
+
+CHART = {
+    "birth_details": {"birth_date": "1990-01-01", "birth_time": "12:00:00", "latitude": 40.7, "longitude": -74.0},
+    "planets": {
+        "Sun": {"longitude": 280.5, "sign": "Capricorn", "degree": 10.5, "house": 10},
+        "Moon": {"longitude": 135.8, "sign": "Leo", "degree": 15.8, "house": 5},
+    },
+    "houses": [{"longitude": 30.0 * i, "sign": "Aries", "degree": 0.0} for i in range(12)],
+    "aspects": [{"planet1": "Sun", "planet2": "Moon", "type": "trine", "orb": 4.7}],
+}
+
+
+@pytest.fixture
+def service():
+    """Single-worker render service that is shut down after the test."""
+    service = RenderService(max_workers=1, max_queue_depth=4)
+    yield service
+    service.shutdown()
+
+
+@pytest.fixture
+def sleep_renderer(monkeypatch):
+    """Register a render job kind that only sleeps."""
+    monkeypatch.setitem(RENDERERS, "sleep", "time:sleep")
+
+
+@pytest.mark.asyncio
+async def test_renders_files_in_a_worker(service, tmp_path):
+    """Test that charts, PDFs and comparisons are rendered and their paths returned."""
+    wheel, pdf, comparison = await asyncio.gather(
+        service.render("chart_wheel", CHART, str(tmp_path / "chart.svg")),
+        service.render("chart_pdf", CHART, str(tmp_path / "chart.pdf")),
+        service.render("comparison", CHART, CHART, str(tmp_path / "comparison.png")),
+    )
+
+    assert wheel == str(tmp_path / "chart.svg")
+    assert open(pdf, "rb").read(4) == b"%PDF"
+    assert os.path.getsize(comparison) > 0
+
+    metrics = service.get_metrics()
+    assert metrics["completed"] == 3
+    assert metrics["in_flight"] == 0
+
+
+@pytest.mark.asyncio
+async def test_timed_out_render_keeps_its_slot(sleep_renderer):
+    """Test that a caller stops waiting at the timeout while the worker keeps the slot."""
+    service = RenderService(max_workers=1, max_queue_depth=1, queue_timeout=0.1)
+    try:
+        # Start the worker so its startup does not count against the timeout
+        await service.render("sleep", 0)
+
+        with pytest.raises(RenderError):
+            await service.render("sleep", 1.0, timeout=0.2)
+        assert service.get_metrics()["in_flight"] == 1
+
+        with pytest.raises(ResourceExhaustionError):
+            await service.render("sleep", 0)
+    finally:
+        service.shutdown()
+
+    metrics = service.get_metrics()
+    assert metrics["timed_out"] == 1
+    assert metrics["rejected"] == 1
+
+
+@pytest.mark.asyncio
+async def test_renderer_errors_reach_the_caller(service):
+    """Test that unknown job kinds and failing renders raise in the caller."""
+    with pytest.raises(RenderError):
+        service.submit("hologram", CHART, "chart.glb")
+
+    with pytest.raises(TypeError):
+        await service.render("chart_wheel")
+    assert service.get_metrics()["failed"] == 1
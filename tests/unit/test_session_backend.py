@@ -0,0 +1,133 @@
+"""
+Unit tests for the async session backends and the session store built on them.
+"""
+
+import asyncio
+import pytest
+
+import fakeredis
+
+from ai_service.api.services.session_backend import MemorySessionBackend, RedisSessionBackend, dumps
+from ai_service.api.services.session_service import SessionStore
+
+
+@pytest.fixture(params=["memory", "redis"])
+def backend(request):
+    if request.param == "memory":
+        return MemorySessionBackend()
+    return RedisSessionBackend(fakeredis.FakeAsyncRedis(), prefix="test_session:")
+
+
+@pytest.mark.asyncio
+async def test_concurrent_responses_are_all_kept(backend):
+    """Test that concurrent read-modify-write updates never lose a response."""
+    store = SessionStore(backend=backend)
+    session_id = await store.create_session("s1", {"chart_id": "chart-1"})
+
+    results = await asyncio.gather(*(
+        store.add_question_response(session_id, f"q{i}", f"Question {i}", "yes") for i in range(20)
+    ))
+    await asyncio.gather(store.update_confidence(session_id, 55.0), store.update_session(session_id, {"data": {"step": 2}}))
+
+    session = await store.get_session(session_id)
+    assert all(results)
+    assert sorted(response["question_id"] for response in session["responses"]) == sorted(f"q{i}" for i in range(20))
+    assert session["current_confidence"] == 55.0
+    assert session["data"] == {"chart_id": "chart-1", "step": 2}
+
+
+@pytest.mark.asyncio
+async def test_missing_sessions_are_not_created_by_updates(backend):
+    """Test that updates to an unknown session report failure instead of creating it."""
+    store = SessionStore(backend=backend)
+
+    assert await store.update_confidence("missing", 40.0) is False
+    assert await store.add_question_response("missing", "q1", "Question", "no") is False
+    assert await store.get_session("missing") is None
+    assert await store.delete_session("missing") is False
+
+
+@pytest.mark.asyncio
+async def test_listing_and_deleting_sessions(backend):
+    """Test that sessions are listed by ID and deleted."""
+    store = SessionStore(backend=backend)
+    for i in range(3):
+        await store.create_session(f"s{i}", {"index": i})
+
+    listed = {session["session_id"] for session in await store.get_all_sessions()}
+    assert listed == {"s0", "s1", "s2"}
+
+    assert await store.delete_session("s1") is True
+    assert {session["session_id"] for session in await store.get_all_sessions()} == {"s0", "s2"}
+
+
+@pytest.mark.asyncio
+async def test_redis_sessions_expire_and_reads_extend_them():
+    """Test that sessions carry a Redis TTL that reads slide forward."""
+    redis_client = fakeredis.FakeAsyncRedis()
+    backend = RedisSessionBackend(redis_client, prefix="test_session:")
+
+    await backend.set("s1", {"status": "active", "tags": {"a"}}, ttl=10)
+    assert await redis_client.ttl("test_session:s1") <= 10
+    assert await redis_client.get("test_session:s1") == dumps({"status": "active", "tags": ["a"]})
+
+    assert await backend.get("s1", ttl=1000) == {"status": "active", "tags": ["a"]}
+    assert await redis_client.ttl("test_session:s1") > 10
+
+
+@pytest.mark.asyncio
+async def test_memory_sessions_expire():
+    """Test that the in-memory stand-in drops expired sessions."""
+    backend = MemorySessionBackend()
+    await backend.set("s1", {"status": "active"}, ttl=0)
+    await backend.set("s2", {"status": "active"}, ttl=60)
+
+    assert await backend.get("s1") is None
+    assert await backend.purge_expired() == 0
+    assert [session_id for session_id, _ in await backend.items()] == ["s2"]
+
+
+@pytest.mark.asyncio
+async def test_answers_append_to_the_log_and_compact():
+    """Test that answers are small log appends that compaction folds into the snapshot."""
+    redis_client = fakeredis.FakeAsyncRedis()
+    store = SessionStore(backend=RedisSessionBackend(redis_client, prefix="test_session:", compact_every=5))
+    session_id = await store.create_session("s1", {"chart_id": "chart-1"})
+    snapshot = await redis_client.get("test_session:s1")
+
+    for i in range(4):
+        await store.add_question_response(session_id, f"q{i}", f"Question {i}", "yes")
+    await store.update_confidence(session_id, 42.0)
+
+    # Four appends left the snapshot alone; the fifth compacted the log
+    assert await redis_client.llen("test_session_events:s1") == 0
+    assert await redis_client.get("test_session:s1") != snapshot
+
+    await store.add_question_response(session_id, "q4", "Question 4", "no")
+    assert await redis_client.llen("test_session_events:s1") == 1
+
+    session = await store.get_session(session_id)
+    assert [response["question_id"] for response in session["responses"]] == ["q0", "q1", "q2", "q3", "q4"]
+    assert session["current_confidence"] == 42.0
+    assert session["data"] == {"chart_id": "chart-1"}
+
+    # Whole-session updates fold the log into a new snapshot
+    await store.create_session(session_id, {"step": 3})
+    assert await redis_client.llen("test_session_events:s1") == 0
+    assert len((await store.get_session(session_id))["responses"]) == 5
+
+
+@pytest.mark.asyncio
+async def test_memory_log_replays_and_compacts():
+    """Test that the in-memory stand-in replays and compacts its log the same way."""
+    backend = MemorySessionBackend(compact_every=3)
+    await backend.set("s1", {"responses": [], "data": {}}, ttl=60)
+
+    assert await backend.append("s1", {"append": {"responses": 1}}, ttl=60) == 1
+    assert await backend.append("s1", {"merge": {"data": {"a": 1}}}, ttl=60) == 2
+    assert await backend.get("s1") == {"responses": [1], "data": {"a": 1}}
+
+    await backend.append("s1", {"set": {"status": "done"}, "append": {"responses": 2}}, ttl=60)
+    assert backend._entries["s1"][2] == []
+    assert await backend.get("s1") == {"responses": [1, 2], "data": {"a": 1}, "status": "done"}
+    assert await backend.append("missing", {"set": {"status": "done"}}, ttl=60) is None
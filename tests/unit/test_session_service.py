@@ -7,10 +7,10 @@ import pytest
 import asyncio
 import os
 import json
-import tempfile
 from datetime import datetime
 from typing import Dict, Any
 
+from ai_service.api.services.session_backend import MemorySessionBackend
 from ai_service.api.services.session_service import SessionStore, get_session_store
 
 class TestSessionService:
@@ -18,19 +18,8 @@ class TestSessionService:
 
     @pytest.fixture
     def session_store(self):
-        """Create a real SessionStore instance with temporary storage."""
-        # Create a temporary directory for session storage
-        temp_dir = tempfile.mkdtemp()
-
-        # Create the session store with the temporary directory
-        store = SessionStore(persistence_dir=temp_dir)
-
-        # Return the store and cleanup function
-        yield store
-
-        # Clean up the temporary directory after tests
-        import shutil
-        shutil.rmtree(temp_dir)
+        """Create a real SessionStore instance on the in-memory backend."""
+        return SessionStore(backend=MemorySessionBackend())
 
     @pytest.mark.asyncio
     async def test_create_session(self, session_store):
@@ -140,8 +129,8 @@ class TestSessionService:
         session_data = {"test": "persistence"}
         await session_store.create_session(session_id, session_data)
 
-        # Create a new session store instance with the same persistence directory
-        new_store = SessionStore(persistence_dir=session_store.persistence_dir)
+        # Create a new session store instance on the same backend
+        new_store = SessionStore(backend=session_store.backend)
 
         # Verify session exists in the new store
         session = await new_store.get_session(session_id)
@@ -0,0 +1,115 @@
+"""
+Unit tests for the matplotlib-free SVG chart renderer.
+"""
+
+import subprocess
+import sys
+import xml.etree.ElementTree as ET
+
+import pytest
+
+from ai_service.core.exceptions import RenderError
+from ai_service.utils import svg_chart
+from ai_service.utils.svg_chart import (
+    SQUARE_HOUSE_CENTERS,
+    chart_cusps,
+    chart_wheel_svg,
+    comparison_svg,
+    house_of,
+    render_chart_wheel_svg,
+    vedic_square_svg,
+)
+
+SVG = "{http://www.w3.org/2000/svg}"
+
+CHART = {
+    "birth_details": {"birth_date": "1990-01-01", "birth_time": "12:00:00"},
+    "ascendant": {"sign": "Aries", "degree": 15.0},
+    "planets": {
+        "Sun": {"longitude": 280.5, "sign": "Capricorn", "degree": 10.5, "house": 10},
+        "Moon": {"longitude": 135.8, "sign": "Leo", "degree": 15.8},
+        "Mars": {"longitude": 137.0, "sign": "Leo", "degree": 17.0},
+    },
+    "houses": [{"number": i + 1, "longitude": (15.0 + 30.0 * i) % 360} for i in range(12)],
+    "aspects": [{"planet1": "Sun", "planet2": "Moon", "type": "trine", "orb": 4.7}],
+}
+
+
+def texts(svg):
+    """Return (x, y, text) of every text element in an SVG document."""
+    root = ET.fromstring(svg)
+    return [
+        (float(node.get("x")), float(node.get("y")), node.text)
+        for node in root.iter(f"{SVG}text")
+    ]
+
+
+def test_module_does_not_import_matplotlib():
+    """Test that the renderer can be imported and used without loading matplotlib."""
+    code = (
+        "import sys\n"
+        "from ai_service.utils.svg_chart import chart_wheel_svg\n"
+        "chart_wheel_svg({})\n"
+        "print('matplotlib' in sys.modules, 'numpy' in sys.modules)\n"
+    )
+    result = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True)
+    assert result.stdout.split() == ["False", "False"]
+
+
+def test_houses_and_cusps():
+    """Test reading cusps from lists or dicts and placing longitudes across 0° Aries."""
+    cusps = chart_cusps(CHART)
+    assert cusps[0] == 15.0 and cusps[11] == 345.0
+    assert chart_cusps({"houses": {str(i + 1): {"longitude": 30.0 * i} for i in range(12)}})[3] == 90.0
+    assert chart_cusps({"houses": [{"longitude": 0.0}]}) == []
+
+    assert house_of(20.0, cusps) == 1
+    assert house_of(5.0, cusps) == 12
+    assert house_of(350.0, cusps) == 12
+    assert house_of(136.0, cusps) == 5
+
+
+def test_vedic_square_places_planets_in_their_houses():
+    """Test that planets are drawn in their house and houses show their sign."""
+    nodes = texts(vedic_square_svg(CHART))
+
+    def nearest_house(x, y):
+        distances = [(cx - x) ** 2 + (cy - y) ** 2 for cx, cy in SQUARE_HOUSE_CENTERS]
+        return distances.index(min(distances)) + 1
+
+    placed = {text: nearest_house(x, y) for x, y, text in nodes}
+    # Sun by its house field, Moon and Mars by longitude
+    assert placed["☉"] == 10
+    assert placed["☽"] == placed["♂"] == 5
+    # The first house is in Aries, sign 1
+    assert any(text == "1" and nearest_house(tx, ty) == 1 for tx, ty, text in nodes)
+    assert any(text == "Asc: Aries 15.0°" for _, _, text in nodes)
+
+
+def test_wheel_and_comparison_are_valid_svg():
+    """Test that the wheel and the comparison overlay draw every planet and the time shift."""
+    wheel = chart_wheel_svg(CHART)
+    symbols = [text for _, _, text in texts(wheel)]
+    assert {"☉", "☽", "♂", "♈", "12"} <= set(symbols)
+    assert "Astrological Chart - 1990-01-01 12:00:00" in symbols
+
+    rectified = dict(CHART, birth_details={"birth_date": "1990-01-01", "birth_time": "12:14:00"})
+    comparison = comparison_svg(CHART, rectified)
+    symbols = [text for _, _, text in texts(comparison)]
+    assert symbols.count("☉") == 2
+    assert any(text.endswith("14 minutes later") for text in symbols)
+    assert svg_chart.ORIGINAL_COLOR in comparison and svg_chart.RECTIFIED_COLOR in comparison
+
+    # Charts with nothing to draw still render
+    ET.fromstring(vedic_square_svg({}))
+    ET.fromstring(comparison_svg({}, {"planets": [{"name": "Sun", "sign": "Leo", "degree": 3}]}))
+
+
+def test_files_are_written_by_extension(tmp_path, monkeypatch):
+    """Test that SVG files are written and PNGs need the rasterizer."""
+    path = render_chart_wheel_svg(CHART, str(tmp_path / "charts" / "chart.svg"))
+    assert open(path, encoding="utf-8").read().startswith("<svg")
+
+    monkeypatch.setattr(svg_chart, "RASTERIZE_AVAILABLE", False)
+    with pytest.raises(RenderError):
+        render_chart_wheel_svg(CHART, str(tmp_path / "chart.png"))
@@ -0,0 +1,59 @@
+"""
+Unit tests for batched transit scoring.
+"""
+
+import pytest
+
+import numpy as np
+
+from ai_service.core.rectification.batch_ephemeris import calculate_batch
+from ai_service.core.rectification.methods.transit_analysis import (
+    TRANSIT_PLANETS, _event_plan, _natal_points, calculate_transit_score,
+    rank_transit_candidates, score_transit_tensor
+)
+
+LATITUDE = 40.7128
+LONGITUDE = -74.0060
+EVENT_TYPES = ["marriage", "career_change", "relocation", "major_illness", "unmapped_event"]
+
+
+@pytest.fixture(scope="module")
+def natal_batch():
+    """Candidate natal charts an hour apart."""
+    return calculate_batch(list(2447893.0 + np.arange(8) / 24), LATITUDE, LONGITUDE)
+
+
+@pytest.fixture(scope="module")
+def transit_batch():
+    """One transit chart per event type."""
+    return calculate_batch(list(2455000.0 + np.arange(len(EVENT_TYPES)) * 400), LATITUDE, LONGITUDE)
+
+
+def test_tensor_matches_per_event_scores(natal_batch, transit_batch):
+    """Test that the batched tensor equals scoring each candidate and event separately."""
+    plans = [_event_plan(event_type) for event_type in EVENT_TYPES]
+    scores, counts = score_transit_tensor(
+        _natal_points(natal_batch), natal_batch.cusps,
+        transit_batch.planet_longitudes(TRANSIT_PLANETS),
+        np.array([points for points, _ in plans]), np.array([houses for _, houses in plans])
+    )
+
+    assert scores.shape == counts.shape == (len(natal_batch), len(EVENT_TYPES))
+    for candidate in range(len(natal_batch)):
+        natal = natal_batch.chart_vector(candidate)
+        for event, event_type in enumerate(EVENT_TYPES):
+            expected = calculate_transit_score(natal, transit_batch.chart_vector(event), event_type)
+            assert (scores[candidate, event], counts[candidate, event]) == expected
+
+
+def test_ranking_averages_valid_events_only():
+    """Test that events without aspects are skipped and empty candidates never rank."""
+    event_scores = np.array([[20.0, 0.0, 10.0], [0.0, 0.0, 0.0]])
+    aspect_counts = np.array([[2, 0, 1], [0, 0, 0]])
+
+    scores, total_aspects, valid_events = rank_transit_candidates(event_scores, aspect_counts)
+
+    assert scores[0] == 15.0
+    assert scores[1] == -np.inf
+    assert total_aspects.tolist() == [3, 0]
+    assert valid_events.tolist() == [2, 0]